@@ -5,11 +5,13 @@ Agents module - exports the agents that can be used in the application.
 from .job_search_agent import JobSearchAgent
 from .job_application_agent import JobApplicationAgent
 from .knowledge_base_agent import KnowledgeBaseAgent
+from .profile_agent import ApplicantProfileAgent
 from .resume_manager_agent import ResumeManagerAgent
 
 __all__ = [
     "JobSearchAgent",
     "JobApplicationAgent",
     "KnowledgeBaseAgent",
+    "ApplicantProfileAgent",
     "ResumeManagerAgent"
 ]
@@ -1,14 +1,28 @@
 import asyncio
+from typing import Awaitable, Callable
 from browser_use import Agent, BrowserSession, Controller, Tools
 from browser_use.llm import ChatOpenAI
 
 from .knowledge_base_agent import KnowledgeBaseAgent
+from .profile_agent import ApplicantProfileAgent
 from .resume_manager_agent import ResumeManagerAgent
+from ..autofill import AutofillResult, FormAutofiller, FormField, is_learnable
+from ..cache import AnswerStore
+from ..llm_gateway import LLMGateway
+from ..browser_readiness import get_page_html, wait_until_ready
+from ..extraction import ExtractedJobDescription, extract_job_description
+from ..models.applicant_profile import ApplicantProfile
+from ..telemetry import Span, browser_step_hooks, get_tracer
 from ..logger_config import get_logger
-from ..config import BROWSER_AGENT_NVIDIA_MODEL, NVIDIA_API_KEY, NVIDIA_BASE_URL
+from ..config import (
+    BROWSER_AGENT_NVIDIA_MODEL, NVIDIA_API_KEY, NVIDIA_BASE_URL, JD_EXTRACT_MIN_CONFIDENCE, FORM_AUTOFILL_ENABLED,
+)
 
 logger = get_logger(__name__)
 
+# Fixed delays the readiness checks replaced: browser start-up and browser reset between agents
+LEGACY_FIXED_DELAY_SECONDS = 2.0 + 2.0
+
 
 class JobApplicationAgent:
     """
@@ -16,34 +30,70 @@ class JobApplicationAgent:
     resume selection, and form filling using the knowledge base.
     """
 
-    def __init__(self, browser: BrowserSession, knowledge_base: KnowledgeBaseAgent, resume_manager: ResumeManagerAgent):
+    def __init__(
+        self,
+        browser: BrowserSession,
+        knowledge_base: KnowledgeBaseAgent,
+        resume_manager: ResumeManagerAgent,
+        profile_agent: ApplicantProfileAgent | None = None,
+        answer_store: AnswerStore | None = None,
+    ):
         # Setup LLM resources
         self.browser = browser
-        self.llm = ChatOpenAI(
+        # Browser steps depend on live page state, so they go through the gateway uncached
+        self.llm = LLMGateway.with_failover(ChatOpenAI(
             model=BROWSER_AGENT_NVIDIA_MODEL,
             base_url=NVIDIA_BASE_URL,
             api_key=NVIDIA_API_KEY,
             reasoning_effort="low",
-        )
+            max_retries=0,
+        ), "nvidia")
 
         # Initialize sub-agents for knowledge base and resume management
         self.knowledge_base = knowledge_base
         self.resume_manager = resume_manager
+        # Optional pre-filled profile snapshot; without it every field goes through the knowledge base
+        self.profile_agent = profile_agent
+        # Optional store of answers submitted on earlier applications, reused before any agent reasoning
+        self.answer_store = answer_store
+
+        # Latency saved by the last apply_to_job versus the old fixed sleeps
+        self.last_readiness_saved_seconds = 0.0
 
-    def _build_tools(self) -> Tools:
+    def _build_tools(self, profile: ApplicantProfile | None = None) -> Tools:
         """
         Creates a browser-use Tools and registers the knowledge base
-        as a callable tool so the agent can query it on demand.
+        as a callable tool so the agent can query it on demand. When a
+        profile snapshot is available it is exposed as an instant lookup too.
         """
         tools = Tools()
         kb = self.knowledge_base  # local ref for the closure
 
+        if profile is not None:
+            sections = ", ".join(ApplicantProfile.model_fields)
+
+            @tools.action(
+                "Look up a section of the applicant's pre-filled profile instantly. "
+                f"Valid sections: {sections}.",
+            )
+            def get_applicant_profile(section: str) -> str:
+                """
+                Args:
+                    section: Name of a profile section, e.g. 'contact' or 'work_history'.
+                Returns:
+                    The section as JSON, or a hint to use query_knowledge_base instead.
+                """
+                value = profile.section(section.strip())
+                if value is None or value in ("null", "[]", "{}"):
+                    return f"Not in the profile snapshot; use query_knowledge_base for '{section}'."
+                return value
+
         @tools.action(
             "Query the applicant's knowledge base to retrieve facts about their "
             "background, education, employment history, skills, or any other personal "
             "information needed to fill the job application form.",
         )
-        def query_knowledge_base(question: str) -> str:
+        async def query_knowledge_base(question: str) -> str:
             """
             Args:
                 question: A natural-language question about the applicant,
@@ -51,37 +101,131 @@ class JobApplicationAgent:
             Returns:
                 Relevant facts retrieved from the knowledge base.
             """
-            return kb.query(question)
+            return await kb.aquery(question)
 
         return tools
 
+    async def _get_profile(self) -> ApplicantProfile | None:
+        if self.profile_agent is None:
+            return None
+        try:
+            return await self.profile_agent.get_profile()
+        except Exception as e:
+            logger.warning(f"Applicant profile unavailable, using knowledge base lookups only: {e}")
+            return None
+
+    async def _extract_from_dom(self, job_url: str) -> tuple[ExtractedJobDescription | None, float]:
+        """
+        Fast path: loads the job page, reads its DOM once and extracts the job
+        description without an LLM. Returns the extraction (None when it failed
+        or is not confident enough) and the seconds spent waiting for the page.
+        """
+        readiness_wait = 0.0
+        try:
+            await self.browser.navigate_to(job_url)
+            readiness_wait = await wait_until_ready(self.browser)
+            extracted = extract_job_description(await get_page_html(self.browser), job_url)
+        except Exception as e:
+            logger.debug(f"DOM job description extraction unavailable: {e}")
+            return None, readiness_wait
+
+        if extracted is None or extracted.confidence < JD_EXTRACT_MIN_CONFIDENCE:
+            confidence = extracted.confidence if extracted else 0.0
+            logger.info(f"DOM extraction not confident enough ({confidence:.2f}), falling back to the extractor agent")
+            return None, readiness_wait
+        logger.info(f"Extracted job description from the DOM via {extracted.method} (confidence {extracted.confidence:.2f})")
+        return extracted, readiness_wait
+
+    async def _autofill(self, profile: ApplicantProfile | None, resume_path: str) -> AutofillResult | None:
+        """Fills the form fields the rules can answer and attaches the resume before the agent starts."""
+        if not FORM_AUTOFILL_ENABLED:
+            return None
+        try:
+            return await FormAutofiller(self.browser, self.answer_store).autofill(profile, resume_path)
+        except Exception as e:
+            logger.warning(f"Form autofill unavailable, leaving the whole form to the agent: {e}")
+            return None
+
+    def _answer_recorder(self, fields: list[FormField]) -> tuple[dict[str, str], Callable[[Agent], Awaitable[None]]]:
+        """
+        Returns the answers seen so far, keyed by field selector, and an agent step hook
+        that refreshes them. Answers are read after every step because the form is gone
+        once the agent has submitted it.
+        """
+        answers: dict[str, str] = {}
+        autofiller = FormAutofiller(self.browser)
+
+        async def on_step_end(agent: Agent):
+            try:
+                values = await autofiller.read_values(fields)
+            except Exception as e:
+                logger.debug(f"Could not read form answers: {e}")
+                return
+            answers.update({selector: value for selector, value in values.items() if value and value.strip()})
+
+        return answers, on_step_end
+
+    async def _learn_answers(self, fields: list[FormField], answers: dict[str, str]):
+        learned = [(field.label, answers[field.selector], field.type) for field in fields if field.selector in answers]
+        if not learned:
+            return
+        try:
+            await asyncio.to_thread(self.answer_store.record_many, learned)
+        except Exception as e:
+            logger.warning(f"Could not store submitted answers: {e}")
+
     async def apply_to_job(self, job_url: str):
         """
-        Navigates to the job URL, uses the ResumeManager to select the best resume,
-        and lets the agent query the KnowledgeBase via a tool call when it needs facts.
+        Navigates to the job URL, extracts the job description (from the DOM when
+        possible, otherwise with an extractor agent), uses the ResumeManager to
+        select the best resume, and lets the agent query the KnowledgeBase via a
+        tool call when it needs facts.
         """
         logger.info(f"Applying to job at {job_url}")
+        self.last_readiness_saved_seconds = 0.0
+        with get_tracer().span("application.apply", url=job_url) as span:
+            history = await self._apply(job_url, span)
+            span.set(success=history.is_successful() if history is not None else False)
+            return history
 
-        # Create an initial agent just to extract the job description
-        extract_instructions = (
-            f"Go to {job_url} and read the entire page. Extract the core job description, "
-            "requirements, and responsibilities. Return ONLY this extracted text."
-        )
+    async def _apply(self, job_url: str, span: Span):
 
-        logger.info("Extracting job description from the page...")
+        # Make sure the CDP target is attached before the first agent drives the browser
+        readiness_wait = await wait_until_ready(self.browser, network_idle_seconds=0)
 
-        extractor_agent = Agent(
-            task=extract_instructions,
-            llm=self.llm,
-            browser=self.browser
-        )
-        extract_history = await extractor_agent.run(max_steps=5)
+        with get_tracer().span("job.extract", source="dom") as extract_span:
+            # Try the deterministic DOM extractor before spending an LLM agent on it
+            extracted, page_wait = await self._extract_from_dom(job_url)
+            readiness_wait += page_wait
+            extractor_agent = None
+
+            if extracted is not None:
+                job_description = extracted.text
+                extract_span.set(method=extracted.method, confidence=round(extracted.confidence, 3))
+            else:
+                # Create an initial agent just to extract the job description
+                extract_instructions = (
+                    f"Go to {job_url} and read the entire page. Extract the core job description, "
+                    "requirements, and responsibilities. Return ONLY this extracted text."
+                )
+
+                logger.info("Extracting job description from the page...")
+                extract_span.set(source="agent")
 
-        # Get the final result from the history
-        job_description = extract_history.final_result() if extract_history.is_successful() else "General Job Description"
+                extractor_agent = Agent(
+                    task=extract_instructions,
+                    llm=self.llm,
+                    browser=self.browser
+                )
+                step_start, step_end = browser_step_hooks("extract")
+                extract_history = await extractor_agent.run(max_steps=5, on_step_start=step_start, on_step_end=step_end)
 
-        if not job_description:
-            job_description = "General Job Description"
+                # Get the final result from the history
+                job_description = extract_history.final_result() if extract_history.is_successful() else "General Job Description"
+
+            if not job_description:
+                job_description = "General Job Description"
+            extract_span.set(chars=len(job_description))
 
         logger.info(f"Extracted job description length: {len(job_description)} characters")
 
@@ -90,42 +234,92 @@ class JobApplicationAgent:
 
         if not best_resume_path:
             logger.error("No suitable resume found.")
-            await extractor_agent.close()
+            if extractor_agent is not None:
+                await extractor_agent.close()
             return None
 
         logger.info(f"Using resume: {best_resume_path}")
 
-        await extractor_agent.close()  # Close the extractor agent before starting the application agent
-        await asyncio.sleep(2)  # Add a delay to allow browser reset
+        if extractor_agent is not None:
+            await extractor_agent.close()  # Close the extractor agent before starting the application agent
+            readiness_wait += await wait_until_ready(self.browser)  # Wait for the page to settle after the reset
+        self.last_readiness_saved_seconds = LEGACY_FIXED_DELAY_SECONDS - readiness_wait
+        logger.info(f"Browser readiness took {readiness_wait:.2f}s, "
+                    f"saving {self.last_readiness_saved_seconds:.2f}s over fixed delays")
 
-        base_instructions = f"""
-        You are an autonomous AI applying for jobs.
+        profile = await self._get_profile()
+        autofill = await self._autofill(profile, best_resume_path)
 
-        Job URL: {job_url}
-        At first, check the current URL is the job application URL. If not, navigate to the application form.
+        if autofill is not None and autofill.uploaded_resume:
+            resume_instructions = f"The resume ({best_resume_path}) is already attached; do not upload it again."
+        else:
+            resume_instructions = (
+                "If the application requires a resume upload, click the upload button and select\n"
+                f"        the file at this absolute path: {best_resume_path}."
+            )
 
-        If the application requires a resume upload, click the upload button and select
-        the file at this absolute path: {best_resume_path}.
+        if autofill is not None and autofill.filled:
+            leftover_labels = "\n".join(f"        - {field.display_name}" for field in autofill.leftovers) or "        (none)"
+            autofill_instructions = f"""
+        These fields were already filled from the applicant profile; do not change them:
+        {", ".join(autofill.filled_labels)}
+        Only these fields still need your attention:
+{leftover_labels}
+        """
+        else:
+            autofill_instructions = ""
+
+        if profile is not None:
+            facts_instructions = f"""
+        The applicant's profile is below. Fill fields it covers directly from it, without
+        any lookup. Only use the `query_knowledge_base` action with a precise question for
+        information the profile does not contain.
 
+        Applicant profile:
+        {profile.to_prompt()}
+        """
+        else:
+            facts_instructions = """
         When you encounter any form field that asks for personal information (name,
         contact details, education, work experience, skills, etc.), always use the
         `query_knowledge_base` action with a precise question to retrieve the correct
         answer before filling the field.
+        """
+
+        base_instructions = f"""
+        You are an autonomous AI applying for jobs.
+
+        Job URL: {job_url}
+        At first, check the current URL is the job application URL. If not, navigate to the application form.
 
+        {resume_instructions}
+        {autofill_instructions}{facts_instructions}
         Do not submit the form until all required fields are filled and a resume is attached.
         """
 
         application_agent = Agent(
             task=base_instructions,
             llm=self.llm,
-            tools=self._build_tools(),
+            tools=self._build_tools(profile),
             available_file_paths=[best_resume_path],
             browser=self.browser,
             use_vision=True,
             directly_open_url=False
         )
 
-        history = await application_agent.run(max_steps=20)
+        span.set(autofilled=len(autofill.filled) if autofill is not None else 0)
+        learnable = [field for field in autofill.leftovers if is_learnable(field)] if autofill is not None else []
+        with get_tracer().span("application.submit") as submit_span:
+            if self.answer_store is not None and learnable:
+                answers, record_answers = self._answer_recorder(learnable)
+                step_start, step_end = browser_step_hooks("apply", on_step_end=record_answers)
+                history = await application_agent.run(max_steps=20, on_step_start=step_start, on_step_end=step_end)
+                if history.is_successful():
+                    await self._learn_answers(learnable, answers)
+            else:
+                step_start, step_end = browser_step_hooks("apply")
+                history = await application_agent.run(max_steps=20, on_step_start=step_start, on_step_end=step_end)
+            submit_span.set(success=history.is_successful(), steps=history.number_of_steps())
         await application_agent.close()
 
         return history
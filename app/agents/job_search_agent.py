@@ -1,52 +1,199 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import quote_plus
+from pydantic import ValidationError
 from browser_use import Agent, BrowserSession
 from browser_use.llm import ChatOpenAI, UserMessage
 
 from .knowledge_base_agent import KnowledgeBaseAgent
-from ..models.llm_responses import JobFitAnalysis
+from ..browser_readiness import get_page_html, wait_until_ready
+from ..cache import FitCache
+from ..extraction import ExtractedJobDescription, JobPageFetcher, extract_job_description
+from ..jobs import NearDuplicateIndex, job_key
+from ..llm_gateway import LLMGateway, get_completion_cache
+from ..prompting import CompactedText, PromptCompactor
+from ..ranking import JobPrefilter
+from ..telemetry import browser_step_hooks, get_tracer
+from ..models.llm_responses import JobFitAnalysis, JobFitBatch, JobPosting, JobSearchPage
 from ..logger_config import get_logger
-from ..config import BROWSER_AGENT_NVIDIA_MODEL, NVIDIA_API_KEY, NVIDIA_BASE_URL
+from ..config import (
+    BROWSER_AGENT_NVIDIA_MODEL, NVIDIA_API_KEY, NVIDIA_BASE_URL,
+    CACHE_DIR, FIT_CACHE_TTL_HOURS, FIT_CACHE_MAX_ENTRIES, FIT_ANALYSIS_CONCURRENCY, JD_EXTRACT_MIN_CONFIDENCE,
+    FIT_BATCH_MAX_JOBS, FIT_BATCH_MAX_TOKENS, FIT_BATCH_VERDICT_TOKENS, FIT_BATCH_LINGER_SECONDS,
+    JOB_SEARCH_MAX_STEPS, JOB_SEARCH_STEPS_PER_PAGE, JOB_SEARCH_MAX_PAGES, JOB_SEARCH_TIMEOUT_SECONDS,
+    FIT_PROMPT_JOB_TOKENS, FIT_PROMPT_PROFILE_TOKENS,
+)
 
 logger = get_logger(__name__)
 
+_URL_RE = re.compile(r"https?://[^\s,<>\"'\]\)]+")
+
+PROFILE_SUMMARY_QUESTION = (
+    "Provide a comprehensive summary of the applicant's professional background, skills, and experience."
+)
+
+NEXT_RESULTS_PAGE_TASK = (
+    "Go to the next page of results for the same search and list its job postings the same way, "
+    "with has_more set for that page. Finish as soon as the page is read."
+)
+
+
+@dataclass
+class _PendingFit:
+    """A job waiting for its fit analysis, with its description compacted for the prompt."""
+    description: str
+    text: CompactedText
+    future: asyncio.Future
+
+
+def _parse_results_page(result: str) -> JobSearchPage:
+    """
+    Reads a results page from the agent's final answer. Structured output is
+    expected; free-form text falls back to the URLs it mentions.
+    """
+    try:
+        return JobSearchPage.model_validate_json(result)
+    except ValidationError:
+        urls = [url.rstrip(".;:") for url in _URL_RE.findall(result)]
+        return JobSearchPage(postings=[JobPosting(url=url) for url in urls])
+
 
 class JobSearchAgent:
     """
     Responsible for searching, analyzing, and filtering applicable job openings.
     """
 
-    def __init__(self, browser: BrowserSession, knowledge_base: KnowledgeBaseAgent):
+    def __init__(
+        self,
+        browser: BrowserSession,
+        knowledge_base: KnowledgeBaseAgent,
+        fit_cache: FitCache | None = None,
+        concurrency: int = FIT_ANALYSIS_CONCURRENCY,
+        page_fetcher: JobPageFetcher | None = None,
+        prefilter: JobPrefilter | None = None,
+        compactor: PromptCompactor | None = None,
+        fit_batch_size: int = FIT_BATCH_MAX_JOBS,
+    ):
         # Setup LLM resources
         self.browser = browser
-        self.llm = ChatOpenAI(
+        self.llm = LLMGateway.with_failover(ChatOpenAI(
             model=BROWSER_AGENT_NVIDIA_MODEL,
             base_url=NVIDIA_BASE_URL,
             api_key=NVIDIA_API_KEY,
             reasoning_effort="low",
-        )
+            max_retries=0,
+        ), "nvidia", cache=get_completion_cache())
 
         # Initialize knowledge base for job fit analysis
         self.knowledge_base = knowledge_base
 
+        # Level one: profile summary per knowledge base version. Level two: persisted verdicts.
+        self._profile_summary: tuple[str, str] | None = None
+        self._profile_lock = asyncio.Lock()  # Concurrent analyses wait for one summary query
+        self.fit_cache = fit_cache or FitCache(
+            Path(CACHE_DIR) / "fit_cache.db",
+            ttl_seconds=FIT_CACHE_TTL_HOURS * 3600,
+            max_entries=FIT_CACHE_MAX_ENTRIES,
+        )
+
+        # Upper bound on fit analysis calls in flight; the provider budget is enforced by the gateway
+        self.concurrency = max(1, concurrency)
+
+        # Jobs analyzed at the same time share one call, and one copy of the profile, up to this many
+        self.fit_batch_size = max(1, fit_batch_size)
+        self._fit_batch: list[_PendingFit] = []
+        self._fit_batch_profile: tuple[str, str] = ("", "")
+        self._fit_batch_tokens = 0
+        self._fit_batch_timer: asyncio.TimerHandle | None = None
+        self._fit_batch_tasks: set[asyncio.Task] = set()
+
+        # Job pages are fetched over plain HTTP; the shared browser only renders JS-only boards, one at a time
+        self.page_fetcher = page_fetcher or JobPageFetcher()
+        self._browser_lock = asyncio.Lock()
+
+        # Descriptions seen by this agent, so a posting found under several URLs is scored once
+        self.duplicates = NearDuplicateIndex()
+
+        # Local screen that rejects obvious mismatches before the LLM is asked
+        self.prefilter = prefilter
+
+        # Packs the most relevant sections of the job and profile into the prompt's token budget
+        self.compactor = compactor or PromptCompactor()
+
+    async def _get_profile_summary(self) -> tuple[str, str]:
+        """
+        Returns (profile version, profile summary), querying the knowledge base
+        only when it has changed since the last summary.
+        """
+        async with self._profile_lock:
+            version = str(self.knowledge_base.version)
+            if self._profile_summary is None or self._profile_summary[0] != version:
+                summary = await self.knowledge_base.aquery(PROFILE_SUMMARY_QUESTION)
+                self._profile_summary = (version, summary)
+            return self._profile_summary
+
     async def analyze_job_fit(self, job_description: str) -> JobFitAnalysis:
         """
         Analyzes if the job is a good fit for the applicant based on their knowledge base.
         Returns a JobFitAnalysis object with 'is_fit' (bool) and 'reasoning' (str).
+        Jobs analyzed at the same time are scored together in batched calls.
+        Raises when no provider could answer after retries and failover, so the
+        job is retried later instead of being scored on a guess.
         """
         logger.info("Analyzing job fit...")
 
+        if self.prefilter is not None:
+            verdict = self.prefilter.check(job_description)
+            if not verdict.passed:
+                return JobFitAnalysis(is_fit=False, reasoning=f"Rejected by the local pre-filter: {verdict.reason}")
+
         # Get a summary of the applicant's profile from the knowledge base
-        profile_summary = self.knowledge_base.query(
-            "Provide a comprehensive summary of the applicant's professional background, skills, and experience."
+        profile_version, profile_summary = await self._get_profile_summary()
+
+        cache_key = FitCache.make_key(job_description, profile_version)
+        cached = self.fit_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Fit analysis cache hit: {cached.is_fit} - {cached.reasoning}")
+            return cached
+
+        job = _PendingFit(
+            description=job_description,
+            text=self.compactor.compact(job_description, FIT_PROMPT_JOB_TOKENS, query=profile_summary),
+            future=asyncio.get_running_loop().create_future(),
         )
+        if self.fit_batch_size == 1:
+            result = await self._score_fit(profile_summary, job)
+        else:
+            self._queue_fit(profile_version, profile_summary, job)
+            result = await job.future
+
+        logger.info(f"Fit analysis result: {result.is_fit} - {result.reasoning}")
+        self.fit_cache.put(cache_key, result)
+        return result
+
+    async def analyze_job_fits(self, job_descriptions: list[str]) -> list[JobFitAnalysis]:
+        """
+        Analyzes many jobs at once, in as few LLM calls as the token budget allows.
+        Returns one analysis per description, in order; raises like analyze_job_fit.
+        """
+        return list(await asyncio.gather(*(self.analyze_job_fit(description) for description in job_descriptions)))
+
+    async def _score_fit(self, profile_summary: str, job: _PendingFit) -> JobFitAnalysis:
+        """Scores one job in its own LLM call."""
+        profile_text = self.compactor.compact(profile_summary, FIT_PROMPT_PROFILE_TOKENS, query=job.description)
+        self.compactor.record("Fit analysis", job.text, profile_text)
 
         prompt = f"""
         You are an expert career advisor. Your task is to determine if a job is a good fit for an applicant.
 
         Applicant Profile Summary:
-        {profile_summary}
+        {profile_text.text}
 
         Job Description:
-        {job_description}
+        {job.text.text}
 
         Evaluate the fit based on:
         1. Required skills vs applicant's skills.
@@ -64,67 +211,329 @@ class JobSearchAgent:
             response = await self.llm.ainvoke(
                 messages=[UserMessage(content=prompt)],
                 output_format=JobFitAnalysis,
+                cache=True,
             )
-
-            result = response.completion
-            logger.info(f"Fit analysis result: {result.is_fit} - {result.reasoning}")
-            return result
         except Exception as e:
             logger.error(f"Error analyzing job fit: {e}")
-            return JobFitAnalysis(is_fit=True, reasoning="Defaulting to True due to analysis error.")
+            raise
+        return response.completion
 
-    async def run_job_search(self, query: str, limit: int = 5) -> list[str]:
+    async def _score_fit_batch(self, profile_summary: str, jobs: list[_PendingFit]) -> list[JobFitAnalysis | None]:
         """
-        Uses browser-use to search for jobs based on a query and returns a list of job URLs.
+        Scores several jobs in one LLM call that carries the profile once.
+        Returns one analysis per job, or None for a job the answer left out.
         """
-        logger.info(f"Searching for jobs with query: {query}")
+        profile_text = self.compactor.compact(
+            profile_summary, FIT_PROMPT_PROFILE_TOKENS, query="\n".join(job.description for job in jobs),
+        )
+        self.compactor.record(f"Fit analysis ({len(jobs)} jobs)", profile_text, *(job.text for job in jobs))
+        job_texts = "\n\n".join(f"Job {number}:\n{job.text.text}" for number, job in enumerate(jobs, start=1))
+
+        prompt = f"""
+        You are an expert career advisor. Your task is to determine, for each of the jobs below,
+        whether it is a good fit for the applicant.
 
-        search_instructions = f"""
-        1. Go to Google and search for "{query} jobs".
-        2. Look for job listings on sites like LinkedIn, Indeed, Greenhouse, Lever, or company career pages.
-        3. Extract the direct application URLs for at least {limit} relevant job postings.
-        4. Return ONLY a comma-separated list of URLs.
+        Applicant Profile Summary:
+        {profile_text.text}
+
+        {job_texts}
+
+        Evaluate each job on its own, based on:
+        1. Required skills vs applicant's skills.
+        2. Experience level required vs applicant's experience.
+        3. Core responsibilities vs applicant's background.
+
+        Return one analysis for every job, numbered as above, in the following JSON format:
+        {{
+            "analyses": [
+                {{"job": integer, "is_fit": boolean, "reasoning": "A brief explanation of why this is or isn't a good fit."}}
+            ]
+        }}
         """
 
-        search_agent = Agent(
-            task=search_instructions,
-            llm=self.llm,
-            browser=self.browser,
+        response = await self.llm.ainvoke(
+            messages=[UserMessage(content=prompt)],
+            output_format=JobFitBatch,
+            cache=True,
         )
+        by_number = {analysis.job: analysis for analysis in response.completion.analyses}
+        logger.info(f"Scored {len(by_number)} of {len(jobs)} jobs in one call, "
+                    f"saving {(len(jobs) - 1) * profile_text.tokens} tokens of repeated profile")
+        return [
+            JobFitAnalysis(is_fit=analysis.is_fit, reasoning=analysis.reasoning) if analysis is not None else None
+            for analysis in (by_number.get(number) for number in range(1, len(jobs) + 1))
+        ]
+
+    def _queue_fit(self, profile_version: str, profile_summary: str, job: _PendingFit):
+        """
+        Adds a job to the next batch. The batch is sent when it is full, when the
+        next job would overflow its token budget, or `FIT_BATCH_LINGER_SECONDS`
+        after its first job arrived, whichever comes first.
+        """
+        cost = job.text.tokens + FIT_BATCH_VERDICT_TOKENS
+        budget = FIT_BATCH_MAX_TOKENS - FIT_PROMPT_PROFILE_TOKENS
+        if self._fit_batch and (self._fit_batch_profile[0] != profile_version or self._fit_batch_tokens + cost > budget):
+            self._flush_fits()
+
+        self._fit_batch.append(job)
+        self._fit_batch_profile = (profile_version, profile_summary)
+        self._fit_batch_tokens += cost
+        if len(self._fit_batch) >= self.fit_batch_size:
+            self._flush_fits()
+        elif self._fit_batch_timer is None:
+            self._fit_batch_timer = asyncio.get_running_loop().call_later(FIT_BATCH_LINGER_SECONDS, self._flush_fits)
+
+    def _flush_fits(self):
+        """Sends the queued jobs, leaving out those whose callers have stopped waiting."""
+        if self._fit_batch_timer is not None:
+            self._fit_batch_timer.cancel()
+            self._fit_batch_timer = None
+        jobs = [job for job in self._fit_batch if not job.future.done()]
+        self._fit_batch, self._fit_batch_tokens = [], 0
+        if jobs:
+            task = asyncio.create_task(self._run_fit_batch(self._fit_batch_profile[1], jobs))
+            self._fit_batch_tasks.add(task)
+            task.add_done_callback(self._fit_batch_tasks.discard)
+
+    async def _run_fit_batch(self, profile_summary: str, jobs: list[_PendingFit]):
+        """Scores a batch and resolves each job's future; jobs the batch could not score are scored one by one."""
+        results: list[JobFitAnalysis | None] = [None] * len(jobs)
+        if len(jobs) > 1:
+            try:
+                results = await self._score_fit_batch(profile_summary, jobs)
+            except Exception as e:
+                logger.warning(f"Batched fit analysis of {len(jobs)} jobs failed ({e}), scoring them one by one")
+
+        async def resolve(job: _PendingFit, result: JobFitAnalysis | None):
+            try:
+                if result is None:
+                    result = await self._score_fit(profile_summary, job)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                return
+            if not job.future.done():
+                job.future.set_result(result)
+
+        await asyncio.gather(*(resolve(job, result) for job, result in zip(jobs, results)))
+
+    @staticmethod
+    def _results_page_task(query: str) -> str:
+        search_url = f"https://www.google.com/search?q={quote_plus(f'{query} jobs')}"
+        return f"""
+        1. Open {search_url} and read the first page of results.
+        2. Look for job listings on sites like LinkedIn, Indeed, Greenhouse, Lever, Ashby, or company career pages.
+        3. For each posting give its title, company, location, direct posting URL and a one-sentence snippet,
+           using what the results page shows without opening the postings.
+        4. Set has_more to whether there is a next page of results. Finish as soon as this page is read.
+        """
+
+    async def search_postings(
+        self,
+        query: str,
+        limit: int = 5,
+        max_pages: int = JOB_SEARCH_MAX_PAGES,
+        max_steps: int = JOB_SEARCH_MAX_STEPS,
+        timeout: float = JOB_SEARCH_TIMEOUT_SECONDS,
+    ) -> AsyncIterator[JobPosting]:
+        """
+        Searches for jobs one results page at a time and yields each new posting
+        as soon as its page is read. Stops once `limit` postings are yielded, the
+        results run out, or the run has spent `max_steps` browser steps or
+        `timeout` seconds. A posting reached through several links is yielded once.
+        """
+        logger.info(f"Searching for jobs with query: {query}")
 
-        history = await search_agent.run()
-        result = history.final_result() if history.is_successful() else ""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        steps = 0
+        seen: set[str] = set()
+        search_agent = None
 
-        if not result:
+        async def count_step(agent):
+            nonlocal steps
+            steps += 1
+
+        step_start, step_end = browser_step_hooks("search", on_step_end=count_step)
+
+        for page_number in range(1, max_pages + 1):
+            remaining_steps, remaining_time = max_steps - steps, deadline - loop.time()
+            if remaining_steps <= 0 or remaining_time <= 0:
+                logger.warning(f"Job search budget spent after {page_number - 1} results pages.")
+                return
+
+            if search_agent is None:
+                search_agent = Agent(
+                    task=self._results_page_task(query),
+                    llm=self.llm,
+                    browser=self.browser,
+                    output_model_schema=JobSearchPage,
+                )
+            else:
+                search_agent.add_new_task(NEXT_RESULTS_PAGE_TASK)
+
+            try:
+                async with asyncio.timeout(remaining_time):
+                    # browser-use caps the steps taken over all of the agent's tasks, so this page's
+                    # allowance goes on top of the steps already taken
+                    history = await search_agent.run(
+                        max_steps=search_agent.state.n_steps - 1 + min(JOB_SEARCH_STEPS_PER_PAGE, remaining_steps),
+                        on_step_start=step_start,
+                        on_step_end=step_end,
+                    )
+            except TimeoutError:
+                search_agent.stop()
+                logger.warning(f"Job search timed out after {timeout:.0f}s on results page {page_number}.")
+                return
+
+            result = history.final_result() if history.is_successful() else ""
+            if not result:
+                logger.warning(f"No job postings read from results page {page_number}.")
+                return
+
+            page = _parse_results_page(result)
+            new_postings = 0
+            for posting in page.postings:
+                posting.url = posting.url.strip().rstrip(".;:")
+                key = job_key(posting.url)
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_postings += 1
+                yield posting
+                if len(seen) >= limit:
+                    return
+
+            logger.info(
+                f"Results page {page_number}: {new_postings} new postings "
+                f"({len(page.postings) - new_postings} duplicate links dropped)."
+            )
+            if not page.has_more or new_postings == 0:
+                return
+
+    async def run_job_search(self, query: str, limit: int = 5) -> list[str]:
+        """
+        Uses browser-use to search for jobs based on a query and returns a list of job URLs.
+        """
+        urls = [posting.url async for posting in self.search_postings(query, limit=limit)]
+        if not urls:
             logger.warning("No job URLs found during search.")
-            return []
+        else:
+            logger.info(f"Found {len(urls)} job URLs.")
+        return urls
+
+    async def _extract_with_browser(self, url: str) -> ExtractedJobDescription | None:
+        """Renders a JS-only job board in the shared browser and extracts its description from the DOM."""
+        async with self._browser_lock:
+            try:
+                await self.browser.navigate_to(url)
+                await wait_until_ready(self.browser)
+                return extract_job_description(await get_page_html(self.browser), url)
+            except Exception as e:
+                logger.debug(f"Browser extraction of {url} unavailable: {e}")
+                return None
+
+    async def get_job_description(self, url: str) -> str:
+        """
+        Returns the job description behind a URL. Pages are fetched and parsed
+        without a browser; only pages whose HTML holds no confident description
+        (boards rendered by JavaScript) are rendered in the browser.
+        """
+        with get_tracer().span("job.extract", source="http") as span:
+            extracted = await self.page_fetcher.fetch_description(url)
+            if extracted is None or extracted.confidence < JD_EXTRACT_MIN_CONFIDENCE:
+                logger.info(f"No confident description in the HTML of {url}, rendering it in the browser")
+                span.set(source="browser")
+                rendered = await self._extract_with_browser(url)
+                candidates = [c for c in (extracted, rendered) if c is not None]
+                extracted = max(candidates, key=lambda c: c.confidence) if candidates else None
+
+            if extracted is None:
+                logger.warning(f"Could not extract a job description from {url}")
+                span.set(found=False)
+                return f"Job at {url}"
+            span.set(found=True, method=extracted.method, confidence=round(extracted.confidence, 3), chars=len(extracted.text))
+            return extracted.text
 
-        urls = [url.strip() for url in result.split(",") if url.strip().startswith("http")]
-        logger.info(f"Found {len(urls)} job URLs.")
-        return urls[:limit]
+    async def _analyze_url(self, url: str, semaphore: asyncio.Semaphore) -> dict | None:
+        """
+        Scores one job, or returns None when its description duplicates a job
+        already seen or it could not be scored.
+        """
+        async with semaphore:
+            job_description = await self.get_job_description(url)
+            if self.duplicates.add(url, job_description) is not None:
+                return None
+            try:
+                fit_analysis = await self.analyze_job_fit(job_description)
+            except Exception as e:
+                logger.warning(f"Skipping {url}, its fit could not be analyzed: {e}")
+                return None
+
+        return {
+            "url": url,
+            "is_fit": fit_analysis.is_fit,
+            "reasoning": fit_analysis.reasoning
+        }
+
+    async def analyze_jobs(self, job_urls: list[str]) -> AsyncIterator[dict]:
+        """
+        Runs fit analysis for many job URLs concurrently, at most `self.concurrency`
+        batches' worth at a time, and yields each result as soon as its verdict
+        arrives. Jobs whose description duplicates another job's are dropped
+        without being scored.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency * self.fit_batch_size)
+        tasks = [asyncio.create_task(self._analyze_url(url, semaphore)) for url in job_urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is not None:
+                    yield result
+        finally:
+            # Stop scoring the rest if the caller stops consuming early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream_fit_jobs(self, query: str, limit: int = 5) -> AsyncIterator[dict]:
+        """
+        Searches for jobs and yields only the fitting ones, as each verdict arrives,
+        so callers can start applying before the remaining jobs are scored.
+        """
+        logger.info(f"Streaming fitting jobs for query: {query}")
+
+        job_urls = await self.run_job_search(query, limit=limit * 2)  # Get more to filter
+
+        async for job in self.analyze_jobs(job_urls):
+            if job["is_fit"]:
+                yield job
 
     async def search_and_filter_jobs(self, query: str, limit: int = 5) -> list[dict]:
         """
         Searches for jobs and filters them based on job fit analysis.
-        Returns a list of dictionaries containing job URLs and fit analysis.
+        Returns a list of dictionaries containing job URLs and fit analysis,
+        in search result order.
         """
         logger.info(f"Searching and filtering jobs for query: {query}")
 
         job_urls = await self.run_job_search(query, limit=limit * 2)  # Get more to filter
 
-        filtered_jobs = []
-        for url in job_urls:
-            # Extract job description from URL (simplified - in practice, you'd scrape the page)
-            job_description = f"Job at {url}"  # Placeholder - actual extraction would require browser agent
-
-            fit_analysis = await self.analyze_job_fit(job_description)
-
-            if fit_analysis.is_fit:
-                filtered_jobs.append({
-                    "url": url,
-                    "is_fit": fit_analysis.is_fit,
-                    "reasoning": fit_analysis.reasoning
-                })
+        order = {url: i for i, url in enumerate(job_urls)}
+        filtered_jobs = [job async for job in self.analyze_jobs(job_urls) if job["is_fit"]]
+        filtered_jobs.sort(key=lambda job: order[job["url"]])
 
         logger.info(f"Found {len(filtered_jobs)} fitting jobs out of {len(job_urls)} searched.")
+        self.log_prefilter_stats()
+        if self.compactor.stats.calls:
+            logger.info(self.compactor.report())
         return filtered_jobs
+
+    def log_prefilter_stats(self):
+        """Logs how many jobs the local pre-filter has rejected without an LLM call."""
+        if self.prefilter is not None:
+            logger.info(self.prefilter.report())
+
+    async def aclose(self):
+        """Closes the pooled HTTP connections."""
+        await self.page_fetcher.aclose()
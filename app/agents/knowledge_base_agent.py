@@ -1,17 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from langchain_cohere import CohereEmbeddings
 from mem0 import Memory
 from mem0.configs.base import MemoryConfig, LlmConfig, EmbedderConfig, RerankerConfig, VectorStoreConfig
 from pathlib import Path
 
+from ..cache import IngestManifest, ManifestEntry, MemoizedQueryEmbeddings, SemanticQueryCache, normalize_question
+from ..telemetry import get_tracer
 from ..logger_config import get_logger
-from ..config import KNOWLEDGE_BASE_DIR, MEM0_LLM_GROQ_MODEL, MEM0_EMBED_COHERE_MODEL, MEM0_RERANK_COHERE_MODEL
+from ..config import (
+    CACHE_DIR, KNOWLEDGE_BASE_DIR, MEM0_LLM_GROQ_MODEL, MEM0_EMBED_COHERE_MODEL, MEM0_RERANK_COHERE_MODEL,
+    KB_QUERY_CACHE_MAX_ENTRIES, KB_QUERY_CACHE_SIMILARITY, KB_QUERY_WORKERS,
+)
 
 logger = get_logger(__name__)
 
 class KnowledgeBaseAgent:
-    def __init__(self, data_dir: str = KNOWLEDGE_BASE_DIR):
+    def __init__(self, data_dir: str = KNOWLEDGE_BASE_DIR, cache_dir: str = CACHE_DIR):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Tracks which files are already in mem0 so warm starts skip them
+        self.manifest = IngestManifest(Path(cache_dir) / "kb_manifest.json")
+        # Near-identical questions from the form agent reuse earlier answers
+        self.query_cache = SemanticQueryCache(KB_QUERY_CACHE_MAX_ENTRIES, KB_QUERY_CACHE_SIMILARITY)
+        # Query vectors are memoized so the semantic cache and mem0's search share one embedding call
+        self.embeddings = MemoizedQueryEmbeddings(CohereEmbeddings(model=MEM0_EMBED_COHERE_MODEL))
+        # mem0 is blocking; async callers run searches here instead of on the event loop
+        self._executor = ThreadPoolExecutor(max_workers=max(1, KB_QUERY_WORKERS), thread_name_prefix="kb-query")
+        self._inflight: dict[str, asyncio.Future] = {}
         # Ensure GROQ_API_KEY is in the environment.
         config = MemoryConfig(
             history_db_path="memory_history.db",
@@ -30,9 +46,7 @@ class KnowledgeBaseAgent:
             embedder=EmbedderConfig(
                 provider="langchain",
                 config={
-                    "model": CohereEmbeddings(
-                        model=MEM0_EMBED_COHERE_MODEL
-                    )
+                    "model": self.embeddings
                 }
             ),
             reranker=RerankerConfig(
@@ -44,25 +58,103 @@ class KnowledgeBaseAgent:
         )
         self.memory = Memory(config=config)
 
+    @property
+    def version(self) -> str:
+        """Fingerprint of the ingested knowledge base content, used to invalidate derived caches."""
+        return self.manifest.fingerprint()
+
     def load_from_directory(self):
-        """Loads all text and markdown files from the data directory into mem0."""
+        """
+        Incrementally syncs text and markdown files from the data directory into mem0.
+        Unchanged files are skipped, changed files have their old memories replaced,
+        and memories of deleted files are removed.
+        """
         logger.info(f"Loading knowledge base from {self.data_dir}...")
+        seen: set[str] = set()
         for file_path in self.data_dir.glob("*.*"):
             if file_path.suffix in [".txt", ".md"]:
+                seen.add(file_path.name)
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        # Add document content to memory associated with the application context
-                        self.memory.add(content, user_id="applicant", metadata={"source": file_path.name})
-                        logger.info(f"Loaded: {file_path.name}")
+                    self._sync_file(file_path)
                 except Exception as e:
                     logger.error(f"Failed to load {file_path.name}: {e}")
 
-    def query(self, question: str) -> str:
-        """Retrieves and formats answers from the knowledge base based on the given question."""
+        for name in self.manifest.names():
+            if name not in seen:
+                try:
+                    self._forget_file(name)
+                    logger.info(f"Removed memories of deleted file: {name}")
+                except Exception as e:
+                    logger.error(f"Failed to remove memories of {name}: {e}")
+
+        self.manifest.save()
+
+    def _sync_file(self, file_path: Path):
+        """Adds a single file to mem0 unless the manifest shows it is already ingested."""
+        stat = file_path.stat()
+        if self.manifest.is_unchanged(file_path.name, stat.st_mtime, stat.st_size):
+            logger.debug(f"Unchanged, skipping: {file_path.name}")
+            return
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        sha256 = IngestManifest.hash_content(content)
+
+        entry = self.manifest.get(file_path.name)
+        if entry is not None and entry.sha256 == sha256:
+            # Touched but not modified, only refresh the stats
+            entry.mtime, entry.size = stat.st_mtime, stat.st_size
+            return
+
+        if entry is not None:
+            self._forget_file(file_path.name)
+
+        # Add document content to memory associated with the application context. An UPDATE
+        # event may hit a memory another file added, so both files then claim it.
+        result = self.memory.add(content, user_id="applicant", metadata={"source": file_path.name})
+        memory_ids = [
+            item["id"] for item in (result or {}).get("results", [])
+            if item.get("id") and item.get("event", "ADD") in ("ADD", "UPDATE")
+        ]
+        self.manifest.set(file_path.name, ManifestEntry(
+            sha256=sha256, mtime=stat.st_mtime, size=stat.st_size, memory_ids=memory_ids
+        ))
+        logger.info(f"Loaded: {file_path.name} ({len(memory_ids)} memories)")
+
+    def _forget_file(self, name: str):
+        """
+        Deletes the memories of a file and drops it from the manifest. Memories that
+        another file also claims are kept, since they hold that file's facts too.
+        """
+        entry = self.manifest.get(name)
+        if entry is None:
+            return
+        shared = self.manifest.shared_memory_ids(name)
+        for memory_id in entry.memory_ids:
+            if memory_id in shared:
+                continue
+            try:
+                self.memory.delete(memory_id)
+            except Exception as e:
+                # mem0 may already have merged or dropped the memory on its own
+                logger.warning(f"Could not delete memory {memory_id} of {name}: {e}")
+        self.manifest.remove(name)
+
+    def _embed_question(self, question: str) -> list[float] | None:
+        """Embeds a question with mem0's embedder; the vector is memoized for the search that may follow."""
+        try:
+            vector = self.memory.embedding_model.embed(question, "search")
+        except Exception as e:
+            logger.debug(f"Could not embed question for the query cache: {e}")
+            return None
+        return vector if isinstance(vector, list) else None
+
+    def _search(self, question: str) -> str:
         # Query memory and fetch relevant facts
         results = self.memory.search(question, user_id="applicant", limit=5)
-        
+        if isinstance(results, dict):
+            results = [item.get("memory", item) if isinstance(item, dict) else item for item in results.get("results", [])]
+
         if not results:
             return "No relevant information found in the knowledge base."
         
@@ -70,6 +162,67 @@ class KnowledgeBaseAgent:
         facts = "\n".join([f"- {res}" for res in results])
         return facts
 
+    def query(self, question: str) -> str:
+        """
+        Retrieves and formats answers from the knowledge base based on the given question.
+        Answers are cached: repeated or near-identical questions skip the search until the
+        knowledge base changes.
+        """
+        with get_tracer().span("kb.query", cache="exact") as span:
+            self.query_cache.invalidate(self.version)
+            cached = self.query_cache.get_exact(question)
+            if cached is not None:
+                return cached
+
+            vector = self._embed_question(question)
+            cached = self.query_cache.get_similar(vector)
+            if cached is not None:
+                span.set(cache="similar")
+                return cached
+
+            span.set(cache="miss")
+            answer = self._search(question)
+            self.query_cache.put(question, vector, answer)
+            return answer
+
+    def query_many(self, questions: list[str]) -> list[str]:
+        """
+        Answers a batch of questions, in order. Uncached questions are embedded together
+        in a single request before their searches run, and duplicates are searched once.
+        """
+        self.query_cache.invalidate(self.version)
+        pending = [q for q in dict.fromkeys(questions) if q not in self.query_cache]
+        if pending:
+            try:
+                self.embeddings.embed_queries(pending)
+            except Exception as e:
+                logger.warning(f"Batch question embedding failed, embedding one by one: {e}")
+        return [self.query(question) for question in questions]
+
+    async def aquery(self, question: str) -> str:
+        """
+        Async variant of query for use inside the event loop. Cache hits return
+        immediately; searches run on a bounded thread pool so they never stall
+        other browser tasks, and concurrent identical questions share one search.
+        """
+        self.query_cache.invalidate(self.version)
+        cached = self.query_cache.get_exact(question)
+        if cached is not None:
+            return cached
+
+        key = normalize_question(question)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, self.query, question)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled caller does not cancel the search for the others
+        return await asyncio.shield(future)
+
+    async def aquery_many(self, questions: list[str]) -> list[str]:
+        """Async variant of query_many, run on the knowledge base thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.query_many, questions)
+
 if __name__ == "__main__":
     # Test the KnowledgeBase
     kb = KnowledgeBaseAgent()
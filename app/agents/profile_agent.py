@@ -0,0 +1,102 @@
+import asyncio
+import json
+from pathlib import Path
+from browser_use.llm import BaseChatModel, ChatGroq, UserMessage
+
+from .knowledge_base_agent import KnowledgeBaseAgent
+from ..models.applicant_profile import ApplicantProfile
+from ..llm_gateway import LLMGateway, get_completion_cache
+from ..logger_config import get_logger
+from ..config import CACHE_DIR, PROFILE_AGENT_GROQ_MODEL
+
+logger = get_logger(__name__)
+
+# One knowledge base question per profile section, answered in a single batch
+PROFILE_QUESTIONS = {
+    "identity": "What is the applicant's full name, first and last name, current job title and total years of experience?",
+    "contact": "What are the applicant's email address, phone number and home address including city, state, postal code and country?",
+    "work_history": "List the applicant's work experience with company, job title, location, start and end dates.",
+    "education": "List the applicant's education with institution, degree, field of study, dates and grade.",
+    "links": "What are the applicant's LinkedIn, GitHub, portfolio and personal website URLs?",
+    "work_authorization": (
+        "Where is the applicant authorized to work, do they require visa sponsorship, "
+        "what is their visa status, are they willing to relocate and what is their notice period?"
+    ),
+    "eeo": "What are the applicant's voluntary self-identification answers: gender, race or ethnicity, veteran status, disability status and pronouns?",
+    "skills": "What are the applicant's main technical and professional skills?",
+}
+
+
+class ApplicantProfileAgent:
+    """
+    Builds a structured snapshot of the applicant from the knowledge base once, so
+    form filling can read common fields directly instead of searching mem0 per
+    field. The snapshot is cached on disk and rebuilt when the knowledge base changes.
+    """
+
+    def __init__(self, knowledge_base: KnowledgeBaseAgent, llm: BaseChatModel | None = None, cache_dir: str = CACHE_DIR):
+        self.knowledge_base = knowledge_base
+        self.llm = llm or LLMGateway.with_failover(
+            ChatGroq(model=PROFILE_AGENT_GROQ_MODEL, temperature=0, max_retries=0), "groq", cache=get_completion_cache(),
+        )
+        self.cache_path = Path(cache_dir) / "applicant_profile.json"
+        self._profile: tuple[str, ApplicantProfile] | None = None
+        self._lock = asyncio.Lock()
+
+    def _load_cached(self, version: str) -> ApplicantProfile | None:
+        if not self.cache_path.exists():
+            return None
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.get("kb_version") != version:
+                return None
+            return ApplicantProfile(**data["profile"])
+        except Exception as e:
+            logger.warning(f"Discarding corrupt applicant profile cache: {e}")
+            return None
+
+    def _save(self, version: str, profile: ApplicantProfile):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"kb_version": version, "profile": profile.model_dump()}), encoding="utf-8")
+        tmp_path.replace(self.cache_path)
+
+    async def build_profile(self) -> ApplicantProfile:
+        """Answers every profile question in one knowledge base batch and structures the facts with the LLM."""
+        answers = await self.knowledge_base.aquery_many(list(PROFILE_QUESTIONS.values()))
+        facts = "\n\n".join(f"## {section}\n{answer}" for section, answer in zip(PROFILE_QUESTIONS, answers))
+        prompt = f"""You are filling in a structured applicant profile for job application forms.
+Use ONLY the facts below. Leave a field empty when the facts do not state it; never guess.
+
+Facts from the applicant's knowledge base:
+{facts}"""
+
+        response = await self.llm.ainvoke(messages=[UserMessage(content=prompt)], output_format=ApplicantProfile,
+                                          cache=True)
+        return response.completion
+
+    async def get_profile(self) -> ApplicantProfile | None:
+        """
+        Returns the profile for the current knowledge base, from memory, disk or a
+        fresh build. Returns None if it cannot be built; callers then fall back to
+        querying the knowledge base per field.
+        """
+        version = str(self.knowledge_base.version)
+        if self._profile is not None and self._profile[0] == version:
+            return self._profile[1]
+
+        # Concurrent application workers wait for a single build
+        async with self._lock:
+            if self._profile is not None and self._profile[0] == version:
+                return self._profile[1]
+            profile = self._load_cached(version)
+            if profile is None:
+                logger.info("Building applicant profile snapshot from the knowledge base...")
+                try:
+                    profile = await self.build_profile()
+                except Exception as e:
+                    logger.error(f"Failed to build applicant profile: {e}")
+                    return None
+                self._save(version, profile)
+            self._profile = (version, profile)
+            return profile
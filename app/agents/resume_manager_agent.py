@@ -1,55 +1,171 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from browser_use.llm import BaseChatModel, ChatGroq, UserMessage
-from pypdf import PdfReader
 from langchain_core.prompts import PromptTemplate
 
+from ..cache import ResumeCache, ResumeFeatures, extract_resume_features
+from ..llm_gateway import LLMGateway, get_completion_cache
+from ..prompting import PromptCompactor
+from ..telemetry import Span, get_tracer
+from ..ranking import ResumeRanker
+from ..text_utils import normalize_tokens, split_sections
 from ..logger_config import get_logger
-from ..config import RESUMES_DIR, RESUME_AGENT_GROQ_MODEL
+from ..config import (
+    CACHE_DIR, RESUMES_DIR, RESUME_AGENT_GROQ_MODEL, RESUME_EXTRACT_WORKERS,
+    RESUME_RANK_TOP_K, RESUME_RANK_CLEAR_MARGIN, RESUME_PROMPT_JOB_TOKENS, RESUME_PROMPT_RESUME_TOKENS,
+)
 
 logger = get_logger(__name__)
 
 class ResumeManagerAgent:
-    def __init__(self, resumes_dir: str = RESUMES_DIR, llm: BaseChatModel | None = None):
+    def __init__(
+        self,
+        resumes_dir: str = RESUMES_DIR,
+        llm: BaseChatModel | None = None,
+        cache_dir: str = CACHE_DIR,
+        compactor: PromptCompactor | None = None,
+    ):
         self.resumes_dir = Path(resumes_dir)
         self.resumes_dir.mkdir(parents=True, exist_ok=True)
-        self.resumes: dict[str, str] = {} # Make a dictionary mapping path to extracted text
+        self._resumes: dict[str, str] | None = None # Lazily populated mapping of path to extracted text
+        self._cache_keys: dict[str, str] = {}
+        self.cache = ResumeCache(Path(cache_dir) / "resumes")
+        self._ranker: ResumeRanker | None = None
+        self._ranker_signature: tuple = ()
         # Initialize an LLM for ranking, or use the one provided
-        self.llm = llm or ChatGroq(model=RESUME_AGENT_GROQ_MODEL, temperature=0)
+        self.llm = llm or LLMGateway.with_failover(
+            ChatGroq(model=RESUME_AGENT_GROQ_MODEL, temperature=0, max_retries=0), "groq", cache=get_completion_cache(),
+        )
+        # Fits the job and the shortlisted resumes into the ranking prompt by their most relevant sections
+        self.compactor = compactor or PromptCompactor()
+
+    @property
+    def resumes(self) -> dict[str, str]:
+        """Maps resume path to extracted text, loading the resumes on first access."""
+        if self._resumes is None:
+            self.load_resumes()
+        return self._resumes
 
     def load_resumes(self):
-        """Scans the resumes directory and extracts text from all PDF files."""
+        """
+        Scans the resumes directory and extracts text from all PDF files.
+        Cached extractions are reused; cold files are extracted in parallel.
+        """
         logger.info(f"Loading resumes from {self.resumes_dir}...")
-        for pdf_path in self.resumes_dir.glob("*.pdf"):
+        self._resumes = {}
+        self._cache_keys = {}
+        misses: dict[str, str] = {}
+        for pdf_path in sorted(self.resumes_dir.glob("*.pdf")):
             try:
-                reader = PdfReader(pdf_path)
-                text = ""
-                for page in reader.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
-                self.resumes[str(pdf_path)] = text
-                logger.info(f"Loaded resume: {pdf_path.name}")
+                key = ResumeCache.key_for(pdf_path)
             except Exception as e:
                 logger.error(f"Failed to load resume {pdf_path.name}: {e}")
+                continue
+            self._cache_keys[str(pdf_path)] = key
+            if not self.cache.contains(key):
+                misses[str(pdf_path)] = key
+
+        for path, features in self._extract_all(list(misses)).items():
+            self.cache.put(misses[path], features)
+
+        for path, key in list(self._cache_keys.items()):
+            features = self.cache.get(key)
+            if features is None:
+                self._cache_keys.pop(path)
+                continue
+            self._resumes[path] = features.text
+            logger.info(f"Loaded resume: {Path(path).name}")
+
+        self.cache.prune(set(self._cache_keys.values()))
+
+    def _extract_all(self, paths: list[str]) -> dict[str, ResumeFeatures]:
+        """Extracts uncached resumes, using a process pool when more than one is cold."""
+        if not paths:
+            return {}
+        logger.info(f"Extracting {len(paths)} uncached resume(s)...")
+        extracted: dict[str, ResumeFeatures] = {}
+        if len(paths) > 1 and RESUME_EXTRACT_WORKERS > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(RESUME_EXTRACT_WORKERS, len(paths))) as pool:
+                    futures = {path: pool.submit(extract_resume_features, path) for path in paths}
+                    for path, future in futures.items():
+                        try:
+                            extracted[path] = future.result()
+                        except Exception as e:
+                            logger.debug(f"Parallel extraction of {Path(path).name} failed: {e}")
+            except Exception as e:
+                logger.warning(f"Parallel resume extraction unavailable, extracting sequentially: {e}")
+
+        # Sequential path for a single cold file, and a retry for anything the pool did not finish
+        for path in paths:
+            if path in extracted:
+                continue
+            try:
+                extracted[path] = extract_resume_features(path)
+            except Exception as e:
+                logger.error(f"Failed to load resume {Path(path).name}: {e}")
+        return extracted
+
+    def get_features(self, resume_path: str) -> ResumeFeatures | None:
+        """Returns the cached tokens and section splits of a loaded resume."""
+        key = self._cache_keys.get(resume_path)
+        if key is None and self._resumes is None:
+            self.load_resumes()
+            key = self._cache_keys.get(resume_path)
+        return self.cache.get(key) if key else None
 
     @property
     def data_dir(self):
         return self.resumes_dir
 
+    def _get_ranker(self) -> ResumeRanker:
+        """Builds the local ranking index once per set of loaded resumes."""
+        signature = tuple((path, self._cache_keys.get(path), len(text)) for path, text in self.resumes.items())
+        if self._ranker is None or signature != self._ranker_signature:
+            inputs = {}
+            for path, text in self.resumes.items():
+                features = self.get_features(path)
+                if features is not None:
+                    inputs[path] = (features.tokens, features.sections)
+                else:
+                    inputs[path] = (normalize_tokens(text), split_sections(text))
+            self._ranker = ResumeRanker(inputs)
+            self._ranker_signature = signature
+        return self._ranker
+
     async def get_best_resume(self, job_description: str) -> str:
         """
-        Ranks the loaded resumes against a job description using an LLM.
+        Ranks the loaded resumes against a job description. A local vector pass
+        shortlists the top candidates; the LLM only breaks ties between them, and
+        is skipped entirely when the top candidate clearly wins.
         Returns the absolute file path to the best-matching resume PDF.
         """
+        with get_tracer().span("resume.rank") as span:
+            return await self._select_resume(job_description, span)
+
+    async def _select_resume(self, job_description: str, span: Span) -> str:
+        span.set(resumes=len(self.resumes))
         if not self.resumes:
             raise ValueError("No resumes loaded. Please load resumes before calling this method.")
         
         if len(self.resumes) == 1:
             best_resume = list(self.resumes.keys())[0]
             logger.info(f"Only one resume found: {Path(best_resume).name}")
+            span.set(method="single")
             return str(Path(best_resume).absolute())
+
+        ranked = self._get_ranker().rank(job_description)
+        candidates = [path for path, _ in ranked[:max(RESUME_RANK_TOP_K, 1)]]
+        best_path, best_score = ranked[0]
+        runner_up_score = ranked[1][1]
+        logger.info(f"Local resume ranking: {[(Path(p).name, round(s, 3)) for p, s in ranked[:len(candidates)]]}")
+
+        if best_score - runner_up_score >= RESUME_RANK_CLEAR_MARGIN or len(candidates) == 1:
+            logger.info(f"Clear local winner, skipping LLM ranking: {Path(best_path).name}")
+            span.set(method="local", candidates=len(candidates))
+            return str(Path(best_path).absolute())
         
-        # Rank resumes against job description using LLM
+        # Rank the shortlisted resumes against job description using LLM
         prompt_template = PromptTemplate(
             input_variables=["resumes_text", "job_description"],
             template="""You are an expert technical recruiter analyzing resumes against a job description.
@@ -64,27 +180,39 @@ Available Resumes:
 Output ONLY the "Resume ID" value of the best matching resume, nothing else. No explanation."""
         )
 
-        resumes_text = ""
-        for i, (path, text) in enumerate(self.resumes.items()):
-            resumes_text += f"Resume ID: {i}\nFile: {path}\nContent:\n{text[:2000]}\n\n" # truncating content for context length
-            
+        span.set(method="llm", candidates=len(candidates))
         try:
-            prompt = prompt_template.format(resumes_text=resumes_text, job_description=job_description[:2000]) # truncating job description as well
-            result = await self.llm.ainvoke(messages=[UserMessage(content=prompt)])
+            job_text = self.compactor.compact(
+                job_description, RESUME_PROMPT_JOB_TOKENS, query="\n".join(self.resumes[path] for path in candidates),
+            )
+            resume_texts = [
+                self.compactor.compact(self.resumes[path], RESUME_PROMPT_RESUME_TOKENS, query=job_description)
+                for path in candidates
+            ]
+            self.compactor.record("Resume ranking", job_text, *resume_texts)
+            resumes_text = "".join(
+                f"Resume ID: {i}\nFile: {path}\nContent:\n{resume_text.text}\n\n"
+                for i, (path, resume_text) in enumerate(zip(candidates, resume_texts))
+            )
+
+            prompt = prompt_template.format(resumes_text=resumes_text, job_description=job_text.text)
+            result = await self.llm.ainvoke(messages=[UserMessage(content=prompt)], cache=True)
             
             selected_id_str = str(result.completion).strip()
             logger.info(f"LLM Selected Resume ID: {selected_id_str}")
             
             try:
                 selected_id = int(selected_id_str)
-                selected_path = list(self.resumes.keys())[selected_id]
+                selected_path = candidates[selected_id]
                 return str(Path(selected_path).absolute())
-            except ValueError:
-                logger.warning(f"Could not parse selected ID: {selected_id_str}. Falling back to default.")
-                return str(Path(list(self.resumes.keys())[0]).absolute())
+            except (ValueError, IndexError):
+                logger.warning(f"Could not parse selected ID: {selected_id_str}. Falling back to top local match.")
+                span.set(method="fallback")
+                return str(Path(best_path).absolute())
         except Exception as e:
              logger.error(f"Error ranking resumes: {e}")
-             return str(Path(list(self.resumes.keys())[0]).absolute())
+             span.set(method="fallback")
+             return str(Path(best_path).absolute())
 
 
 if __name__ == "__main__":
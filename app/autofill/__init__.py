@@ -0,0 +1,24 @@
+"""
+Autofill module - exports the rule-based form autofill engine used before the LLM agent.
+"""
+
+from .engine import AutofillResult, FormAutofiller
+from .field_mapping import (
+    FIELD_RULES, LEARNABLE_FIELD_TYPES, FieldAssignment, FillPlan, choose_option, is_learnable, match_rule, plan_fill,
+)
+from .form_fields import FormField, detect_form_fields
+
+__all__ = [
+    "AutofillResult",
+    "FIELD_RULES",
+    "FieldAssignment",
+    "FillPlan",
+    "FormAutofiller",
+    "FormField",
+    "LEARNABLE_FIELD_TYPES",
+    "choose_option",
+    "detect_form_fields",
+    "is_learnable",
+    "match_rule",
+    "plan_fill",
+]
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from pathlib import Path
+from browser_use import BrowserSession
+from pydantic import BaseModel, Field
+
+from .field_mapping import FieldAssignment, FillPlan, choose_option, is_learnable, plan_fill
+from .form_fields import FormField, detect_form_fields
+from ..browser_readiness import evaluate, get_page_html
+from ..cache import AnswerStore
+from ..models.applicant_profile import ApplicantProfile
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Fills every planned field in one round trip. Values are set through the native
+# setter and followed by input/change events so React-controlled inputs notice.
+_FILL_JS = """
+(() => {
+  const items = %s;
+  const norm = (s) => (s || '').toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+  const labelOf = (el) => {
+    const byFor = el.id && document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+    const wrap = el.closest('label');
+    return norm((byFor || wrap || {}).textContent || el.value);
+  };
+  const fire = (el) => {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.dispatchEvent(new Event('blur', {bubbles: true}));
+  };
+  return items.map((item) => {
+    const els = Array.from(document.querySelectorAll(item.selector));
+    if (!els.length) return false;
+    const el = els[0];
+    if (item.type === 'radio') {
+      // Whole-word matching as in choose_option, so "no" never clicks "Not a veteran"
+      const value = norm(item.value);
+      const target = els.find((r) => labelOf(r) === value)
+        || els.find((r) => labelOf(r).startsWith(value + ' '))
+        || (value.length > 2 && els.find((r) => (' ' + labelOf(r) + ' ').includes(' ' + value + ' ')));
+      if (!target) return false;
+      target.click();
+      return target.checked;
+    }
+    if (item.type === 'select') {
+      const option = Array.from(el.options).find((o) => norm(o.textContent) === norm(item.value));
+      if (!option) return false;
+      el.value = option.value;
+      fire(el);
+      return true;
+    }
+    const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, item.value);
+    fire(el);
+    return el.value === item.value;
+  });
+})()
+"""
+
+# Reads the current answers of the given fields: the selected option text for
+# selects and radios, the value otherwise. Missing fields are left out.
+_READ_JS = """
+(() => {
+  const items = %s;
+  const text = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+  const out = {};
+  for (const item of items) {
+    const els = Array.from(document.querySelectorAll(item.selector));
+    if (!els.length) continue;
+    if (item.type === 'radio') {
+      const checked = els.find((r) => r.checked);
+      if (!checked) continue;
+      const byFor = checked.id && document.querySelector('label[for="' + CSS.escape(checked.id) + '"]');
+      const wrap = checked.closest('label');
+      out[item.selector] = text((byFor || wrap || {}).textContent || checked.value);
+    } else if (item.type === 'select') {
+      const option = els[0].selectedOptions[0];
+      if (option && option.value !== '') out[item.selector] = text(option.textContent);
+    } else {
+      out[item.selector] = els[0].value;
+    }
+  }
+  return out;
+})()
+"""
+
+
+class AutofillResult(BaseModel):
+    filled: list[FieldAssignment] = Field(default_factory=list)
+    uploaded_resume: bool = False
+    leftovers: list[FormField] = Field(default_factory=list, description="Fields left for the LLM agent")
+
+    @property
+    def filled_labels(self) -> list[str]:
+        return [a.field.display_name for a in self.filled]
+
+
+class FormAutofiller:
+    """
+    Rule-based autofill for application forms. Detects the fields on the current
+    page, fills every field it can map to the applicant profile in one batch over
+    the browser session, attaches the resume, and reports the leftovers so only
+    those go to the LLM agent. With an answer store, questions answered on earlier
+    applications are filled from it as well.
+    """
+
+    def __init__(self, browser: BrowserSession, answer_store: AnswerStore | None = None):
+        self.browser = browser
+        self.answer_store = answer_store
+
+    async def _fill(self, assignments: list[FieldAssignment]) -> list[bool]:
+        if not assignments:
+            return []
+        items = [{"selector": a.field.selector, "type": a.field.type, "value": a.value} for a in assignments]
+        results = await evaluate(self.browser, _FILL_JS % json.dumps(items))
+        return results if isinstance(results, list) else [False] * len(assignments)
+
+    async def _upload(self, upload: FieldAssignment) -> bool:
+        """Attaches a file to a file input through CDP, as a user picking it in the dialog would."""
+        cdp_session = await self.browser.get_or_create_cdp_session(focus=False)
+        result = await cdp_session.cdp_client.send.Runtime.evaluate(
+            params={"expression": f"document.querySelector({json.dumps(upload.field.selector)})"},
+            session_id=cdp_session.session_id,
+        )
+        object_id = result.get("result", {}).get("objectId")
+        if not object_id:
+            return False
+        await cdp_session.cdp_client.send.DOM.setFileInputFiles(
+            params={"files": [str(Path(upload.value).absolute())], "objectId": object_id},
+            session_id=cdp_session.session_id,
+        )
+        return True
+
+    async def _apply_learned_answers(self, plan: FillPlan):
+        """Moves leftovers the answer store has seen before into the plan's assignments."""
+        candidates = [field for field in plan.leftovers if is_learnable(field)]
+        if self.answer_store is None or not candidates:
+            return
+        learned = await asyncio.to_thread(self.answer_store.lookup_many, [field.label for field in candidates])
+        for field, answer in zip(candidates, learned):
+            if answer is None:
+                continue
+            value = choose_option(answer.answer, field.options) if field.options else answer.answer
+            if value:
+                plan.leftovers.remove(field)
+                plan.assignments.append(FieldAssignment(field=field, key=f"learned:{answer.match}", value=value))
+
+    async def plan(self, profile: ApplicantProfile | None, resume_path: str | None) -> FillPlan:
+        plan = plan_fill(detect_form_fields(await get_page_html(self.browser)), profile, resume_path)
+        await self._apply_learned_answers(plan)
+        return plan
+
+    async def read_values(self, fields: list[FormField]) -> dict[str, str]:
+        """Current answers of the given fields in the page, keyed by field selector."""
+        if not fields:
+            return {}
+        items = [{"selector": f.selector, "type": f.type} for f in fields]
+        values = await evaluate(self.browser, _READ_JS % json.dumps(items))
+        return values if isinstance(values, dict) else {}
+
+    async def autofill(self, profile: ApplicantProfile | None, resume_path: str | None) -> AutofillResult:
+        plan = await self.plan(profile, resume_path)
+        result = AutofillResult(leftovers=list(plan.leftovers))
+
+        for assignment, ok in zip(plan.assignments, await self._fill(plan.assignments)):
+            if ok:
+                result.filled.append(assignment)
+            else:
+                result.leftovers.append(assignment.field)
+
+        for upload in plan.uploads:
+            try:
+                uploaded = await self._upload(upload)
+            except Exception as e:
+                logger.warning(f"Resume upload into {upload.field.display_name} failed: {e}")
+                uploaded = False
+            if uploaded:
+                result.uploaded_resume = True
+            else:
+                result.leftovers.append(upload.field)
+
+        logger.info(f"Autofilled {len(result.filled)} field(s), resume attached: {result.uploaded_resume}, "
+                    f"{len(result.leftovers)} left for the agent")
+        return result
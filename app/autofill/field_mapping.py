@@ -0,0 +1,231 @@
+import re
+from dataclasses import dataclass
+from typing import Callable
+from pydantic import BaseModel, Field
+
+from .form_fields import FormField
+from ..models.applicant_profile import ApplicantProfile
+
+ProfileValue = Callable[[ApplicantProfile], str | None]
+
+
+def _yes_no(value: bool | None) -> str | None:
+    return None if value is None else ("Yes" if value else "No")
+
+
+def _full_name(p: ApplicantProfile) -> str | None:
+    return p.full_name or " ".join(n for n in (p.first_name, p.last_name) if n) or None
+
+
+def _first_name(p: ApplicantProfile) -> str | None:
+    return p.first_name or (p.full_name.split()[0] if p.full_name else None)
+
+
+def _last_name(p: ApplicantProfile) -> str | None:
+    return p.last_name or (p.full_name.split()[-1] if p.full_name and len(p.full_name.split()) > 1 else None)
+
+
+def _location(p: ApplicantProfile) -> str | None:
+    parts = [p.contact.city, p.contact.state, p.contact.country]
+    return ", ".join(part for part in parts if part) or None
+
+
+def _years(p: ApplicantProfile) -> str | None:
+    if p.years_of_experience is None:
+        return None
+    return f"{p.years_of_experience:g}"
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    key: str
+    value: ProfileValue
+    names: frozenset[str] = frozenset()
+    autocomplete: frozenset[str] = frozenset()
+    label: re.Pattern | None = None
+    input_types: frozenset[str] = frozenset()
+
+
+def _rule(key: str, value: ProfileValue, names=(), autocomplete=(), label: str | None = None, input_types=()) -> FieldRule:
+    return FieldRule(
+        key=key,
+        value=value,
+        names=frozenset(names),
+        autocomplete=frozenset(autocomplete),
+        label=re.compile(label, re.I) if label else None,
+        input_types=frozenset(input_types),
+    )
+
+
+# Ordered: the first matching rule wins, so specific rules come before generic ones.
+# Names cover the field names and ids used by Greenhouse, Lever, Ashby and Workday forms.
+FIELD_RULES: list[FieldRule] = [
+    _rule("preferred_name", _first_name, label=r"preferred (first )?name"),
+    _rule("first_name", _first_name,
+          names=("first_name", "firstname", "fname", "given_name", "legalnamesection_firstname"),
+          autocomplete=("given-name",), label=r"^(legal )?first name|given name|forename"),
+    _rule("last_name", _last_name,
+          names=("last_name", "lastname", "lname", "family_name", "surname", "legalnamesection_lastname"),
+          autocomplete=("family-name",), label=r"^(legal )?last name|family name|surname"),
+    _rule("full_name", _full_name,
+          names=("name", "full_name", "fullname", "candidate_name", "_systemfield_name"),
+          autocomplete=("name",), label=r"^(full |your |legal )?name$|full name"),
+    _rule("email", lambda p: p.contact.email,
+          names=("email", "email_address", "emailaddress", "_systemfield_email"),
+          autocomplete=("email",), label=r"e-?mail", input_types=("email",)),
+    _rule("phone", lambda p: p.contact.phone,
+          names=("phone", "phone_number", "phonenumber", "mobile", "telephone", "_systemfield_phone"),
+          autocomplete=("tel", "tel-national"), label=r"phone|mobile|telephone", input_types=("tel",)),
+    _rule("linkedin", lambda p: p.links.linkedin,
+          names=("urls_linkedin", "linkedin", "linkedin_profile", "linkedin_url"), label=r"linked ?in"),
+    _rule("github", lambda p: p.links.github, names=("urls_github", "github", "github_url"), label=r"github"),
+    _rule("portfolio", lambda p: p.links.portfolio or p.links.website,
+          names=("urls_portfolio", "portfolio", "portfolio_url"), label=r"portfolio"),
+    _rule("website", lambda p: p.links.website or p.links.portfolio,
+          names=("urls_other", "website", "personal_website"), autocomplete=("url",),
+          label=r"website|personal (site|url)|^url$", input_types=("url",)),
+    _rule("current_company", lambda p: p.work_history[0].company if p.work_history else None,
+          names=("org", "company", "current_company"), autocomplete=("organization",),
+          label=r"current (company|employer)|^company( name)?$|^employer"),
+    _rule("current_title", lambda p: p.headline or (p.work_history[0].title if p.work_history else None),
+          names=("current_title", "job_title"), autocomplete=("organization-title",),
+          label=r"current (job )?title|current (role|position)|^title$"),
+    _rule("address", lambda p: p.contact.address, autocomplete=("street-address", "address-line1"),
+          label=r"^(street |home )?address"),
+    _rule("city", lambda p: p.contact.city, autocomplete=("address-level2",), label=r"^city$"),
+    _rule("state", lambda p: p.contact.state, autocomplete=("address-level1",), label=r"^(state|province|region)"),
+    _rule("postal_code", lambda p: p.contact.postal_code, autocomplete=("postal-code",), label=r"zip|postal"),
+    _rule("country", lambda p: p.contact.country, autocomplete=("country", "country-name"), label=r"^country"),
+    _rule("location", _location, names=("location", "candidate_location", "current_location"),
+          label=r"^(current )?location|where are you (currently )?(located|based)"),
+    _rule("years_of_experience", _years,
+          label=r"^(how many )?(total )?years of (professional |work |relevant )?experience( do you have)?\??$"),
+    _rule("school", lambda p: p.education[0].institution if p.education else None,
+          names=("school", "school_name"), label=r"^(school|university|college|institution)"),
+    _rule("degree", lambda p: p.education[0].degree if p.education else None, names=("degree",), label=r"^degree"),
+    _rule("discipline", lambda p: p.education[0].field_of_study if p.education else None,
+          names=("discipline",), label=r"discipline|field of study|^major"),
+    _rule("sponsorship", lambda p: _yes_no(p.work_authorization.requires_sponsorship), label=r"sponsor"),
+    _rule("relocation", lambda p: _yes_no(p.work_authorization.willing_to_relocate), label=r"relocat"),
+    _rule("notice_period", lambda p: p.work_authorization.notice_period,
+          label=r"notice period|earliest start|when can you start"),
+    _rule("gender", lambda p: p.eeo.gender, label=r"^gender|gender identity"),
+    _rule("race_ethnicity", lambda p: p.eeo.race_ethnicity, label=r"race|ethnicity|hispanic"),
+    _rule("veteran_status", lambda p: p.eeo.veteran_status, label=r"veteran"),
+    _rule("disability_status", lambda p: p.eeo.disability_status, label=r"disabilit"),
+    _rule("pronouns", lambda p: p.eeo.pronouns, label=r"pronoun"),
+]
+
+# Short-answer fields whose submitted answers can be reused on other forms. Free-text
+# answers (textareas) tend to be specific to one company and are left to the agent.
+LEARNABLE_FIELD_TYPES = frozenset({"text", "email", "tel", "url", "number", "select", "radio"})
+
+RESUME_NAMES = frozenset({"resume", "resume_file", "cv", "_systemfield_resume", "resume_upload"})
+RESUME_LABEL = re.compile(r"\b(resume|résumé|cv|curriculum vitae)\b", re.I)
+COVER_LETTER_LABEL = re.compile(r"cover letter", re.I)
+
+
+class FieldAssignment(BaseModel):
+    field: FormField
+    key: str = Field(description="Name of the mapping rule that matched, e.g. 'email' or 'resume'")
+    value: str
+
+
+class FillPlan(BaseModel):
+    assignments: list[FieldAssignment] = Field(default_factory=list, description="Text, select and radio fields to fill")
+    uploads: list[FieldAssignment] = Field(default_factory=list, description="File inputs to attach a file to")
+    leftovers: list[FormField] = Field(default_factory=list, description="Fields no rule could answer")
+
+
+def normalize_name(value: str | None) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", (value or "").lower()).strip("_")
+
+
+def _name_matches(field: FormField, names: frozenset[str]) -> bool:
+    for raw in (field.name, field.id, field.automation_id):
+        normalized = normalize_name(raw)
+        # Prefixed variants ("job_application_first_name") only match multi-word names,
+        # so "preferred_name" is not mistaken for "name"
+        if normalized and any(normalized == n or ("_" in n and normalized.endswith("_" + n)) for n in names):
+            return True
+    return False
+
+
+def match_rule(field: FormField) -> FieldRule | None:
+    """Finds the mapping rule for a field: known ATS names first, then autocomplete hints, then the label."""
+    autocomplete = (field.autocomplete or "").lower().split()
+    for rule in FIELD_RULES:
+        if rule.names and _name_matches(field, rule.names):
+            return rule
+    for rule in FIELD_RULES:
+        if rule.autocomplete and any(token in rule.autocomplete for token in autocomplete):
+            return rule
+    for rule in FIELD_RULES:
+        if rule.label is not None and field.label and rule.label.search(field.label):
+            return rule
+    for rule in FIELD_RULES:
+        if field.type in rule.input_types:
+            return rule
+    return None
+
+
+def choose_option(value: str, options: list[str]) -> str | None:
+    """
+    Picks the select or radio option matching a value: exact, then prefix, then
+    containment. Prefix and containment compare whole words, so "male" never
+    picks "Female" and "no" never picks "Not a veteran".
+    """
+    target = normalize_name(value)
+    if not target:
+        return None
+    normalized = [(option, normalize_name(option)) for option in options]
+    for option, norm in normalized:
+        if norm == target:
+            return option
+    for option, norm in normalized:
+        if norm.startswith(target + "_"):
+            return option
+    for option, norm in normalized:
+        if len(target) > 2 and f"_{target}_" in f"_{norm}_":
+            return option
+    return None
+
+
+def is_learnable(field: FormField) -> bool:
+    return field.type in LEARNABLE_FIELD_TYPES and bool(field.label)
+
+
+def _is_resume_field(field: FormField) -> bool:
+    if COVER_LETTER_LABEL.search(field.label):
+        return False
+    return _name_matches(field, RESUME_NAMES) or bool(RESUME_LABEL.search(field.label))
+
+
+def plan_fill(fields: list[FormField], profile: ApplicantProfile | None, resume_path: str | None = None) -> FillPlan:
+    """
+    Maps detected form fields to applicant data. Fields with a known value become
+    assignments, the resume input becomes an upload, and everything else is left
+    for the LLM agent. Fields that already hold a value are left untouched.
+    """
+    plan = FillPlan()
+    resume_attached = False
+    for field in fields:
+        if field.type == "file":
+            if resume_path and not resume_attached and _is_resume_field(field):
+                plan.uploads.append(FieldAssignment(field=field, key="resume", value=resume_path))
+                resume_attached = True
+            else:
+                plan.leftovers.append(field)
+            continue
+        if field.value and field.type not in ("checkbox",):
+            continue
+
+        rule = match_rule(field) if profile is not None and field.type != "checkbox" else None
+        value = rule.value(profile) if rule is not None else None
+        if value and field.type in ("select", "radio"):
+            value = choose_option(value, field.options)
+        if not value:
+            plan.leftovers.append(field)
+            continue
+        plan.assignments.append(FieldAssignment(field=field, key=rule.key, value=value))
+    return plan
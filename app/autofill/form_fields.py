@@ -0,0 +1,147 @@
+import re
+from bs4 import BeautifulSoup, Tag
+from pydantic import BaseModel, Field
+
+_SKIPPED_INPUT_TYPES = {"hidden", "submit", "button", "reset", "image", "search"}
+_LABEL_CLASS = re.compile(r"label|question-title|field-title", re.I)
+_REQUIRED_MARK = re.compile(r"\s*[*✱]\s*$")
+
+
+class FormField(BaseModel):
+    selector: str = Field(description="CSS selector addressing the field, or the radio group, in the page")
+    tag: str = Field(description="input, textarea or select")
+    type: str = Field(default="text", description="Input type; 'radio' fields stand for the whole group")
+    name: str | None = None
+    id: str | None = None
+    label: str = Field(default="", description="Visible label, falling back to aria-label or placeholder")
+    autocomplete: str | None = None
+    automation_id: str | None = Field(default=None, description="data-automation-id / data-qa attribute used by some ATSs")
+    required: bool = False
+    value: str = ""
+    options: list[str] = Field(default_factory=list, description="Option texts of a select or radio group")
+
+    @property
+    def display_name(self) -> str:
+        return self.label or self.name or self.id or self.selector
+
+
+def _text(element: Tag | None) -> str:
+    if element is None:
+        return ""
+    text = " ".join(element.get_text(" ", strip=True).split())
+    return _REQUIRED_MARK.sub("", text)
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _selector(element: Tag, soup: BeautifulSoup) -> str | None:
+    """Shortest attribute selector that matches exactly this element (or its radio group)."""
+    tag = element.name
+    element_id = element.get("id")
+    if element_id and len(soup.find_all(id=element_id)) == 1:
+        return f"{tag}[id={_css_string(element_id)}]"
+    name = element.get("name")
+    if name:
+        if element.get("type") == "radio" or len(soup.find_all(tag, attrs={"name": name})) == 1:
+            return f"{tag}[name={_css_string(name)}]"
+    return None
+
+
+def _label_for(element: Tag, soup: BeautifulSoup) -> str:
+    element_id = element.get("id")
+    if element_id:
+        label = soup.find("label", attrs={"for": element_id})
+        if label is not None:
+            return _text(label)
+    wrapping = element.find_parent("label")
+    if wrapping is not None and element.get("type") not in ("radio", "checkbox"):
+        return _text(wrapping)
+    if element.get("aria-label"):
+        return element["aria-label"].strip()
+    labelled_by = element.get("aria-labelledby")
+    if labelled_by:
+        texts = [_text(soup.find(id=ref)) for ref in labelled_by.split()]
+        if any(texts):
+            return " ".join(t for t in texts if t)
+    # Boards like Lever put the label in a sibling container of the field's wrapper
+    container = element.parent
+    for _ in range(6):
+        if container is None:
+            break
+        legend = container.find("legend")
+        if legend is not None:
+            return _text(legend)
+        heading = container.find(class_=_LABEL_CLASS)
+        if heading is not None and element not in heading.descendants:
+            return _text(heading)
+        container = container.parent
+    return (element.get("placeholder") or "").strip()
+
+
+def _option_label(radio: Tag, soup: BeautifulSoup) -> str:
+    radio_id = radio.get("id")
+    if radio_id:
+        label = soup.find("label", attrs={"for": radio_id})
+        if label is not None:
+            return _text(label)
+    wrapping = radio.find_parent("label")
+    if wrapping is not None:
+        return _text(wrapping)
+    return radio.get("value", "")
+
+
+def detect_form_fields(html: str) -> list[FormField]:
+    """
+    Lists the fillable fields of every form on a page from its HTML, in document
+    order, with the label, name, id and ATS hints needed to map them to applicant
+    data. Radio buttons sharing a name are reported once, as a group.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    fields: list[FormField] = []
+    seen_groups: set[str] = set()
+
+    for element in soup.find_all(["input", "textarea", "select"]):
+        field_type = (element.get("type") or ("textarea" if element.name == "textarea" else "text")).lower()
+        if element.name == "select":
+            field_type = "select"
+        if field_type in _SKIPPED_INPUT_TYPES or element.has_attr("disabled"):
+            continue
+
+        name = element.get("name")
+        if field_type == "radio":
+            if not name or name in seen_groups:
+                continue
+            seen_groups.add(name)
+
+        selector = _selector(element, soup)
+        if selector is None:
+            continue
+
+        options: list[str] = []
+        if field_type == "select":
+            options = [_text(o) for o in element.find_all("option") if o.get("value", _text(o)) != ""]
+        elif field_type == "radio":
+            options = [_option_label(r, soup) for r in soup.find_all("input", attrs={"type": "radio", "name": name})]
+
+        if field_type == "radio":
+            group = element.find_parent("fieldset")
+            label = _text(group.find("legend")) if group is not None and group.find("legend") else _label_for(element, soup)
+        else:
+            label = _label_for(element, soup)
+
+        fields.append(FormField(
+            selector=selector,
+            tag=element.name,
+            type=field_type,
+            name=name,
+            id=element.get("id"),
+            label=label,
+            autocomplete=element.get("autocomplete"),
+            automation_id=element.get("data-automation-id") or element.get("data-qa"),
+            required=element.has_attr("required") or element.get("aria-required") == "true",
+            value=(element.get("value") or _text(element)) if field_type not in ("radio", "checkbox", "select", "file") else "",
+            options=options,
+        ))
+    return fields
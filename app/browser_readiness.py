@@ -0,0 +1,73 @@
+import asyncio
+import time
+from browser_use import BrowserSession
+
+from .logger_config import get_logger
+from .config import BROWSER_READY_TIMEOUT, BROWSER_NETWORK_IDLE_SECONDS
+
+logger = get_logger(__name__)
+
+# Completed resource loads plus the document itself; stops growing once the network goes quiet
+_RESOURCE_COUNT_JS = "performance.getEntriesByType('resource').length"
+_POLL_INTERVAL = 0.05
+
+
+async def evaluate(browser: BrowserSession, expression: str):
+    """Evaluates a JavaScript expression in the focused page and returns its JSON value."""
+    cdp_session = await browser.get_or_create_cdp_session(focus=False)
+    result = await cdp_session.cdp_client.send.Runtime.evaluate(
+        params={"expression": expression, "returnByValue": True},
+        session_id=cdp_session.session_id,
+    )
+    return result.get("result", {}).get("value")
+
+
+async def _wait_for_target(browser: BrowserSession):
+    while not (browser.is_cdp_connected and browser.agent_focus_target_id):
+        await asyncio.sleep(_POLL_INTERVAL)
+
+
+async def _wait_for_load(browser: BrowserSession):
+    while await evaluate(browser, "document.readyState") != "complete":
+        await asyncio.sleep(_POLL_INTERVAL)
+
+
+async def _wait_for_network_idle(browser: BrowserSession, idle_seconds: float):
+    last_count = await evaluate(browser, _RESOURCE_COUNT_JS)
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < idle_seconds:
+        await asyncio.sleep(_POLL_INTERVAL)
+        count = await evaluate(browser, _RESOURCE_COUNT_JS)
+        if count != last_count:
+            last_count, quiet_since = count, time.monotonic()
+
+
+async def wait_until_ready(
+    browser: BrowserSession,
+    timeout: float = BROWSER_READY_TIMEOUT,
+    network_idle_seconds: float = BROWSER_NETWORK_IDLE_SECONDS,
+) -> float:
+    """
+    Waits until the browser session has an attached CDP target, the focused page
+    has finished loading, and (optionally) no new resources have loaded for
+    `network_idle_seconds`. Never raises: on timeout or probe failure it logs and
+    returns so the caller can carry on. Returns the seconds spent waiting.
+    """
+    started = time.monotonic()
+    try:
+        async with asyncio.timeout(timeout):
+            await _wait_for_target(browser)
+            await _wait_for_load(browser)
+            if network_idle_seconds > 0:
+                await _wait_for_network_idle(browser, network_idle_seconds)
+    except TimeoutError:
+        logger.warning(f"Browser not ready after {timeout:.1f}s, continuing anyway")
+    except Exception as e:
+        logger.debug(f"Browser readiness probe unavailable, continuing: {e}")
+    return time.monotonic() - started
+
+
+async def get_page_html(browser: BrowserSession) -> str:
+    """Returns the focused page's serialized DOM in a single CDP round trip."""
+    html = await evaluate(browser, "document.documentElement.outerHTML")
+    return html if isinstance(html, str) else ""
@@ -0,0 +1,30 @@
+"""
+Cache module - exports the persistent caches and manifests used by the agents.
+"""
+
+from .answer_store import AnswerStore, AnswerStoreStats, LearnedAnswer
+from .fit_cache import FitCache, job_fingerprint
+from .http_cache import CachedResponse, HttpCache
+from .ingest_manifest import IngestManifest, ManifestEntry
+from .llm_cache import CompletionCache
+from .query_cache import MemoizedQueryEmbeddings, SemanticQueryCache, normalize_question
+from .resume_cache import ResumeCache, ResumeFeatures, extract_resume_features
+
+__all__ = [
+    "AnswerStore",
+    "AnswerStoreStats",
+    "CachedResponse",
+    "CompletionCache",
+    "FitCache",
+    "HttpCache",
+    "IngestManifest",
+    "LearnedAnswer",
+    "ManifestEntry",
+    "MemoizedQueryEmbeddings",
+    "ResumeCache",
+    "ResumeFeatures",
+    "SemanticQueryCache",
+    "extract_resume_features",
+    "job_fingerprint",
+    "normalize_question",
+]
@@ -0,0 +1,227 @@
+import sqlite3
+import threading
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from pydantic import BaseModel
+
+from .query_cache import normalize_question
+from ..logger_config import get_logger
+from ..config import ANSWER_STORE_FUZZY_THRESHOLD, ANSWER_STORE_SIMILARITY
+
+logger = get_logger(__name__)
+
+# Words that change the phrasing of a form question but not what it asks
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "your", "you", "do", "does", "did", "are", "is", "be", "what", "how", "many", "much",
+    "would", "will", "can", "please", "kindly", "provide", "enter", "of", "in", "to", "for", "with", "have",
+    "current", "currently", "if", "any", "optional", "required",
+})
+
+
+class LearnedAnswer(BaseModel):
+    label: str
+    answer: str
+    field_type: str = "text"
+    match: str = "exact"
+    score: float = 1.0
+
+
+class AnswerStoreStats(BaseModel):
+    lookups: int = 0
+    exact_hits: int = 0
+    fuzzy_hits: int = 0
+    vector_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.fuzzy_hits + self.vector_hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+def _content_tokens(key: str) -> set[str]:
+    return {token for token in key.split() if token not in _FILLER_WORDS}
+
+
+def _has_unmatched_token(tokens_a: set[str], tokens_b: set[str]) -> bool:
+    """True when a word of one question has no near-identical counterpart (plural, spelling variant) in the other."""
+    for token in tokens_a ^ tokens_b:
+        others = tokens_b if token in tokens_a else tokens_a
+        if not any(SequenceMatcher(None, token, other).ratio() >= 0.8 for other in others):
+            return True
+    return False
+
+
+def fuzzy_score(a: str, b: str) -> float:
+    """
+    Similarity of two normalized questions. Filler words are ignored and every
+    remaining word must have a near-identical counterpart (plurals, spelling
+    variants), so "work in the united states" never matches "work in the united kingdom".
+    """
+    tokens_a, tokens_b = _content_tokens(a), _content_tokens(b)
+    if not tokens_a or not tokens_b or _has_unmatched_token(tokens_a, tokens_b):
+        return 0.0
+    return SequenceMatcher(None, " ".join(sorted(tokens_a)), " ".join(sorted(tokens_b))).ratio()
+
+
+def differs_in_content(a: str, b: str) -> bool:
+    """
+    True when two normalized questions share wording but differ in a content word,
+    e.g. the country in "authorized to work in the united states/kingdom" or the
+    visa type in a sponsorship question. Embeddings place such pairs very close, so
+    vector matches are checked with this. Paraphrases without shared words pass.
+    """
+    tokens_a, tokens_b = _content_tokens(a), _content_tokens(b)
+    return bool(tokens_a & tokens_b) and _has_unmatched_token(tokens_a, tokens_b)
+
+
+class AnswerStore:
+    """
+    Persistent store of answers submitted to application form questions, keyed by
+    the normalized question label. Lookups try an exact match, then a fuzzy match
+    on the wording, then a vector match on the label embedding that must not
+    contradict the wording. Rows live in SQLite and are mirrored in memory, so
+    lookups never touch the disk.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        embeddings: Embeddings | None = None,
+        fuzzy_threshold: float = ANSWER_STORE_FUZZY_THRESHOLD,
+        similarity_threshold: float = ANSWER_STORE_SIMILARITY,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.embeddings = embeddings
+        self.fuzzy_threshold = fuzzy_threshold
+        self.similarity_threshold = similarity_threshold
+        self.stats = AnswerStoreStats()
+        self._lock = threading.RLock()  # Labels may be embedded off the event loop
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS learned_answers ("
+            "key TEXT PRIMARY KEY, label TEXT NOT NULL, answer TEXT NOT NULL, field_type TEXT NOT NULL, "
+            "embedding BLOB, uses INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._answers: dict[str, LearnedAnswer] = {}
+        self._vectors: dict[str, np.ndarray] = {}
+        for key, label, answer, field_type, embedding in self._conn.execute(
+            "SELECT key, label, answer, field_type, embedding FROM learned_answers"
+        ):
+            self._answers[key] = LearnedAnswer(label=label, answer=answer, field_type=field_type)
+            if embedding is not None:
+                self._vectors[key] = np.frombuffer(embedding, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray | None:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else None
+
+    def _embed(self, labels: list[str]) -> list[np.ndarray | None]:
+        if self.embeddings is None or not labels:
+            return [None] * len(labels)
+        try:
+            embed_queries = getattr(self.embeddings, "embed_queries", None)
+            vectors = embed_queries(labels) if callable(embed_queries) else [self.embeddings.embed_query(l) for l in labels]
+        except Exception as e:
+            logger.warning(f"Could not embed form labels, vector matching skipped: {e}")
+            return [None] * len(labels)
+        return [self._unit(vector) for vector in vectors]
+
+    def _match_text(self, key: str) -> LearnedAnswer | None:
+        if key in self._answers:
+            return self._answers[key].model_copy(update={"match": "exact", "score": 1.0})
+        best_key, best_score = None, 0.0
+        for candidate in self._answers:
+            score = fuzzy_score(key, candidate)
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_key is not None and best_score >= self.fuzzy_threshold:
+            return self._answers[best_key].model_copy(update={"match": "fuzzy", "score": best_score})
+        return None
+
+    def _match_vector(self, key: str, vector: np.ndarray | None) -> LearnedAnswer | None:
+        keyed = [] if vector is None else [(k, v) for k, v in self._vectors.items() if v.shape == vector.shape]
+        if not keyed:
+            return None
+        similarities = np.stack([v for _, v in keyed]) @ vector
+        for best in np.argsort(-similarities):
+            if similarities[best] < self.similarity_threshold:
+                break
+            candidate = keyed[best][0]
+            if not differs_in_content(key, candidate):
+                return self._answers[candidate].model_copy(update={"match": "vector", "score": float(similarities[best])})
+        return None
+
+    def _count(self, found: LearnedAnswer | None):
+        self.stats.lookups += 1
+        if found is None:
+            self.stats.misses += 1
+        else:
+            setattr(self.stats, f"{found.match}_hits", getattr(self.stats, f"{found.match}_hits") + 1)
+
+    def lookup_many(self, labels: list[str]) -> list[LearnedAnswer | None]:
+        """Looks up many labels, embedding all the ones text matching missed in a single request."""
+        with self._lock:
+            found: list[LearnedAnswer | None] = [self._match_text(normalize_question(label)) for label in labels]
+        pending = [i for i, answer in enumerate(found) if answer is None and normalize_question(labels[i])]
+        if pending and self._vectors:
+            vectors = self._embed([labels[i] for i in pending])
+            with self._lock:
+                for i, vector in zip(pending, vectors):
+                    found[i] = self._match_vector(normalize_question(labels[i]), vector)
+
+        with self._lock:
+            for answer in found:
+                self._count(answer)
+        for answer in found:
+            if answer is not None:
+                logger.debug(f"Learned answer ({answer.match}, {answer.score:.2f}) for '{answer.label}'")
+        return found
+
+    def lookup(self, label: str) -> LearnedAnswer | None:
+        return self.lookup_many([label])[0]
+
+    def record_many(self, answers: list[tuple[str, str, str]]):
+        """Stores (label, answer, field_type) triples, replacing earlier answers to the same question."""
+        answers = [(label, answer.strip(), field_type) for label, answer, field_type in answers
+                   if normalize_question(label) and answer and answer.strip()]
+        if not answers:
+            return
+        vectors = self._embed([label for label, _, _ in answers])
+        now = time.time()
+        with self._lock:
+            for (label, answer, field_type), vector in zip(answers, vectors):
+                key = normalize_question(label)
+                self._answers[key] = LearnedAnswer(label=label, answer=answer, field_type=field_type)
+                if vector is not None:
+                    self._vectors[key] = vector
+                self._conn.execute(
+                    "INSERT INTO learned_answers (key, label, answer, field_type, embedding, uses, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 1, ?) ON CONFLICT(key) DO UPDATE SET label = excluded.label, "
+                    "answer = excluded.answer, field_type = excluded.field_type, "
+                    "embedding = COALESCE(excluded.embedding, embedding), uses = uses + 1, updated_at = excluded.updated_at",
+                    (key, label, answer, field_type, vector.tobytes() if vector is not None else None, now),
+                )
+            self._conn.commit()
+        logger.info(f"Learned {len(answers)} form answer(s), {len(self._answers)} stored")
+
+    def record(self, label: str, answer: str, field_type: str = "text"):
+        self.record_many([(label, answer, field_type)])
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,90 @@
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from ..models.llm_responses import JobFitAnalysis
+from ..logger_config import get_logger
+from ..text_utils import normalize_tokens
+
+logger = get_logger(__name__)
+
+
+def job_fingerprint(job_description: str) -> str:
+    """Fingerprint of a job description that ignores case, punctuation and whitespace differences."""
+    normalized = " ".join(normalize_tokens(job_description))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class FitCache:
+    """
+    Two-tier cache of job fit verdicts keyed by job fingerprint and profile version.
+    An in-memory LRU sits in front of a SQLite table so verdicts survive restarts.
+    """
+
+    def __init__(self, db_path: str | Path, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 1024):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lru: OrderedDict[str, tuple[JobFitAnalysis, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fit_verdicts ("
+            "key TEXT PRIMARY KEY, analysis TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM fit_verdicts WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(job_description: str, profile_version: str) -> str:
+        return f"{job_fingerprint(job_description)}:{profile_version}"
+
+    def _is_fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl_seconds
+
+    def get(self, key: str) -> JobFitAnalysis | None:
+        cached = self._lru.get(key)
+        if cached is None:
+            row = self._conn.execute(
+                "SELECT analysis, created_at FROM fit_verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                cached = (JobFitAnalysis.model_validate_json(row[0]), row[1])
+
+        if cached is None or not self._is_fresh(cached[1]):
+            if cached is not None:
+                self.delete(key)
+            self.misses += 1
+            return None
+
+        self._remember(key, cached)
+        self.hits += 1
+        return cached[0]
+
+    def put(self, key: str, analysis: JobFitAnalysis):
+        created_at = time.time()
+        self._remember(key, (analysis, created_at))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO fit_verdicts (key, analysis, created_at) VALUES (?, ?, ?)",
+            (key, analysis.model_dump_json(), created_at),
+        )
+        self._conn.commit()
+
+    def delete(self, key: str):
+        self._lru.pop(key, None)
+        self._conn.execute("DELETE FROM fit_verdicts WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def _remember(self, key: str, value: tuple[JobFitAnalysis, float]):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedResponse(BaseModel):
+    url: str
+    status: int
+    body: str
+    etag: str | None = Field(default=None, description="ETag validator sent back as If-None-Match")
+    last_modified: str | None = Field(default=None, description="Last-Modified validator sent back as If-Modified-Since")
+    fetched_at: float = Field(default_factory=time.time, description="When the body was last fetched or revalidated")
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages, one JSON file per URL, holding the body and
+    the validators needed to revalidate it with a conditional request.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{self.key_for(url)}.json"
+
+    def get(self, url: str) -> CachedResponse | None:
+        entry_path = self._entry_path(url)
+        if not entry_path.exists():
+            return None
+        try:
+            return CachedResponse(**json.loads(entry_path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.warning(f"Discarding corrupt HTTP cache entry {entry_path.name}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+
+    def put(self, response: CachedResponse):
+        tmp_path = self._entry_path(response.url).with_suffix(".tmp")
+        tmp_path.write_text(response.model_dump_json(), encoding="utf-8")
+        tmp_path.replace(self._entry_path(response.url))
+
+    def touch(self, response: CachedResponse) -> CachedResponse:
+        """Marks an entry as freshly revalidated after a 304 Not Modified."""
+        refreshed = response.model_copy(update={"fetched_at": time.time()})
+        self.put(refreshed)
+        return refreshed
+
+    def delete(self, url: str):
+        self._entry_path(url).unlink(missing_ok=True)
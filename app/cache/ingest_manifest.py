@@ -0,0 +1,83 @@
+import hashlib
+import json
+from pathlib import Path
+from pydantic import BaseModel, Field
+
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ManifestEntry(BaseModel):
+    sha256: str = Field(description="Hex digest of the source file content")
+    mtime: float = Field(description="Modification time of the source file when it was ingested")
+    size: int = Field(description="Size of the source file in bytes when it was ingested")
+    memory_ids: list[str] = Field(default_factory=list, description="mem0 memory IDs this file added or updated")
+
+
+class IngestManifest:
+    """
+    Persistent record of which knowledge base files have been ingested into mem0,
+    keyed by file name. Used to skip unchanged files and to clean up the memories
+    of changed or deleted ones.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: dict[str, ManifestEntry] = {}
+        self.load()
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def load(self):
+        """Reads the manifest from disk. A missing or corrupt file yields an empty manifest."""
+        if not self.path.exists():
+            return
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {name: ManifestEntry(**entry) for name, entry in raw.items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Writes the manifest atomically so an interrupted run never leaves a half-written file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({name: entry.model_dump() for name, entry in self.entries.items()}, indent=2),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
+
+    def get(self, name: str) -> ManifestEntry | None:
+        return self.entries.get(name)
+
+    def set(self, name: str, entry: ManifestEntry):
+        self.entries[name] = entry
+
+    def remove(self, name: str) -> ManifestEntry | None:
+        return self.entries.pop(name, None)
+
+    def names(self) -> list[str]:
+        return list(self.entries.keys())
+
+    def shared_memory_ids(self, name: str) -> frozenset[str]:
+        """Memory IDs of `name` that another file also claims, e.g. because mem0 merged their facts."""
+        others = {memory_id for other, entry in self.entries.items() if other != name for memory_id in entry.memory_ids}
+        entry = self.entries.get(name)
+        return frozenset(others.intersection(entry.memory_ids) if entry is not None else ())
+
+    def fingerprint(self) -> str:
+        """Short digest over every ingested file's content hash; changes whenever any file does."""
+        digest = hashlib.sha256()
+        for name in sorted(self.entries):
+            digest.update(f"{name}:{self.entries[name].sha256}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def is_unchanged(self, name: str, mtime: float, size: int) -> bool:
+        """Cheap check using file stats only, so unchanged files are never re-read."""
+        entry = self.entries.get(name)
+        return entry is not None and entry.mtime == mtime and entry.size == size
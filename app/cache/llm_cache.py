@@ -0,0 +1,61 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from pydantic import BaseModel
+
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CompletionCache:
+    """
+    Content-addressed cache of LLM completions in SQLite. The key is a hash of
+    the model, the full message list and the requested output schema, so the
+    same prompt always maps to the same entry and any change to it misses.
+    """
+
+    def __init__(self, db_path: str | Path, ttl_seconds: float = 7 * 24 * 3600):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, completion TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM completions WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: list[BaseModel], output_format: type[BaseModel] | None = None) -> str:
+        payload = {
+            "model": model,
+            "messages": [message.model_dump(mode="json") for message in messages],
+            "schema": output_format.model_json_schema() if output_format is not None else None,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Returns the raw completion (text, or the structured output as JSON) if it is cached and fresh."""
+        row = self._conn.execute("SELECT completion, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, completion: str):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO completions (key, model, completion, created_at) VALUES (?, ?, ?, ?)",
+            (key, model, completion, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,150 @@
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercases a question and strips punctuation and extra whitespace for exact-match lookups."""
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+
+class MemoizedQueryEmbeddings(Embeddings):
+    """
+    Wraps an embeddings model and remembers recent query vectors, so a question
+    embedded for the semantic cache is not embedded again by mem0's own search.
+    Document embeddings pass straight through.
+    """
+
+    def __init__(self, inner: Embeddings, max_entries: int = 256):
+        self.inner = inner
+        self.max_entries = max_entries
+        self._memo: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()  # Queries may be embedded from the knowledge base's worker threads
+        self.calls = 0
+
+    def _remember(self, text: str, vector: list[float]):
+        with self._lock:
+            self._memo[text] = vector
+            self._memo.move_to_end(text)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def _recall(self, text: str) -> list[float] | None:
+        with self._lock:
+            if text not in self._memo:
+                return None
+            self._memo.move_to_end(text)
+            return self._memo[text]
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = self._recall(text)
+        if vector is not None:
+            return vector
+        self.calls += 1
+        vector = self.inner.embed_query(text)
+        self._remember(text, vector)
+        return vector
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embeds many queries, sending every uncached one in a single request."""
+        with self._lock:
+            misses = list(dict.fromkeys(t for t in texts if t not in self._memo))
+        if misses:
+            self.calls += 1
+            embed = getattr(self.inner, "embed", None)
+            if callable(embed):
+                vectors = embed(misses, input_type="search_query")
+            else:
+                vectors = [self.inner.embed_query(text) for text in misses]
+            for text, vector in zip(misses, vectors):
+                self._remember(text, vector)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.inner.embed_documents(texts)
+
+
+class SemanticQueryCache:
+    """
+    LRU cache of knowledge base answers. A question hits when its normalized text
+    was asked before, or when its embedding is within `similarity_threshold`
+    (cosine) of a cached question's. Bound to one knowledge base version and
+    cleared when that version changes.
+    """
+
+    def __init__(self, max_entries: int = 256, similarity_threshold: float = 0.9):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.version: str | None = None
+        self._entries: OrderedDict[str, tuple[np.ndarray | None, str]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, question: str) -> bool:
+        return normalize_question(question) in self._entries
+
+    def invalidate(self, version: str):
+        """Drops every entry if the knowledge base version differs from the cached one."""
+        with self._lock:
+            if version != self.version:
+                if self._entries:
+                    logger.info(f"Knowledge base changed, dropping {len(self._entries)} cached answers")
+                self._entries.clear()
+                self.version = version
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray | None:
+        if vector is None:
+            return None
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else None
+
+    def get_exact(self, question: str) -> str | None:
+        key = normalize_question(question)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][1]
+
+    def get_similar(self, vector) -> str | None:
+        query = self._unit(vector)
+        with self._lock:
+            keyed = [] if query is None else [
+                (key, v) for key, (v, _) in self._entries.items() if v is not None and v.shape == query.shape
+            ]
+            if not keyed:
+                self.misses += 1
+                return None
+            similarities = np.stack([v for _, v in keyed]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+            key = keyed[best][0]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.semantic_hits += 1
+            logger.debug(f"Semantic cache hit on '{key}' (similarity {similarities[best]:.3f})")
+            return self._entries[key][1]
+
+    def put(self, question: str, vector, answer: str):
+        key = normalize_question(question)
+        with self._lock:
+            self._entries[key] = (self._unit(vector), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,78 @@
+import hashlib
+import json
+from pathlib import Path
+from pydantic import BaseModel, Field
+from pypdf import PdfReader, __version__ as PYPDF_VERSION
+
+from ..logger_config import get_logger
+from ..text_utils import normalize_tokens, split_sections
+
+logger = get_logger(__name__)
+
+
+class ResumeFeatures(BaseModel):
+    text: str = Field(description="Full text extracted from the resume PDF")
+    tokens: list[str] = Field(default_factory=list, description="Normalized word tokens of the text")
+    sections: dict[str, str] = Field(default_factory=dict, description="Text split by canonical section name")
+
+
+def extract_resume_features(pdf_path: str) -> ResumeFeatures:
+    """
+    Extracts the text of a resume PDF and derives its features.
+    Kept at module level so it can run inside a process pool worker.
+    """
+    reader = PdfReader(pdf_path)
+    pages = [page.extract_text() for page in reader.pages]
+    text = "".join(f"{extracted}\n" for extracted in pages if extracted)
+    return ResumeFeatures(text=text, tokens=normalize_tokens(text), sections=split_sections(text))
+
+
+class ResumeCache:
+    """
+    On-disk cache of extracted resume features, one JSON file per entry keyed by the
+    PDF content hash and the pypdf version. Entries are read from disk on first access.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memo: dict[str, ResumeFeatures] = {}
+
+    @staticmethod
+    def key_for(pdf_path: str | Path) -> str:
+        digest = hashlib.sha256(Path(pdf_path).read_bytes()).hexdigest()
+        return f"{digest}-pypdf{PYPDF_VERSION}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def contains(self, key: str) -> bool:
+        return key in self._memo or self._entry_path(key).exists()
+
+    def get(self, key: str) -> ResumeFeatures | None:
+        if key in self._memo:
+            return self._memo[key]
+        entry_path = self._entry_path(key)
+        if not entry_path.exists():
+            return None
+        try:
+            features = ResumeFeatures(**json.loads(entry_path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.warning(f"Discarding corrupt resume cache entry {entry_path.name}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+        self._memo[key] = features
+        return features
+
+    def put(self, key: str, features: ResumeFeatures):
+        self._memo[key] = features
+        tmp_path = self._entry_path(key).with_suffix(".tmp")
+        tmp_path.write_text(features.model_dump_json(), encoding="utf-8")
+        tmp_path.replace(self._entry_path(key))
+
+    def prune(self, keep: set[str]):
+        """Deletes entries of resumes that no longer exist or were extracted by another pypdf version."""
+        for entry_path in self.cache_dir.glob("*.json"):
+            if entry_path.stem not in keep:
+                entry_path.unlink(missing_ok=True)
+                self._memo.pop(entry_path.stem, None)
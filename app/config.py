@@ -6,6 +6,21 @@ load_dotenv()
 # Data Directories
 KNOWLEDGE_BASE_DIR = os.getenv("KNOWLEDGE_BASE_DIR", "user_data/knowledge_base")
 RESUMES_DIR = os.getenv("RESUMES_DIR", "user_data/resumes")
+CACHE_DIR = os.getenv("CACHE_DIR", "user_data/cache")
+
+# Resume Processing Configuration
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "4"))
+RESUME_RANK_TOP_K = int(os.getenv("RESUME_RANK_TOP_K", "3"))
+RESUME_RANK_CLEAR_MARGIN = float(os.getenv("RESUME_RANK_CLEAR_MARGIN", "0.15"))
+
+# Job Fit Analysis Configuration
+FIT_CACHE_TTL_HOURS = float(os.getenv("FIT_CACHE_TTL_HOURS", "168"))
+FIT_CACHE_MAX_ENTRIES = int(os.getenv("FIT_CACHE_MAX_ENTRIES", "1024"))
+FIT_ANALYSIS_CONCURRENCY = int(os.getenv("FIT_ANALYSIS_CONCURRENCY", "4"))
+FIT_BATCH_MAX_JOBS = int(os.getenv("FIT_BATCH_MAX_JOBS", "8"))  # 1 sends every job in its own call
+FIT_BATCH_MAX_TOKENS = int(os.getenv("FIT_BATCH_MAX_TOKENS", "8000"))  # Prompt plus expected answer
+FIT_BATCH_VERDICT_TOKENS = int(os.getenv("FIT_BATCH_VERDICT_TOKENS", "100"))  # Answer tokens reserved per job
+FIT_BATCH_LINGER_SECONDS = float(os.getenv("FIT_BATCH_LINGER_SECONDS", "0.25"))
 
 # Browser Configuration
 BROWSER_EXECUTABLE_PATH = os.getenv("BROWSER_EXECUTABLE_PATH", "C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe")
@@ -17,6 +32,7 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 BROWSER_AGENT_GROQ_MODEL = os.getenv("BROWSER_AGENT_GROQ_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
 RESUME_AGENT_GROQ_MODEL = os.getenv("RESUME_AGENT_GROQ_MODEL", "llama-3.1-8b-instant")
 MEM0_LLM_GROQ_MODEL = os.getenv("MEM0_LLM_GROQ_MODEL", "openai/gpt-oss-120b")
+PROFILE_AGENT_GROQ_MODEL = os.getenv("PROFILE_AGENT_GROQ_MODEL", "openai/gpt-oss-120b")
 
 # Cohere Model Configuration
 COHERE_API_KEY = os.getenv("COHERE_API_KEY", "")
@@ -26,4 +42,112 @@ MEM0_RERANK_COHERE_MODEL = os.getenv("MEM0_RERANK_COHERE_MODEL", "rerank-v4.0-fa
 # Nvidia AI Endpoints Configuration
 NVIDIA_API_KEY = os.getenv("NVIDIA_API_KEY", "")
 NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1/"
-BROWSER_AGENT_NVIDIA_MODEL = os.getenv("BROWSER_AGENT_NVIDIA_MODEL", "qwen/qwen3.5-122b-a10b")
\ No newline at end of file
+BROWSER_AGENT_NVIDIA_MODEL = os.getenv("BROWSER_AGENT_NVIDIA_MODEL", "qwen/qwen3.5-122b-a10b")
+
+# Local Fit Pre-filter Configuration
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFILTER_RULES_PATH = os.getenv("PREFILTER_RULES_PATH", "user_data/prefilter_rules.json")
+PREFILTER_MIN_SCORE = float(os.getenv("PREFILTER_MIN_SCORE", "0.15"))
+PREFILTER_SIMILARITY_WEIGHT = float(os.getenv("PREFILTER_SIMILARITY_WEIGHT", "0.5"))
+
+# Provider Rate Limits (requests per minute)
+PROVIDER_REQUESTS_PER_MINUTE = {
+    "nvidia": float(os.getenv("NVIDIA_REQUESTS_PER_MINUTE", "40")),
+    "groq": float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+    "cohere": float(os.getenv("COHERE_REQUESTS_PER_MINUTE", "100")),
+}
+
+# LLM Gateway Configuration
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "20"))
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "20"))  # 0 disables hedged requests
+LLM_FAILOVER_ENABLED = os.getenv("LLM_FAILOVER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Telemetry Configuration (spans go to one JSONL file per run; OpenTelemetry is optional)
+TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_DIR = os.getenv("TRACE_DIR", "user_data/traces")
+TELEMETRY_OTEL_ENABLED = os.getenv("TELEMETRY_OTEL_ENABLED", "false").lower() in ("1", "true", "yes")
+PROVIDER_PRICE_PER_MILLION_TOKENS = {
+    "nvidia": float(os.getenv("NVIDIA_PRICE_PER_MILLION_TOKENS", "0")),
+    "groq": float(os.getenv("GROQ_PRICE_PER_MILLION_TOKENS", "0")),
+}
+
+# Prompt Compaction Configuration (budgets are in tokens)
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "Xenova/gpt-4o")  # Hugging Face repo holding a tokenizer.json
+PROMPT_TOKENIZER_PATH = os.getenv("PROMPT_TOKENIZER_PATH", os.path.join(CACHE_DIR, "tokenizer.json"))
+# Offline runs set this to false: without a local copy, token counts are then estimated instead of downloading
+PROMPT_TOKENIZER_DOWNLOAD = os.getenv("PROMPT_TOKENIZER_DOWNLOAD", "true").lower() in ("1", "true", "yes")
+FIT_PROMPT_JOB_TOKENS = int(os.getenv("FIT_PROMPT_JOB_TOKENS", "1200"))
+FIT_PROMPT_PROFILE_TOKENS = int(os.getenv("FIT_PROMPT_PROFILE_TOKENS", "600"))
+RESUME_PROMPT_JOB_TOKENS = int(os.getenv("RESUME_PROMPT_JOB_TOKENS", "600"))
+RESUME_PROMPT_RESUME_TOKENS = int(os.getenv("RESUME_PROMPT_RESUME_TOKENS", "500"))
+
+# Application Scheduler Configuration
+APPLICATION_WORKERS = int(os.getenv("APPLICATION_WORKERS", "3"))
+DOMAIN_MAX_CONCURRENT = int(os.getenv("DOMAIN_MAX_CONCURRENT", "2"))
+DOMAIN_MIN_INTERVAL_SECONDS = float(os.getenv("DOMAIN_MIN_INTERVAL_SECONDS", "5"))
+
+# Browser Pool Configuration
+BROWSER_POOL_MIN_SIZE = int(os.getenv("BROWSER_POOL_MIN_SIZE", "1"))
+BROWSER_POOL_MAX_SIZE = int(os.getenv("BROWSER_POOL_MAX_SIZE", "3"))
+BROWSER_POOL_MAX_TASKS = int(os.getenv("BROWSER_POOL_MAX_TASKS", "20"))
+BROWSER_POOL_MAX_AGE_MINUTES = float(os.getenv("BROWSER_POOL_MAX_AGE_MINUTES", "60"))
+BROWSER_POOL_MAX_RSS_MB = float(os.getenv("BROWSER_POOL_MAX_RSS_MB", "2048"))
+BROWSER_POOL_PROBE_TIMEOUT = float(os.getenv("BROWSER_POOL_PROBE_TIMEOUT", "5"))
+BROWSER_POOL_USER_DATA_DIR = os.getenv("BROWSER_POOL_USER_DATA_DIR", "./profile-pool")  # Per-slot copies of the profile, made once
+
+# Browser Readiness Configuration
+BROWSER_READY_TIMEOUT = float(os.getenv("BROWSER_READY_TIMEOUT", "10"))
+BROWSER_NETWORK_IDLE_SECONDS = float(os.getenv("BROWSER_NETWORK_IDLE_SECONDS", "0.5"))
+
+# Job Description Extraction Configuration
+JD_EXTRACT_MIN_CONFIDENCE = float(os.getenv("JD_EXTRACT_MIN_CONFIDENCE", "0.6"))
+
+# HTTP Client Configuration
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+HTTP_CACHE_FRESH_SECONDS = float(os.getenv("HTTP_CACHE_FRESH_SECONDS", "3600"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0 Safari/537.36",
+)
+
+# Knowledge Base Query Cache Configuration
+KB_QUERY_CACHE_MAX_ENTRIES = int(os.getenv("KB_QUERY_CACHE_MAX_ENTRIES", "256"))
+KB_QUERY_CACHE_SIMILARITY = float(os.getenv("KB_QUERY_CACHE_SIMILARITY", "0.9"))
+KB_QUERY_WORKERS = int(os.getenv("KB_QUERY_WORKERS", "4"))
+
+# Form Autofill Configuration
+FORM_AUTOFILL_ENABLED = os.getenv("FORM_AUTOFILL_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Learned Form Answer Configuration
+ANSWER_STORE_FUZZY_THRESHOLD = float(os.getenv("ANSWER_STORE_FUZZY_THRESHOLD", "0.85"))
+ANSWER_STORE_SIMILARITY = float(os.getenv("ANSWER_STORE_SIMILARITY", "0.95"))
+
+# Job Pipeline Configuration
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "user_data/jobs.db")
+JOB_CLAIM_LEASE_SECONDS = float(os.getenv("JOB_CLAIM_LEASE_SECONDS", "3600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_SEARCH_QUERY = os.getenv("JOB_SEARCH_QUERY", "")
+JOB_SEARCH_LIMIT = int(os.getenv("JOB_SEARCH_LIMIT", "5"))
+JOB_SEARCH_MAX_STEPS = int(os.getenv("JOB_SEARCH_MAX_STEPS", "20"))
+JOB_SEARCH_STEPS_PER_PAGE = int(os.getenv("JOB_SEARCH_STEPS_PER_PAGE", "8"))
+JOB_SEARCH_MAX_PAGES = int(os.getenv("JOB_SEARCH_MAX_PAGES", "3"))
+JOB_SEARCH_TIMEOUT_SECONDS = float(os.getenv("JOB_SEARCH_TIMEOUT_SECONDS", "300"))
+JOB_URLS = [url.strip() for url in os.getenv("JOB_URLS", "").split(",") if url.strip()]
+
+# ATS Job Board Configuration ("greenhouse:acme,lever:globex,ashby:initech")
+ATS_BOARDS = [board.strip() for board in os.getenv("ATS_BOARDS", "").split(",") if board.strip()]
+GREENHOUSE_BOARDS_API_URL = "https://boards-api.greenhouse.io/v1/boards"
+LEVER_POSTINGS_API_URL = "https://api.lever.co/v0/postings"
+ASHBY_JOB_BOARD_API_URL = "https://api.ashbyhq.com/posting-api/job-board"
+
+# Duplicate Posting Detection Configuration
+DEDUP_JACCARD_THRESHOLD = float(os.getenv("DEDUP_JACCARD_THRESHOLD", "0.8"))
+DEDUP_SIMHASH_DISTANCE = int(os.getenv("DEDUP_SIMHASH_DISTANCE", "3"))
+DEDUP_MIN_TOKENS = int(os.getenv("DEDUP_MIN_TOKENS", "40"))
+DEDUP_MINHASH_PERMUTATIONS = int(os.getenv("DEDUP_MINHASH_PERMUTATIONS", "64"))
@@ -0,0 +1,20 @@
+"""
+Connectors module - exports the ATS job board connectors and the incremental board sync.
+"""
+
+from .ashby import AshbyConnector
+from .base import BoardConnector, BoardPosting
+from .board_sync import CONNECTORS, BoardSync, parse_board
+from .greenhouse import GreenhouseConnector
+from .lever import LeverConnector
+
+__all__ = [
+    "CONNECTORS",
+    "AshbyConnector",
+    "BoardConnector",
+    "BoardPosting",
+    "BoardSync",
+    "GreenhouseConnector",
+    "LeverConnector",
+    "parse_board",
+]
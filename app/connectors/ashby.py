@@ -0,0 +1,26 @@
+from .base import BoardConnector, BoardPosting, html_to_text, parse_timestamp
+from ..config import ASHBY_JOB_BOARD_API_URL
+
+
+class AshbyConnector(BoardConnector):
+    """Ashby posting API; unlisted postings are skipped."""
+
+    ats = "ashby"
+    base_url = ASHBY_JOB_BOARD_API_URL
+
+    async def list_postings(self, company: str) -> list[BoardPosting]:
+        payload = await self._get_json(f"{self.base_url}/{company}", params={"includeCompensation": "false"})
+        return [
+            BoardPosting(
+                ats=self.ats,
+                company=company,
+                job_id=job["id"],
+                title=job.get("title", ""),
+                location=job.get("location", ""),
+                url=job["jobUrl"],
+                description=job.get("descriptionPlain") or html_to_text(job.get("descriptionHtml", "")),
+                updated_at=parse_timestamp(job.get("updatedAt") or job.get("publishedAt")),
+            )
+            for job in payload.get("jobs", [])
+            if job.get("isListed", True)
+        ]
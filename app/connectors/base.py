@@ -0,0 +1,67 @@
+import abc
+from datetime import datetime
+from html import unescape
+from typing import Any
+from bs4 import BeautifulSoup
+from pydantic import BaseModel, Field
+
+from ..http_client import PooledHttpClient
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class BoardPosting(BaseModel):
+    ats: str
+    company: str = Field(description="Board token, e.g. the 'acme' in boards.greenhouse.io/acme")
+    job_id: str
+    title: str
+    location: str = ""
+    url: str = Field(description="Public posting URL, the one applications are made through")
+    description: str = Field(default="", description="Plain text of the job description")
+    updated_at: float = Field(default=0.0, description="When the posting last changed, as a Unix timestamp")
+
+
+def html_to_text(html: str) -> str:
+    """Plain text of an HTML fragment; HTML-escaped fragments (as Greenhouse sends them) are unescaped first."""
+    if not html:
+        return ""
+    text = BeautifulSoup(unescape(html), "html.parser").get_text("\n", strip=True)
+    return "\n".join(line for line in (line.strip() for line in text.splitlines()) if line)
+
+
+def parse_timestamp(value: Any) -> float:
+    """Unix timestamp of an ISO 8601 string or epoch milliseconds; 0 when missing or unreadable."""
+    if isinstance(value, (int, float)):
+        return value / 1000
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            logger.debug(f"Unreadable timestamp: {value}")
+    return 0.0
+
+
+class BoardConnector(abc.ABC):
+    """
+    Lists the open postings of one company on an ATS through its public job board
+    JSON API, without a browser. Subclasses set `ats` and `base_url` and implement
+    `list_postings`, turning the API payload into BoardPostings. HTTP and JSON
+    errors propagate so a failed board is not mistaken for an empty one.
+    """
+
+    ats: str = ""
+    base_url: str = ""
+
+    def __init__(self, http: PooledHttpClient, base_url: str | None = None):
+        self.http = http
+        self.base_url = (base_url or self.base_url).rstrip("/")
+
+    async def _get_json(self, url: str, params: dict[str, Any] | None = None) -> Any:
+        response = await self.http.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @abc.abstractmethod
+    async def list_postings(self, company: str) -> list[BoardPosting]:
+        """Every open posting on the company's board."""
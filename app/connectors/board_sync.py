@@ -0,0 +1,76 @@
+import asyncio
+import httpx
+
+from .ashby import AshbyConnector
+from .base import BoardConnector, BoardPosting
+from .greenhouse import GreenhouseConnector
+from .lever import LeverConnector
+from ..http_client import PooledHttpClient
+from ..jobs import JobStore
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+CONNECTORS: dict[str, type[BoardConnector]] = {
+    connector.ats: connector for connector in (GreenhouseConnector, LeverConnector, AshbyConnector)
+}
+
+
+def parse_board(spec: str) -> tuple[str, str]:
+    """Splits an 'ats:company' board spec, e.g. 'greenhouse:acme'."""
+    ats, _, company = spec.strip().partition(":")
+    ats, company = ats.strip().lower(), company.strip()
+    if ats not in CONNECTORS or not company:
+        raise ValueError(f"Unknown job board '{spec}', expected one of {sorted(CONNECTORS)} as 'ats:company'")
+    return ats, company
+
+
+class BoardSync:
+    """
+    Pulls postings from the configured ATS boards concurrently over the pooled
+    HTTP client. The JobStore keeps, per board, the newest update time already
+    handed on, so each sync returns only postings added or changed since the
+    last one. A board whose API fails is skipped and keeps its cursor.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        boards: list[str],
+        http: PooledHttpClient | None = None,
+        base_urls: dict[str, str] | None = None,
+    ):
+        self.store = store
+        self.boards = [parse_board(board) for board in boards]
+        self.http = http or PooledHttpClient()
+        self.connectors = {ats: connector(self.http, (base_urls or {}).get(ats)) for ats, connector in CONNECTORS.items()}
+
+    async def _fetch_board(self, ats: str, company: str) -> list[BoardPosting] | None:
+        board = f"{ats}:{company}"
+        try:
+            postings = await self.connectors[ats].list_postings(company)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to list postings on {board}: {e}")
+            return None
+
+        since = self.store.board_cursor(board)
+        updated = [p for p in postings if since is None or p.updated_at > since]
+        logger.info(f"{board}: {len(updated)} of {len(postings)} postings new or updated since the last sync")
+        return updated
+
+    async def fetch_updates(self) -> dict[str, list[BoardPosting]]:
+        """Returns the new or updated postings of every board that could be read, keyed by 'ats:company'."""
+        results = await asyncio.gather(*(self._fetch_board(ats, company) for ats, company in self.boards))
+        return {
+            f"{ats}:{company}": postings
+            for (ats, company), postings in zip(self.boards, results)
+            if postings is not None
+        }
+
+    def commit(self, board: str, postings: list[BoardPosting]):
+        """Moves a board's cursor past postings once they are safely stored."""
+        if postings:
+            self.store.record_board_sync(board, max(p.updated_at for p in postings))
+
+    async def aclose(self):
+        await self.http.aclose()
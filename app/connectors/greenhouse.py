@@ -0,0 +1,25 @@
+from .base import BoardConnector, BoardPosting, html_to_text, parse_timestamp
+from ..config import GREENHOUSE_BOARDS_API_URL
+
+
+class GreenhouseConnector(BoardConnector):
+    """Greenhouse job board API: one request returns every posting with its content."""
+
+    ats = "greenhouse"
+    base_url = GREENHOUSE_BOARDS_API_URL
+
+    async def list_postings(self, company: str) -> list[BoardPosting]:
+        payload = await self._get_json(f"{self.base_url}/{company}/jobs", params={"content": "true"})
+        return [
+            BoardPosting(
+                ats=self.ats,
+                company=company,
+                job_id=str(job["id"]),
+                title=job.get("title", ""),
+                location=(job.get("location") or {}).get("name", ""),
+                url=job["absolute_url"],
+                description=html_to_text(job.get("content", "")),
+                updated_at=parse_timestamp(job.get("updated_at")),
+            )
+            for job in payload.get("jobs", [])
+        ]
@@ -0,0 +1,46 @@
+from .base import BoardConnector, BoardPosting, html_to_text, parse_timestamp
+from ..config import LEVER_POSTINGS_API_URL
+
+_PAGE_SIZE = 100
+
+
+def _description(posting: dict) -> str:
+    # Lever keeps the requirements and benefits lists apart from the intro
+    parts = [posting.get("descriptionPlain", "")]
+    for section in posting.get("lists", []):
+        parts.append(section.get("text", ""))
+        parts.append(html_to_text(section.get("content", "")))
+    parts.append(posting.get("additionalPlain", ""))
+    return "\n".join(part.strip() for part in parts if part and part.strip())
+
+
+class LeverConnector(BoardConnector):
+    """Lever postings API, read a page of `_PAGE_SIZE` postings at a time."""
+
+    ats = "lever"
+    base_url = LEVER_POSTINGS_API_URL
+
+    async def list_postings(self, company: str) -> list[BoardPosting]:
+        postings: list[BoardPosting] = []
+        skip = 0
+        while True:
+            page = await self._get_json(
+                f"{self.base_url}/{company}", params={"mode": "json", "skip": skip, "limit": _PAGE_SIZE}
+            )
+            postings.extend(
+                BoardPosting(
+                    ats=self.ats,
+                    company=company,
+                    job_id=posting["id"],
+                    title=posting.get("text", ""),
+                    location=(posting.get("categories") or {}).get("location", ""),
+                    url=posting["hostedUrl"],
+                    description=_description(posting),
+                    # The API only reports updatedAt for some boards; creation time is the fallback
+                    updated_at=parse_timestamp(posting.get("updatedAt") or posting.get("createdAt")),
+                )
+                for posting in page
+            )
+            if len(page) < _PAGE_SIZE:
+                return postings
+            skip += _PAGE_SIZE
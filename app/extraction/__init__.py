@@ -0,0 +1,14 @@
+"""
+Extraction module - exports the deterministic, LLM-free page fetchers and extractors.
+"""
+
+from .job_description import ExtractedJobDescription, detect_site, extract_job_description
+from .page_fetcher import FetchedPage, JobPageFetcher
+
+__all__ = [
+    "ExtractedJobDescription",
+    "FetchedPage",
+    "JobPageFetcher",
+    "detect_site",
+    "extract_job_description",
+]
@@ -0,0 +1,159 @@
+import json
+import re
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, Tag
+from pydantic import BaseModel, Field
+
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# CSS selectors for the description container of each applicant tracking system
+SITE_SELECTORS: dict[str, list[str]] = {
+    "greenhouse": [".job__description", "#content .body", "#content", "div.job-post-content"],
+    "lever": ["div[data-qa='job-description']", ".posting-page .section.page-centered"],
+    "workday": ["[data-automation-id='jobPostingDescription']"],
+    "ashby": ["div[class*='descriptionText']", "div[class*='_description_']"],
+}
+
+SITE_HOSTS: dict[str, tuple[str, ...]] = {
+    "greenhouse": ("greenhouse.io",),
+    "lever": ("lever.co",),
+    "workday": ("myworkdayjobs.com", "workday.com"),
+    "ashby": ("ashbyhq.com",),
+}
+
+# Headings that mark a block as a job description rather than page chrome
+DESCRIPTION_CUES = (
+    "responsibilities", "requirements", "qualifications", "what you'll do", "what you will do",
+    "about the role", "about you", "experience", "skills", "benefits", "who you are",
+)
+
+_NOISE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "form", "svg", "button", "iframe")
+_BLOCK_TAGS = ("article", "main", "section", "div")
+_MIN_DESCRIPTION_CHARS = 300
+
+
+class ExtractedJobDescription(BaseModel):
+    text: str = Field(description="Plain text of the job description")
+    confidence: float = Field(description="Extractor confidence between 0 and 1")
+    method: str = Field(description="Which strategy produced the text, e.g. 'greenhouse', 'json-ld' or 'heuristic'")
+
+
+def detect_site(url: str) -> str | None:
+    """Returns the applicant tracking system hosting the URL, if it is a known one."""
+    host = urlparse(url).netloc.lower()
+    for site, hosts in SITE_HOSTS.items():
+        if any(host == h or host.endswith("." + h) for h in hosts):
+            return site
+    return None
+
+
+def _clean_text(text: str) -> str:
+    lines = (re.sub(r"[ \t ]+", " ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _cue_count(text: str) -> int:
+    lowered = text.lower()
+    return sum(1 for cue in DESCRIPTION_CUES if cue in lowered)
+
+
+def _length_factor(text: str) -> float:
+    return min(1.0, len(text) / (_MIN_DESCRIPTION_CHARS * 2))
+
+
+def _from_site_selectors(soup: BeautifulSoup, site: str) -> ExtractedJobDescription | None:
+    # Boards split postings differently (Lever keeps requirements outside the intro), so keep the fullest match
+    best: ExtractedJobDescription | None = None
+    for selector in SITE_SELECTORS[site]:
+        elements = soup.select(selector)
+        if not elements:
+            continue
+        text = _clean_text("\n".join(el.get_text("\n", strip=True) for el in elements))
+        if not text:
+            continue
+        confidence = round(min(0.6 + 0.35 * _length_factor(text) + (0.05 if _cue_count(text) else 0.0), 1.0), 3)
+        if best is None or confidence > best.confidence:
+            best = ExtractedJobDescription(text=text, confidence=confidence, method=site)
+    return best
+
+
+def _from_json_ld(soup: BeautifulSoup) -> ExtractedJobDescription | None:
+    """Most boards embed a schema.org JobPosting whose description is the full posting."""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if isinstance(data, dict):
+            items = data.get("@graph", [data])
+        elif isinstance(data, list):
+            items = data
+        else:
+            continue
+        for item in items:
+            if not isinstance(item, dict) or not item.get("description"):
+                continue
+            types = item.get("@type")
+            if "JobPosting" not in (types if isinstance(types, list) else [types]):
+                continue
+            description = BeautifulSoup(item["description"], "html.parser").get_text("\n", strip=True)
+            title = item.get("title")
+            text = _clean_text(f"{title}\n{description}" if title else description)
+            confidence = 0.55 + 0.35 * _length_factor(text)
+            return ExtractedJobDescription(text=text, confidence=round(confidence, 3), method="json-ld")
+    return None
+
+
+def _from_heuristics(soup: BeautifulSoup) -> ExtractedJobDescription | None:
+    """
+    Readability-style fallback: score every block by how much text it holds
+    directly in paragraphs and lists, penalise link-heavy blocks, and reward
+    description headings.
+    """
+    best: tuple[float, Tag] | None = None
+    for block in soup.find_all(_BLOCK_TAGS):
+        text = block.get_text(" ", strip=True)
+        if len(text) < _MIN_DESCRIPTION_CHARS / 2:
+            continue
+        link_text = sum(len(a.get_text(" ", strip=True)) for a in block.find_all("a"))
+        link_density = link_text / max(len(text), 1)
+        content_chars = sum(len(el.get_text(" ", strip=True)) for el in block.find_all(["p", "li"], recursive=True))
+        score = content_chars * (1 - link_density) * (1 + 0.25 * _cue_count(text))
+        # Prefer the tightest block holding the content over its ancestors
+        score /= 1 + max(0, len(text) - content_chars) / max(content_chars, 1)
+        if best is None or score > best[0]:
+            best = (score, block)
+
+    if best is None:
+        return None
+    text = _clean_text(best[1].get_text("\n", strip=True))
+    confidence = 0.2 + 0.3 * _length_factor(text) + min(0.3, 0.1 * _cue_count(text))
+    return ExtractedJobDescription(text=text, confidence=round(confidence, 3), method="heuristic")
+
+
+def extract_job_description(html: str, url: str = "") -> ExtractedJobDescription | None:
+    """
+    Extracts the job description from a page's HTML without an LLM. Tries the
+    site-specific selectors for the URL's applicant tracking system, then
+    schema.org JSON-LD, then readability-style heuristics, and returns the most
+    confident result.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    json_ld = _from_json_ld(soup)
+    for tag in soup.find_all(_NOISE_TAGS):
+        tag.decompose()
+
+    candidates = [json_ld]
+    site = detect_site(url)
+    if site:
+        candidates.append(_from_site_selectors(soup, site))
+    candidates.append(_from_heuristics(soup))
+
+    results = [c for c in candidates if c is not None]
+    if not results:
+        return None
+    best = max(results, key=lambda c: c.confidence)
+    logger.debug(f"Extracted job description via {best.method} (confidence {best.confidence})")
+    return best
@@ -0,0 +1,83 @@
+from pathlib import Path
+import httpx
+from pydantic import BaseModel
+
+from .job_description import ExtractedJobDescription, extract_job_description
+from ..cache import CachedResponse, HttpCache
+from ..http_client import PooledHttpClient
+from ..logger_config import get_logger
+from ..config import CACHE_DIR, HTTP_CACHE_FRESH_SECONDS
+
+logger = get_logger(__name__)
+
+
+class FetchedPage(BaseModel):
+    url: str
+    status: int
+    html: str
+    from_cache: bool = False
+    revalidated: bool = False
+
+
+class JobPageFetcher:
+    """
+    Fetches job pages over the shared HTTP client without a browser. Pages are
+    cached on disk; entries younger than `fresh_seconds` are served without a
+    request, older ones are revalidated with ETag / Last-Modified so an
+    unchanged page costs a 304 instead of a full download.
+    """
+
+    def __init__(
+        self,
+        http: PooledHttpClient | None = None,
+        cache: HttpCache | None = None,
+        fresh_seconds: float = HTTP_CACHE_FRESH_SECONDS,
+    ):
+        self.http = http or PooledHttpClient()
+        self.cache = cache or HttpCache(Path(CACHE_DIR) / "http")
+        self.fresh_seconds = fresh_seconds
+
+    async def fetch(self, url: str) -> FetchedPage | None:
+        """Returns the page HTML, or None when it could not be fetched and nothing is cached."""
+        cached = self.cache.get(url)
+        if cached is not None and cached.age_seconds < self.fresh_seconds:
+            return FetchedPage(url=url, status=cached.status, html=cached.body, from_cache=True)
+
+        try:
+            response = await self.http.get(url, headers=cached.conditional_headers() if cached else None)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return self._stale(cached)
+
+        if response.status_code == 304 and cached is not None:
+            cached = self.cache.touch(cached)
+            return FetchedPage(url=url, status=cached.status, html=cached.body, from_cache=True, revalidated=True)
+        if response.status_code != 200:
+            logger.warning(f"Fetching {url} returned HTTP {response.status_code}")
+            return self._stale(cached)
+
+        entry = CachedResponse(
+            url=url,
+            status=response.status_code,
+            body=response.text,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        self.cache.put(entry)
+        return FetchedPage(url=url, status=entry.status, html=entry.body)
+
+    def _stale(self, cached: CachedResponse | None) -> FetchedPage | None:
+        if cached is None:
+            return None
+        logger.info(f"Serving stale cached copy of {cached.url}")
+        return FetchedPage(url=cached.url, status=cached.status, html=cached.body, from_cache=True)
+
+    async def fetch_description(self, url: str) -> ExtractedJobDescription | None:
+        """Fetches a job page and extracts its description without an LLM or a browser."""
+        page = await self.fetch(url)
+        if page is None:
+            return None
+        return extract_job_description(page.html, url)
+
+    async def aclose(self):
+        await self.http.aclose()
@@ -0,0 +1,57 @@
+import asyncio
+import importlib.util
+from collections import defaultdict
+from urllib.parse import urlparse
+import httpx
+
+from .logger_config import get_logger
+from .config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_TIMEOUT_SECONDS,
+    HTTP_KEEPALIVE_SECONDS, HTTP_USER_AGENT,
+)
+
+logger = get_logger(__name__)
+
+# HTTP/2 needs the optional h2 package; without it httpx stays on HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class PooledHttpClient:
+    """
+    One shared httpx client for all plain HTTP fetches. Connections are kept
+    alive and multiplexed over HTTP/2 where the server supports it, the pool
+    is bounded overall, and each host gets its own cap on requests in flight
+    so a single board cannot take every connection.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.max_per_host = max(1, max_per_host)
+        self.client = client or httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": HTTP_USER_AGENT},
+        )
+        self._host_slots: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.max_per_host))
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    async def get(self, url: str, headers: dict[str, str] | None = None, **kwargs) -> httpx.Response:
+        async with self._host_slots[self.host_of(url)]:
+            return await self.client.get(url, headers=headers, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import socket
+
+from .agents import JobSearchAgent
+from .connectors import BoardSync
+from .jobs import JobRecord, JobStore, NearDuplicateIndex, job_key
+from .scheduler import ApplicationResult, ApplicationScheduler
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobPipeline:
+    """
+    Drives jobs through the persistent pipeline: search results are recorded as
+    discovered, postings synced from ATS boards arrive already described, each
+    job is described and scored by the search agent, and fitting jobs are handed
+    to the application scheduler. Every step is claimed from and committed to the
+    JobStore, so rerunning after a crash only does the work that did not finish.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        search_agent: JobSearchAgent,
+        scheduler: ApplicationScheduler | None = None,
+        worker_id: str | None = None,
+        board_sync: BoardSync | None = None,
+    ):
+        self.store = store
+        self.search_agent = search_agent
+        self.scheduler = scheduler
+        self.worker_id = worker_id or default_worker_id()
+        self.board_sync = board_sync
+        self._duplicates: NearDuplicateIndex | None = None
+        self._failed: set[int] = set()  # Jobs that failed scoring in this pass wait for the next run
+
+    def _duplicate_index(self) -> NearDuplicateIndex:
+        """Index of every description in the store, built on first use so resumed runs see earlier jobs."""
+        if self._duplicates is None:
+            self._duplicates = NearDuplicateIndex()
+            for job in self.store.jobs():
+                if job.description:
+                    self._duplicates.add(job.job_key, job.description)
+        return self._duplicates
+
+    async def discover(self, query: str, limit: int = 5) -> list[JobRecord]:
+        """Searches for a query once; a query searched by an earlier run is not searched again."""
+        if self.store.search_completed(query):
+            logger.info(f"Search for '{query}' already done, resuming from the job store")
+            return []
+        urls = await self.search_agent.run_job_search(query, limit=limit * 2)  # Get more to filter
+        added = self.store.add(urls, query=query)
+        self.store.record_search(query, len(urls))
+        logger.info(f"Discovered {len(added)} new job(s) for '{query}'")
+        return added
+
+    async def sync_boards(self) -> list[JobRecord]:
+        """
+        Records the postings added to the ATS boards since the last sync, and
+        refreshes the description of known jobs whose posting changed. Board
+        descriptions come with the API, so these jobs are scored without fetching
+        the job page. Returns the jobs added or refreshed.
+        """
+        if self.board_sync is None:
+            return []
+        synced: list[JobRecord] = []
+        refreshed = 0
+        for board, postings in (await self.board_sync.fetch_updates()).items():
+            added = {job.job_key: job for job in self.store.add([posting.url for posting in postings], query=board)}
+            for posting in postings:
+                job = added.get(job_key(posting.url)) or self.store.find(posting.url)
+                # Lead with the title, as scraped descriptions do, so title rules see it
+                description = "\n".join(filter(None, (posting.title, posting.location, posting.description)))
+                if job.job_key in added:
+                    if posting.description:
+                        self._describe(job, description)
+                    synced.append(job)
+                elif posting.description and description != job.description and job.state in ("discovered", "described", "scored"):
+                    # An edited posting is scored again; jobs applied to or given up on are left alone
+                    self._describe(job, description)
+                    synced.append(job)
+                    refreshed += 1
+            self.board_sync.commit(board, postings)
+        logger.info(f"Synced {len(synced) - refreshed} new and {refreshed} updated job(s) "
+                    f"from {len(self.board_sync.boards)} ATS board(s)")
+        return synced
+
+    def _describe(self, job: JobRecord, description: str) -> bool:
+        """Stores a job's description. Returns False when it duplicates an earlier job, which is closed unscored."""
+        self.store.mark_described(job.id, description)
+        # The same posting under another URL is never scored or applied to twice
+        duplicate_of = self._duplicate_index().add(job.job_key, description)
+        if duplicate_of is not None:
+            self.store.mark_scored(job.id, False, f"Duplicate of {duplicate_of}")
+            return False
+        return True
+
+    async def _advance(self, job: JobRecord):
+        """Moves one claimed job from discovered or described to scored."""
+        try:
+            description = job.description
+            if job.state == "discovered":
+                description = await self.search_agent.get_job_description(job.url)
+                if not self._describe(job, description):
+                    return
+            fit_analysis = await self.search_agent.analyze_job_fit(description)
+            self.store.mark_scored(job.id, fit_analysis.is_fit, fit_analysis.reasoning)
+        except Exception as e:
+            logger.error(f"Failed to score {job.url}: {e}")
+            self.store.mark_failed(job.id, str(e))
+            self._failed.add(job.id)
+
+    async def _score_worker(self, worker: int):
+        while jobs := self.store.claim(("discovered", "described"), f"{self.worker_id}/score-{worker}",
+                                       exclude=self._failed):
+            await self._advance(jobs[0])
+
+    async def score(self):
+        """
+        Describes and scores every pending job with `search_agent.concurrency`
+        workers. A job that fails is not retried until the next run.
+        """
+        self._duplicate_index()
+        self._failed.clear()
+        await asyncio.gather(*(self._score_worker(i) for i in range(self.search_agent.concurrency)))
+        self.search_agent.log_prefilter_stats()
+
+    async def apply(self):
+        """Claims every fitting job not yet applied to and runs it through the application scheduler."""
+        if self.scheduler is None:
+            return
+        jobs = self.store.claim("scored", f"{self.worker_id}/apply", limit=-1, fit_only=True)
+        if not jobs:
+            logger.info("No fitting jobs waiting to be applied to")
+            return
+        by_url = {job.url: job for job in jobs}
+
+        def on_result(result: ApplicationResult):
+            job = by_url[result.url]
+            if result.status == "succeeded":
+                self.store.mark_applied(job.id)
+            else:
+                # A failed form may have been partly submitted, so it is never retried; a skipped one
+                # (no suitable resume) submitted nothing and is tried again by the next run
+                self.store.mark_failed(job.id, result.error or f"Application {result.status}",
+                                       final=result.status == "failed")
+
+        try:
+            await self.scheduler.run(list(by_url), on_result=on_result)
+        finally:
+            # Jobs the scheduler never reported on go back to the queue for the next run
+            for job in jobs:
+                current = self.store.get(job.id)
+                if current is not None and current.claimed_by == job.claimed_by:
+                    self.store.release(job.id)
+
+    async def run(self, query: str | None = None, limit: int = 5, urls: list[str] | None = None) -> dict[str, int]:
+        """Runs discovery, scoring and applications, resuming whatever an earlier run left unfinished."""
+        if urls:
+            self.store.add(urls)
+        await self.sync_boards()
+        if query:
+            await self.discover(query, limit)
+        await self.score()
+        await self.apply()
+        counts = self.store.counts()
+        logger.info(f"Job pipeline: {counts}")
+        return counts
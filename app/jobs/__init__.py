@@ -0,0 +1,21 @@
+"""
+Jobs module - exports the persistent job pipeline store, job URL canonicalization
+and duplicate posting detection.
+"""
+
+from .dedup import MinHasher, NearDuplicateIndex, simhash
+from .job_store import JOB_STATES, JobRecord, JobStore
+from .urls import canonicalize_url, dedupe_urls, extract_ats_job_id, job_key
+
+__all__ = [
+    "JOB_STATES",
+    "JobRecord",
+    "JobStore",
+    "MinHasher",
+    "NearDuplicateIndex",
+    "canonicalize_url",
+    "dedupe_urls",
+    "extract_ats_job_id",
+    "job_key",
+    "simhash",
+]
@@ -0,0 +1,134 @@
+import hashlib
+from collections import defaultdict
+import numpy as np
+
+from ..text_utils import normalize_tokens
+from ..logger_config import get_logger
+from ..config import DEDUP_JACCARD_THRESHOLD, DEDUP_MIN_TOKENS, DEDUP_MINHASH_PERMUTATIONS, DEDUP_SIMHASH_DISTANCE
+
+logger = get_logger(__name__)
+
+_SHINGLE_SIZE = 3
+_MASK_SEED = 1729
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(tokens: list[str], size: int = _SHINGLE_SIZE) -> set[str]:
+    """Overlapping word n-grams of a token list; short texts yield a single shingle."""
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def simhash(tokens: list[str]) -> int:
+    """
+    64-bit SimHash of a token list, weighted by term frequency. Texts that differ
+    in a few words differ in a few bits, so near-identical postings are found by
+    Hamming distance.
+    """
+    counts: dict[str, int] = defaultdict(int)
+    for token in tokens:
+        counts[token] += 1
+    if not counts:
+        return 0
+    hashes = np.array([_hash64(token) for token in counts], dtype=np.uint64)
+    weights = np.array(list(counts.values()), dtype=np.int64)
+    bits = ((hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).astype(np.int64)
+    votes = weights @ (2 * bits - 1)
+    return sum(1 << int(i) for i in np.flatnonzero(votes > 0))
+
+
+class MinHasher:
+    """MinHash signatures over shingle sets, one XOR-mask permutation per signature row."""
+
+    def __init__(self, permutations: int = DEDUP_MINHASH_PERMUTATIONS, seed: int = _MASK_SEED):
+        rng = np.random.default_rng(seed)
+        self.masks = rng.integers(0, np.iinfo(np.int64).max, size=permutations, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, shingle_set: set[str]) -> np.ndarray:
+        if not shingle_set:
+            return np.full(len(self.masks), np.iinfo(np.uint64).max, dtype=np.uint64)
+        hashes = np.array([_hash64(s) for s in shingle_set], dtype=np.uint64)
+        return (hashes[None, :] ^ self.masks[:, None]).min(axis=1)
+
+    @staticmethod
+    def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """
+    Finds job descriptions that are the same posting under a different URL.
+    A SimHash within a few bits catches copies with cosmetic edits; MinHash with
+    LSH banding catches reposts whose shingles mostly overlap. Texts shorter than
+    `min_tokens` are never matched, as placeholders look alike without being alike.
+    """
+
+    def __init__(
+        self,
+        jaccard_threshold: float = DEDUP_JACCARD_THRESHOLD,
+        simhash_distance: int = DEDUP_SIMHASH_DISTANCE,
+        min_tokens: int = DEDUP_MIN_TOKENS,
+        permutations: int = DEDUP_MINHASH_PERMUTATIONS,
+        bands: int = 16,
+    ):
+        self.jaccard_threshold = jaccard_threshold
+        self.simhash_distance = simhash_distance
+        self.min_tokens = min_tokens
+        self.hasher = MinHasher(permutations)
+        self.bands = bands if permutations % bands == 0 else 1
+        self._keys: list[str] = []
+        self._simhashes: list[int] = []
+        self._signatures: list[np.ndarray] = []
+        self._buckets: dict[tuple[int, bytes], list[int]] = defaultdict(list)
+        self.duplicates = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, bytes]]:
+        return [(i, band.tobytes()) for i, band in enumerate(np.split(signature, self.bands))]
+
+    def _fingerprint(self, text: str) -> tuple[int, np.ndarray] | None:
+        tokens = normalize_tokens(text)
+        if len(tokens) < self.min_tokens:
+            return None
+        return simhash(tokens), self.hasher.signature(shingles(tokens))
+
+    def _match(self, fingerprint: tuple[int, np.ndarray]) -> str | None:
+        fingerprint_simhash, signature = fingerprint
+        for i, other in enumerate(self._simhashes):
+            if (fingerprint_simhash ^ other).bit_count() <= self.simhash_distance:
+                return self._keys[i]
+        candidates = {i for band_key in self._band_keys(signature) for i in self._buckets.get(band_key, [])}
+        best = max(candidates, key=lambda i: MinHasher.jaccard(signature, self._signatures[i]), default=None)
+        if best is not None and MinHasher.jaccard(signature, self._signatures[best]) >= self.jaccard_threshold:
+            return self._keys[best]
+        return None
+
+    def add(self, key: str, text: str) -> str | None:
+        """
+        Indexes a description under `key` unless it duplicates one already indexed.
+        Returns the key of the earlier posting it duplicates, or None when it is new.
+        """
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return None
+        duplicate_of = self._match(fingerprint)
+        if duplicate_of == key:
+            return None  # The same posting seen again, not a copy of another one
+        if duplicate_of is not None:
+            self.duplicates += 1
+            logger.info(f"{key} duplicates {duplicate_of}, skipping it")
+            return duplicate_of
+
+        index = len(self._keys)
+        self._keys.append(key)
+        self._simhashes.append(fingerprint[0])
+        self._signatures.append(fingerprint[1])
+        for band_key in self._band_keys(fingerprint[1]):
+            self._buckets[band_key].append(index)
+        return None
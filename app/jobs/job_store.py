@@ -0,0 +1,219 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Collection
+from pydantic import BaseModel, Field
+
+from .urls import canonicalize_url, extract_ats_job_id, job_key
+from ..logger_config import get_logger
+from ..config import JOB_CLAIM_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+logger = get_logger(__name__)
+
+# discovered -> described -> scored -> applied, with failed reachable from every stage
+JOB_STATES = ("discovered", "described", "scored", "applied", "failed")
+
+_COLUMNS = (
+    "id, url, canonical_url, job_key, ats, ats_job_id, query, state, description, is_fit, reasoning, "
+    "attempts, error, claimed_by, claimed_at, created_at, updated_at"
+)
+
+
+class JobRecord(BaseModel):
+    id: int
+    url: str
+    canonical_url: str
+    job_key: str = Field(description="ATS job ID ('greenhouse:123') or the canonical URL, unique per posting")
+    ats: str | None = None
+    ats_job_id: str | None = None
+    query: str | None = Field(default=None, description="Search query the job was discovered by")
+    state: str = "discovered"
+    description: str | None = None
+    is_fit: bool | None = None
+    reasoning: str | None = None
+    attempts: int = 0
+    error: str | None = None
+    claimed_by: str | None = None
+    claimed_at: float | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "JobRecord":
+        values = dict(zip([c.strip() for c in _COLUMNS.split(",")], row))
+        if values["is_fit"] is not None:
+            values["is_fit"] = bool(values["is_fit"])
+        return cls(**values)
+
+
+class JobStore:
+    """
+    Durable job pipeline state in SQLite (WAL mode, so several processes can share
+    it). Jobs are deduplicated by ATS job ID or canonical URL and move through
+    discovered -> described -> scored -> applied/failed. Workers claim jobs
+    atomically with a lease; claims held by a crashed worker expire, so an
+    interrupted batch picks up where it stopped.
+    """
+
+    def __init__(self, db_path: str | Path, lease_seconds: float = JOB_CLAIM_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+
+        # Autocommit mode: every statement below is its own atomic transaction
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, canonical_url TEXT NOT NULL, "
+            "job_key TEXT NOT NULL UNIQUE, ats TEXT, ats_job_id TEXT, query TEXT, "
+            "state TEXT NOT NULL DEFAULT 'discovered', description TEXT, is_fit INTEGER, reasoning TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, error TEXT, claimed_by TEXT, claimed_at REAL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, claimed_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS searches (query TEXT PRIMARY KEY, found INTEGER NOT NULL, completed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS board_syncs (board TEXT PRIMARY KEY, last_updated REAL NOT NULL, synced_at REAL NOT NULL)"
+        )
+
+    def add(self, urls: list[str], query: str | None = None) -> list[JobRecord]:
+        """Records newly discovered job URLs and returns the ones that were not already known."""
+        now = time.time()
+        added: list[JobRecord] = []
+        with self._lock:
+            for url in urls:
+                ats_id = extract_ats_job_id(url)
+                row = self._conn.execute(
+                    "INSERT INTO jobs (url, canonical_url, job_key, ats, ats_job_id, query, created_at, updated_at) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(job_key) DO NOTHING RETURNING {_COLUMNS}",
+                    (url, canonicalize_url(url), job_key(url), ats_id[0] if ats_id else None,
+                     ats_id[1] if ats_id else None, query, now, now),
+                ).fetchone()
+                if row is not None:
+                    added.append(JobRecord.from_row(row))
+        if len(added) < len(urls):
+            logger.info(f"Skipped {len(urls) - len(added)} already known job(s)")
+        return added
+
+    def get(self, job_id: int) -> JobRecord | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return JobRecord.from_row(row) if row else None
+
+    def find(self, url: str) -> JobRecord | None:
+        """Looks a job up by any URL of the same posting."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_key = ?", (job_key(url),)).fetchone()
+        return JobRecord.from_row(row) if row else None
+
+    def jobs(self, state: str | None = None) -> list[JobRecord]:
+        with self._lock:
+            if state is None:
+                rows = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY id").fetchall()
+            else:
+                rows = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE state = ? ORDER BY id", (state,)).fetchall()
+        return [JobRecord.from_row(row) for row in rows]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: 0 for state in JOB_STATES} | dict(rows)
+
+    def claim(self, states: str | tuple[str, ...], worker: str, limit: int = 1, fit_only: bool = False,
+              exclude: Collection[int] = ()) -> list[JobRecord]:
+        """
+        Atomically claims up to `limit` unclaimed jobs in the given state(s), oldest
+        first, skipping the job IDs in `exclude`. Claims older than the lease count
+        as abandoned and can be taken over.
+        """
+        states = (states,) if isinstance(states, str) else tuple(states)
+        exclude = tuple(exclude)
+        now = time.time()
+        placeholders = ", ".join("?" * len(states))
+        fit_filter = " AND is_fit = 1" if fit_only else ""
+        exclude_filter = f" AND id NOT IN ({', '.join('?' * len(exclude))})" if exclude else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"UPDATE jobs SET claimed_by = ?, claimed_at = ?, updated_at = ? WHERE id IN ("
+                f"SELECT id FROM jobs WHERE state IN ({placeholders}){fit_filter}{exclude_filter} "
+                "AND (claimed_by IS NULL OR claimed_at < ?) ORDER BY id LIMIT ?) "
+                f"RETURNING {_COLUMNS}",
+                (worker, now, now, *states, *exclude, now - self.lease_seconds, limit),
+            ).fetchall()
+        return sorted((JobRecord.from_row(row) for row in rows), key=lambda job: job.id)
+
+    def release(self, job_id: int):
+        """Gives a claimed job back without changing its state."""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET claimed_by = NULL, claimed_at = NULL WHERE id = ?", (job_id,))
+
+    def _advance(self, job_id: int, state: str, **values):
+        assignments = "".join(f", {column} = ?" for column in values)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET state = ?, claimed_by = NULL, claimed_at = NULL, updated_at = ?{assignments} WHERE id = ?",
+                (state, time.time(), *values.values(), job_id),
+            )
+
+    def mark_described(self, job_id: int, description: str):
+        self._advance(job_id, "described", description=description, error=None)
+
+    def mark_scored(self, job_id: int, is_fit: bool, reasoning: str):
+        self._advance(job_id, "scored", is_fit=int(is_fit), reasoning=reasoning, error=None)
+
+    def mark_applied(self, job_id: int):
+        self._advance(job_id, "applied", error=None)
+
+    def mark_failed(self, job_id: int, error: str, final: bool = False) -> bool:
+        """
+        Records a failed attempt. The job stays in its stage for another try until
+        it has failed `max_attempts` times, or at once when `final`, then moves to
+        'failed'. Returns True when the job is given up on.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = ?, claimed_by = NULL, claimed_at = NULL, "
+                "updated_at = ?, state = CASE WHEN ? OR attempts + 1 >= ? THEN 'failed' ELSE state END "
+                "WHERE id = ? RETURNING state",
+                (error, time.time(), final, self.max_attempts, job_id),
+            ).fetchone()
+        return row is not None and row[0] == "failed"
+
+    def search_completed(self, query: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM searches WHERE query = ?", (query,)).fetchone() is not None
+
+    def record_search(self, query: str, found: int):
+        """Marks a search query as done, so a resumed batch does not search again."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, found, completed_at) VALUES (?, ?, ?)",
+                (query, found, time.time()),
+            )
+
+    def board_cursor(self, board: str) -> float | None:
+        """Update time of the newest posting already synced from an ATS board, or None if it was never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT last_updated FROM board_syncs WHERE board = ?", (board,)).fetchone()
+        return row[0] if row else None
+
+    def record_board_sync(self, board: str, last_updated: float):
+        """Moves a board's cursor forward; it never moves back."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO board_syncs (board, last_updated, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(board) DO UPDATE SET last_updated = MAX(last_updated, excluded.last_updated), "
+                "synced_at = excluded.synced_at",
+                (board, last_updated, time.time()),
+            )
+
+    def close(self):
+        self._conn.close()
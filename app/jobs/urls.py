@@ -0,0 +1,89 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only record where a click came from
+TRACKING_PARAMS = frozenset({
+    "gh_src", "source", "src", "ref", "referrer", "refid", "trk", "trkinfo", "trackingid", "lever-source",
+    "lever-origin", "lever-via", "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "from", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "icid", "ccuid", "sid",
+})
+_TRACKING_PREFIXES = ("utm_", "_hs", "mc_")
+
+# (ATS, host pattern, path pattern capturing the job ID)
+_ATS_PATH_PATTERNS: list[tuple[str, re.Pattern, re.Pattern]] = [
+    ("greenhouse", re.compile(r"(^|\.)greenhouse\.io$"), re.compile(r"/jobs/(\d+)")),
+    ("lever", re.compile(r"^jobs\.(eu\.)?lever\.co$"), re.compile(r"^/[^/]+/([0-9a-fA-F-]{36})")),
+    ("ashby", re.compile(r"^jobs\.ashbyhq\.com$"), re.compile(r"^/[^/]+/([0-9a-fA-F-]{36})")),
+    ("workday", re.compile(r"\.myworkdayjobs\.com$"), re.compile(r"/job/[^?]*_([A-Za-z]*-?\d+)(?:-\d+)?/?$")),
+    ("smartrecruiters", re.compile(r"^jobs\.smartrecruiters\.com$"), re.compile(r"^/[^/]+/(\d+)")),
+    ("linkedin", re.compile(r"(^|\.)linkedin\.com$"), re.compile(r"/jobs/view/(?:[^/]*-)?(\d+)")),
+]
+# (ATS, query parameter holding the job ID); gh_jid marks Greenhouse jobs embedded on company sites
+_ATS_QUERY_PARAMS: list[tuple[str, str]] = [
+    ("greenhouse", "gh_jid"),
+    ("greenhouse", "token"),
+    ("linkedin", "currentjobid"),
+    ("indeed", "jk"),
+    ("indeed", "vjk"),
+]
+# Trailing path segments that lead to the same posting's application form
+_APPLY_SUFFIXES = re.compile(r"/(apply|application)/?$")
+
+
+def _is_tracking(param: str) -> bool:
+    return param.lower() in TRACKING_PARAMS or param.lower().startswith(_TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a job URL so the same posting reached through different links
+    compares equal: lowercase host without 'www.', no fragment, tracking
+    parameters removed, remaining parameters sorted, no trailing slash and no
+    '/apply' suffix.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    path = _APPLY_SUFFIXES.sub("", parts.path).rstrip("/") or "/"
+    scheme = "https" if parts.scheme in ("http", "https", "") else parts.scheme.lower()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def extract_ats_job_id(url: str) -> tuple[str, str] | None:
+    """Returns (ATS name, job ID) for links to known applicant tracking systems and job boards."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    for ats, host_pattern, path_pattern in _ATS_PATH_PATTERNS:
+        if host_pattern.search(host):
+            match = path_pattern.search(parts.path)
+            if match:
+                job_id = match.group(1)
+                # Workday requisition IDs are only unique within a tenant
+                return (ats, f"{host.split('.')[0]}:{job_id}") if ats == "workday" else (ats, job_id.lower())
+    params = {k.lower(): v for k, v in parse_qsl(parts.query)}
+    for ats, param in _ATS_QUERY_PARAMS:
+        if param == "token" and "greenhouse.io" not in host:
+            continue
+        if params.get(param):
+            return ats, params[param]
+    return None
+
+
+def job_key(url: str) -> str:
+    """Deduplication key of a job URL: the ATS job ID when one is known, otherwise the canonical URL."""
+    ats_id = extract_ats_job_id(url)
+    return f"{ats_id[0]}:{ats_id[1]}" if ats_id else canonicalize_url(url)
+
+
+def dedupe_urls(urls: list[str]) -> list[str]:
+    """Drops URLs that point to a posting already in the list, keeping the first link to each."""
+    seen: set[str] = set()
+    unique: list[str] = []
+    for url in urls:
+        key = job_key(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
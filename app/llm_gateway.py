@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import random
+from pathlib import Path
+from typing import Any, TypeVar
+import httpx
+from pydantic import BaseModel, ValidationError
+from browser_use.llm import BaseChatModel, ChatGroq, ChatOpenAI
+from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion
+
+from .cache import CompletionCache
+from .rate_limit import AsyncTokenBucket, get_rate_limiter
+from .telemetry import current_span, get_tracer
+from .logger_config import get_logger
+from .config import (
+    BROWSER_AGENT_GROQ_MODEL, BROWSER_AGENT_NVIDIA_MODEL, GROQ_API_KEY, NVIDIA_API_KEY, NVIDIA_BASE_URL,
+    CACHE_DIR, LLM_CACHE_TTL_HOURS, LLM_FAILOVER_ENABLED, LLM_HEDGE_AFTER_SECONDS, LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_SECONDS, LLM_RETRY_MAX_SECONDS, PROVIDER_PRICE_PER_MILLION_TOKENS,
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Rate limits, server errors and dropped connections are worth retrying; bad requests are not."""
+    if isinstance(error, ModelRateLimitError):
+        return True
+    if isinstance(error, ModelProviderError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (TimeoutError, httpx.TransportError))
+
+
+def backoff_delay(attempt: int, base: float = LLM_RETRY_BASE_SECONDS, cap: float = LLM_RETRY_MAX_SECONDS) -> float:
+    """Full-jitter exponential backoff, so callers throttled together do not retry together."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _key_id(provider: str, api_key: str | None) -> str:
+    # The configured key shares the provider-wide budget; any other key gets its own, named by a digest
+    default_key = {"nvidia": NVIDIA_API_KEY, "groq": GROQ_API_KEY}.get(provider, "")
+    if not api_key or api_key == default_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class LLMRoute:
+    """One provider endpoint the gateway can send requests to, with that provider's request budget."""
+
+    def __init__(self, provider: str, llm: BaseChatModel, rate_limiter: AsyncTokenBucket | None = None):
+        self.provider = provider
+        self.llm = llm
+        self.rate_limiter = rate_limiter or get_rate_limiter(provider, _key_id(provider, getattr(llm, "api_key", None)))
+
+
+def nvidia_route(model: str = BROWSER_AGENT_NVIDIA_MODEL) -> LLMRoute:
+    # Client-side retries are off: the gateway retries with jitter and fails over instead
+    return LLMRoute("nvidia", ChatOpenAI(
+        model=model, base_url=NVIDIA_BASE_URL, api_key=NVIDIA_API_KEY, reasoning_effort="low", max_retries=0,
+    ))
+
+
+def groq_route(model: str = BROWSER_AGENT_GROQ_MODEL) -> LLMRoute:
+    return LLMRoute("groq", ChatGroq(model=model, api_key=GROQ_API_KEY or None, max_retries=0))
+
+
+# The endpoint each provider fails over to
+FAILOVER_ROUTES = {"nvidia": groq_route, "groq": nvidia_route}
+
+_completion_cache: CompletionCache | None = None
+
+
+def get_completion_cache() -> CompletionCache:
+    """Returns the on-disk completion cache shared by every gateway in the process."""
+    global _completion_cache
+    if _completion_cache is None:
+        _completion_cache = CompletionCache(Path(CACHE_DIR) / "llm_cache.db", ttl_seconds=LLM_CACHE_TTL_HOURS * 3600)
+    return _completion_cache
+
+
+class LLMGatewayStats(BaseModel):
+    calls: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    hedges: int = 0
+    failovers: int = 0
+    errors: int = 0
+
+
+class LLMGateway:
+    """
+    The one way agents call an LLM. It has the same `ainvoke` interface as a
+    browser-use chat model, so it can also drive browser-use agents. Each call
+    is sent to the first route; rate limits and server errors are retried with
+    jittered backoff inside that route's token bucket. When a route fails for
+    good the next provider is tried (failover). When it is merely slow for
+    `hedge_after` seconds, the next provider is raced against it (hedging).
+    Calls made with `cache=True` are answered from the content-addressed
+    completion cache when the same prompt was answered before.
+    """
+
+    _verified_api_keys: bool = False
+
+    def __init__(
+        self,
+        routes: list[LLMRoute],
+        cache: CompletionCache | None = None,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_base: float = LLM_RETRY_BASE_SECONDS,
+        retry_max: float = LLM_RETRY_MAX_SECONDS,
+        hedge_after: float = LLM_HEDGE_AFTER_SECONDS,
+    ):
+        if not routes:
+            raise ValueError("An LLM gateway needs at least one route.")
+        self.routes = routes
+        self.cache = cache
+        self.max_retries = max(0, max_retries)
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.hedge_after = hedge_after
+        self.model = str(routes[0].llm.model)
+        self.stats = LLMGatewayStats()
+
+    @classmethod
+    def with_failover(cls, primary: BaseChatModel, provider: str, **kwargs) -> "LLMGateway":
+        """Gateway for `primary` that fails over to the other configured provider, if failover is enabled."""
+        routes = [LLMRoute(provider, primary)]
+        if LLM_FAILOVER_ENABLED and provider in FAILOVER_ROUTES:
+            routes.append(FAILOVER_ROUTES[provider]())
+        return cls(routes, **kwargs)
+
+    @property
+    def provider(self) -> str:
+        return self.routes[0].llm.provider
+
+    @property
+    def name(self) -> str:
+        return self.routes[0].llm.name
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    async def ainvoke(
+        self, messages: list[BaseMessage], output_format: type[T] | None = None, cache: bool = False, **kwargs: Any
+    ) -> ChatInvokeCompletion:
+        output = output_format.__name__ if output_format is not None else "text"
+        with get_tracer().span("llm.call", model=self.model, output=output, cached=False) as span:
+            key = None
+            if cache and self.cache is not None:
+                key = CompletionCache.make_key(self.model, messages, output_format)
+                cached = self._from_cache(key, output_format)
+                if cached is not None:
+                    self.stats.cache_hits += 1
+                    span.set(cached=True)
+                    return cached
+
+            self.stats.calls += 1
+            response = await self._race_routes(messages, output_format, kwargs)
+            if response.usage is not None:
+                provider = span.attributes.get("provider")
+                span.set(
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                    cost_usd=response.usage.total_tokens * PROVIDER_PRICE_PER_MILLION_TOKENS.get(provider, 0.0) / 1e6,
+                )
+            if key is not None:
+                completion = response.completion
+                raw = completion.model_dump_json() if isinstance(completion, BaseModel) else str(completion)
+                self.cache.put(key, self.model, raw)
+            return response
+
+    def _from_cache(self, key: str, output_format: type[T] | None) -> ChatInvokeCompletion | None:
+        raw = self.cache.get(key)
+        if raw is None:
+            return None
+        try:
+            completion = output_format.model_validate_json(raw) if output_format is not None else raw
+        except ValidationError:
+            return None  # The schema changed shape since; ask again
+        return ChatInvokeCompletion(completion=completion, usage=None)
+
+    async def _call_route(self, route: LLMRoute, messages: list[BaseMessage], output_format, kwargs: dict):
+        for attempt in range(self.max_retries + 1):
+            await route.rate_limiter.acquire()
+            # Route tasks inherit the caller's context, so this is the call's 'llm.call' span
+            span = current_span()
+            try:
+                response = await route.llm.ainvoke(messages, output_format, **kwargs)
+                if span is not None:
+                    span.set(provider=route.provider)
+                return response
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt, self.retry_base, self.retry_max)
+                self.stats.retries += 1
+                if span is not None:
+                    span.add("retries")
+                logger.warning(f"{route.provider} call failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _race_routes(self, messages: list[BaseMessage], output_format, kwargs: dict) -> ChatInvokeCompletion:
+        """
+        Starts on the first route and adds the next one when every running route
+        has failed, or when none has answered within `hedge_after` seconds. The
+        first answer wins and the requests still running are cancelled.
+        """
+        pending: set[asyncio.Task] = set()
+        next_route = 0
+        last_error: BaseException | None = None
+
+        def start_next():
+            nonlocal next_route
+            route = self.routes[next_route]
+            next_route += 1
+            pending.add(asyncio.create_task(self._call_route(route, messages, output_format, kwargs), name=route.provider))
+
+        start_next()
+        try:
+            while pending:
+                can_hedge = self.hedge_after > 0 and next_route < len(self.routes)
+                done, _ = await asyncio.wait(
+                    pending, timeout=self.hedge_after if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.stats.hedges += 1
+                    current_span().add("hedges")
+                    logger.info(f"No answer after {self.hedge_after:.0f}s, hedging on {self.routes[next_route].provider}")
+                    start_next()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"LLM call on {task.get_name()} failed: {last_error}")
+                if not pending and next_route < len(self.routes):
+                    self.stats.failovers += 1
+                    current_span().add("failovers")
+                    logger.warning(f"Failing over to {self.routes[next_route].provider}")
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self.stats.errors += 1
+        raise last_error
@@ -0,0 +1,79 @@
+import json
+from pydantic import BaseModel, Field
+
+
+class ContactInfo(BaseModel):
+    email: str | None = Field(default=None, description="Primary email address")
+    phone: str | None = Field(default=None, description="Phone number including country code if known")
+    address: str | None = Field(default=None, description="Street address")
+    city: str | None = None
+    state: str | None = None
+    postal_code: str | None = None
+    country: str | None = None
+
+
+class WorkExperience(BaseModel):
+    company: str
+    title: str
+    location: str | None = None
+    start_date: str | None = Field(default=None, description="Start date as written in the knowledge base, e.g. 'Jan 2021'")
+    end_date: str | None = Field(default=None, description="End date, or 'Present' for the current role")
+    summary: str | None = Field(default=None, description="One or two sentences on the role")
+
+
+class Education(BaseModel):
+    institution: str
+    degree: str | None = None
+    field_of_study: str | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+    grade: str | None = Field(default=None, description="GPA, percentage or classification")
+
+
+class Links(BaseModel):
+    linkedin: str | None = None
+    github: str | None = None
+    portfolio: str | None = None
+    website: str | None = None
+    other: list[str] = Field(default_factory=list)
+
+
+class WorkAuthorization(BaseModel):
+    authorized_countries: list[str] = Field(default_factory=list, description="Countries the applicant may work in")
+    requires_sponsorship: bool | None = Field(default=None, description="Whether visa sponsorship is needed")
+    visa_status: str | None = None
+    willing_to_relocate: bool | None = None
+    notice_period: str | None = None
+
+
+class EEOAnswers(BaseModel):
+    gender: str | None = None
+    race_ethnicity: str | None = None
+    veteran_status: str | None = None
+    disability_status: str | None = None
+    pronouns: str | None = None
+
+
+class ApplicantProfile(BaseModel):
+    first_name: str | None = None
+    last_name: str | None = None
+    full_name: str | None = None
+    headline: str | None = Field(default=None, description="Current job title or professional headline")
+    years_of_experience: float | None = None
+    contact: ContactInfo = Field(default_factory=ContactInfo)
+    work_history: list[WorkExperience] = Field(default_factory=list, description="Most recent role first")
+    education: list[Education] = Field(default_factory=list)
+    links: Links = Field(default_factory=Links)
+    work_authorization: WorkAuthorization = Field(default_factory=WorkAuthorization)
+    eeo: EEOAnswers = Field(default_factory=EEOAnswers, description="Voluntary self-identification answers")
+    skills: list[str] = Field(default_factory=list)
+
+    def to_prompt(self) -> str:
+        """Compact JSON of the known fields, for embedding in an agent task."""
+        return self.model_dump_json(exclude_none=True, exclude_defaults=True, indent=1)
+
+    def section(self, name: str) -> str | None:
+        """JSON of one top-level field, or None if the profile has no such field."""
+        if name not in ApplicantProfile.model_fields:
+            return None
+        return json.dumps(self.model_dump(include={name}, exclude_none=True).get(name))
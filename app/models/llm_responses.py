@@ -3,3 +3,24 @@ from pydantic import BaseModel, Field
 class JobFitAnalysis(BaseModel):
     is_fit: bool = Field(description="Whether the job is a good fit for the applicant")
     reasoning: str = Field(description="A brief explanation of why this is or isn't a good fit")
+
+
+class NumberedJobFitAnalysis(JobFitAnalysis):
+    job: int = Field(description="The number of the job this analysis is for, as given in the prompt")
+
+
+class JobFitBatch(BaseModel):
+    analyses: list[NumberedJobFitAnalysis] = Field(description="One analysis per job in the prompt")
+
+
+class JobPosting(BaseModel):
+    title: str = Field(default="", description="The job title as listed")
+    company: str = Field(default="", description="The hiring company")
+    location: str = Field(default="", description="The job location, or 'Remote'")
+    url: str = Field(description="The direct URL of the job posting, not a search engine redirect")
+    snippet: str = Field(default="", description="A one-sentence summary of the listing")
+
+
+class JobSearchPage(BaseModel):
+    postings: list[JobPosting] = Field(default_factory=list, description="The job postings listed on this results page")
+    has_more: bool = Field(default=False, description="Whether there is a next page of results")
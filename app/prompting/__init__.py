@@ -0,0 +1,21 @@
+"""
+Prompting module - exports the token counters and the prompt compactor used to fit LLM prompts into a budget.
+"""
+
+from .compaction import CompactedText, CompactionStats, PromptCompactor, split_segments
+from .tokens import (
+    ApproximateTokenCounter, TokenCounter, TokenizerCounter, aget_token_counter, get_token_counter, load_token_counter,
+)
+
+__all__ = [
+    "ApproximateTokenCounter",
+    "CompactedText",
+    "CompactionStats",
+    "PromptCompactor",
+    "TokenCounter",
+    "TokenizerCounter",
+    "aget_token_counter",
+    "get_token_counter",
+    "load_token_counter",
+    "split_segments",
+]
@@ -0,0 +1,175 @@
+import re
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .tokens import TokenCounter, get_token_counter
+from ..ranking import HashedBM25Index
+from ..text_utils import normalize_tokens, split_sections
+from ..logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# How much a section is worth to a fit or resume decision, before its relevance to the other side
+SECTION_PRIORITY = {
+    "requirements": 1.0,
+    "skills": 1.0,
+    "experience": 0.9,
+    "responsibilities": 0.85,
+    "header": 0.8,  # Title, company and location usually open the text
+    "summary": 0.7,
+    "preferred": 0.6,
+    "projects": 0.6,
+    "body": 0.5,  # Chunks of text without recognised headings, ranked by relevance alone
+    "certifications": 0.4,
+    "education": 0.35,
+    "publications": 0.2,
+    "awards": 0.2,
+    "benefits": 0.05,
+}
+_DEFAULT_PRIORITY = 0.3
+_UNTITLED = ("header", "body")
+_SEPARATOR = "\n\n"
+_TRIM_MARKER = " [...]"
+_MIN_SCORE = 0.1  # Boilerplate scoring below this is dropped even when there is room for it
+_MIN_PARTIAL_TOKENS = 24  # Below this a trimmed section says too little to be worth its heading
+_SENTENCES_PER_CHUNK = 3
+
+
+class CompactedText(BaseModel):
+    text: str
+    original_tokens: int
+    tokens: int
+    kept_sections: list[str] = Field(default_factory=list)
+    dropped_sections: list[str] = Field(default_factory=list)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class CompactionStats(BaseModel):
+    calls: int = 0
+    original_tokens: int = 0
+    tokens: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+    @property
+    def savings_rate(self) -> float:
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+
+def split_segments(text: str) -> list[tuple[str, str]]:
+    """
+    Splits text into (section name, body) pairs by its headings. Text without
+    recognisable headings is split into paragraphs, or into runs of a few
+    sentences when it is a single paragraph.
+    """
+    sections = split_sections(text)
+    if len(sections) > 1:
+        return list(sections.items())
+    chunks = [chunk.strip() for chunk in re.split(r"\n\s*\n", text) if chunk.strip()]
+    if len(chunks) <= 1:
+        sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+        chunks = [" ".join(sentences[i:i + _SENTENCES_PER_CHUNK]) for i in range(0, len(sentences), _SENTENCES_PER_CHUNK)]
+    return [("body", chunk) for chunk in chunks if chunk]
+
+
+class PromptCompactor:
+    """
+    Fits job descriptions and resumes into a token budget without blind slicing.
+    The text is split into sections, each scored by how much its kind matters
+    (requirements and skills over benefits) plus its BM25 similarity to the
+    other side of the comparison. The best sections are packed into the budget,
+    a section that only partly fits is trimmed, boilerplate is left out even
+    when it would fit, and the kept sections are put back in their original
+    order. Token counts come from a real tokenizer.
+    """
+
+    def __init__(self, counter: TokenCounter | None = None):
+        self._counter = counter
+        self.stats = CompactionStats()
+
+    @property
+    def counter(self) -> TokenCounter:
+        if self._counter is None:
+            # Loaded on first use, so idle agents never load it; main.py preloads it off the event loop
+            self._counter = get_token_counter()
+        return self._counter
+
+    def compact(self, text: str, budget: int, query: str = "") -> CompactedText:
+        """
+        Returns `text` cut down to at most `budget` tokens, keeping the sections
+        most relevant to `query` (e.g. the resume when compacting a job description).
+        """
+        original_tokens = self.counter.count(text)
+        segments = split_segments(text)
+        names = [name for name, _ in segments]
+        if original_tokens <= budget:
+            return CompactedText(text=text, original_tokens=original_tokens, tokens=original_tokens, kept_sections=names)
+
+        rendered = [body if name in _UNTITLED else f"{name.title()}:\n{body}" for name, body in segments]
+        costs = [self.counter.count(section + _SEPARATOR) for section in rendered]
+        relevance = HashedBM25Index.from_texts(rendered).score(normalize_tokens(query)) if query.strip() \
+            else np.zeros(len(rendered), dtype=np.float32)
+        scores = [SECTION_PRIORITY.get(name, _DEFAULT_PRIORITY) + float(similarity)
+                  for name, similarity in zip(names, relevance)]
+
+        kept: dict[int, str] = {}
+        remaining = budget
+        for i in sorted(range(len(rendered)), key=lambda i: -scores[i]):
+            if scores[i] < _MIN_SCORE:
+                break
+            if costs[i] <= remaining:
+                kept[i] = rendered[i]
+                remaining -= costs[i]
+            elif remaining >= _MIN_PARTIAL_TOKENS:
+                kept[i] = self._trim(rendered[i], remaining - self.counter.count(_SEPARATOR))
+                remaining -= self.counter.count(kept[i] + _SEPARATOR)
+
+        compacted = _SEPARATOR.join(kept[i] for i in sorted(kept))
+        tokens = self.counter.count(compacted)
+        if tokens > budget:  # Token counts are not quite additive across section boundaries
+            compacted = self._trim(compacted, budget)
+            tokens = self.counter.count(compacted)
+        return CompactedText(
+            text=compacted,
+            original_tokens=original_tokens,
+            tokens=tokens,
+            kept_sections=[names[i] for i in sorted(kept)],
+            dropped_sections=[name for i, name in enumerate(names) if i not in kept],
+        )
+
+    def _trim(self, text: str, budget: int) -> str:
+        """Longest word-boundary prefix of `text` that fits in `budget` tokens, marked as cut."""
+        words = re.findall(r"\S+\s*", text)
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.counter.count("".join(words[:middle]).rstrip() + _TRIM_MARKER) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        return "".join(words[:low]).rstrip() + _TRIM_MARKER if low else ""
+
+    def record(self, label: str, *parts: CompactedText):
+        """Logs the token savings of one prompt and adds them to the running totals."""
+        original_tokens = sum(part.original_tokens for part in parts)
+        tokens = sum(part.tokens for part in parts)
+        self.stats.calls += 1
+        self.stats.original_tokens += original_tokens
+        self.stats.tokens += tokens
+        dropped = sorted({name for part in parts for name in part.dropped_sections})
+        saved = original_tokens - tokens
+        logger.info(
+            f"{label} prompt: {tokens} of {original_tokens} tokens, saved {saved}"
+            f" ({saved / original_tokens if original_tokens else 0.0:.0%})"
+            + (f", dropped {dropped}" if dropped else "")
+        )
+
+    def report(self) -> str:
+        stats = self.stats
+        return (f"Prompt compaction saved {stats.saved_tokens} of {stats.original_tokens} tokens "
+                f"({stats.savings_rate:.0%}) over {stats.calls} prompts ({self.counter.name} tokenizer)")
@@ -0,0 +1,95 @@
+import asyncio
+import math
+import re
+import threading
+from pathlib import Path
+from typing import Protocol
+
+from ..logger_config import get_logger
+from ..config import PROMPT_TOKENIZER, PROMPT_TOKENIZER_DOWNLOAD, PROMPT_TOKENIZER_PATH
+
+logger = get_logger(__name__)
+
+# Words, numbers and single punctuation marks, roughly how BPE tokenizers split text
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+class TokenCounter(Protocol):
+    name: str
+
+    def count(self, text: str) -> int: ...
+
+
+class TokenizerCounter:
+    """Counts tokens with a Hugging Face `tokenizers` tokenizer."""
+
+    def __init__(self, tokenizer, name: str = "tokenizer"):
+        self.tokenizer = tokenizer
+        self.name = name
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+class ApproximateTokenCounter:
+    """
+    Estimates BPE token counts without a vocabulary: one token per punctuation
+    mark or number, and one per four characters of a word. Used only when no
+    tokenizer can be loaded.
+    """
+
+    name = "approximate"
+
+    def count(self, text: str) -> int:
+        return sum(math.ceil(len(piece) / 4) if piece[0].isalpha() else 1 for piece in _PIECE_RE.findall(text))
+
+
+def load_token_counter(
+    name: str = PROMPT_TOKENIZER,
+    path: str | Path = PROMPT_TOKENIZER_PATH,
+    download: bool = PROMPT_TOKENIZER_DOWNLOAD,
+) -> TokenCounter:
+    """
+    Loads the tokenizer from its local copy, downloading and saving it on first
+    use unless `download` is off. Falls back to an estimate when neither is
+    possible (e.g. offline). The download blocks, so async code loads it with
+    aget_token_counter.
+    """
+    path = Path(path)
+    if not path.exists() and not download:
+        logger.info(f"No local copy of tokenizer {name} and downloads are off, estimating token counts instead")
+        return ApproximateTokenCounter()
+    try:
+        from tokenizers import Tokenizer
+        if path.exists():
+            tokenizer = Tokenizer.from_file(str(path))
+        else:
+            tokenizer = Tokenizer.from_pretrained(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tokenizer.save(str(path))
+        return TokenizerCounter(tokenizer, name)
+    except Exception as e:
+        logger.warning(f"Tokenizer {name} is unavailable ({e}), estimating token counts instead")
+        return ApproximateTokenCounter()
+
+
+_token_counter: TokenCounter | None = None
+_token_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Returns the token counter shared by every prompt in the process."""
+    global _token_counter
+    with _token_counter_lock:
+        if _token_counter is None:
+            _token_counter = load_token_counter()
+        return _token_counter
+
+
+async def aget_token_counter() -> TokenCounter:
+    """Async variant of get_token_counter; a first load runs on a thread so a download never stalls the event loop."""
+    if _token_counter is not None:
+        return _token_counter
+    return await asyncio.to_thread(get_token_counter)
@@ -0,0 +1,17 @@
+"""
+Ranking module - exports the local, LLM-free scoring utilities.
+"""
+
+from .job_prefilter import JobPrefilter, PrefilterRules, PrefilterStats, PrefilterVerdict, extract_skills
+from .resume_ranker import ResumeRanker
+from .vectorizer import HashedBM25Index
+
+__all__ = [
+    "HashedBM25Index",
+    "JobPrefilter",
+    "PrefilterRules",
+    "PrefilterStats",
+    "PrefilterVerdict",
+    "ResumeRanker",
+    "extract_skills",
+]
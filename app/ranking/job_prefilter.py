@@ -0,0 +1,223 @@
+import re
+from pathlib import Path
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .resume_ranker import ResumeRanker
+from ..text_utils import normalize_tokens
+from ..logger_config import get_logger
+from ..config import PREFILTER_MIN_SCORE, PREFILTER_SIMILARITY_WEIGHT
+
+logger = get_logger(__name__)
+
+# Skills recognised in job and resume text; multi-word skills are matched as token n-grams
+SKILL_VOCABULARY = frozenset({
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "ruby", "php", "scala",
+    "kotlin", "swift", "sql", "postgresql", "mysql", "mongodb", "redis", "kafka", "spark", "hadoop", "airflow",
+    "dbt", "snowflake", "aws", "gcp", "google cloud", "azure", "docker", "kubernetes", "terraform", "ansible",
+    "linux", "django", "flask", "fastapi", "react", "angular", "vue", "node.js", "next.js", "graphql", "grpc",
+    "pytorch", "tensorflow", "scikit-learn", "pandas", "numpy", "machine learning", "deep learning", "nlp",
+    "computer vision", "prometheus", "grafana", "elasticsearch", "spring", ".net", "rails", "html", "css",
+})
+SKILL_ALIASES = {
+    "go": "golang", "postgres": "postgresql", "k8s": "kubernetes", "js": "javascript", "ts": "typescript",
+    "node": "node.js", "nodejs": "node.js", "sklearn": "scikit-learn", "ml": "machine learning",
+    "torch": "pytorch", "gke": "kubernetes", "eks": "kubernetes",
+}
+# "go" is an ordinary English word, so only count it next to a programming cue
+_GO_RE = re.compile(r"\bgo\b(?=\s*(?:\(|/|,|and\b|or\b|lang\b|programming|services|microservices))|\bin go\b", re.I)
+
+# Title words mapped to a seniority level; titles without any count as "mid"
+SENIORITY_PATTERNS = (
+    ("intern", re.compile(r"\bintern(ship)?\b", re.I)),
+    ("director", re.compile(r"\b(director|vp|vice president|head of)\b", re.I)),
+    ("manager", re.compile(r"\bmanager\b", re.I)),
+    ("principal", re.compile(r"\b(principal|distinguished)\b", re.I)),
+    ("staff", re.compile(r"\bstaff\b", re.I)),
+    ("lead", re.compile(r"\blead (\w+ )?(engineer|developer|scientist|designer|architect)\b", re.I)),
+    ("senior", re.compile(r"\b(senior|sr\.?)\s", re.I)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|graduate|new grad)\b", re.I)),
+)
+
+_TITLE_MAX_CHARS = 120
+
+
+def extract_skills(text: str, vocabulary: frozenset[str] = SKILL_VOCABULARY) -> set[str]:
+    """Canonical names of the known skills mentioned in a text."""
+    tokens = normalize_tokens(text)
+    grams = set(tokens)
+    grams.update(" ".join(tokens[i:i + 2]) for i in range(len(tokens) - 1))
+    grams.update(" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2))
+    skills = {SKILL_ALIASES.get(gram, gram) for gram in grams if gram != "go"}
+    if _GO_RE.search(text):
+        skills.add("golang")
+    return {skill for skill in skills if skill in vocabulary}
+
+
+def job_title(description: str) -> str:
+    """
+    The posting title, i.e. the first line of a description when it reads as one.
+    Board postings and JSON-LD extractions lead with the title; other scraped text
+    may open with a sentence, in which case there is no title.
+    """
+    first_line = description.strip().split("\n", 1)[0].strip()
+    if len(first_line) > _TITLE_MAX_CHARS or first_line.endswith((".", "!", "?")):
+        return ""
+    return first_line
+
+
+def detect_seniority(title: str) -> str:
+    """Seniority level named in a posting title; "mid" when it names none or there is no title."""
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(title):
+            return level
+    return "mid"
+
+
+def keyword_pattern(keyword: str) -> re.Pattern:
+    """Matches a title keyword as whole words (plurals too), so "intern" never matches "internal"."""
+    return re.compile(rf"(?<!\w){re.escape(keyword.strip())}s?(?!\w)", re.I)
+
+
+class PrefilterRules(BaseModel):
+    """Hard rules from the pre-filter config file; an empty list turns its rule off."""
+
+    title_keywords: list[str] = Field(default_factory=list, description="The title must mention one of these")
+    excluded_title_keywords: list[str] = Field(default_factory=list, description="Reject titles mentioning any")
+    seniority_levels: list[str] = Field(default_factory=list, description="Accepted levels, e.g. ['mid', 'senior']")
+    required_skills: list[str] = Field(default_factory=list, description="Core stack; the job must ask for some of it")
+    min_required_skills: int = 1
+    excluded_keywords: list[str] = Field(default_factory=list, description="Reject jobs mentioning any, anywhere")
+    locations: list[str] = Field(default_factory=list, description="Accepted locations")
+    allow_remote: bool = True
+    skills: list[str] = Field(default_factory=list, description="Extra skills to recognise beyond the built-in list")
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "PrefilterRules":
+        """Loads rules from a JSON file; a missing file means no hard rules."""
+        path = Path(path)
+        if not path.exists():
+            logger.info(f"No pre-filter rules at {path}, only the match score is checked")
+            return cls()
+        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+
+
+class PrefilterVerdict(BaseModel):
+    passed: bool
+    score: float | None = Field(default=None, description="Blend of resume similarity and skill coverage")
+    reason: str = ""
+    rule: str | None = Field(default=None, description="Which check rejected the job, e.g. 'seniority' or 'score'")
+    job_skills: list[str] = Field(default_factory=list)
+
+
+class PrefilterStats(BaseModel):
+    checked: int = 0
+    rejected: int = 0
+    by_rule: dict[str, int] = Field(default_factory=dict)
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.checked if self.checked else 0.0
+
+
+class JobPrefilter:
+    """
+    Local screen run before the LLM fit analysis. Jobs breaking a hard rule
+    (title, seniority, core stack, excluded keywords, location) are rejected
+    outright; the rest get a score blending the best BM25 similarity to the
+    applicant's resumes with the share of the job's skills the resumes cover.
+    Jobs scoring under `min_score` are rejected without a remote call.
+    """
+
+    def __init__(
+        self,
+        rules: PrefilterRules | None = None,
+        resumes: dict[str, str] | None = None,
+        min_score: float = PREFILTER_MIN_SCORE,
+        similarity_weight: float = PREFILTER_SIMILARITY_WEIGHT,
+    ):
+        self.rules = rules or PrefilterRules()
+        self.min_score = min_score
+        self.similarity_weight = similarity_weight
+        self.title_patterns = [keyword_pattern(k) for k in self.rules.title_keywords]
+        self.excluded_title_patterns = {k: keyword_pattern(k) for k in self.rules.excluded_title_keywords}
+        self.vocabulary = SKILL_VOCABULARY | {skill.lower() for skill in self.rules.skills + self.rules.required_skills}
+        resumes = resumes or {}
+        self.ranker = ResumeRanker.from_texts(resumes) if resumes else None
+        self.applicant_skills = set().union(*(extract_skills(text, self.vocabulary) for text in resumes.values()))
+        self.stats = PrefilterStats()
+
+    @classmethod
+    def from_file(cls, path: str | Path, resumes: dict[str, str] | None = None, **kwargs) -> "JobPrefilter":
+        return cls(PrefilterRules.from_file(path), resumes, **kwargs)
+
+    def _check_rules(self, description: str, job_skills: set[str]) -> tuple[str, str] | None:
+        """Returns (rule, reason) for the first hard rule the job breaks, or None."""
+        rules = self.rules
+        title, lowered = job_title(description), description.lower()
+
+        # Only the title counts: the body may mention "internal tools", a "sales team" or the
+        # "head of" the job reports to. A posting without a title cannot break a title rule
+        if title and self.title_patterns and not any(p.search(title) for p in self.title_patterns):
+            return "title", "title matches none of the target titles"
+        excluded = next((k for k, p in self.excluded_title_patterns.items() if p.search(title)), None)
+        if excluded:
+            return "title", f"title mentions '{excluded}'"
+        seniority = detect_seniority(title)
+        if rules.seniority_levels and seniority not in rules.seniority_levels:
+            return "seniority", f"seniority '{seniority}' is not one of {rules.seniority_levels}"
+        if rules.required_skills:
+            core = {SKILL_ALIASES.get(s.lower(), s.lower()) for s in rules.required_skills} & job_skills
+            if len(core) < min(rules.min_required_skills, len(rules.required_skills)):
+                return "required_skills", "the job asks for none of the core stack" if not core \
+                    else f"the job only asks for {sorted(core)} of the core stack"
+        excluded = next((k for k in rules.excluded_keywords if k.lower() in lowered), None)
+        if excluded:
+            return "excluded_keyword", f"the job mentions '{excluded}'"
+        if rules.locations and not any(loc.lower() in lowered for loc in rules.locations):
+            if not (rules.allow_remote and "remote" in lowered):
+                return "location", f"the job is not in {rules.locations}"
+        return None
+
+    def check_many(self, descriptions: list[str]) -> list[PrefilterVerdict]:
+        """Screens a batch of jobs; resume similarity for the whole batch is one matrix product."""
+        similarities = self.ranker.best_scores(descriptions) if self.ranker is not None \
+            else np.zeros(len(descriptions), dtype=np.float32)
+        verdicts = []
+        for description, similarity in zip(descriptions, similarities):
+            job_skills = extract_skills(description, self.vocabulary)
+            verdict = self._verdict(description, job_skills, float(similarity))
+            self.stats.checked += 1
+            if not verdict.passed:
+                self.stats.rejected += 1
+                self.stats.by_rule[verdict.rule] = self.stats.by_rule.get(verdict.rule, 0) + 1
+                logger.info(f"Pre-filter rejected a job: {verdict.reason}")
+            verdicts.append(verdict)
+        return verdicts
+
+    def check(self, description: str) -> PrefilterVerdict:
+        return self.check_many([description])[0]
+
+    def _verdict(self, description: str, job_skills: set[str], similarity: float) -> PrefilterVerdict:
+        skills = sorted(job_skills)
+        broken = self._check_rules(description, job_skills)
+        if broken is not None:
+            return PrefilterVerdict(passed=False, rule=broken[0], reason=broken[1], job_skills=skills)
+        if self.ranker is None:
+            return PrefilterVerdict(passed=True, job_skills=skills)  # Nothing to compare against
+
+        coverage = len(job_skills & self.applicant_skills) / len(job_skills) if job_skills else 1.0
+        score = round(self.similarity_weight * similarity + (1 - self.similarity_weight) * coverage, 4)
+        if score < self.min_score:
+            return PrefilterVerdict(
+                passed=False, score=score, rule="score", job_skills=skills,
+                reason=f"match score {score:.2f} is below {self.min_score:.2f} "
+                       f"(similarity {similarity:.2f}, skill coverage {coverage:.0%})",
+            )
+        return PrefilterVerdict(passed=True, score=score, job_skills=skills)
+
+    def report(self) -> str:
+        stats = self.stats
+        rules = ", ".join(f"{rule}: {count}" for rule, count in sorted(stats.by_rule.items()))
+        return (f"Pre-filter rejected {stats.rejected} of {stats.checked} jobs ({stats.rejection_rate:.0%})"
+                + (f" [{rules}]" if rules else ""))
@@ -0,0 +1,52 @@
+import numpy as np
+
+from .vectorizer import HashedBM25Index
+from ..text_utils import normalize_tokens, split_sections
+
+# Sections worth matching against a job description on their own
+RANKED_SECTIONS = ("summary", "experience", "skills", "projects", "certifications")
+
+
+class ResumeRanker:
+    """
+    Local pre-ranker for resumes. Every resume contributes one row for its full text
+    and one row per relevant section; a resume's score is its best-matching row.
+    """
+
+    def __init__(self, resumes: dict[str, tuple[list[str], dict[str, str]]]):
+        """
+        Args:
+            resumes: Maps resume path to its (normalized tokens, section splits).
+        """
+        self.paths = list(resumes.keys())
+        rows: list[list[str]] = []
+        owners: list[int] = []
+        for owner, (tokens, sections) in enumerate(resumes.values()):
+            rows.append(tokens)
+            owners.append(owner)
+            for name in RANKED_SECTIONS:
+                if sections.get(name):
+                    rows.append(normalize_tokens(sections[name]))
+                    owners.append(owner)
+        self.index = HashedBM25Index(rows)
+        self.owners = np.asarray(owners, dtype=np.int64)
+
+    @classmethod
+    def from_texts(cls, resumes: dict[str, str]) -> "ResumeRanker":
+        return cls({path: (normalize_tokens(text), split_sections(text)) for path, text in resumes.items()})
+
+    def rank(self, job_description: str) -> list[tuple[str, float]]:
+        """Returns (resume path, score) pairs, best first. Ties keep the original resume order."""
+        if not self.paths:
+            return []
+        row_scores = self.index.score(normalize_tokens(job_description))
+        scores = np.full(len(self.paths), -np.inf, dtype=np.float32)
+        np.maximum.at(scores, self.owners, row_scores)
+        order = np.argsort(-scores, kind="stable")
+        return [(self.paths[i], float(scores[i])) for i in order]
+
+    def best_scores(self, job_descriptions: list[str]) -> np.ndarray:
+        """Score of the best-matching resume for each job description, scored as one batch."""
+        if not self.paths:
+            return np.zeros(len(job_descriptions), dtype=np.float32)
+        return self.index.score_many([normalize_tokens(text) for text in job_descriptions]).max(axis=0)
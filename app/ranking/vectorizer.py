@@ -0,0 +1,66 @@
+import zlib
+import numpy as np
+
+from ..text_utils import normalize_tokens
+
+DEFAULT_DIM = 4096
+
+
+def hash_token(token: str, dim: int = DEFAULT_DIM) -> int:
+    """Maps a token to a stable column index (crc32 is stable across processes, unlike hash())."""
+    return zlib.crc32(token.encode("utf-8")) % dim
+
+
+def term_counts(tokens: list[str], dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Returns a float32 vector of raw term counts using the hashing trick."""
+    counts = np.zeros(dim, dtype=np.float32)
+    if tokens:
+        np.add.at(counts, np.fromiter((hash_token(t, dim) for t in tokens), dtype=np.int64), 1.0)
+    return counts
+
+
+class HashedBM25Index:
+    """
+    Compact local retrieval index. Each document is stored as a row of BM25-weighted,
+    L2-normalised term weights in a float32 matrix, so a query is scored against
+    every document with a single matrix-vector product.
+    """
+
+    def __init__(self, documents: list[list[str]], dim: int = DEFAULT_DIM, k1: float = 1.5, b: float = 0.75):
+        self.dim = dim
+        counts = np.stack([term_counts(tokens, dim) for tokens in documents]) if documents \
+            else np.zeros((0, dim), dtype=np.float32)
+        n_docs = max(len(documents), 1)
+        doc_freq = np.count_nonzero(counts, axis=0).astype(np.float32)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        lengths = counts.sum(axis=1, keepdims=True)
+        avg_length = float(lengths.mean()) if len(documents) else 1.0
+        saturation = counts * (k1 + 1) / (counts + k1 * (1 - b + b * lengths / max(avg_length, 1.0)))
+        self.matrix = _l2_normalize(saturation * self.idf)
+
+    @classmethod
+    def from_texts(cls, texts: list[str], **kwargs) -> "HashedBM25Index":
+        return cls([normalize_tokens(text) for text in texts], **kwargs)
+
+    def query_vector(self, tokens: list[str]) -> np.ndarray:
+        counts = term_counts(tokens, self.dim)
+        return _l2_normalize((np.log1p(counts) * self.idf)[None, :])[0]
+
+    def score(self, tokens: list[str]) -> np.ndarray:
+        """Cosine similarity between the query and every indexed document."""
+        if self.matrix.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        return self.matrix @ self.query_vector(tokens)
+
+    def score_many(self, queries: list[list[str]]) -> np.ndarray:
+        """Cosine similarities of a batch of queries, shaped (documents, queries)."""
+        if self.matrix.shape[0] == 0 or not queries:
+            return np.zeros((self.matrix.shape[0], len(queries)), dtype=np.float32)
+        counts = np.stack([term_counts(tokens, self.dim) for tokens in queries])
+        return self.matrix @ _l2_normalize(np.log1p(counts) * self.idf).T
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1.0, norms)).astype(np.float32)
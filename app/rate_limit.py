@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from .config import PROVIDER_REQUESTS_PER_MINUTE
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code. Refills continuously at `rate_per_minute` and
+    allows bursts of up to `capacity` requests. Taking a token never awaits while
+    holding state, so no lock is needed inside a single event loop.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    async def acquire(self) -> float:
+        """Waits for a token and returns how long the caller was throttled, in seconds."""
+        started = time.monotonic()
+        while not self.try_acquire():
+            if self.rate <= 0:
+                raise RuntimeError("Rate limit budget is zero; no requests can be made.")
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            logger.debug(f"Throttled for {waited:.2f}s by rate limit")
+        return waited
+
+
+_buckets: dict[str, AsyncTokenBucket] = {}
+
+
+def get_rate_limiter(provider: str, key: str = "") -> AsyncTokenBucket:
+    """Returns the shared request budget for a provider (and optionally an API key)."""
+    bucket_id = f"{provider}:{key}"
+    if bucket_id not in _buckets:
+        _buckets[bucket_id] = AsyncTokenBucket(PROVIDER_REQUESTS_PER_MINUTE.get(provider, 60.0))
+    return _buckets[bucket_id]
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+from browser_use import BrowserSession
+from pydantic import BaseModel, Field
+
+from .agents import ApplicantProfileAgent, JobApplicationAgent, KnowledgeBaseAgent, ResumeManagerAgent
+from .cache import AnswerStore
+from .session_pool import SessionPool
+from .logger_config import get_logger
+from .config import APPLICATION_WORKERS, DOMAIN_MAX_CONCURRENT, DOMAIN_MIN_INTERVAL_SECONDS
+
+logger = get_logger(__name__)
+
+
+class ApplicationResult(BaseModel):
+    url: str
+    status: str = Field(description="One of 'succeeded', 'failed' or 'skipped'")
+    worker: int = Field(description="Index of the worker that handled the job")
+    duration_seconds: float = 0.0
+    readiness_saved_seconds: float = Field(default=0.0, description="Latency saved by readiness checks over fixed sleeps")
+    error: str | None = None
+
+
+class ApplicationReport(BaseModel):
+    results: list[ApplicationResult] = Field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def status_counts(self) -> dict[str, int]:
+        return dict(Counter(r.status for r in self.results))
+
+    @property
+    def jobs_per_minute(self) -> float:
+        return len(self.results) / self.wall_seconds * 60 if self.wall_seconds > 0 else 0.0
+
+
+class DomainThrottle:
+    """
+    Per-domain politeness: caps concurrent applications on one host and spaces
+    out consecutive starts on it by a minimum interval.
+    """
+
+    def __init__(self, max_concurrent: int = DOMAIN_MAX_CONCURRENT, min_interval: float = DOMAIN_MIN_INTERVAL_SECONDS):
+        self.min_interval = min_interval
+        self._semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max(1, max_concurrent)))
+        self._last_start: dict[str, float] = {}
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        domain = self.domain_of(url)
+        async with self._semaphores[domain]:
+            while (wait := self._last_start.get(domain, float("-inf")) + self.min_interval - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            self._last_start[domain] = time.monotonic()
+            yield
+
+
+AgentFactory = Callable[[BrowserSession], JobApplicationAgent]
+
+
+class ApplicationScheduler:
+    """
+    Applies to a queue of job URLs with N concurrent workers. Each job runs on a
+    browser borrowed from the SessionPool's warm pool, so workers never share a
+    browser, while all workers share the knowledge base and resume manager.
+    """
+
+    def __init__(
+        self,
+        session_pool: SessionPool,
+        knowledge_base: KnowledgeBaseAgent,
+        resume_manager: ResumeManagerAgent,
+        workers: int = APPLICATION_WORKERS,
+        throttle: DomainThrottle | None = None,
+        agent_factory: AgentFactory | None = None,
+        profile_agent: ApplicantProfileAgent | None = None,
+        answer_store: AnswerStore | None = None,
+    ):
+        self.session_pool = session_pool
+        self.knowledge_base = knowledge_base
+        self.resume_manager = resume_manager
+        self.profile_agent = profile_agent
+        self.answer_store = answer_store
+        self.workers = max(1, workers)
+        self.throttle = throttle or DomainThrottle()
+        self.agent_factory = agent_factory or self._default_agent_factory
+
+    def _default_agent_factory(self, browser: BrowserSession) -> JobApplicationAgent:
+        return JobApplicationAgent(browser=browser, knowledge_base=self.knowledge_base,
+                                   resume_manager=self.resume_manager, profile_agent=self.profile_agent,
+                                   answer_store=self.answer_store)
+
+    async def _apply_one(self, worker: int, agent: JobApplicationAgent, url: str) -> ApplicationResult:
+        started = time.monotonic()
+        try:
+            async with self.throttle.slot(url):
+                history = await agent.apply_to_job(url)
+            if history is None:
+                return ApplicationResult(url=url, status="skipped", worker=worker,
+                                         duration_seconds=time.monotonic() - started, error="No suitable resume found.")
+            status = "succeeded" if history.is_successful() else "failed"
+            return ApplicationResult(url=url, status=status, worker=worker, duration_seconds=time.monotonic() - started,
+                                     readiness_saved_seconds=agent.last_readiness_saved_seconds)
+        except Exception as e:
+            logger.error(f"Worker {worker} failed on {url}: {e}")
+            return ApplicationResult(url=url, status="failed", worker=worker,
+                                     duration_seconds=time.monotonic() - started, error=str(e))
+
+    async def _worker(self, worker: int, queue: asyncio.Queue, report: ApplicationReport,
+                      on_result: Callable[[ApplicationResult], Awaitable[None] | None] | None):
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # Each job borrows a healthy browser; the pool recycles it after enough tasks or memory growth
+            try:
+                async with self.session_pool.acquire() as browser:
+                    result = await self._apply_one(worker, self.agent_factory(browser), url)
+            except Exception as e:
+                logger.error(f"Worker {worker} could not get a browser for {url}: {e}")
+                result = ApplicationResult(url=url, status="failed", worker=worker, error=f"No browser available: {e}")
+            report.results.append(result)
+            logger.info(f"[worker {worker}] {result.status}: {url} ({result.duration_seconds:.1f}s)")
+            if on_result is not None:
+                maybe_awaitable = on_result(result)
+                if asyncio.iscoroutine(maybe_awaitable):
+                    await maybe_awaitable
+
+    async def run(self, job_urls: list[str],
+                  on_result: Callable[[ApplicationResult], Awaitable[None] | None] | None = None) -> ApplicationReport:
+        """
+        Applies to every URL and returns a report with per-job status and throughput.
+        `on_result` is called as each job finishes.
+        """
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for url in job_urls:
+            queue.put_nowait(url)
+
+        report = ApplicationReport()
+        started = time.monotonic()
+        n_workers = min(self.workers, len(job_urls))
+        logger.info(f"Applying to {len(job_urls)} jobs with {n_workers} workers...")
+        outcomes = await asyncio.gather(
+            *(self._worker(i, queue, report, on_result) for i in range(n_workers)),
+            return_exceptions=True,
+        )
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Worker {i} crashed: {outcome}")
+
+        # Anything left in the queue was never attempted because every worker crashed
+        while not queue.empty():
+            report.results.append(ApplicationResult(url=queue.get_nowait(), status="failed", worker=-1,
+                                                    error="No worker available."))
+
+        report.wall_seconds = time.monotonic() - started
+        metrics = self.session_pool.metrics
+        logger.info(f"Browser pool: {metrics.acquisitions} acquisitions, avg wait {metrics.avg_wait_seconds:.2f}s, "
+                    f"max wait {metrics.max_wait_seconds:.2f}s, {metrics.recycled} recycled")
+        if self.answer_store is not None:
+            stats = self.answer_store.stats
+            logger.info(f"Learned answers: {stats.hit_rate:.0%} hit rate over {stats.lookups} lookups "
+                        f"({stats.exact_hits} exact, {stats.fuzzy_hits} fuzzy, {stats.vector_hits} vector)")
+        logger.info(
+            f"Applied to {len(report.results)} jobs in {report.wall_seconds:.1f}s: "
+            f"{report.status_counts} ({report.jobs_per_minute:.2f} jobs/min)"
+        )
+        return report
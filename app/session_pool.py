@@ -1,12 +1,151 @@
-from browser_use import Browser
+import asyncio
+import shutil
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+import psutil
+from browser_use import Browser, BrowserSession
+from pydantic import BaseModel
+
+from .telemetry import get_tracer
+from .logger_config import get_logger
+from .config import (
+    BROWSER_EXECUTABLE_PATH, BROWSER_PROFILE_DIR, BROWSER_USER_DATA_DIR,
+    BROWSER_POOL_MIN_SIZE, BROWSER_POOL_MAX_SIZE, BROWSER_POOL_MAX_TASKS, BROWSER_POOL_MAX_AGE_MINUTES,
+    BROWSER_POOL_MAX_RSS_MB, BROWSER_POOL_PROBE_TIMEOUT, BROWSER_POOL_USER_DATA_DIR,
+)
+
+logger = get_logger(__name__)
+
+
+class PoolMetrics(BaseModel):
+    acquisitions: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    launches: int = 0
+    recycled: int = 0
+    failed_probes: int = 0
+    rss_evictions: int = 0
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+
+
+class PooledBrowser:
+    def __init__(self, browser: Browser, slot: int):
+        self.browser = browser
+        self.slot = slot
+        self.created_at = time.monotonic()
+        self.tasks = 0
+
+    @property
+    def age_minutes(self) -> float:
+        return (time.monotonic() - self.created_at) / 60
+
+
+def browser_rss_mb(browser: BrowserSession) -> float | None:
+    """Resident memory of a local browser process and all its children, in MB."""
+    watchdog = getattr(browser, "_local_browser_watchdog", None)
+    pid = getattr(watchdog, "browser_pid", None)
+    if pid is None:
+        return None
+    try:
+        process = psutil.Process(pid)
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+# Caches and Chromium's profile lock files are not worth copying into a pool slot
+_PROFILE_SEED_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "Cache", "Code Cache", "GPUCache", "DawnCache", "GrShaderCache", "ShaderCache", "Crashpad",
+)
+_SEEDED_MARKER = ".pool-seeded"
+
+
+def seed_pool_profile(slot: int, source_dir: str | Path = BROWSER_USER_DATA_DIR,
+                      pool_dir: str | Path = BROWSER_POOL_USER_DATA_DIR) -> Path:
+    """
+    Gives a pool slot its own copy of the configured browser profile, so pooled
+    browsers carry the user's logins and cookies. A slot is seeded once and then
+    reused across launches and recycles; delete its directory to seed it again.
+    Files the running tenant browser keeps locked are skipped with a warning.
+    """
+    source, target = Path(source_dir), Path(pool_dir) / f"slot-{slot}"
+    marker = target / _SEEDED_MARKER
+    if marker.exists():
+        return target
+    # Anything without the marker is a copy that was interrupted, so it starts over
+    shutil.rmtree(target, ignore_errors=True)
+    if not source.is_dir():
+        logger.warning(f"Browser profile {source} not found, pool slot {slot} starts with an empty profile")
+        target.mkdir(parents=True, exist_ok=True)
+        return target
+    try:
+        shutil.copytree(source, target, ignore=_PROFILE_SEED_IGNORE)
+    except shutil.Error as e:
+        logger.warning(f"Pool slot {slot} profile copy skipped {len(e.args[0])} locked or unreadable file(s)")
+    marker.touch()
+    return target
+
+
+async def launch_pooled_browser(slot: int) -> Browser:
+    """
+    Starts a pool browser on its slot's copy of the configured profile. Chromium
+    locks a profile per process, so slots cannot share the original directory.
+    """
+    user_data_dir = await asyncio.to_thread(seed_pool_profile, slot)
+    b = Browser(
+        executable_path=BROWSER_EXECUTABLE_PATH,
+        user_data_dir=str(user_data_dir),
+        profile_directory=BROWSER_PROFILE_DIR,
+        args=['--disable-extensions'],
+        keep_alive=True
+    )
+    await b.start()
+    return b
 
-from .config import BROWSER_EXECUTABLE_PATH, BROWSER_PROFILE_DIR, BROWSER_USER_DATA_DIR
 
 class SessionPool:
-    def __init__(self):
+    def __init__(
+        self,
+        min_size: int = BROWSER_POOL_MIN_SIZE,
+        max_size: int = BROWSER_POOL_MAX_SIZE,
+        max_tasks: int = BROWSER_POOL_MAX_TASKS,
+        max_age_minutes: float = BROWSER_POOL_MAX_AGE_MINUTES,
+        max_rss_mb: float = BROWSER_POOL_MAX_RSS_MB,
+        probe_timeout: float = BROWSER_POOL_PROBE_TIMEOUT,
+        launcher: Callable[[int], Awaitable[Browser]] = launch_pooled_browser,
+    ):
         self._by_tenant: dict[str, Browser] = {}
 
+        # Warm pool of interchangeable browsers handed out by acquire()
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.max_tasks = max_tasks
+        self.max_age_minutes = max_age_minutes
+        self.max_rss_mb = max_rss_mb
+        self.probe_timeout = probe_timeout
+        self._launcher = launcher
+        self._idle: list[PooledBrowser] = []
+        self._free_slots: list[int] = list(range(self.max_size))
+        self._size = 0
+        self._available: asyncio.Condition | None = None
+        self._background: set[asyncio.Task] = set()
+        self.metrics = PoolMetrics()
+
     async def get_or_create(self, tenant_id: str = "default") -> Browser:
+        if tenant_id in self._by_tenant and not await self.is_alive(self._by_tenant[tenant_id]):
+            logger.warning(f"Browser for tenant '{tenant_id}' is unresponsive, restarting it")
+            await self.close(tenant_id)
         if tenant_id not in self._by_tenant:
             b = Browser(
                 executable_path=BROWSER_EXECUTABLE_PATH,
@@ -15,10 +154,120 @@ class SessionPool:
                 args=['--disable-extensions'],
                 keep_alive=True
             )
-            await b.start()
+            with get_tracer().span("browser.start", kind="tenant"):
+                await b.start()
             self._by_tenant[tenant_id] = b
         return self._by_tenant[tenant_id]
 
+    async def is_alive(self, browser: BrowserSession) -> bool:
+        """Liveness probe: the browser must answer a trivial CDP command within the probe timeout."""
+        try:
+            await asyncio.wait_for(browser.cdp_client.send.Browser.getVersion(), timeout=self.probe_timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Browser liveness probe failed: {e}")
+            return False
+
+    def _condition(self) -> asyncio.Condition:
+        if self._available is None:
+            self._available = asyncio.Condition()
+        return self._available
+
+    def _reserve_slot(self) -> int:
+        # Reserved synchronously so concurrent acquirers can never exceed max_size
+        self._size += 1
+        return self._free_slots.pop(0)
+
+    async def _launch(self, slot: int) -> PooledBrowser:
+        try:
+            with get_tracer().span("browser.start", kind="pool", slot=slot):
+                browser = await self._launcher(slot)
+        except Exception:
+            self._size -= 1
+            self._free_slots.append(slot)
+            raise
+        self.metrics.launches += 1
+        return PooledBrowser(browser, slot)
+
+    async def _discard(self, pooled: PooledBrowser, reason: str):
+        logger.info(f"Recycling pooled browser slot {pooled.slot} ({reason})")
+        try:
+            await pooled.browser.kill()
+        except Exception as e:
+            logger.debug(f"Error killing pooled browser: {e}")
+        self._size -= 1
+        self._free_slots.append(pooled.slot)
+        self.metrics.recycled += 1
+
+    def _recycle_reason(self, pooled: PooledBrowser) -> str | None:
+        if self.max_tasks and pooled.tasks >= self.max_tasks:
+            return f"served {pooled.tasks} tasks"
+        if self.max_age_minutes and pooled.age_minutes >= self.max_age_minutes:
+            return f"older than {self.max_age_minutes} minutes"
+        if self.max_rss_mb:
+            rss = browser_rss_mb(pooled.browser)
+            if rss is not None and rss > self.max_rss_mb:
+                self.metrics.rss_evictions += 1
+                return f"RSS {rss:.0f}MB over {self.max_rss_mb:.0f}MB"
+        return None
+
+    async def prewarm(self):
+        """Launches browsers until the pool holds at least min_size of them."""
+        launches = [self._launch(self._reserve_slot()) for _ in range(max(0, self.min_size - self._size))]
+        for result in await asyncio.gather(*launches, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to prewarm browser: {result}")
+            else:
+                self._idle.append(result)
+        logger.info(f"Browser pool warm with {len(self._idle)} idle browser(s)")
+
+    async def _checkout(self) -> PooledBrowser:
+        condition = self._condition()
+        while True:
+            async with condition:
+                while not self._idle and self._size >= self.max_size:
+                    await condition.wait()
+                pooled = self._idle.pop() if self._idle else None
+                slot = self._reserve_slot() if pooled is None else None
+            if pooled is None:
+                try:
+                    return await self._launch(slot)
+                finally:
+                    async with condition:
+                        condition.notify()
+            if await self.is_alive(pooled.browser):
+                return pooled
+            self.metrics.failed_probes += 1
+            await self._discard(pooled, "failed liveness probe")
+
+    async def _checkin(self, pooled: PooledBrowser):
+        pooled.tasks += 1
+        reason = self._recycle_reason(pooled)
+        if reason is not None:
+            await self._discard(pooled, reason)
+            if self._size < self.min_size:
+                task = asyncio.create_task(self.prewarm())
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+        else:
+            self._idle.append(pooled)
+        async with self._condition():
+            self._condition().notify()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Browser]:
+        """Borrows a healthy browser from the warm pool for one task and returns it afterwards."""
+        started = time.monotonic()
+        pooled = await self._checkout()
+        waited = time.monotonic() - started
+        self.metrics.acquisitions += 1
+        self.metrics.total_wait_seconds += waited
+        self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, waited)
+        try:
+            yield pooled.browser
+        finally:
+            await self._checkin(pooled)
+
     async def close(self, tenant_id: str):
         b = self._by_tenant.pop(tenant_id, None)
         if b:
@@ -27,4 +276,11 @@ class SessionPool:
     async def close_all(self):
         for b in list(self._by_tenant.values()):
             await b.kill()
-        self._by_tenant.clear()
\ No newline at end of file
+        self._by_tenant.clear()
+        for task in list(self._background):
+            task.cancel()
+        while self._idle:
+            pooled = self._idle.pop()
+            await pooled.browser.kill()
+            self._size -= 1
+            self._free_slots.append(pooled.slot)
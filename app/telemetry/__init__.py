@@ -0,0 +1,27 @@
+"""
+Telemetry module - exports the span tracer, its JSONL and OpenTelemetry exporters, and the per-stage latency report.
+"""
+
+from .report import StageStats, format_report, load_spans, summarize, trace_files
+from .tracer import (
+    JsonlSpanExporter, OpenTelemetryExporter, Span, SpanExporter, Tracer,
+    browser_step_hooks, configure_tracing, current_span, get_tracer, set_tracer,
+)
+
+__all__ = [
+    "JsonlSpanExporter",
+    "OpenTelemetryExporter",
+    "Span",
+    "SpanExporter",
+    "StageStats",
+    "Tracer",
+    "browser_step_hooks",
+    "configure_tracing",
+    "current_span",
+    "format_report",
+    "get_tracer",
+    "load_spans",
+    "set_tracer",
+    "summarize",
+    "trace_files",
+]
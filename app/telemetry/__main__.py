@@ -0,0 +1,29 @@
+"""
+Prints p50/p95 latency per stage across recorded runs:
+
+    python -m app.telemetry                 # every run in TRACE_DIR
+    python -m app.telemetry --runs 5        # the last five runs
+    python -m app.telemetry --stage llm.    # LLM calls only
+    python -m app.telemetry run.jsonl ...   # specific trace files
+"""
+import argparse
+
+from .report import format_report, load_spans, summarize, trace_files
+from ..config import TRACE_DIR
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m app.telemetry", description="Per-stage latency report.")
+    parser.add_argument("files", nargs="*", help="Trace files to read instead of the trace directory")
+    parser.add_argument("--trace-dir", default=TRACE_DIR, help=f"Directory of run traces (default: {TRACE_DIR})")
+    parser.add_argument("--runs", type=int, default=None, help="Only the last N runs")
+    parser.add_argument("--stage", default="", help="Only stages starting with this prefix")
+    args = parser.parse_args(argv)
+
+    files = args.files or trace_files(args.trace_dir, args.runs)
+    print(f"{len(files)} run(s)")
+    print(format_report(summarize(load_spans(files), args.stage)))
+
+
+if __name__ == "__main__":
+    main()
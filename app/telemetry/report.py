@@ -0,0 +1,94 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+from pydantic import BaseModel, Field, ValidationError
+
+from .tracer import Span
+from ..logger_config import get_logger
+from ..config import TRACE_DIR
+
+logger = get_logger(__name__)
+
+# Span attributes added up per stage in the report
+SUMMED_ATTRIBUTES = ("prompt_tokens", "completion_tokens", "cost_usd", "retries")
+
+
+class StageStats(BaseModel):
+    stage: str
+    count: int
+    runs: int = Field(description="How many runs the stage appeared in")
+    errors: int = 0
+    p50_ms: float
+    p95_ms: float
+    total_ms: float
+    totals: dict[str, float] = Field(default_factory=dict, description="Summed tokens, costs and retries")
+
+
+def trace_files(trace_dir: str | Path = TRACE_DIR, last_runs: int | None = None) -> list[Path]:
+    """The run traces in a directory, oldest first; run ids start with their start time."""
+    files = sorted(Path(trace_dir).glob("*.jsonl"))
+    return files[-last_runs:] if last_runs else files
+
+
+def load_spans(paths: Iterable[str | Path]) -> list[Span]:
+    """Reads spans from JSONL traces, skipping lines cut short by a crash."""
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    spans.append(Span.model_validate_json(line))
+                except (ValidationError, json.JSONDecodeError):
+                    logger.debug(f"Skipping malformed span on line {number} of {path}")
+    return spans
+
+
+def summarize(spans: Iterable[Span], stage_prefix: str = "") -> list[StageStats]:
+    """Aggregates spans per stage, slowest stage (by total time) first."""
+    by_stage: dict[str, list[Span]] = defaultdict(list)
+    for span in spans:
+        if span.name.startswith(stage_prefix):
+            by_stage[span.name].append(span)
+
+    stats = []
+    for stage, stage_spans in by_stage.items():
+        durations = np.array([span.duration_ms for span in stage_spans], dtype=np.float64)
+        p50, p95 = np.percentile(durations, [50, 95])
+        totals: dict[str, float] = {}
+        for key in SUMMED_ATTRIBUTES:
+            values = [span.attributes.get(key) for span in stage_spans]
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            if numbers:
+                totals[key] = float(sum(numbers))
+        stats.append(StageStats(
+            stage=stage,
+            count=len(stage_spans),
+            runs=len({span.trace_id for span in stage_spans}),
+            errors=sum(span.status == "error" for span in stage_spans),
+            p50_ms=float(p50),
+            p95_ms=float(p95),
+            total_ms=float(durations.sum()),
+            totals=totals,
+        ))
+    return sorted(stats, key=lambda s: -s.total_ms)
+
+
+def format_report(stats: list[StageStats]) -> str:
+    """Renders stage statistics as a plain-text table."""
+    if not stats:
+        return "No spans recorded."
+    header = f"{'stage':<22}{'count':>7}{'runs':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}" \
+             f"{'tokens':>10}{'cost $':>9}"
+    lines = [header, "-" * len(header)]
+    for s in stats:
+        tokens = s.totals.get("prompt_tokens", 0) + s.totals.get("completion_tokens", 0)
+        cost = s.totals.get("cost_usd")
+        lines.append(
+            f"{s.stage:<22}{s.count:>7}{s.runs:>6}{s.errors:>8}{s.p50_ms:>10.1f}{s.p95_ms:>10.1f}"
+            f"{s.total_ms / 1000:>10.1f}{int(tokens) if tokens else '-':>10}{f'{cost:.4f}' if cost else '-':>9}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,241 @@
+import asyncio
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Protocol
+from pydantic import BaseModel, Field
+
+from ..logger_config import get_logger
+from ..config import TELEMETRY_ENABLED, TELEMETRY_OTEL_ENABLED, TRACE_DIR
+
+logger = get_logger(__name__)
+
+AttributeValue = str | int | float | bool | None
+
+
+class Span(BaseModel):
+    """One timed stage of a run, such as an LLM call or a browser step."""
+
+    trace_id: str = Field(description="The run the span belongs to")
+    span_id: str
+    parent_id: str | None = None
+    name: str = Field(description="The stage, e.g. 'llm.call' or 'browser.step'")
+    start: float = Field(description="Unix time the stage started at")
+    duration_ms: float = 0.0
+    status: str = "ok"  # "ok", "error" or "cancelled"
+    error: str | None = None
+    attributes: dict[str, AttributeValue] = Field(default_factory=dict, description="Counts, tokens, costs and labels")
+
+    def set(self, **attributes: AttributeValue):
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1):
+        """Adds to a counter attribute, starting from zero."""
+        self.attributes[key] = (self.attributes.get(key) or 0) + amount
+
+
+class SpanExporter(Protocol):
+    def on_start(self, span: Span): ...
+
+    def export(self, span: Span): ...
+
+    def close(self): ...
+
+
+class JsonlSpanExporter:
+    """Appends every finished span to a JSONL file, one line per span."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()  # Knowledge base queries finish on worker threads
+
+    def on_start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        line = span.model_dump_json() + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetryExporter:
+    """
+    Mirrors spans to OpenTelemetry through its API, so they reach whatever SDK
+    and exporter the process is configured with (e.g. by `opentelemetry-instrument`).
+    Without an SDK installed the API is a no-op.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = trace.get_tracer("auto_job_application")
+        self._live: dict[str, Any] = {}
+
+    def on_start(self, span: Span):
+        parent = self._live.get(span.parent_id) if span.parent_id else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        self._live[span.span_id] = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start * 1e9),
+        )
+
+    def export(self, span: Span):
+        otel_span = self._live.pop(span.span_id, None)
+        if otel_span is None:  # Recorded after the fact, e.g. a browser step
+            self.on_start(span)
+            otel_span = self._live.pop(span.span_id)
+        otel_span.set_attributes({key: value for key, value in span.attributes.items() if value is not None})
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.start + span.duration_ms / 1000) * 1e9))
+
+    def close(self):
+        pass
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    """The innermost span open in this task, if any."""
+    return _current_span.get()
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class Tracer:
+    """
+    Times the stages of a run as nested spans and hands each finished span to
+    the exporters. Spans opened inside another span, in the same task or in a
+    task it started, become its children. With no exporters, spans are timed
+    and dropped.
+    """
+
+    def __init__(self, exporters: list[SpanExporter] | None = None, run_id: str | None = None):
+        self.exporters = exporters or []
+        self.run_id = run_id or new_run_id()
+
+    def _new_span(self, name: str, start: float, attributes: dict[str, AttributeValue]) -> Span:
+        parent = _current_span.get()
+        return Span(
+            trace_id=self.run_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent is not None else None,
+            name=name,
+            start=start,
+            attributes=attributes,
+        )
+
+    def _export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.debug(f"Could not export span {span.name}: {e}")
+
+    @contextmanager
+    def span(self, name: str, **attributes: AttributeValue) -> Iterator[Span]:
+        """Times the enclosed block; errors are recorded on the span and re-raised."""
+        span = self._new_span(name, time.time(), attributes)
+        for exporter in self.exporters:
+            try:
+                exporter.on_start(span)
+            except Exception as e:
+                logger.debug(f"Could not start span {name}: {e}")
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                pass  # Closed from another context, e.g. an async generator resumed by a new task
+            self._export(span)
+
+    def record(self, name: str, start: float, duration_ms: float, **attributes: AttributeValue) -> Span:
+        """Records a stage timed elsewhere, such as by agent hooks."""
+        span = self._new_span(name, start, attributes)
+        span.duration_ms = duration_ms
+        self._export(span)
+        return span
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+AgentHook = Callable[[Any], Awaitable[None]]
+
+
+def browser_step_hooks(task: str, on_step_end: AgentHook | None = None) -> tuple[AgentHook, AgentHook]:
+    """
+    Returns (on_step_start, on_step_end) hooks for a browser-use agent run that
+    record each step as a 'browser.step' span. An existing on_step_end hook is
+    run after the step is recorded.
+    """
+    started: list[float] = []
+
+    async def step_start(agent):
+        started[:] = [time.time(), time.perf_counter()]
+
+    async def step_end(agent):
+        if started:
+            state = getattr(agent, "state", None)
+            get_tracer().record(
+                "browser.step", started[0], (time.perf_counter() - started[1]) * 1000,
+                task=task, step=getattr(state, "n_steps", None),
+            )
+        if on_step_end is not None:
+            await on_step_end(agent)
+
+    return step_start, step_end
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer; it exports nothing until tracing is configured."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def configure_tracing(
+    trace_dir: str | Path = TRACE_DIR, enabled: bool = TELEMETRY_ENABLED, otel: bool = TELEMETRY_OTEL_ENABLED,
+) -> Tracer:
+    """Starts a run: its spans go to `<trace_dir>/<run id>.jsonl`, and to OpenTelemetry when enabled."""
+    tracer = Tracer()
+    if enabled:
+        tracer.exporters.append(JsonlSpanExporter(Path(trace_dir) / f"{tracer.run_id}.jsonl"))
+        logger.info(f"Tracing run {tracer.run_id} to {trace_dir}")
+    if otel:
+        try:
+            tracer.exporters.append(OpenTelemetryExporter())
+        except ImportError:
+            logger.warning("TELEMETRY_OTEL_ENABLED is set but opentelemetry-api is not installed")
+    return set_tracer(tracer)
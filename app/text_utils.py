@@ -0,0 +1,57 @@
+import re
+
+# Common resume and job posting headings, mapped to a canonical section name
+SECTION_ALIASES: dict[str, str] = {
+    "summary": "summary",
+    "profile": "summary",
+    "about": "summary",
+    "objective": "summary",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "education": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "projects": "projects",
+    "certifications": "certifications",
+    "publications": "publications",
+    "awards": "awards",
+    "responsibilities": "responsibilities",
+    "what you'll do": "responsibilities",
+    "requirements": "requirements",
+    "qualifications": "requirements",
+    "minimum qualifications": "requirements",
+    "preferred qualifications": "preferred",
+    "nice to have": "preferred",
+    "benefits": "benefits",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+_HEADING_RE = re.compile(r"^\s*([A-Za-z][A-Za-z '&/]{1,40}?)\s*:?\s*$")
+
+
+def normalize_tokens(text: str) -> list[str]:
+    """Lowercases text and splits it into word tokens, keeping tech names like 'c++', 'c#' and 'node.js' intact."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def split_sections(text: str) -> dict[str, str]:
+    """
+    Splits resume or job posting text into canonical sections by detecting heading lines.
+    Text before the first recognised heading is returned under 'header'.
+    """
+    sections: dict[str, list[str]] = {}
+    current = "header"
+    for line in text.splitlines():
+        match = _HEADING_RE.match(line)
+        if match:
+            heading = SECTION_ALIASES.get(match.group(1).strip().lower())
+            if heading:
+                current = heading
+                continue
+        sections.setdefault(current, []).append(line)
+    joined = {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    return {name: body for name, body in joined.items() if body}
@@ -1,44 +1,79 @@
 import asyncio
+from pathlib import Path
 
-from app.agents import JobSearchAgent, JobApplicationAgent, KnowledgeBaseAgent, ResumeManagerAgent
+from app.agents import ApplicantProfileAgent, JobSearchAgent, KnowledgeBaseAgent, ResumeManagerAgent
+from app.cache import AnswerStore
+from app.config import (
+    ATS_BOARDS, CACHE_DIR, JOB_STORE_PATH, JOB_SEARCH_QUERY, JOB_SEARCH_LIMIT, JOB_URLS,
+    PREFILTER_ENABLED, PREFILTER_RULES_PATH,
+)
+from app.connectors import BoardSync
+from app.job_pipeline import JobPipeline
+from app.jobs import JobStore
 from app.logger_config import setup_logger
+from app.prompting import aget_token_counter
+from app.ranking import JobPrefilter
+from app.scheduler import ApplicationScheduler
 from app.session_pool import SessionPool
+from app.telemetry import configure_tracing
 
 logger = setup_logger()
 
 
 async def main():
+    tracer = configure_tracing()  # Per-stage spans of this run; `task trace-report` summarizes them
+    session_pool = SessionPool()
+    answer_store = search_agent = job_store = None
     try:
-        session_pool = SessionPool()
+        # The prompt tokenizer may need a download; load it off the event loop before any prompt is built
+        await aget_token_counter()
+
+        # Pooled application browsers copy the user's profile, so they start before the main browser locks it
+        await session_pool.prewarm()
         browser = await session_pool.get_or_create("main")
 
         knowledge_base = KnowledgeBaseAgent()
         knowledge_base.load_from_directory()
 
-        resume_manager = ResumeManagerAgent()
-        resume_manager.load_resumes()
+        resume_manager = ResumeManagerAgent()  # Resume text is extracted once per PDF and cached on disk
+        profile_agent = ApplicantProfileAgent(knowledge_base)  # Profile snapshot is built once per knowledge base version
+        answer_store = AnswerStore(Path(CACHE_DIR) / "answers.db", embeddings=knowledge_base.embeddings)  # Answers learned from past forms
 
-        # Initialize both agents
-        search_agent = JobSearchAgent(browser=browser, knowledge_base=knowledge_base)
-        application_agent = JobApplicationAgent(browser=browser, knowledge_base=knowledge_base, resume_manager=resume_manager)
+        # Obvious mismatches are screened out locally against the rules file and the resumes. Building the
+        # pre-filter loads every resume now, parsing only the PDFs that are new or changed since the last run
+        prefilter = JobPrefilter.from_file(PREFILTER_RULES_PATH, resume_manager.resumes) if PREFILTER_ENABLED else None
 
-        # Example 1: Search for jobs and get filtered results
-        # job_results = await search_agent.search_and_filter_jobs("Python Developer", limit=5)
-        # logger.info(f"Found {len(job_results)} fitting jobs:")
-        # for job in job_results:
-        #     logger.info(f"  - {job['url']}: {job['reasoning']}")
+        # Initialize the search agent and the application scheduler (one pooled browser per worker)
+        search_agent = JobSearchAgent(browser=browser, knowledge_base=knowledge_base, prefilter=prefilter)
+        scheduler = ApplicationScheduler(session_pool, knowledge_base=knowledge_base, resume_manager=resume_manager,
+                                         profile_agent=profile_agent, answer_store=answer_store)
 
-        # Example 2: Apply to a specific job URL
-        job_url = "https://job-boards.greenhouse.io/bugcrowd/jobs/7507933?gh_jid=7507933&gh_src=my.greenhouse.search"  # Provide target job URL
-        logger.info(f"Starting job application on: {job_url}")
+        # Jobs found by the search query and any URLs given directly go through the persistent
+        # pipeline: a rerun after a crash skips the searching, scoring and applying already done
+        job_store = JobStore(JOB_STORE_PATH)
+        # Configured ATS boards are listed over the search agent's pooled HTTP client, no browser needed
+        board_sync = BoardSync(job_store, ATS_BOARDS, http=search_agent.page_fetcher.http) if ATS_BOARDS else None
+        pipeline = JobPipeline(job_store, search_agent, scheduler, board_sync=board_sync)
+        logger.info(f"Running job pipeline for query '{JOB_SEARCH_QUERY}', {len(ATS_BOARDS)} ATS board(s) "
+                    f"and {len(JOB_URLS)} given URL(s)")
 
-        await asyncio.sleep(2)  # Add a delay to allow browser initialization
-        history = await application_agent.apply_to_job(job_url)
-        return history
+        with tracer.span("pipeline.run", boards=len(ATS_BOARDS), urls=len(JOB_URLS)):
+            report = await pipeline.run(query=JOB_SEARCH_QUERY or None, limit=JOB_SEARCH_LIMIT, urls=JOB_URLS)
+        return report
     except Exception as e:
         logger.error(f"Error occurred: {e}")
         raise e
+    finally:
+        # Pooled browsers are kept alive between tasks, so they would outlive the run without this
+        if search_agent is not None:
+            await search_agent.aclose()
+        await session_pool.close_all()
+        if job_store is not None:
+            job_store.close()
+        if answer_store is not None:
+            answer_store.close()
+        tracer.close()
 
 
 if __name__ == "__main__":
-    history = asyncio.run(main())
+    report = asyncio.run(main())
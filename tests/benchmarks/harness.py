@@ -0,0 +1,117 @@
+"""
+Timing and baseline comparison for the offline benchmarks.
+
+Each benchmark is timed over a few runs after a warm-up, and its median is
+compared with the stored baseline for the same benchmark and corpus size.
+Timings vary between machines, so a result only counts as a regression when
+its median is both `BENCHMARK_TOLERANCE` (relative) and `BENCHMARK_NOISE_FLOOR_MS`
+(absolute) slower than the baseline. Set `BENCHMARK_UPDATE_BASELINES=1` to
+store the current results as the new baselines instead.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "0.5"))
+NOISE_FLOOR_MS = float(os.getenv("BENCHMARK_NOISE_FLOOR_MS", "25"))
+UPDATE_BASELINES = os.getenv("BENCHMARK_UPDATE_BASELINES", "").lower() in ("1", "true", "yes")
+
+
+class BenchmarkResult(BaseModel):
+    name: str
+    size: int = Field(description="Corpus size the benchmark ran at, e.g. the number of resumes")
+    runs: int
+    items: int = Field(description="Units of work per run, e.g. jobs screened or questions answered")
+    p50_ms: float
+    p95_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    @property
+    def throughput(self) -> float:
+        """Items per second at the median run time."""
+        return self.items / (self.p50_ms / 1000) if self.p50_ms else 0.0
+
+
+async def measure(
+    name: str,
+    size: int,
+    run: Callable[[Any], Awaitable[Any]],
+    setup: Callable[[], Awaitable[Any]] | None = None,
+    teardown: Callable[[Any], Awaitable[Any]] | None = None,
+    items: int = 1,
+    runs: int = 5,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """
+    Times `run` over `runs` runs after `warmup` untimed ones. Each run gets a
+    fresh state from `setup`, and `teardown` cleans it up; neither is timed.
+    """
+    durations = []
+    for i in range(warmup + runs):
+        state = await setup() if setup is not None else None
+        started = time.perf_counter()
+        try:
+            await run(state)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if teardown is not None:
+                await teardown(state)
+        if i >= warmup:
+            durations.append(elapsed)
+    p50, p95 = np.percentile(durations, [50, 95])
+    return BenchmarkResult(name=name, size=size, runs=runs, items=items, p50_ms=float(p50), p95_ms=float(p95))
+
+
+class Baselines:
+    """Stored benchmark results, keyed by benchmark and corpus size."""
+
+    def __init__(self, path: str | Path = BASELINES_PATH):
+        self.path = Path(path)
+        self.results: dict[str, dict[str, float]] = (
+            json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+        )
+
+    def regression(self, result: BenchmarkResult, tolerance: float = TOLERANCE,
+                   noise_floor_ms: float = NOISE_FLOOR_MS) -> str | None:
+        """Describes how `result` regressed against its baseline, or None when it did not (or has none)."""
+        baseline = self.results.get(result.key)
+        if baseline is None:
+            return None
+        slower_ms = result.p50_ms - baseline["p50_ms"]
+        if slower_ms > noise_floor_ms and result.p50_ms > baseline["p50_ms"] * (1 + tolerance):
+            return (f"{result.key} p50 is {result.p50_ms:.1f} ms against a baseline of {baseline['p50_ms']:.1f} ms "
+                    f"({slower_ms / baseline['p50_ms']:+.0%})")
+        return None
+
+    def update(self, result: BenchmarkResult):
+        self.results[result.key] = {
+            "p50_ms": round(result.p50_ms, 1),
+            "p95_ms": round(result.p95_ms, 1),
+            "throughput": round(result.throughput, 2),
+        }
+
+    def save(self):
+        self.path.write_text(json.dumps(dict(sorted(self.results.items())), indent=2) + "\n", encoding="utf-8")
+
+
+def format_results(results: list[BenchmarkResult], baselines: Baselines) -> str:
+    """Renders results next to their baselines as a plain-text table."""
+    header = f"{'benchmark':<32}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>10}{'baseline':>10}{'change':>9}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        baseline = baselines.results.get(result.key)
+        change = f"{result.p50_ms / baseline['p50_ms'] - 1:+.0%}" if baseline else "-"
+        lines.append(
+            f"{result.key:<32}{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}{result.throughput:>10.1f}"
+            f"{baseline['p50_ms'] if baseline else '-':>10}{change:>9}"
+        )
+    return "\n".join(lines)
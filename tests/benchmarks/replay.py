@@ -0,0 +1,379 @@
+"""
+Offline stand-ins for the services a run talks to, served through the test stub
+server so the code under test goes through its real HTTP clients:
+
+- an OpenAI-compatible chat endpoint answering fit, batch fit, resume ranking
+  and profile prompts with canned verdicts,
+- a Cohere-compatible embed endpoint returning deterministic feature-hashed
+  vectors, so similar texts get similar vectors,
+- saved ATS job pages and application forms,
+
+plus in-process replays of what cannot go over HTTP here: the mem0 memory,
+browser-use agents and the browser's CDP session.
+"""
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import numpy as np
+
+from conftest import StubRequest, StubResponse
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGE_FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+CHAT_PATH = "/llm/v1/chat/completions"
+EMBED_PATH = "/cohere/v1/embed"
+
+# Provider round trips, roughly what a fast hosted model and embedder answer in
+LLM_LATENCY_SECONDS = 0.02
+EMBED_LATENCY_SECONDS = 0.005
+EMBED_DIMENSIONS = 256
+
+# Skills the replayed applicant does not have; a job asking for them is not a fit
+_MISMATCH_RE = re.compile(r"\b(Java|Kotlin|Android|React)\b")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def load_corpus() -> dict[str, Any]:
+    return json.loads((FIXTURES / "corpus.json").read_text(encoding="utf-8"))
+
+
+def load_profile() -> dict[str, Any]:
+    return json.loads((FIXTURES / "applicant_profile.json").read_text(encoding="utf-8"))
+
+
+# --- Generated corpora ---------------------------------------------------------------------------
+
+def make_jobs(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Distinct job postings assembled from the corpus; most ask for a skill the applicant lacks."""
+    corpus, rng = load_corpus(), random.Random(seed)
+    jobs = []
+    for i in range(count):
+        company = f"{rng.choice(corpus['companies'])} {i}"
+        jobs.append({
+            "title": rng.choice(corpus["titles"]),
+            "company": company,
+            "intro": rng.choice(corpus["intros"]).format(company=company),
+            "responsibilities": rng.sample(corpus["responsibilities"], 4),
+            "requirements": rng.sample(corpus["requirements"], 3),
+            "benefits": rng.choice(corpus["benefits"]),
+        })
+    return jobs
+
+
+def job_text(job: dict[str, Any]) -> str:
+    """The job as the plain-text description extracted from its page."""
+    lines = "\n".join
+    return (f"{job['title']} - {job['company']}\n\n{job['intro']}\n\nResponsibilities\n{lines(job['responsibilities'])}"
+            f"\n\nRequirements\n{lines(job['requirements'])}\n\nBenefits\n{job['benefits']}")
+
+
+def job_page(job: dict[str, Any], template: str = "greenhouse") -> str:
+    """Renders a job into a saved ATS page, in place of the page's own posting."""
+    items = lambda lines: "".join(f"<li>{line}</li>" for line in lines)
+    description = (f"<p>{job['intro']}</p><h3>What you'll do</h3><ul>{items(job['responsibilities'])}</ul>"
+                   f"<h3>Requirements</h3><ul>{items(job['requirements'])}</ul>"
+                   f"<h3>Benefits</h3><p>{job['benefits']}</p>")
+    html = (PAGE_FIXTURES / "job_pages" / f"{template}.html").read_text(encoding="utf-8")
+    if template == "json_ld":
+        html = re.sub(r'"title": "[^"]*"', f'"title": "{job["title"]}"', html, count=1)
+        return re.sub(r'"description": "[^"]*"', lambda _: f'"description": {json.dumps(description)}', html, count=1)
+    html = re.sub(r'(<h1 class="section-header">)[^<]*', lambda m: m.group(1) + job["title"], html, count=1)
+    return re.sub(r'(<div class="job__description body">).*?(</div>)', lambda m: m.group(1) + description + m.group(2),
+                  html, count=1, flags=re.S)
+
+
+def application_page(job: dict[str, Any]) -> str:
+    """A job page with the saved Greenhouse application form in place of its stub form."""
+    form = (PAGE_FIXTURES / "forms" / "greenhouse_form.html").read_text(encoding="utf-8")
+    form = re.search(r"<form.*</form>", form, flags=re.S).group(0)
+    return re.sub(r"<form.*?</form>", lambda _: form, job_page(job), count=1, flags=re.S)
+
+
+def make_resumes(count: int, seed: int = 0) -> list[list[str]]:
+    """Lines (name, section headings and content) of `count` variants of the applicant's resume."""
+    corpus, rng = load_corpus(), random.Random(seed)
+    resumes = []
+    for i in range(count):
+        companies = rng.sample(corpus["companies"], 2)
+        resumes.append([
+            "Jane Doe",
+            "Summary",
+            f"{rng.choice(corpus['titles'])} with {rng.randint(2, 12)} years of experience, variant {i}.",
+            "Experience",
+            *(rng.choice(corpus["experience"]).format(company=company) for company in companies),
+            "Skills",
+            ", ".join(rng.sample(corpus["skills"], 6)),
+        ])
+    return resumes
+
+
+def make_pdf(path: Path, lines: list[str]):
+    """Writes a minimal one-page PDF that pypdf can extract the given lines from."""
+    text_ops = " ".join(f"({line.replace('(', '[').replace(')', ']')}) Tj 0 -14 Td" for line in lines)
+    content = f"BT /F1 10 Tf 72 760 Td {text_ops} ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref_offset = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    path.write_bytes(body.encode("latin-1"))
+
+
+def make_kb_documents(count: int, seed: int = 0) -> list[str]:
+    """Knowledge base notes: the applicant's facts spread over `count` documents, padded with filler notes."""
+    corpus, rng = load_corpus(), random.Random(seed)
+    documents = [[] for _ in range(count)]
+    for i, fact in enumerate(corpus["facts"]):
+        documents[i % count].append(fact)
+    for lines in documents:
+        while len(lines) < 3:
+            lines.append(rng.choice(corpus["experience"]).format(company=rng.choice(corpus["companies"])))
+    return ["\n".join(lines) for lines in documents]
+
+
+# --- HTTP replays --------------------------------------------------------------------------------
+
+def _chat_completion(content: str) -> StubResponse:
+    body = {
+        "id": "chatcmpl-replay", "object": "chat.completion", "created": 0, "model": "replay",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+    return StubResponse(body=json.dumps(body), headers={"Content-Type": "application/json"}, delay=LLM_LATENCY_SECONDS)
+
+
+def _verdict(job_text: str) -> dict[str, Any]:
+    mismatch = _MISMATCH_RE.search(job_text)
+    if mismatch:
+        return {"is_fit": False, "reasoning": f"The role centres on {mismatch.group(1)}, which the applicant has not used."}
+    return {"is_fit": True, "reasoning": "The applicant's Python backend experience covers the requirements."}
+
+
+def answer_chat(request: StubRequest) -> StubResponse:
+    """Answers a chat completion with the canned answer for its kind of prompt."""
+    body = json.loads(request.body)
+    prompt = body["messages"][-1]["content"]
+    if isinstance(prompt, list):
+        prompt = " ".join(part.get("text", "") for part in prompt)
+    schema = json.dumps(body.get("response_format") or {})
+
+    if '"analyses"' in schema:
+        jobs = re.findall(r"Job (\d+):\n(.*?)(?=\n\s*Job \d+:\n|\n\s*Evaluate each job)", prompt, flags=re.S)
+        analyses = [{"job": int(number), **_verdict(text)} for number, text in jobs]
+        return _chat_completion(json.dumps({"analyses": analyses}))
+    if '"is_fit"' in schema:
+        job_text = prompt.split("Job Description:", 1)[-1].split("Evaluate the fit", 1)[0]
+        return _chat_completion(json.dumps(_verdict(job_text)))
+    if '"first_name"' in schema:
+        return _chat_completion(json.dumps(load_profile()))
+    return _chat_completion("0")  # Resume ranking: the first shortlisted resume
+
+
+def embed_text(text: str, dimensions: int = EMBED_DIMENSIONS) -> list[float]:
+    """Feature-hashed bag of words, normalised; texts sharing words get similar vectors."""
+    vector = np.zeros(dimensions, dtype=np.float64)
+    for token in _TOKEN_RE.findall(text.lower()):
+        digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        vector[digest % dimensions] += 1.0 if digest >> 63 else -1.0
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).round(6).tolist()
+
+
+def answer_embed(request: StubRequest) -> StubResponse:
+    texts = json.loads(request.body)["texts"]
+    body = {
+        "id": "embed-replay", "texts": texts, "response_type": "embeddings_by_type",
+        "embeddings": {"float": [embed_text(text) for text in texts]},
+        "meta": {"billed_units": {"input_tokens": sum(len(text.split()) for text in texts)}},
+    }
+    return StubResponse(body=json.dumps(body), headers={"Content-Type": "application/json"}, delay=EMBED_LATENCY_SECONDS)
+
+
+def serve_replays(stub_server):
+    """Routes the chat and embed replays on the stub server."""
+    stub_server.route(CHAT_PATH, answer_chat, method="POST")
+    stub_server.route(EMBED_PATH, answer_embed, method="POST")
+
+
+def serve_pages(stub_server, pages: dict[str, str]) -> list[str]:
+    """Serves each page under its path and returns their URLs."""
+    for path, html in pages.items():
+        stub_server.route(path, StubResponse(body=html, headers={"Content-Type": "text/html; charset=utf-8"}))
+    return [stub_server.url(path) for path in pages]
+
+
+# --- In-process replays --------------------------------------------------------------------------
+
+@dataclass
+class MemoryStore:
+    """The memories of one knowledge base, shared by every replayed mem0 instance built over it."""
+
+    texts: dict[str, str] = field(default_factory=dict)
+    vectors: dict[str, np.ndarray] = field(default_factory=dict)
+
+
+class ReplayMemory:
+    """
+    A mem0 `Memory` without its fact-extraction LLM or vector database: each line
+    added becomes a memory, embedded with the configured embedder, and searches
+    rank memories by cosine similarity.
+    """
+
+    def __init__(self, config, store: MemoryStore):
+        self.embedder = config.embedder.config["model"]
+        self.store = store
+        self.embedding_model = self
+
+    @classmethod
+    def factory(cls, store: MemoryStore):
+        return lambda config: cls(config, store)
+
+    def embed(self, text: str, memory_action: str | None = None) -> list[float]:
+        return self.embedder.embed_query(text)
+
+    def add(self, content: str, user_id: str | None = None, metadata: dict | None = None, **kwargs) -> dict:
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+        vectors = self.embedder.embed_documents(lines)
+        results = []
+        for line, vector in zip(lines, vectors):
+            memory_id = hashlib.sha1(f"{metadata}:{line}".encode()).hexdigest()[:16]
+            self.store.texts[memory_id] = line
+            self.store.vectors[memory_id] = np.asarray(vector, dtype=np.float32)
+            results.append({"id": memory_id, "memory": line, "event": "ADD"})
+        return {"results": results}
+
+    def delete(self, memory_id: str):
+        self.store.texts.pop(memory_id, None)
+        self.store.vectors.pop(memory_id, None)
+
+    def search(self, query: str, user_id: str | None = None, limit: int = 5, **kwargs) -> dict:
+        if not self.store.vectors:
+            return {"results": []}
+        ids = list(self.store.vectors)
+        scores = np.stack([self.store.vectors[i] for i in ids]) @ np.asarray(self.embed(query), dtype=np.float32)
+        best = np.argsort(-scores)[:limit]
+        return {"results": [{"id": ids[i], "memory": self.store.texts[ids[i]], "score": float(scores[i])} for i in best]}
+
+
+class ReplayHistory:
+    def __init__(self, result: str, steps: int):
+        self.result = result
+        self.steps = steps
+
+    def is_successful(self) -> bool:
+        return True
+
+    def final_result(self) -> str:
+        return self.result
+
+    def number_of_steps(self) -> int:
+        return self.steps
+
+
+class ReplayAgent:
+    """
+    A browser-use `Agent` replaying a recorded run: the given number of steps,
+    each passing through the run's step hooks, then the recorded final result.
+    """
+
+    def __init__(self, result: str = "", steps: int = 1, **kwargs):
+        self.result = result
+        self.steps = steps
+        self.state = type("AgentState", (), {"n_steps": 0})()
+
+    @classmethod
+    def factory(cls, result: str = "", steps: int = 1):
+        return lambda *args, **kwargs: cls(result, steps, **kwargs)
+
+    def add_new_task(self, task: str):
+        pass
+
+    def stop(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def run(self, max_steps: int = 100, on_step_start=None, on_step_end=None) -> ReplayHistory:
+        for _ in range(min(self.steps, max_steps)):
+            self.state.n_steps += 1
+            if on_step_start is not None:
+                await on_step_start(self)
+            if on_step_end is not None:
+                await on_step_end(self)
+        return ReplayHistory(self.result, self.state.n_steps)
+
+
+class _ReplayCDPSession:
+    def __init__(self, browser: "ReplayBrowser"):
+        self.session_id = "replay-session"
+        self.cdp_client = self
+        self.send = self
+        self.Runtime = self
+        self.DOM = self
+        self.browser = browser
+
+    async def evaluate(self, params: dict, session_id: str | None = None) -> dict:
+        return {"result": self.browser.evaluate(params["expression"], params.get("returnByValue", False))}
+
+    async def setFileInputFiles(self, params: dict, session_id: str | None = None) -> dict:
+        self.browser.uploads.extend(params["files"])
+        return {}
+
+
+class ReplayBrowser:
+    """
+    A browser session over the stub server: navigation downloads the page, and
+    the page-side scripts the app evaluates over CDP (load state, HTML, form
+    fills and reads) are answered from the downloaded HTML and what was filled.
+    """
+
+    def __init__(self):
+        self.is_cdp_connected = True
+        self.agent_focus_target_id = "replay-target"
+        self.html = "<html></html>"
+        self.values: dict[str, str] = {}
+        self.uploads: list[str] = []
+        self._cdp_session = _ReplayCDPSession(self)
+
+    async def navigate_to(self, url: str):
+        async with httpx.AsyncClient() as client:
+            self.html = (await client.get(url)).text
+        self.values = {}
+
+    async def get_or_create_cdp_session(self, focus: bool = True) -> _ReplayCDPSession:
+        return self._cdp_session
+
+    def evaluate(self, expression: str, return_by_value: bool) -> dict:
+        if not return_by_value:
+            return {"objectId": "replay-node"}
+        if expression == "document.readyState":
+            return {"value": "complete"}
+        if expression == "document.documentElement.outerHTML":
+            return {"value": self.html}
+        if expression.startswith("performance.getEntriesByType"):
+            return {"value": 1}
+        items = json.loads(re.search(r"const items = (\[.*\]);", expression).group(1))
+        if "out[item.selector]" in expression:  # Reading the answers back
+            return {"value": {item["selector"]: self.values.get(item["selector"], "") for item in items}}
+        self.values.update({item["selector"]: item["value"] for item in items})
+        return {"value": [True] * len(items)}
@@ -0,0 +1,206 @@
+"""
+Offline end-to-end benchmarks of the job search, resume ranking, knowledge base
+and application stages, at several corpus sizes. LLM answers, embeddings and
+ATS pages are replayed through the stub server, so no network or API key is
+needed. They are excluded from the default test run:
+
+    task bench                                    # compare against baselines.json
+    BENCHMARK_UPDATE_BASELINES=1 task bench       # store new baselines
+"""
+import itertools
+import pytest
+import sys
+import os
+from functools import partial
+from unittest.mock import patch
+
+# Add the project root and this directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from browser_use.llm import ChatOpenAI
+from langchain_cohere import CohereEmbeddings
+from app.agents import ApplicantProfileAgent, JobSearchAgent, KnowledgeBaseAgent, ResumeManagerAgent
+from app.agents.job_application_agent import JobApplicationAgent
+from app.cache import AnswerStore, FitCache, HttpCache
+from app.extraction import JobPageFetcher
+from app.llm_gateway import LLMGateway, LLMRoute
+from app.models.llm_responses import JobPosting, JobSearchPage
+from app.prompting import ApproximateTokenCounter, PromptCompactor
+from app.rate_limit import AsyncTokenBucket
+from harness import UPDATE_BASELINES, Baselines, BenchmarkResult, format_results, measure
+from replay import (
+    CHAT_PATH, EMBED_PATH, MemoryStore, ReplayAgent, ReplayBrowser, ReplayMemory, application_page, job_page, job_text,
+    load_corpus, make_jobs, make_kb_documents, make_pdf, make_resumes, serve_pages, serve_replays,
+)
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def baselines(request):
+    """Collects the module's results; checks them against the baselines, or stores them as the new ones."""
+    baselines = Baselines()
+    results: list[BenchmarkResult] = []
+
+    def record(result: BenchmarkResult):
+        results.append(result)
+        regression = baselines.regression(result)
+        if not UPDATE_BASELINES:
+            assert regression is None, regression
+
+    yield record
+
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    capture = request.config.pluginmanager.get_plugin("capturemanager")
+    if reporter is not None and capture is not None and results:
+        with capture.global_and_fixture_disabled():
+            reporter.write_line("\n" + format_results(results, baselines))
+    if UPDATE_BASELINES:
+        for result in results:
+            baselines.update(result)
+        baselines.save()
+
+
+@pytest.fixture
+def replays(stub_server):
+    serve_replays(stub_server)
+    return stub_server
+
+
+def replay_gateway(stub_server) -> LLMGateway:
+    """A gateway whose only route is the replayed chat endpoint, without a completion cache."""
+    llm = ChatOpenAI(model="replay", base_url=stub_server.url(CHAT_PATH.removesuffix("/chat/completions")),
+                     api_key="replay", max_retries=0)
+    return LLMGateway([LLMRoute("replay", llm, rate_limiter=AsyncTokenBucket(rate_per_minute=60000, capacity=1000))])
+
+
+def compactor() -> PromptCompactor:
+    """Compaction with the offline token estimate, so no tokenizer download is attempted."""
+    return PromptCompactor(ApproximateTokenCounter())
+
+
+def knowledge_base(stub_server, data_dir, cache_dir, store: MemoryStore) -> KnowledgeBaseAgent:
+    """A knowledge base whose embeddings come from the replayed Cohere endpoint and memories from `store`."""
+    embeddings = partial(CohereEmbeddings, cohere_api_key="replay",
+                         base_url=stub_server.url(EMBED_PATH.removesuffix("/v1/embed")))
+    with patch('app.agents.knowledge_base_agent.Memory', ReplayMemory.factory(store)), \
+         patch('app.agents.knowledge_base_agent.CohereEmbeddings', embeddings):
+        return KnowledgeBaseAgent(data_dir=str(data_dir), cache_dir=str(cache_dir))
+
+
+def loaded_knowledge_base(stub_server, tmp_path, documents: int) -> KnowledgeBaseAgent:
+    data_dir = tmp_path / "kb"
+    data_dir.mkdir()
+    for i, document in enumerate(make_kb_documents(documents)):
+        (data_dir / f"note_{i:04d}.md").write_text(document, encoding="utf-8")
+    kb = knowledge_base(stub_server, data_dir, tmp_path / "cache", MemoryStore())
+    kb.load_from_directory()
+    return kb
+
+
+def resume_manager(stub_server, tmp_path, resumes: int) -> ResumeManagerAgent:
+    resumes_dir = tmp_path / "resumes"
+    resumes_dir.mkdir()
+    for i, lines in enumerate(make_resumes(resumes)):
+        make_pdf(resumes_dir / f"resume_{i:03d}.pdf", lines)
+    manager = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=replay_gateway(stub_server),
+                                 cache_dir=str(tmp_path / "cache"), compactor=compactor())
+    manager.load_resumes()
+    return manager
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("jobs", [10, 40])
+async def test_search_and_filter_jobs(replays, baselines, tmp_path, jobs):
+    """Search results page to fit verdicts: page fetches, extraction, dedup, compaction and batched fit calls."""
+    postings = make_jobs(jobs)
+    pages = {f"/jobs/{i}": job_page(job, "greenhouse" if i % 2 else "json_ld") for i, job in enumerate(postings)}
+    urls = serve_pages(replays, pages)
+    results_page = JobSearchPage(postings=[JobPosting(url=url) for url in urls]).model_dump_json()
+    kb = loaded_knowledge_base(replays, tmp_path, documents=10)
+    run_dirs = (tmp_path / f"run_{i}" for i in itertools.count())
+
+    async def setup():
+        run_dir = next(run_dirs)
+        agent = JobSearchAgent(
+            browser=ReplayBrowser(), knowledge_base=kb, fit_cache=FitCache(run_dir / "fit_cache.db"),
+            page_fetcher=JobPageFetcher(cache=HttpCache(run_dir / "http")), compactor=compactor(),
+        )
+        agent.llm = replay_gateway(replays)
+        return agent
+
+    async def run(agent: JobSearchAgent):
+        fits = await agent.search_and_filter_jobs("Python backend engineer", limit=jobs // 2)
+        assert 0 < len(fits) < jobs
+
+    async def teardown(agent: JobSearchAgent):
+        await agent.aclose()
+        agent.fit_cache.close()
+
+    with patch('app.agents.job_search_agent.Agent', ReplayAgent.factory(result=results_page, steps=3)):
+        result = await measure("search_and_filter_jobs", jobs, run, setup, teardown, items=jobs, runs=3)
+    baselines(result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resumes", [5, 25, 100])
+async def test_get_best_resume(replays, baselines, tmp_path, resumes):
+    """Local ranking of every resume, with an LLM tie-break when the shortlist is close."""
+    manager = resume_manager(replays, tmp_path, resumes)
+    descriptions = [job_text(job) for job in make_jobs(10, seed=1)]
+
+    async def run(_):
+        for description in descriptions:
+            assert await manager.get_best_resume(description)
+
+    baselines(await measure("get_best_resume", resumes, run, items=len(descriptions)))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("documents", [10, 50, 250])
+async def test_knowledge_base_query(replays, baselines, tmp_path, documents):
+    """Cold query caches answering form questions, their paraphrases and repeats."""
+    corpus = load_corpus()
+    questions = corpus["questions"] + corpus["paraphrases"] + corpus["questions"]
+    loaded = loaded_knowledge_base(replays, tmp_path, documents)
+
+    async def setup():
+        # A fresh agent over the loaded memories, so every run starts with empty query caches
+        return knowledge_base(replays, tmp_path / "kb", tmp_path / "cache", loaded.memory.store)
+
+    async def run(kb: KnowledgeBaseAgent):
+        answers = [kb.query(question) for question in questions]
+        assert all("No relevant information" not in answer for answer in answers)
+
+    async def teardown(kb: KnowledgeBaseAgent):
+        kb._executor.shutdown()
+
+    baselines(await measure("knowledge_base_query", documents, run, setup, teardown, items=len(questions)))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resumes", [5, 25])
+async def test_apply_to_job(replays, baselines, tmp_path, resumes):
+    """One application: DOM extraction, resume choice, profile, autofill of the form and the replayed agent."""
+    jobs = make_jobs(5, seed=2)
+    urls = itertools.cycle(serve_pages(replays, {f"/apply/{i}": application_page(job) for i, job in enumerate(jobs)}))
+    kb = loaded_knowledge_base(replays, tmp_path, documents=10)
+    manager = resume_manager(replays, tmp_path, resumes)
+    profile_agent = ApplicantProfileAgent(kb, llm=replay_gateway(replays), cache_dir=str(tmp_path / "cache"))
+    assert await profile_agent.get_profile() is not None  # Built once per knowledge base, not per application
+    answer_store = AnswerStore(tmp_path / "answers.db", embeddings=kb.embeddings)
+
+    async def setup():
+        return JobApplicationAgent(browser=ReplayBrowser(), knowledge_base=kb, resume_manager=manager,
+                                   profile_agent=profile_agent, answer_store=answer_store)
+
+    async def run(agent: JobApplicationAgent):
+        history = await agent.apply_to_job(next(urls))
+        assert history.is_successful()
+        assert agent.browser.uploads and agent.browser.values
+
+    with patch('app.agents.job_application_agent.Agent', ReplayAgent.factory(result="Application submitted", steps=4)):
+        result = await measure("apply_to_job", resumes, run, setup, runs=3)
+    answer_store.close()
+    baselines(result)
@@ -0,0 +1,155 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import pytest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.telemetry import Span, Tracer, get_tracer, set_tracer
+
+
+@dataclass
+class StubRequest:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes = b""
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: bytes | str = b""
+    headers: dict[str, str] = field(default_factory=dict)
+    delay: float = 0.0
+
+
+Route = StubResponse | Callable[[StubRequest], StubResponse]
+
+
+class StubServer:
+    """
+    Local HTTP server for tests. Routes map a method and path (query string
+    excluded) to a canned StubResponse or a callable building one; every
+    request is recorded, and the peak number of requests in flight is tracked.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], Route] = {}
+        self.requests: list[StubRequest] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def route(self, path: str, response: Route, method: str = "GET"):
+        self.routes[(method, path)] = response
+
+    def requests_for(self, path: str) -> list[StubRequest]:
+        return [r for r in self.requests if r.path.split("?")[0] == path]
+
+    def _dispatch(self, request: StubRequest) -> StubResponse:
+        with self._lock:
+            self.requests.append(request)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            route = self.routes.get((request.method, request.path.split("?")[0]))
+            if route is None:
+                return StubResponse(status=404, body="not found")
+            response = route(request) if callable(route) else route
+            if response.delay:
+                time.sleep(response.delay)
+            return response
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = StubRequest(
+                    method=self.command,
+                    path=self.path,
+                    headers={k.lower(): v for k, v in self.headers.items()},
+                    body=self.rfile.read(length) if length else b"",
+                )
+                response = server._dispatch(request)
+                body = response.body.encode("utf-8") if isinstance(response.body, str) else response.body
+                self.send_response(response.status)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """A local HTTP server the code under test can reach instead of the internet."""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+class SpanRecorder:
+    """Span exporter keeping finished spans in memory."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def on_start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def span_recorder():
+    """Installs a tracer recording every span into a list, restoring the process-wide tracer afterwards."""
+    previous = get_tracer()
+    recorder = SpanRecorder()
+    set_tracer(Tracer([recorder], run_id="run-1"))
+    yield recorder
+    set_tracer(previous)
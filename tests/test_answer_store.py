@@ -0,0 +1,121 @@
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.cache import AnswerStore
+from app.cache.answer_store import differs_in_content, fuzzy_score
+
+# Toy embedding space: questions about salary and about referral sources point different ways
+VECTORS = {
+    "Expected salary": [1.0, 0.0, 0.0],
+    "What are your compensation expectations?": [0.99, 0.05, 0.0],
+    "How did you hear about us?": [0.0, 1.0, 0.0],
+    "Favourite colour": [0.0, 0.0, 1.0],
+    "Years of Python experience": [0.0, 0.7, 0.7],
+    "Notice period": [0.5, 0.5, 0.5],
+    # Embeddings barely tell these apart, only their wording does
+    "Are you authorized to work in the United States?": [0.6, -0.8, 0.0],
+    "Are you authorized to work in the United Kingdom?": [0.6, -0.78, 0.02],
+    "Will you require H-1B visa sponsorship?": [-0.6, 0.0, 0.8],
+    "Will you require TN visa sponsorship?": [-0.6, 0.02, 0.8],
+}
+
+
+def fake_embeddings():
+    embeddings = MagicMock(spec=["embed_queries"])
+    embeddings.embed_queries.side_effect = lambda texts: [VECTORS[t] for t in texts]
+    return embeddings
+
+
+@pytest.fixture
+def store(tmp_path):
+    answer_store = AnswerStore(tmp_path / "answers.db", embeddings=fake_embeddings())
+    yield answer_store
+    answer_store.close()
+
+
+def test_fuzzy_score_ignores_phrasing_but_not_content():
+    """Test that filler words and plurals match while a different country does not."""
+    assert fuzzy_score("years of python experience", "how many years of python experience do you have") > 0.85
+    assert fuzzy_score("year of python experience", "years of python experience") > 0.85
+    assert fuzzy_score("authorized to work in the united states", "authorized to work in the united kingdom") == 0.0
+
+
+def test_differs_in_content():
+    """Test that shared wording with a different content word is caught, while pure paraphrases pass."""
+    assert differs_in_content("authorized to work in the united states", "authorized to work in the united kingdom")
+    assert differs_in_content("will you require h 1b visa sponsorship", "will you require tn visa sponsorship")
+    assert not differs_in_content("what are your compensation expectations", "expected salary")
+    assert not differs_in_content("years of python experience", "how many years of python experience do you have")
+
+
+def test_vector_match_rejects_questions_that_differ_in_content(store):
+    """Test that a close embedding does not reuse the answer to a question about another country or visa."""
+    store.record_many([("Are you authorized to work in the United States?", "Yes", "radio"),
+                       ("Will you require H-1B visa sponsorship?", "No", "radio")])
+
+    assert store.lookup("Are you authorized to work in the United Kingdom?") is None
+    assert store.lookup("Will you require TN visa sponsorship?") is None
+    assert store.stats.vector_hits == 0
+
+
+def test_lookup_exact_fuzzy_and_vector(store):
+    """Test the lookup order and that each tier is counted in the statistics."""
+    store.record_many([("Expected salary", "120000", "text"), ("Years of Python experience", "6", "text")])
+
+    exact = store.lookup("expected  salary?")
+    fuzzy = store.lookup("How many years of Python experience do you have?")
+    vector = store.lookup("What are your compensation expectations?")
+    miss = store.lookup("Favourite colour")
+
+    assert (exact.answer, exact.match) == ("120000", "exact")
+    assert (fuzzy.answer, fuzzy.match) == ("6", "fuzzy")
+    assert (vector.answer, vector.match) == ("120000", "vector")
+    assert miss is None
+    stats = store.stats
+    assert (stats.lookups, stats.exact_hits, stats.fuzzy_hits, stats.vector_hits, stats.misses) == (4, 1, 1, 1, 1)
+    assert stats.hit_rate == pytest.approx(0.75)
+
+
+def test_lookup_many_embeds_misses_in_one_call(store):
+    """Test that text matches skip the embedding call and the rest share one request."""
+    store.record("Expected salary", "120000")
+    store.embeddings.embed_queries.reset_mock()
+
+    results = store.lookup_many(["Expected salary", "What are your compensation expectations?", "Favourite colour"])
+
+    assert [r.match if r else None for r in results] == ["exact", "vector", None]
+    store.embeddings.embed_queries.assert_called_once_with(["What are your compensation expectations?", "Favourite colour"])
+
+
+def test_answers_persist_and_latest_wins(tmp_path):
+    """Test that answers survive a restart, including their embeddings, and re-recording replaces them."""
+    first = AnswerStore(tmp_path / "answers.db", embeddings=fake_embeddings())
+    first.record("How did you hear about us?", "LinkedIn")
+    first.record("How did you hear about us?", "Referral", "select")
+    first.close()
+
+    reopened = AnswerStore(tmp_path / "answers.db", embeddings=fake_embeddings())
+    answer = reopened.lookup("How did you hear about us?")
+
+    assert len(reopened) == 1
+    assert (answer.answer, answer.field_type) == ("Referral", "select")
+    assert reopened._vectors
+    reopened.close()
+
+
+def test_record_skips_empty_answers_and_survives_embedding_errors(tmp_path):
+    """Test that blank answers are not stored and an embedding failure still stores the text."""
+    embeddings = MagicMock(spec=["embed_queries"])
+    embeddings.embed_queries.side_effect = RuntimeError("embedding service down")
+    answer_store = AnswerStore(tmp_path / "answers.db", embeddings=embeddings)
+
+    answer_store.record_many([("Expected salary", "  ", "text"), ("Notice period", "2 weeks", "text")])
+
+    assert len(answer_store) == 1
+    assert answer_store.lookup("Notice period").answer == "2 weeks"
+    answer_store.close()
@@ -0,0 +1,270 @@
+import json
+import re
+import shutil
+import subprocess
+import httpx
+import pytest
+import sys
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import StubResponse
+from app.autofill import FormAutofiller, choose_option, detect_form_fields, plan_fill
+from app.autofill.engine import _FILL_JS
+from app.cache import AnswerStore
+from app.models.applicant_profile import (
+    ApplicantProfile, ContactInfo, EEOAnswers, Links, WorkAuthorization, WorkExperience,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "forms"
+RESUME_PATH = "user_data/resumes/test_resume.pdf"
+
+
+@pytest.fixture
+def profile():
+    """Create a profile covering the standard contact, link and EEO fields."""
+    return ApplicantProfile(
+        first_name="Jane",
+        last_name="Doe",
+        full_name="Jane Doe",
+        contact=ContactInfo(email="jane@example.com", phone="+1 555 0100", city="Austin", state="TX", country="USA"),
+        work_history=[WorkExperience(company="Initech", title="Backend Engineer")],
+        links=Links(linkedin="https://linkedin.com/in/janedoe", github="https://github.com/janedoe"),
+        work_authorization=WorkAuthorization(requires_sponsorship=False),
+        eeo=EEOAnswers(gender="Decline to self identify", veteran_status="I am not a protected veteran"),
+    )
+
+
+def serve_form(stub_server, name: str) -> str:
+    """Serves a form fixture from the stub server and downloads it, as the browser would."""
+    stub_server.route(f"/{name}", StubResponse(body=(FIXTURES / f"{name}.html").read_text(encoding="utf-8"),
+                                              headers={"Content-Type": "text/html"}))
+    return httpx.get(stub_server.url(f"/{name}")).text
+
+
+def make_browser(html: str):
+    """Create a browser session whose CDP session serves the page HTML, reports fills and hands out node handles."""
+    browser = MagicMock()
+    cdp_session = MagicMock()
+    cdp_session.session_id = "session-1"
+    browser.filled_items = []
+    browser.page_values = {}
+
+    async def evaluate(params, session_id):
+        expression = params["expression"]
+        if expression == "document.documentElement.outerHTML":
+            return {"result": {"value": html}}
+        if not params.get("returnByValue"):
+            return {"result": {"objectId": "node-1"}}
+        if "out[item.selector]" in expression:
+            return {"result": {"value": browser.page_values}}
+        items = json.loads(re.search(r"const items = (\[.*\]);", expression).group(1))
+        browser.filled_items.extend(items)
+        return {"result": {"value": [True] * len(items)}}
+
+    cdp_session.cdp_client.send.Runtime.evaluate = AsyncMock(side_effect=evaluate)
+    cdp_session.cdp_client.send.DOM.setFileInputFiles = AsyncMock(return_value={})
+    browser.get_or_create_cdp_session = AsyncMock(return_value=cdp_session)
+    browser.cdp_session = cdp_session
+    return browser
+
+
+def test_detect_greenhouse_fields(stub_server):
+    """Test that labels, names, required flags and options are read from a Greenhouse form."""
+    fields = {f.label: f for f in detect_form_fields(serve_form(stub_server, "greenhouse_form"))}
+
+    assert "fingerprint" not in {f.name for f in fields.values()}
+    assert fields["First Name"].selector == 'input[id="first_name"]'
+    assert fields["First Name"].required
+    assert fields["Resume/CV"].type == "file"
+    assert fields["Will you now or in the future require visa sponsorship?"].options == ["Yes", "No"]
+    assert fields["Gender"].type == "radio"
+    assert fields["Gender"].options == ["Male", "Female", "Decline To Self Identify"]
+
+
+def test_detect_lever_fields_uses_container_labels(stub_server):
+    """Test that Lever's application-label divs label fields that have no <label for>."""
+    fields = {f.name: f for f in detect_form_fields(serve_form(stub_server, "lever_form"))}
+
+    assert fields["name"].label == "Full name"
+    assert fields["urls[LinkedIn]"].label == "LinkedIn URL"
+    assert fields["cards[abc][field1]"].label == "Are you willing to relocate to Berlin?"
+    assert fields["cards[abc][field1]"].options == ["Yes", "No"]
+
+
+def test_plan_greenhouse_form(stub_server, profile):
+    """Test that profile fields are mapped, the resume is uploaded and open questions are left over."""
+    plan = plan_fill(detect_form_fields(serve_form(stub_server, "greenhouse_form")), profile, RESUME_PATH)
+    values = {a.field.label: a.value for a in plan.assignments}
+    leftovers = {f.label for f in plan.leftovers}
+
+    assert values["First Name"] == "Jane"
+    assert values["Last Name"] == "Doe"
+    assert values["Preferred First Name"] == "Jane"
+    assert values["Email"] == "jane@example.com"
+    assert values["Phone"] == "+1 555 0100"
+    assert values["Location (City)"] == "Austin, TX, USA"
+    assert values["LinkedIn Profile"] == "https://linkedin.com/in/janedoe"
+    assert values["Will you now or in the future require visa sponsorship?"] == "No"
+    assert values["Gender"] == "Decline To Self Identify"
+    assert values["Veteran Status"] == "I am not a protected veteran"
+    assert [u.field.label for u in plan.uploads] == ["Resume/CV"]
+    assert leftovers == {"Cover Letter", "Website", "Why do you want to work at Acme?", "How did you hear about us?"}
+
+
+def test_plan_lever_form(stub_server, profile):
+    """Test the Lever name conventions: single name field, org and urls[...] links."""
+    plan = plan_fill(detect_form_fields(serve_form(stub_server, "lever_form")), profile, RESUME_PATH)
+    values = {a.field.name: a.value for a in plan.assignments}
+
+    assert values["name"] == "Jane Doe"
+    assert values["org"] == "Initech"
+    assert values["urls[LinkedIn]"] == "https://linkedin.com/in/janedoe"
+    assert values["urls[GitHub]"] == "https://github.com/janedoe"
+    assert values["location"] == "Austin, TX, USA"
+    assert [u.field.name for u in plan.uploads] == ["resume"]
+    # Unknown relocation preference and open questions stay with the agent
+    assert {f.name for f in plan.leftovers} == {"urls[Portfolio]", "cards[abc][field0]", "cards[abc][field1]", "comments"}
+
+
+def test_plan_skips_prefilled_fields(profile):
+    """Test that a field the page already filled is not overwritten."""
+    html = '<form><label for="email">Email</label><input id="email" name="email" value="old@example.com"></form>'
+
+    plan = plan_fill(detect_form_fields(html), profile, None)
+
+    assert plan.assignments == []
+    assert plan.leftovers == []
+
+
+def test_plan_without_profile_leaves_everything(stub_server):
+    """Test that without a profile only the resume upload is planned."""
+    plan = plan_fill(detect_form_fields(serve_form(stub_server, "greenhouse_form")), None, RESUME_PATH)
+
+    assert plan.assignments == []
+    assert len(plan.uploads) == 1
+
+
+def test_choose_option():
+    """Test option matching: exact, then prefix, then containment."""
+    options = ["Yes", "No", "I don't wish to answer"]
+
+    assert choose_option("no", options) == "No"
+    assert choose_option("I don't wish", options) == "I don't wish to answer"
+    assert choose_option("wish to answer", options) == "I don't wish to answer"
+    assert choose_option("Maybe", options) is None
+
+
+def test_choose_option_matches_whole_words():
+    """Test that prefix and containment matches never cut into a word."""
+    assert choose_option("male", ["Female", "Male", "Decline to self identify"]) == "Male"
+    assert choose_option("male", ["Female", "Non-binary"]) is None
+    assert choose_option("no", ["Not a protected veteran", "Yes"]) is None
+    assert choose_option("United States", ["United Kingdom", "United States of America"]) == "United States of America"
+
+
+def run_fill_js(items: list[dict], radio_labels: list[str]) -> tuple[list, list[str]]:
+    """Runs the fill script in Node against a fake DOM of labelled radios; returns its results and the checked labels."""
+    script = f"""
+const radios = {json.dumps(radio_labels)}.map((label) => ({{
+  id: '', value: label, checked: false, closest: () => ({{textContent: label}}), click() {{ this.checked = true; }},
+}}));
+global.document = {{querySelectorAll: () => radios, querySelector: () => null}};
+global.CSS = {{escape: (s) => s}};
+const results = {_FILL_JS % json.dumps(items)};
+console.log(JSON.stringify([results, radios.filter((r) => r.checked).map((r) => r.value)]));
+"""
+    output = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    results, checked = json.loads(output)
+    return results, checked
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs Node.js to run the fill script")
+def test_fill_script_matches_radios_on_whole_words():
+    """Test that the in-page radio matching never cuts into a word, like choose_option."""
+    veteran = ["Not a protected veteran", "None of the above", "No"]
+    assert run_fill_js([{"selector": "input", "type": "radio", "value": "no"}], veteran) == ([True], ["No"])
+    assert run_fill_js([{"selector": "input", "type": "radio", "value": "no"}], veteran[:2]) == ([False], [])
+    assert run_fill_js([{"selector": "input", "type": "radio", "value": "Decline"}],
+                       ["Yes", "Decline to self identify"]) == ([True], ["Decline to self identify"])
+    assert run_fill_js([{"selector": "input", "type": "radio", "value": "male"}], ["Female", "Male"]) == \
+        ([True], ["Male"])
+
+
+@pytest.mark.asyncio
+async def test_autofill_fills_in_one_batch_and_uploads_resume(stub_server, profile):
+    """Test that all planned fields go out in a single evaluate and the resume through DOM.setFileInputFiles."""
+    browser = make_browser(serve_form(stub_server, "greenhouse_form"))
+
+    result = await FormAutofiller(browser).autofill(profile, RESUME_PATH)
+
+    send = browser.cdp_session.cdp_client.send
+    fill_calls = [c for c in send.Runtime.evaluate.await_args_list if c.kwargs["params"].get("returnByValue")
+                  and "const items" in c.kwargs["params"]["expression"]]
+    assert len(fill_calls) == 1
+    assert len(browser.filled_items) == len(result.filled) == 10
+    assert result.uploaded_resume
+    send.DOM.setFileInputFiles.assert_awaited_once_with(
+        params={"files": [str(Path(RESUME_PATH).absolute())], "objectId": "node-1"},
+        session_id="session-1",
+    )
+    assert "Why do you want to work at Acme?" in [f.label for f in result.leftovers]
+
+
+@pytest.mark.asyncio
+async def test_autofill_reports_failed_fills_as_leftovers(profile):
+    """Test that fields the page rejected are handed back to the agent."""
+    html = '<form><label for="email">Email</label><input id="email" name="email"></form>'
+    browser = make_browser(html)
+    browser.cdp_session.cdp_client.send.Runtime.evaluate = AsyncMock(side_effect=[
+        {"result": {"value": html}},
+        {"result": {"value": [False]}},
+    ])
+
+    result = await FormAutofiller(browser).autofill(profile, None)
+
+    assert result.filled == []
+    assert [f.label for f in result.leftovers] == ["Email"]
+
+
+@pytest.mark.asyncio
+async def test_autofill_uses_learned_answers_for_leftovers(stub_server, profile, tmp_path):
+    """Test that questions answered on earlier forms are filled before the agent sees them."""
+    answer_store = AnswerStore(tmp_path / "answers.db")
+    answer_store.record_many([
+        ("How did you hear about us?", "LinkedIn", "text"),
+        ("Are you willing to relocate to Berlin?", "no", "radio"),
+        ("Why do you want to work at Acme?", "Because", "textarea"),
+    ])
+    browser = make_browser(serve_form(stub_server, "lever_form"))
+    html = serve_form(stub_server, "greenhouse_form")
+
+    lever = await FormAutofiller(browser, answer_store).autofill(profile, RESUME_PATH)
+    browser.filled_items.clear()
+    greenhouse = await FormAutofiller(make_browser(html), answer_store).autofill(profile, RESUME_PATH)
+
+    lever_learned = {a.field.label: (a.key, a.value) for a in lever.filled if a.key.startswith("learned")}
+    greenhouse_learned = {a.field.label: (a.key, a.value) for a in greenhouse.filled if a.key.startswith("learned")}
+    assert lever_learned == {"Are you willing to relocate to Berlin?": ("learned:exact", "No")}
+    assert greenhouse_learned == {"How did you hear about us?": ("learned:exact", "LinkedIn")}
+    # Free-text answers are never reused
+    assert "Why do you want to work at Acme?" in [f.label for f in greenhouse.leftovers]
+    assert answer_store.stats.hits == 2
+    answer_store.close()
+
+
+@pytest.mark.asyncio
+async def test_read_values(stub_server):
+    """Test that current field answers are read back in one evaluate, keyed by selector."""
+    browser = make_browser(serve_form(stub_server, "greenhouse_form"))
+    browser.page_values = {'input[id="question_30005"]': "A friend"}
+    fields = [f for f in detect_form_fields(serve_form(stub_server, "greenhouse_form")) if f.label == "How did you hear about us?"]
+
+    values = await FormAutofiller(browser).read_values(fields)
+
+    assert values == {'input[id="question_30005"]': "A friend"}
+    assert await FormAutofiller(browser).read_values([]) == {}
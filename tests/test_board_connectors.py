@@ -0,0 +1,213 @@
+import json
+import pytest
+import pytest_asyncio
+import sys
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import StubResponse
+from app.agents.job_search_agent import JobSearchAgent
+from app.connectors import (
+    AshbyConnector, BoardConnector, BoardSync, GreenhouseConnector, LeverConnector, parse_board,
+)
+from app.http_client import PooledHttpClient
+from app.job_pipeline import JobPipeline
+from app.jobs import JobStore
+from app.models.llm_responses import JobFitAnalysis
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ats_boards"
+BOARDS = ["greenhouse:acme", "lever:globex", "ashby:initech"]
+BOARD_PATHS = {"greenhouse": "/greenhouse/acme/jobs", "lever": "/lever/globex", "ashby": "/ashby/initech"}
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES / f"{name}.json").read_text(encoding="utf-8")
+
+
+def json_response(body: str, delay: float = 0.0) -> StubResponse:
+    return StubResponse(body=body, headers={"Content-Type": "application/json"}, delay=delay)
+
+
+def base_urls(stub_server) -> dict[str, str]:
+    return {ats: stub_server.url(f"/{ats}") for ats in ("greenhouse", "lever", "ashby")}
+
+
+def route_boards(stub_server, delay: float = 0.0):
+    """Serves the recorded board payloads the way the real APIs lay them out."""
+    stub_server.route(BOARD_PATHS["greenhouse"], json_response(fixture("greenhouse_acme"), delay))
+    stub_server.route(BOARD_PATHS["lever"], json_response(fixture("lever_globex"), delay))
+    stub_server.route(BOARD_PATHS["ashby"], json_response(fixture("ashby_initech"), delay))
+
+
+@pytest_asyncio.fixture
+async def http():
+    client = PooledHttpClient()
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(tmp_path / "jobs.db")
+    yield job_store
+    job_store.close()
+
+
+@pytest.mark.asyncio
+async def test_greenhouse_connector(stub_server, http):
+    """Test that Greenhouse postings are read with their unescaped content and update time."""
+    route_boards(stub_server)
+
+    postings = await GreenhouseConnector(http, stub_server.url("/greenhouse")).list_postings("acme")
+
+    assert [(p.job_id, p.title, p.location) for p in postings] == [
+        ("4012345", "Senior Python Engineer", "Remote - US"),
+        ("4012346", "Engineering Manager", "New York, NY"),
+    ]
+    assert postings[0].description.splitlines() == [
+        "Acme is hiring a", "Senior Python Engineer", "to build our data platform.",
+        "Requirements", "5+ years of Python", "Experience with Django and AWS",
+    ]
+    assert postings[0].updated_at == 1759334400.0
+    assert "content=true" in stub_server.requests_for(BOARD_PATHS["greenhouse"])[0].path
+
+
+@pytest.mark.asyncio
+async def test_lever_connector_reads_lists_and_pages(stub_server, http):
+    """Test that Lever descriptions include the requirement lists and that full pages fetch the next one."""
+    recorded = json.loads(fixture("lever_globex"))
+    full_page = [dict(recorded[0], id=f"{i:08x}-0000-4000-8000-000000000000") for i in range(100)]
+    stub_server.route(
+        BOARD_PATHS["lever"],
+        lambda request: json_response(json.dumps(full_page if "skip=0" in request.path else recorded)),
+    )
+
+    postings = await LeverConnector(http, stub_server.url("/lever")).list_postings("globex")
+
+    assert len(postings) == 101
+    last = postings[-1]
+    assert (last.title, last.location, last.url) == ("Backend Engineer", "Berlin", recorded[0]["hostedUrl"])
+    assert "What we look for\n3+ years of backend experience" in last.description
+    assert last.description.endswith("We offer relocation support.")
+    assert last.updated_at == 1759300000.0
+    assert len(stub_server.requests_for(BOARD_PATHS["lever"])) == 2
+
+
+@pytest.mark.asyncio
+async def test_ashby_connector_skips_unlisted(stub_server, http):
+    """Test that only listed Ashby postings are returned."""
+    route_boards(stub_server)
+
+    postings = await AshbyConnector(http, stub_server.url("/ashby")).list_postings("initech")
+
+    assert [p.title for p in postings] == ["Machine Learning Engineer"]
+    assert postings[0].description == "Train and ship ranking models with PyTorch."
+
+
+def test_connector_without_list_postings_cannot_be_created():
+    """Test that a connector missing list_postings fails when built, not in the middle of a sync."""
+    class IncompleteConnector(BoardConnector):
+        ats = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteConnector(MagicMock(spec=PooledHttpClient))
+
+
+def test_parse_board():
+    """Test board specs and that unknown boards are rejected."""
+    assert parse_board(" Greenhouse:acme ") == ("greenhouse", "acme")
+    with pytest.raises(ValueError):
+        parse_board("workday:acme")
+    with pytest.raises(ValueError):
+        parse_board("lever")
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_boards_concurrently(stub_server, http, store):
+    """Test that all boards are listed at once and a failing board does not hold up the others."""
+    route_boards(stub_server, delay=0.2)
+    stub_server.route(BOARD_PATHS["ashby"], StubResponse(status=500, body="error", delay=0.2))
+
+    updates = await BoardSync(store, BOARDS, http=http, base_urls=base_urls(stub_server)).fetch_updates()
+
+    assert sorted(updates) == ["greenhouse:acme", "lever:globex"]
+    assert len(updates["greenhouse:acme"]) == 2
+    assert stub_server.peak_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_is_incremental(stub_server, http, store):
+    """Test that a second sync only returns postings updated after the committed cursor."""
+    route_boards(stub_server)
+    sync = BoardSync(store, ["greenhouse:acme"], http=http, base_urls=base_urls(stub_server))
+
+    first = await sync.fetch_updates()
+    sync.commit("greenhouse:acme", first["greenhouse:acme"])
+    unchanged = await sync.fetch_updates()
+    payload = json.loads(fixture("greenhouse_acme"))
+    payload["jobs"][1]["updated_at"] = "2025-10-05T00:00:00Z"
+    stub_server.route(BOARD_PATHS["greenhouse"], json_response(json.dumps(payload)))
+    changed = await sync.fetch_updates()
+
+    assert len(first["greenhouse:acme"]) == 2
+    assert unchanged == {"greenhouse:acme": []}
+    assert [p.job_id for p in changed["greenhouse:acme"]] == ["4012346"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_scores_board_postings_without_fetching_pages(stub_server, http, store):
+    """Test that synced postings arrive described, are scored from the board text and are not added twice."""
+    route_boards(stub_server)
+    search_agent = MagicMock(spec=JobSearchAgent)
+    search_agent.concurrency = 2
+    search_agent.get_job_description = AsyncMock()
+    search_agent.analyze_job_fit = AsyncMock(return_value=JobFitAnalysis(is_fit=True, reasoning="ok"))
+    sync = BoardSync(store, BOARDS, http=http, base_urls=base_urls(stub_server))
+    pipeline = JobPipeline(store, search_agent, board_sync=sync)
+
+    counts = await pipeline.run()
+    assert await pipeline.sync_boards() == []
+
+    assert counts["scored"] == 4
+    search_agent.get_job_description.assert_not_awaited()
+    assert search_agent.analyze_job_fit.await_count == 4
+    job = store.find("https://www.acme.com/careers?gh_jid=4012346")
+    assert (job.job_key, job.query) == ("greenhouse:4012346", "greenhouse:acme")
+    assert job.description == "Engineering Manager\nNew York, NY\nLead a team of eight engineers shipping our billing services."
+    assert store.board_cursor("lever:globex") == 1759300000.0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rescores_updated_board_postings(stub_server, http, store):
+    """Test that an edited posting gets its new description and is scored again, unless already applied to."""
+    stub_server.route(BOARD_PATHS["greenhouse"], json_response(fixture("greenhouse_acme")))
+    search_agent = MagicMock(spec=JobSearchAgent)
+    search_agent.concurrency = 1
+    search_agent.analyze_job_fit = AsyncMock(return_value=JobFitAnalysis(is_fit=True, reasoning="ok"))
+    pipeline = JobPipeline(store, search_agent,
+                           board_sync=BoardSync(store, ["greenhouse:acme"], http=http, base_urls=base_urls(stub_server)))
+    await pipeline.run()
+    applied = store.find("https://job-boards.greenhouse.io/acme/jobs/4012345")
+    store.mark_applied(applied.id)
+
+    payload = json.loads(fixture("greenhouse_acme"))
+    for posting in payload["jobs"]:
+        posting["updated_at"] = "2025-10-05T00:00:00Z"
+        posting["content"] = "Now fully remote. " + posting["content"]
+    stub_server.route(BOARD_PATHS["greenhouse"], json_response(json.dumps(payload)))
+    synced = await pipeline.sync_boards()
+
+    job = store.find("https://www.acme.com/careers?gh_jid=4012346")
+    assert [j.job_key for j in synced] == ["greenhouse:4012346"]
+    assert job.state == "described"
+    assert "Now fully remote." in job.description
+    assert store.get(applied.id).state == "applied"
+    assert "Now fully remote." not in store.get(applied.id).description
+
+    await pipeline.score()
+    assert store.find("https://www.acme.com/careers?gh_jid=4012346").state == "scored"
+    assert search_agent.analyze_job_fit.await_count == 3
@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, AsyncMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.browser_readiness import get_page_html, wait_until_ready
+
+
+def make_browser(values: dict[str, list]):
+    """Create a browser session whose page evaluations return scripted values per expression."""
+    browser = MagicMock()
+    browser.is_cdp_connected = True
+    browser.agent_focus_target_id = "target-1"
+    cdp_session = MagicMock()
+    cdp_session.session_id = "session-1"
+
+    async def evaluate(params, session_id):
+        queue = values[params["expression"]]
+        value = queue.pop(0) if len(queue) > 1 else queue[0]
+        return {"result": {"value": value}}
+
+    cdp_session.cdp_client.send.Runtime.evaluate = evaluate
+    browser.get_or_create_cdp_session = AsyncMock(return_value=cdp_session)
+    return browser
+
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_waits_for_load():
+    """Test that readiness returns once the document has finished loading."""
+    browser = make_browser({"document.readyState": ["loading", "interactive", "complete"]})
+
+    waited = await wait_until_ready(browser, timeout=2, network_idle_seconds=0)
+
+    assert 0 < waited < 1
+
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_waits_for_network_idle():
+    """Test that readiness waits until the resource count stops growing."""
+    browser = make_browser({
+        "document.readyState": ["complete"],
+        "performance.getEntriesByType('resource').length": [1, 2, 3, 3],
+    })
+
+    waited = await wait_until_ready(browser, timeout=2, network_idle_seconds=0.1)
+
+    assert waited >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_times_out_without_raising():
+    """Test that a page that never loads hits the timeout instead of hanging."""
+    browser = make_browser({"document.readyState": ["loading"]})
+
+    waited = await wait_until_ready(browser, timeout=0.2, network_idle_seconds=0)
+
+    assert 0.2 <= waited < 1
+
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_waits_for_cdp_target():
+    """Test that readiness does not probe the page before a target is attached."""
+    browser = make_browser({"document.readyState": ["complete"]})
+    browser.agent_focus_target_id = None
+
+    waited = await wait_until_ready(browser, timeout=0.2, network_idle_seconds=0)
+
+    assert waited >= 0.2
+    browser.get_or_create_cdp_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_page_html():
+    """Test that the page DOM is read with a single evaluation."""
+    browser = make_browser({"document.documentElement.outerHTML": ["<html><body>Job</body></html>"]})
+
+    assert await get_page_html(browser) == "<html><body>Job</body></html>"
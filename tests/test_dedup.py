@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.extraction import extract_job_description
+from app.jobs import MinHasher, NearDuplicateIndex, dedupe_urls, simhash
+from app.jobs.dedup import shingles
+from app.text_utils import normalize_tokens
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+
+
+@pytest.fixture(scope="module")
+def descriptions() -> dict[str, str]:
+    """Job descriptions extracted from the distinct postings in the job page fixtures."""
+    texts = {}
+    for name in ("greenhouse", "lever", "workday", "ashby", "json_ld", "generic"):
+        path = FIXTURES / f"{name}.html"
+        texts[name] = extract_job_description(path.read_text(encoding="utf-8"), f"https://example.com/{name}").text
+    return texts
+
+
+def test_simhash_is_close_for_small_edits(descriptions):
+    """Test that a cosmetic edit flips a few bits while a different posting flips many."""
+    original = normalize_tokens(descriptions["greenhouse"])
+    edited = normalize_tokens(descriptions["greenhouse"].replace("Senior", "Sr."))
+    other = normalize_tokens(descriptions["lever"])
+
+    assert (simhash(original) ^ simhash(edited)).bit_count() <= 8
+    assert (simhash(original) ^ simhash(other)).bit_count() > 16
+
+
+def test_minhash_estimates_jaccard():
+    """Test that the signature agreement tracks the true shingle overlap."""
+    hasher = MinHasher(permutations=256)
+    tokens = [f"word{i}" for i in range(200)]
+    a, b = shingles(tokens), shingles(tokens[:150] + [f"other{i}" for i in range(50)])
+    true_jaccard = len(a & b) / len(a | b)
+
+    estimate = MinHasher.jaccard(hasher.signature(a), hasher.signature(b))
+
+    assert estimate == pytest.approx(true_jaccard, abs=0.1)
+
+
+def test_index_keeps_distinct_postings(descriptions):
+    """Test that different jobs are all indexed as new."""
+    index = NearDuplicateIndex()
+
+    assert [index.add(name, text) for name, text in descriptions.items()] == [None] * len(descriptions)
+    assert len(index) == len(descriptions)
+
+
+def test_index_flags_reposts(descriptions):
+    """Test that the same posting with edits or extra boilerplate is reported as a duplicate."""
+    index = NearDuplicateIndex()
+    original = descriptions["greenhouse"]
+    index.add("greenhouse:1", original)
+
+    assert index.add("linkedin:9", original.replace("Senior", "Sr.")) == "greenhouse:1"
+    assert index.add("indeed:7", original + " Apply today through our careers page, we review every application.") == "greenhouse:1"
+    assert index.duplicates == 2
+    assert len(index) == 1
+
+
+def test_index_ignores_short_texts_and_same_key(descriptions):
+    """Test that placeholders are never matched and re-adding the same job is not a duplicate."""
+    index = NearDuplicateIndex()
+
+    assert index.add("a", "Job at https://example.com/1") is None
+    assert index.add("b", "Job at https://example.com/1") is None
+    index.add("greenhouse:1", descriptions["greenhouse"])
+    assert index.add("greenhouse:1", descriptions["greenhouse"]) is None
+    assert len(index) == 1
+
+
+def test_dedupe_urls_keeps_first_link_per_posting():
+    """Test that tracking variants and board mirrors of one posting collapse to the first link."""
+    urls = [
+        "https://job-boards.greenhouse.io/acme/jobs/123?gh_src=linkedin",
+        "https://www.acme.com/careers?gh_jid=123",
+        "https://example.com/jobs/1?utm_source=google",
+        "https://example.com/jobs/1/",
+        "https://example.com/jobs/2",
+    ]
+
+    assert dedupe_urls(urls) == [urls[0], urls[2], urls[4]]
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.cache import FitCache, job_fingerprint
+from app.models.llm_responses import JobFitAnalysis
+
+
+@pytest.fixture
+def fit_cache(tmp_path):
+    cache = FitCache(tmp_path / "fit_cache.db", ttl_seconds=60, max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_job_fingerprint_ignores_formatting():
+    """Test that case, punctuation and whitespace do not change the fingerprint."""
+    assert job_fingerprint("Python Developer!\n Remote") == job_fingerprint("python developer remote")
+    assert job_fingerprint("Python Developer") != job_fingerprint("Java Developer")
+
+
+def test_fit_cache_key_includes_profile_version():
+    """Test that the same job under a different profile version gets a different key."""
+    assert FitCache.make_key("Python Developer", "v1") != FitCache.make_key("Python Developer", "v2")
+
+
+def test_fit_cache_round_trip(fit_cache):
+    """Test that stored verdicts are returned and counted as hits."""
+    analysis = JobFitAnalysis(is_fit=True, reasoning="Match")
+    fit_cache.put("k1", analysis)
+
+    assert fit_cache.get("k1") == analysis
+    assert fit_cache.get("missing") is None
+    assert (fit_cache.hits, fit_cache.misses) == (1, 1)
+
+
+def test_fit_cache_lru_falls_back_to_sqlite(fit_cache):
+    """Test that entries evicted from memory are still served from SQLite."""
+    for key in ("k1", "k2", "k3"):
+        fit_cache.put(key, JobFitAnalysis(is_fit=True, reasoning=key))
+
+    assert "k1" not in fit_cache._lru
+    assert fit_cache.get("k1").reasoning == "k1"
+
+
+def test_fit_cache_expires_entries(fit_cache):
+    """Test that entries older than the TTL are treated as misses and removed."""
+    fit_cache.put("k1", JobFitAnalysis(is_fit=True, reasoning="Match"))
+
+    with patch('app.cache.fit_cache.time.time', return_value=time.time() + 120):
+        assert fit_cache.get("k1") is None
+
+    assert fit_cache.get("k1") is None
@@ -9,7 +9,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.agents.job_application_agent import JobApplicationAgent
 from app.agents.knowledge_base_agent import KnowledgeBaseAgent
+from app.agents.profile_agent import ApplicantProfileAgent
 from app.agents.resume_manager_agent import ResumeManagerAgent
+from app.autofill import AutofillResult, FieldAssignment, detect_form_fields
+from app.cache import AnswerStore
+from app.models.applicant_profile import ApplicantProfile, ContactInfo
 
 
 class TestJobApplicationAgent:
@@ -176,3 +180,174 @@ class TestJobApplicationAgent:
 
         # Should return the history even if unsuccessful
         assert result is not None
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_uses_readiness_instead_of_sleep(self, job_application_agent):
+        """Test that readiness checks replace the fixed delays and the saving is reported."""
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = "Looking for Python developer."
+
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=mock_history)
+        mock_agent.close = AsyncMock()
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent), \
+             patch('app.agents.job_application_agent.wait_until_ready', AsyncMock(return_value=0.25)) as mock_ready, \
+             patch('asyncio.sleep', AsyncMock()) as mock_sleep:
+            await job_application_agent.apply_to_job("https://example.com/job/123")
+
+        assert mock_ready.await_count == 2
+        mock_sleep.assert_not_called()
+        assert job_application_agent.last_readiness_saved_seconds == pytest.approx(3.5)
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_dom_fast_path_skips_extractor(self, job_application_agent):
+        """Test that a confident DOM extraction skips the extractor agent and feeds the resume ranking."""
+        html = (Path(__file__).parent / "fixtures" / "job_pages" / "greenhouse.html").read_text(encoding="utf-8")
+        job_application_agent.browser.navigate_to = AsyncMock()
+
+        mock_history = MagicMock()
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=mock_history)
+        mock_agent.close = AsyncMock()
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent) as mock_agent_cls, \
+             patch('app.agents.job_application_agent.wait_until_ready', AsyncMock(return_value=0.25)), \
+             patch('app.agents.job_application_agent.get_page_html', AsyncMock(return_value=html)):
+            result = await job_application_agent.apply_to_job("https://job-boards.greenhouse.io/acme/jobs/1")
+
+        assert result is mock_history
+        # Only the application agent is created
+        assert mock_agent_cls.call_count == 1
+        job_application_agent.browser.navigate_to.assert_awaited_once_with("https://job-boards.greenhouse.io/acme/jobs/1")
+        job_description = job_application_agent.resume_manager.get_best_resume.call_args.args[0]
+        assert "PostgreSQL and Kafka" in job_description
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_low_confidence_falls_back_to_extractor(self, job_application_agent):
+        """Test that a thin page falls back to the LLM extractor agent."""
+        job_application_agent.browser.navigate_to = AsyncMock()
+
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = "Looking for Python developer."
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=mock_history)
+        mock_agent.close = AsyncMock()
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent) as mock_agent_cls, \
+             patch('app.agents.job_application_agent.wait_until_ready', AsyncMock(return_value=0.25)), \
+             patch('app.agents.job_application_agent.get_page_html', AsyncMock(return_value="<html><body></body></html>")):
+            await job_application_agent.apply_to_job("https://example.com/job/123")
+
+        assert mock_agent_cls.call_count == 2
+        job_application_agent.resume_manager.get_best_resume.assert_awaited_once_with("Looking for Python developer.")
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_embeds_profile_snapshot(self, mock_browser_session, mock_knowledge_base, mock_resume_manager):
+        """Test that the profile snapshot is given to the agent in the task and as an instant lookup tool."""
+        profile = ApplicantProfile(full_name="Jane Doe", contact=ContactInfo(email="jane@example.com"))
+        profile_agent = MagicMock(spec=ApplicantProfileAgent)
+        profile_agent.get_profile = AsyncMock(return_value=profile)
+        agent = JobApplicationAgent(mock_browser_session, mock_knowledge_base, mock_resume_manager, profile_agent=profile_agent)
+
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = "Looking for Python developer."
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=mock_history)
+        mock_agent.close = AsyncMock()
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent) as mock_agent_cls:
+            await agent.apply_to_job("https://example.com/job/123")
+
+        application_kwargs = mock_agent_cls.call_args.kwargs
+        assert "jane@example.com" in application_kwargs["task"]
+        actions = application_kwargs["tools"].registry.registry.actions
+        assert await actions["get_applicant_profile"].function(section="contact") == '{"email": "jane@example.com"}'
+        assert "query_knowledge_base" in await actions["get_applicant_profile"].function(section="eeo")
+        mock_knowledge_base.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_query_knowledge_base_tool_is_async(self, job_application_agent, mock_knowledge_base):
+        """Test that the knowledge base tool awaits the non-blocking query path."""
+        mock_knowledge_base.aquery = AsyncMock(return_value="Phone: 555-0100")
+        action = job_application_agent._build_tools().registry.registry.actions["query_knowledge_base"]
+
+        result = await action.function(question="What is the applicant's phone number?")
+
+        assert result == "Phone: 555-0100"
+        mock_knowledge_base.aquery.assert_awaited_once_with("What is the applicant's phone number?")
+        mock_knowledge_base.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_autofills_before_agent(self, mock_browser_session, mock_knowledge_base, mock_resume_manager):
+        """Test that autofilled fields and the attached resume are reported, leaving only the leftovers to the agent."""
+        profile = ApplicantProfile(first_name="Jane", last_name="Doe", contact=ContactInfo(email="jane@example.com"))
+        profile_agent = MagicMock(spec=ApplicantProfileAgent)
+        profile_agent.get_profile = AsyncMock(return_value=profile)
+        agent = JobApplicationAgent(mock_browser_session, mock_knowledge_base, mock_resume_manager, profile_agent=profile_agent)
+        form = detect_form_fields(
+            '<form><label for="first_name">First Name</label><input id="first_name" name="first_name">'
+            '<label for="q1">Why do you want to work here?</label><textarea id="q1" name="q1"></textarea></form>'
+        )
+        autofill = AutofillResult(
+            filled=[FieldAssignment(field=form[0], key="first_name", value="Jane")],
+            uploaded_resume=True,
+            leftovers=[form[1]],
+        )
+
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = "Looking for Python developer."
+        mock_agent = MagicMock()
+        mock_agent.run = AsyncMock(return_value=mock_history)
+        mock_agent.close = AsyncMock()
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent) as mock_agent_cls, \
+             patch('app.agents.job_application_agent.FormAutofiller') as mock_autofiller_cls:
+            mock_autofiller_cls.return_value.autofill = AsyncMock(return_value=autofill)
+            await agent.apply_to_job("https://example.com/job/123")
+
+        mock_autofiller_cls.return_value.autofill.assert_awaited_once_with(profile, mock_resume_manager.get_best_resume.return_value)
+        task = mock_agent_cls.call_args.kwargs["task"]
+        assert "already attached" in task
+        assert "First Name" in task
+        assert "- Why do you want to work here?" in task
+
+    @pytest.mark.asyncio
+    async def test_apply_to_job_learns_submitted_answers(self, mock_browser_session, mock_knowledge_base, mock_resume_manager, tmp_path):
+        """Test that answers the agent gave to leftover questions are stored after a successful application."""
+        answer_store = AnswerStore(tmp_path / "answers.db")
+        agent = JobApplicationAgent(mock_browser_session, mock_knowledge_base, mock_resume_manager, answer_store=answer_store)
+        form = detect_form_fields(
+            '<form><label for="q1">How did you hear about us?</label><input id="q1" name="q1">'
+            '<label for="q2">Why do you want to work here?</label><textarea id="q2" name="q2"></textarea></form>'
+        )
+        autofill = AutofillResult(uploaded_resume=True, leftovers=form)
+
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = "Looking for Python developer."
+        mock_agent = MagicMock()
+        mock_agent.close = AsyncMock()
+
+        async def run(max_steps, on_step_start=None, on_step_end=None):
+            if on_step_end is not None:
+                await on_step_end(mock_agent)
+            return mock_history
+
+        mock_agent.run = AsyncMock(side_effect=run)
+
+        with patch('app.agents.job_application_agent.Agent', return_value=mock_agent), \
+             patch('app.agents.job_application_agent.FormAutofiller') as mock_autofiller_cls:
+            mock_autofiller_cls.return_value.autofill = AsyncMock(return_value=autofill)
+            mock_autofiller_cls.return_value.read_values = AsyncMock(return_value={'input[id="q1"]': "LinkedIn"})
+            await agent.apply_to_job("https://example.com/job/123")
+
+        # Only the short-answer field is watched and learned
+        mock_autofiller_cls.return_value.read_values.assert_awaited_with([form[0]])
+        assert answer_store.lookup("How did you hear about us?").answer == "LinkedIn"
+        assert len(answer_store) == 1
+        answer_store.close()
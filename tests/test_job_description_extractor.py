@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.extraction import detect_site, extract_job_description
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+
+
+def load(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("url,site", [
+    ("https://job-boards.greenhouse.io/acme/jobs/4012345", "greenhouse"),
+    ("https://boards.greenhouse.io/acme/jobs/4012345", "greenhouse"),
+    ("https://jobs.lever.co/globex/5f1c", "lever"),
+    ("https://initech.wd5.myworkdayjobs.com/en-US/initech/job/123", "workday"),
+    ("https://jobs.ashbyhq.com/hooli/abc", "ashby"),
+    ("https://example.com/careers/1", None),
+    ("https://notgreenhouse.io.example.com/jobs/1", None),
+])
+def test_detect_site(url, site):
+    """Test that known applicant tracking systems are recognised by host."""
+    assert detect_site(url) == site
+
+
+@pytest.mark.parametrize("fixture,url,method,expected", [
+    ("greenhouse.html", "https://job-boards.greenhouse.io/acme/jobs/1", "greenhouse", "PostgreSQL and Kafka"),
+    ("lever.html", "https://jobs.lever.co/globex/123", "lever", "Strong SQL and Python skills"),
+    ("workday.html", "https://initech.wd5.myworkdayjobs.com/en-US/initech/job/123", "workday", "PyTorch"),
+    ("ashby.html", "https://jobs.ashbyhq.com/hooli/abc", "ashby", "React and TypeScript"),
+])
+def test_site_selectors_extract_description(fixture, url, method, expected):
+    """Test that each ATS fixture is extracted by its site selectors with high confidence."""
+    result = extract_job_description(load(fixture), url)
+
+    assert result.method == method
+    assert result.confidence >= 0.8
+    assert expected in result.text
+
+
+def test_extraction_drops_page_chrome():
+    """Test that navigation, forms and footers do not leak into the description."""
+    result = extract_job_description(load("greenhouse.html"), "https://job-boards.greenhouse.io/acme/jobs/1")
+
+    assert "Privacy Policy" not in result.text
+    assert "First Name" not in result.text
+    assert "window.__remixContext" not in result.text
+
+
+def test_lever_keeps_requirements_outside_intro():
+    """Test that Lever postings include the requirement lists, not only the intro block."""
+    result = extract_job_description(load("lever.html"), "https://jobs.lever.co/globex/123")
+
+    assert "Globex is looking for a Data Engineer" in result.text
+    assert "3+ years of experience in data engineering" in result.text
+
+
+def test_json_ld_job_posting():
+    """Test that a schema.org JobPosting is used when the page body is rendered by JavaScript."""
+    result = extract_job_description(load("json_ld.html"), "https://umbrella.example.com/jobs/9")
+
+    assert result.method == "json-ld"
+    assert result.confidence >= 0.6
+    assert "Kubernetes fleet" in result.text
+    assert "<li>" not in result.text
+
+
+def test_heuristics_on_unknown_site():
+    """Test that the readability fallback picks the article over sidebars and navigation."""
+    result = extract_job_description(load("generic.html"), "https://stark.example.com/careers/backend")
+
+    assert result.method == "heuristic"
+    assert result.confidence >= 0.6
+    assert "gRPC APIs in Go" in result.text
+    assert "Other job one" not in result.text
+    assert "Contact" not in result.text
+
+
+def test_ats_page_on_unknown_host_uses_heuristics():
+    """Test that a known ATS page on an unexpected host still extracts via heuristics."""
+    result = extract_job_description(load("workday.html"), "https://careers.initech.example.com/job/123")
+
+    assert result.method == "heuristic"
+    assert "PyTorch" in result.text
+
+
+def test_thin_page_has_no_confident_result():
+    """Test that an unrendered single-page app yields nothing for the caller to trust."""
+    result = extract_job_description(load("thin.html"), "https://jobs.ashbyhq.com/hooli/abc")
+
+    assert result is None or result.confidence < 0.6
+
+
+def test_empty_html():
+    """Test that empty input is handled without raising."""
+    assert extract_job_description("", "") is None
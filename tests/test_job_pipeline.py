@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.agents.job_search_agent import JobSearchAgent
+from app.job_pipeline import JobPipeline
+from app.jobs import JobStore
+from app.models.llm_responses import JobFitAnalysis
+from app.scheduler import ApplicationReport, ApplicationResult, ApplicationScheduler
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-batch; not caught like an ordinary error."""
+
+
+URLS = [
+    "https://boards.greenhouse.io/acme/jobs/1?gh_src=google",
+    "https://boards.greenhouse.io/acme/jobs/1",
+    "https://jobs.lever.co/globex/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60",
+    "https://example.com/jobs/java",
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(tmp_path / "jobs.db")
+    yield job_store
+    job_store.close()
+
+
+@pytest.fixture
+def mock_search_agent():
+    """Create a search agent that finds URLS and only fits non-Java jobs."""
+    agent = MagicMock(spec=JobSearchAgent)
+    agent.concurrency = 2
+    agent.run_job_search = AsyncMock(return_value=URLS)
+    agent.get_job_description = AsyncMock(side_effect=lambda url: f"Description of {url}")
+    agent.analyze_job_fit = AsyncMock(
+        side_effect=lambda description: JobFitAnalysis(is_fit="java" not in description, reasoning="checked")
+    )
+    return agent
+
+
+@pytest.fixture
+def mock_scheduler():
+    """Create a scheduler that succeeds on every URL and reports each result."""
+    scheduler = MagicMock(spec=ApplicationScheduler)
+
+    async def run(job_urls, on_result=None):
+        report = ApplicationReport()
+        for url in job_urls:
+            result = ApplicationResult(url=url, status="succeeded", worker=0)
+            report.results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return report
+
+    scheduler.run = AsyncMock(side_effect=run)
+    return scheduler
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_jobs_to_applied(store, mock_search_agent, mock_scheduler):
+    """Test that duplicates are dropped, every job is scored once and only fitting jobs are applied to."""
+    counts = await JobPipeline(store, mock_search_agent, mock_scheduler).run("python", limit=2)
+
+    assert counts == {"discovered": 0, "described": 0, "scored": 1, "applied": 2, "failed": 0}
+    assert mock_search_agent.get_job_description.await_count == 3
+    assert mock_search_agent.analyze_job_fit.await_count == 3
+    applied_urls = mock_scheduler.run.call_args.args[0]
+    assert sorted(applied_urls) == sorted([URLS[0], URLS[2]])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_resumes_after_crash(store, mock_search_agent, mock_scheduler):
+    """Test that a rerun neither searches nor rescores jobs an interrupted run already handled."""
+    mock_search_agent.analyze_job_fit.side_effect = [JobFitAnalysis(is_fit=True, reasoning="ok"), Crash]
+    pipeline = JobPipeline(store, mock_search_agent, mock_scheduler, worker_id="crashed")
+    mock_search_agent.concurrency = 1
+    with pytest.raises(Crash):
+        await pipeline.run("python")
+    # The interrupted job is still claimed by the dead worker until its lease runs out
+    store.lease_seconds = 0
+
+    mock_search_agent.get_job_description.reset_mock()
+    mock_search_agent.analyze_job_fit.reset_mock()
+    mock_search_agent.analyze_job_fit.side_effect = lambda d: JobFitAnalysis(is_fit=True, reasoning="ok")
+    counts = await JobPipeline(store, mock_search_agent, mock_scheduler, worker_id="resumed").run("python")
+
+    mock_search_agent.run_job_search.assert_awaited_once()
+    # Only the interrupted job (already described) and the untouched one are scored again
+    assert mock_search_agent.get_job_description.await_count == 1
+    assert mock_search_agent.analyze_job_fit.await_count == 2
+    assert counts["applied"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_closes_failed_applications(store, mock_search_agent, mock_scheduler):
+    """Test that a failed application is never submitted again, a skipped one stays queued and unreported jobs are released."""
+    async def run(job_urls, on_result=None):
+        on_result(ApplicationResult(url=job_urls[0], status="failed", worker=0, error="Form error"))
+        on_result(ApplicationResult(url=job_urls[1], status="skipped", worker=0, error="No suitable resume found."))
+        return ApplicationReport()
+
+    mock_scheduler.run.side_effect = run
+    store.add([f"https://example.com/jobs/{i}" for i in range(3)])
+
+    await JobPipeline(store, mock_search_agent, mock_scheduler).run()
+
+    failed, = store.jobs("failed")
+    assert (failed.url, failed.error) == ("https://example.com/jobs/0", "Form error")
+    assert [(job.attempts, job.claimed_by) for job in store.jobs("scored")] == [(1, None), (0, None)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retries_failed_scoring_on_the_next_run(store, mock_search_agent):
+    """Test that a job failing to score is tried once per run until it runs out of attempts."""
+    store.add(["https://example.com/jobs/1"])
+    mock_search_agent.analyze_job_fit.side_effect = RuntimeError("LLM down")
+
+    await JobPipeline(store, mock_search_agent).score()
+    assert mock_search_agent.analyze_job_fit.await_count == 1
+    assert store.jobs("described")[0].attempts == 1
+
+    for _ in range(store.max_attempts - 1):
+        await JobPipeline(store, mock_search_agent).score()
+    assert mock_search_agent.analyze_job_fit.await_count == store.max_attempts
+    assert store.counts()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_workers_share_the_queue(store, mock_search_agent):
+    """Test that concurrent score workers each take different jobs."""
+    store.add([f"https://example.com/jobs/{i}" for i in range(6)])
+    seen = []
+
+    async def describe(url):
+        seen.append(url)
+        await asyncio.sleep(0.01)
+        return f"Description of {url}"
+
+    mock_search_agent.get_job_description.side_effect = describe
+    mock_search_agent.concurrency = 3
+
+    await JobPipeline(store, mock_search_agent).score()
+
+    assert len(seen) == len(set(seen)) == 6
+    assert store.counts()["scored"] == 6
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_duplicate_descriptions(store, mock_search_agent, mock_scheduler):
+    """Test that a posting reached through a second URL is closed as a duplicate without scoring it."""
+    description = " ".join(f"Responsibility {i}: build Python services with Django and AWS." for i in range(10))
+    mock_search_agent.get_job_description.side_effect = lambda url: description
+    mock_search_agent.concurrency = 1
+    first, second = store.add(["https://boards.greenhouse.io/acme/jobs/1", "https://www.linkedin.com/jobs/view/99"])
+
+    await JobPipeline(store, mock_search_agent, mock_scheduler).run()
+
+    mock_search_agent.analyze_job_fit.assert_awaited_once_with(description)
+    duplicate = store.get(second.id)
+    assert (duplicate.state, duplicate.is_fit, duplicate.reasoning) == ("scored", False, "Duplicate of greenhouse:1")
+    assert store.get(first.id).state == "applied"
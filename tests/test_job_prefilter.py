@@ -0,0 +1,126 @@
+import pytest
+import sys
+import os
+from pathlib import Path
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.extraction import extract_job_description
+from app.ranking import JobPrefilter, PrefilterRules, extract_skills
+from app.ranking.job_prefilter import detect_seniority, job_title
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+BACKEND_RESUME = """Jane Doe
+Summary
+Backend engineer with 6 years building Python services.
+Experience
+Built Django and FastAPI services on AWS, PostgreSQL and Redis, with Kafka event pipelines.
+Skills
+Python, Django, PostgreSQL, Kafka, AWS, Docker, Kubernetes"""
+
+
+@pytest.fixture(scope="module")
+def descriptions() -> dict[str, str]:
+    """Job descriptions extracted from the job page fixtures."""
+    return {
+        name: extract_job_description((FIXTURES / f"{name}.html").read_text(encoding="utf-8"), "https://example.com").text
+        for name in ("greenhouse", "lever", "ashby", "generic")
+    }
+
+
+def test_extract_skills_handles_aliases_and_phrases():
+    """Test that aliases map to one name, phrases are matched and 'go' needs a programming cue."""
+    assert extract_skills("Services in Go, Postgres and k8s; some machine learning") == \
+        {"golang", "postgresql", "kubernetes", "machine learning"}
+    assert extract_skills("You will go the extra mile with Node and sklearn") == {"node.js", "scikit-learn"}
+
+
+@pytest.mark.parametrize("title, level", [
+    ("Senior Backend Engineer", "senior"),
+    ("Software Engineering Intern, Summer 2026", "intern"),
+    ("Lead Data Engineer", "lead"),
+    ("You will lead a team of engineers", "mid"),
+    ("Director of Engineering", "director"),
+    ("Backend Developer", "mid"),
+    ("", "mid"),
+])
+def test_detect_seniority(title, level):
+    assert detect_seniority(title) == level
+
+
+def test_job_title(descriptions):
+    """Test that the title is the first line only when it reads as a title."""
+    assert job_title(descriptions["generic"]) == "Backend Developer"
+    assert job_title("Engineering Manager\nNew York, NY\nLead a team of eight engineers.") == "Engineering Manager"
+    assert job_title(descriptions["greenhouse"]) == ""  # Opens with a sentence about the company
+
+
+def test_seniority_ignores_the_body():
+    """Test that a manager or head the job reports to does not make a mid-level job senior."""
+    description = ("Backend Engineer\nRemote\nYou will build Python services, reporting to our "
+                   "Engineering Manager / Head of Platform.")
+
+    assert JobPrefilter(PrefilterRules(seniority_levels=["mid"])).check(description).passed
+
+
+def test_score_rejects_mismatched_stack(descriptions):
+    """Test that jobs far from the resumes are rejected on score while matching ones pass."""
+    prefilter = JobPrefilter(resumes={"backend.pdf": BACKEND_RESUME}, min_score=0.15)
+
+    verdicts = dict(zip(descriptions, prefilter.check_many(list(descriptions.values()))))
+
+    assert verdicts["greenhouse"].passed and verdicts["greenhouse"].score > 0.4
+    assert not verdicts["ashby"].passed and verdicts["ashby"].rule == "score"
+    assert verdicts["ashby"].job_skills == ["css", "react", "typescript"]
+    assert prefilter.stats.checked == 4
+    assert prefilter.stats.rejection_rate == prefilter.stats.rejected / 4
+    assert prefilter.stats.by_rule["score"] == prefilter.stats.rejected
+
+
+def test_hard_rules(descriptions):
+    """Test that each rule from the config rejects the jobs breaking it, with its reason."""
+    senior = "Senior Backend Engineer\n" + descriptions["greenhouse"]
+    assert JobPrefilter(PrefilterRules(seniority_levels=["mid"])).check(senior).rule == "seniority"
+    assert JobPrefilter(PrefilterRules(title_keywords=["developer"])).check(senior).rule == "title"
+    assert JobPrefilter(PrefilterRules(excluded_title_keywords=["backend"])).check(descriptions["generic"]).reason == \
+        "title mentions 'backend'"
+    assert JobPrefilter(PrefilterRules(required_skills=["python", "django"])).check(descriptions["ashby"]).rule == \
+        "required_skills"
+    assert JobPrefilter(PrefilterRules(locations=["Tokyo"], allow_remote=False)).check(descriptions["lever"]).rule == \
+        "location"
+    # Without resumes to compare against, jobs passing the rules are let through
+    assert JobPrefilter(PrefilterRules(required_skills=["golang"])).check(descriptions["generic"]).passed
+
+
+def test_title_keywords_match_whole_words_in_the_title():
+    """Test that title keywords match whole words of the title only, never the body."""
+    prefilter = JobPrefilter(PrefilterRules(title_keywords=["engineer"], excluded_title_keywords=["intern", "sales"]))
+    body = "\nRemote\nBuild internal tooling and international payments with our sales engineering team."
+
+    assert prefilter.check("Senior Backend Engineer" + body).passed
+    assert prefilter.check("Software Engineer Intern" + body).reason == "title mentions 'intern'"
+    assert prefilter.check("Backend Engineers, Internal Platform" + body).passed
+    assert prefilter.check("Sales Engineer" + body).reason == "title mentions 'sales'"
+    assert prefilter.check("Engineering Manager" + body).rule == "title"
+    # Without a title there is nothing to match the title rules against
+    assert prefilter.check("We build internal tools for our sales team. Join us!" + body).passed
+
+
+def test_rules_load_from_file(tmp_path):
+    """Test that rules are read from JSON and that a missing file means no rules."""
+    path = tmp_path / "rules.json"
+    path.write_text('{"seniority_levels": ["senior"], "skills": ["celery"]}', encoding="utf-8")
+
+    prefilter = JobPrefilter.from_file(path, {"a.pdf": "Python and Celery"})
+
+    assert prefilter.rules.seniority_levels == ["senior"]
+    assert prefilter.applicant_skills == {"python", "celery"}
+    assert JobPrefilter.from_file(tmp_path / "missing.json").rules == PrefilterRules()
+
+
+def test_report(descriptions):
+    prefilter = JobPrefilter(PrefilterRules(seniority_levels=["mid"]))
+    prefilter.check_many(["Senior Backend Engineer\n" + descriptions["greenhouse"], descriptions["generic"]])
+
+    assert prefilter.report() == "Pre-filter rejected 1 of 2 jobs (50%) [seniority: 1]"
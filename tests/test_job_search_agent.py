@@ -1,6 +1,9 @@
+import asyncio
+import re
 import pytest
 import sys
 import os
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, AsyncMock
 
 # Add the project root to the path
@@ -8,7 +11,82 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.agents.job_search_agent import JobSearchAgent
 from app.agents.knowledge_base_agent import KnowledgeBaseAgent
-from app.models.llm_responses import JobFitAnalysis
+from app.cache import FitCache
+from app.extraction import ExtractedJobDescription, JobPageFetcher
+from app.models.llm_responses import JobFitAnalysis, JobFitBatch, JobPosting, JobSearchPage, NumberedJobFitAnalysis
+from app.prompting import ApproximateTokenCounter, PromptCompactor
+from app.ranking import JobPrefilter, PrefilterRules
+
+
+def results_page(urls: list[str], has_more: bool = True) -> str:
+    """Structured output of one results page listing the given posting URLs."""
+    postings = [JobPosting(title=f"Engineer {i}", company="Acme", location="Remote", url=url, snippet="Build things")
+                for i, url in enumerate(urls)]
+    return JobSearchPage(postings=postings, has_more=has_more).model_dump_json()
+
+
+class FakeSearchAgent:
+    """
+    Stands in for a browser-use agent, answering one results page per finished run.
+    Like the real agent, `max_steps` caps the steps taken over all runs, follow-up
+    tasks included, and a run cut short by it finishes without a result.
+    """
+
+    def __init__(self, pages: list[str], steps_per_run: int = 1):
+        self.pages = pages
+        self.steps_per_run = steps_per_run
+        self.state = SimpleNamespace(n_steps=1)
+        self.runs = []
+        self.steps_taken = []
+        self.results = []
+        self.stopped = False
+
+    def add_new_task(self, task):
+        pass
+
+    def stop(self):
+        self.stopped = True
+
+    async def run(self, max_steps=500, on_step_start=None, on_step_end=None):
+        self.runs.append(max_steps)
+        steps = 0
+        while self.state.n_steps <= max_steps and steps < self.steps_per_run:
+            if on_step_start is not None:
+                await on_step_start(self)
+            if on_step_end is not None:
+                await on_step_end(self)
+            self.state.n_steps += 1
+            steps += 1
+        self.steps_taken.append(steps)
+        done = steps == self.steps_per_run
+        if done:
+            self.results.append(self.pages[len(self.results)])
+        history = MagicMock()
+        history.is_successful.return_value = done
+        history.final_result.return_value = self.results[-1] if done else None
+        return history
+
+
+class FakeFitLLM:
+    """Answers fit prompts, single or batched: every job that mentions Java is not a fit."""
+
+    def __init__(self, fail_batches: bool = False, skip_jobs: tuple[int, ...] = ()):
+        self.prompts: list[str] = []
+        self.fail_batches = fail_batches
+        self.skip_jobs = skip_jobs
+
+    async def ainvoke(self, messages, output_format=None, **kwargs):
+        prompt = messages[0].content
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if output_format is JobFitAnalysis:
+            return MagicMock(completion=JobFitAnalysis(is_fit="Java" not in prompt, reasoning="single"))
+        if self.fail_batches:
+            raise ValueError("malformed batch answer")
+        jobs = re.findall(r"Job (\d+):\n(.*)", prompt)
+        analyses = [NumberedJobFitAnalysis(job=int(number), is_fit="Java" not in text, reasoning=f"batched {number}")
+                    for number, text in jobs if int(number) not in self.skip_jobs]
+        return MagicMock(completion=JobFitBatch(analyses=analyses))
 
 
 class TestJobSearchAgent:
@@ -23,17 +101,37 @@ class TestJobSearchAgent:
     def mock_knowledge_base(self):
         """Create a mock knowledge base agent."""
         kb = MagicMock(spec=KnowledgeBaseAgent)
-        kb.query.return_value = "Applicant has 5 years of Python experience, skilled in Django and AWS."
+        kb.aquery.return_value = "Applicant has 5 years of Python experience, skilled in Django and AWS."
+        kb.version = "kb-v1"
         return kb
 
     @pytest.fixture
-    def job_search_agent(self, mock_browser_session, mock_knowledge_base):
-        """Create a JobSearchAgent instance with mocked dependencies."""
-        return JobSearchAgent(browser=mock_browser_session, knowledge_base=mock_knowledge_base)
+    def fit_cache(self, tmp_path):
+        """Create a fit cache backed by a temporary SQLite file."""
+        cache = FitCache(tmp_path / "fit_cache.db")
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def mock_page_fetcher(self):
+        """Create a page fetcher that finds no description over plain HTTP."""
+        fetcher = MagicMock(spec=JobPageFetcher)
+        fetcher.fetch_description = AsyncMock(return_value=None)
+        return fetcher
 
-    def test_job_search_agent_initialization(self, mock_browser_session, mock_knowledge_base):
+    @pytest.fixture
+    def job_search_agent(self, mock_browser_session, mock_knowledge_base, fit_cache, mock_page_fetcher):
+        """Create a JobSearchAgent instance with mocked dependencies."""
+        return JobSearchAgent(
+            browser=mock_browser_session,
+            knowledge_base=mock_knowledge_base,
+            fit_cache=fit_cache,
+            page_fetcher=mock_page_fetcher,
+        )
+
+    def test_job_search_agent_initialization(self, mock_browser_session, mock_knowledge_base, fit_cache):
         """Test that JobSearchAgent initializes properly."""
-        agent = JobSearchAgent(browser=mock_browser_session, knowledge_base=mock_knowledge_base)
+        agent = JobSearchAgent(browser=mock_browser_session, knowledge_base=mock_knowledge_base, fit_cache=fit_cache)
         assert agent is not None
         assert agent.browser == mock_browser_session
         assert agent.knowledge_base == mock_knowledge_base
@@ -67,13 +165,178 @@ class TestJobSearchAgent:
 
     @pytest.mark.asyncio
     async def test_analyze_job_fit_error_handling(self, job_search_agent):
-        """Test that job fit analysis handles errors gracefully."""
+        """Test that a failed analysis raises instead of guessing a verdict."""
         with patch.object(job_search_agent.llm, 'ainvoke', AsyncMock(side_effect=Exception("LLM error"))):
+            with pytest.raises(Exception, match="LLM error"):
+                await job_search_agent.analyze_job_fit("Some job description.")
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_reuses_profile_summary(self, job_search_agent, mock_knowledge_base):
+        """Test that the profile summary is queried once per knowledge base version."""
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=True, reasoning="Skills match well.")
+
+        with patch.object(job_search_agent.llm, 'ainvoke', AsyncMock(return_value=mock_response)):
+            await job_search_agent.analyze_job_fit("Python developer role.")
+            await job_search_agent.analyze_job_fit("Django developer role.")
+            assert mock_knowledge_base.aquery.await_count == 1
+
+            mock_knowledge_base.version = "kb-v2"
+            await job_search_agent.analyze_job_fit("Flask developer role.")
+
+        assert mock_knowledge_base.aquery.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_memoizes_verdicts(self, job_search_agent):
+        """Test that a job judged before is answered from the cache, ignoring formatting."""
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=False, reasoning="Needs Java.")
+        mock_ainvoke = AsyncMock(return_value=mock_response)
+
+        with patch.object(job_search_agent.llm, 'ainvoke', mock_ainvoke):
+            first = await job_search_agent.analyze_job_fit("Senior Java Architect, 10 years.")
+            second = await job_search_agent.analyze_job_fit("  senior java architect -- 10 YEARS ")
+
+        assert mock_ainvoke.call_count == 1
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_compacts_long_descriptions(self, mock_browser_session, mock_knowledge_base, fit_cache):
+        """Test that an oversized description is cut to its relevant sections before it reaches the LLM."""
+        compactor = PromptCompactor(ApproximateTokenCounter())
+        agent = JobSearchAgent(
+            browser=mock_browser_session, knowledge_base=mock_knowledge_base, fit_cache=fit_cache, compactor=compactor,
+        )
+        job_description = (
+            "Python Developer at Acme\n\nRequirements\nPython, Django and AWS experience.\n\n"
+            "Benefits\n" + "Free snacks and a gym membership. " * 300
+        )
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=True, reasoning="Skills match.")
+
+        with patch('app.agents.job_search_agent.FIT_PROMPT_JOB_TOKENS', 100), \
+             patch.object(agent.llm, 'ainvoke', AsyncMock(return_value=mock_response)) as mock_ainvoke:
+            await agent.analyze_job_fit(job_description)
+
+        prompt = mock_ainvoke.call_args.kwargs["messages"][0].content
+        assert "Python, Django and AWS experience." in prompt
+        assert "gym membership" not in prompt
+        assert compactor.stats.calls == 1 and compactor.stats.saved_tokens > 1000
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fits_batches_jobs_in_one_call(self, job_search_agent, mock_knowledge_base):
+        """Test that concurrent analyses share one call carrying the profile once, with verdicts in job order."""
+        job_search_agent.llm = FakeFitLLM()
+        descriptions = [f"{language} developer number {i}." for i, language in enumerate(["Python", "Java", "Go", "Java"])]
+
+        results = await job_search_agent.analyze_job_fits(descriptions)
+
+        assert [result.is_fit for result in results] == [True, False, True, False]
+        assert [result.reasoning for result in results] == ["batched 1", "batched 2", "batched 3", "batched 4"]
+        assert len(job_search_agent.llm.prompts) == 1
+        assert job_search_agent.llm.prompts[0].count(mock_knowledge_base.aquery.return_value) == 1
+        mock_knowledge_base.aquery.assert_awaited_once()
+        mock_knowledge_base.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fits_splits_batches_by_token_budget(self, job_search_agent):
+        """Test that a batch is closed before the next job would overflow the token budget."""
+        job_search_agent.llm = FakeFitLLM()
+        job_search_agent.compactor = PromptCompactor(ApproximateTokenCounter())
+        descriptions = [f"Python developer number {i}. " + "Build services. " * 40 for i in range(6)]
+
+        with patch('app.agents.job_search_agent.FIT_PROMPT_PROFILE_TOKENS', 100), \
+             patch('app.agents.job_search_agent.FIT_BATCH_VERDICT_TOKENS', 50), \
+             patch('app.agents.job_search_agent.FIT_BATCH_MAX_TOKENS', 720):
+            results = await job_search_agent.analyze_job_fits(descriptions)
+
+        assert all(result.is_fit for result in results)
+        assert [prompt.count("Job ") for prompt in job_search_agent.llm.prompts] == [2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fits_caps_batch_size(self, job_search_agent):
+        """Test that a batch never holds more than the batch size, and a lone leftover job uses the single-job prompt."""
+        job_search_agent.llm = FakeFitLLM()
+        job_search_agent.fit_batch_size = 2
+
+        await job_search_agent.analyze_job_fits([f"Python developer number {i}." for i in range(5)])
+
+        # Two full batches, then the last job alone in the single-job prompt
+        assert len(job_search_agent.llm.prompts) == 3
+        assert "Job Description:" in job_search_agent.llm.prompts[-1]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_single_calls(self, job_search_agent):
+        """Test that a batch whose answer cannot be used is rescored one job at a time."""
+        job_search_agent.llm = FakeFitLLM(fail_batches=True)
+
+        results = await job_search_agent.analyze_job_fits(["Python developer.", "Java developer.", "Rust developer."])
+
+        assert [result.is_fit for result in results] == [True, False, True]
+        assert [result.reasoning for result in results] == ["single"] * 3
+        assert len(job_search_agent.llm.prompts) == 4
+
+    @pytest.mark.asyncio
+    async def test_jobs_missing_from_a_batch_answer_are_rescored(self, job_search_agent):
+        """Test that jobs a batch answer leaves out are rescored one by one while the rest keep their batched verdicts."""
+        job_search_agent.llm = FakeFitLLM(skip_jobs=(2,))
+
+        results = await job_search_agent.analyze_job_fits(["Python developer.", "Java developer.", "Rust developer."])
+
+        assert [result.reasoning for result in results] == ["batched 1", "single", "batched 3"]
+        assert results[1].is_fit is False
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_cache_survives_restart(self, mock_browser_session, mock_knowledge_base, tmp_path):
+        """Test that verdicts persisted in SQLite are reused by a new agent."""
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=True, reasoning="Great match.")
+        db_path = tmp_path / "restart.db"
+
+        agent = JobSearchAgent(browser=mock_browser_session, knowledge_base=mock_knowledge_base, fit_cache=FitCache(db_path))
+        with patch.object(agent.llm, 'ainvoke', AsyncMock(return_value=mock_response)):
+            await agent.analyze_job_fit("Python developer role.")
+        agent.fit_cache.close()
+
+        restarted = JobSearchAgent(browser=mock_browser_session, knowledge_base=mock_knowledge_base, fit_cache=FitCache(db_path))
+        mock_ainvoke = AsyncMock()
+        with patch.object(restarted.llm, 'ainvoke', mock_ainvoke):
+            result = await restarted.analyze_job_fit("Python developer role.")
+        restarted.fit_cache.close()
+
+        mock_ainvoke.assert_not_called()
+        assert result.reasoning == "Great match."
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_does_not_cache_errors(self, job_search_agent):
+        """Test that error fallbacks are not memoized."""
+        with patch.object(job_search_agent.llm, 'ainvoke', AsyncMock(side_effect=Exception("LLM error"))):
+            with pytest.raises(Exception):
+                await job_search_agent.analyze_job_fit("Some job description.")
+
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=False, reasoning="Not a match.")
+        with patch.object(job_search_agent.llm, 'ainvoke', AsyncMock(return_value=mock_response)):
             result = await job_search_agent.analyze_job_fit("Some job description.")
 
-        # Should default to is_fit=True on error
-        assert result.is_fit is True
-        assert "analysis error" in result.reasoning
+        assert result.is_fit is False
+
+    @pytest.mark.asyncio
+    async def test_analyze_job_fit_prefilter_skips_llm(self, job_search_agent):
+        """Test that a job rejected by the local pre-filter never reaches the LLM."""
+        job_search_agent.prefilter = JobPrefilter(PrefilterRules(excluded_title_keywords=["intern"]))
+        mock_response = MagicMock()
+        mock_response.completion = JobFitAnalysis(is_fit=True, reasoning="Good match")
+
+        with patch.object(job_search_agent.llm, 'ainvoke', AsyncMock(return_value=mock_response)) as mock_ainvoke:
+            rejected = await job_search_agent.analyze_job_fit("Software Engineering Intern\nPython and Django.")
+            accepted = await job_search_agent.analyze_job_fit("Senior Software Engineer\nPython and Django.")
+
+        assert rejected.is_fit is False
+        assert rejected.reasoning == "Rejected by the local pre-filter: title mentions 'intern'"
+        assert accepted.is_fit is True
+        mock_ainvoke.assert_awaited_once()
+        assert job_search_agent.prefilter.stats.rejection_rate == 0.5
 
     @pytest.mark.asyncio
     async def test_run_job_search_success(self, job_search_agent, mock_browser_session):
@@ -125,6 +388,121 @@ class TestJobSearchAgent:
 
         assert urls == []
 
+    @pytest.mark.asyncio
+    async def test_run_job_search_drops_duplicate_links(self, job_search_agent):
+        """Test that URLs are parsed from free-form output and links to the same posting are kept once."""
+        mock_history = MagicMock()
+        mock_history.is_successful.return_value = True
+        mock_history.final_result.return_value = (
+            "Found these:\nhttps://boards.greenhouse.io/acme/jobs/7?gh_src=abc, "
+            "https://www.acme.com/careers?gh_jid=7\n(https://jobs.lever.co/globex/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60/apply)."
+        )
+
+        with patch('app.agents.job_search_agent.Agent') as mock_agent_class:
+            mock_agent_class.return_value.run = AsyncMock(return_value=mock_history)
+            urls = await job_search_agent.run_job_search("Python developer", limit=5)
+
+        assert urls == [
+            "https://boards.greenhouse.io/acme/jobs/7?gh_src=abc",
+            "https://jobs.lever.co/globex/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60/apply",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_postings_returns_typed_postings(self, job_search_agent):
+        """Test that structured results are yielded as postings and the agent is asked for the page schema."""
+        fake = FakeSearchAgent([results_page(["https://jobs.lever.co/acme/1", "https://example.com/jobs/2"], has_more=False)])
+
+        with patch('app.agents.job_search_agent.Agent', return_value=fake) as mock_agent_class:
+            postings = [p async for p in job_search_agent.search_postings("Python developer", limit=5)]
+
+        assert [(p.title, p.company, p.url) for p in postings] == [
+            ("Engineer 0", "Acme", "https://jobs.lever.co/acme/1"),
+            ("Engineer 1", "Acme", "https://example.com/jobs/2"),
+        ]
+        assert mock_agent_class.call_args.kwargs["output_model_schema"] is JobSearchPage
+        assert "google.com/search?q=Python+developer+jobs" in mock_agent_class.call_args.kwargs["task"]
+
+    @pytest.mark.asyncio
+    async def test_search_postings_paginates_until_limit(self, job_search_agent):
+        """Test that later pages are only read while more postings are needed, skipping repeated links."""
+        fake = FakeSearchAgent([
+            results_page(["https://example.com/jobs/1", "https://example.com/jobs/2"]),
+            results_page(["https://example.com/jobs/2/?utm_source=google", "https://example.com/jobs/3", "https://example.com/jobs/4"]),
+            results_page(["https://example.com/jobs/5"]),
+        ])
+
+        with patch('app.agents.job_search_agent.Agent', return_value=fake):
+            search = job_search_agent.search_postings("Python developer", limit=3)
+            first = await anext(search)
+            runs_after_first = len(fake.runs)
+            rest = [p.url async for p in search]
+
+        assert first.url == "https://example.com/jobs/1"
+        assert runs_after_first == 1
+        assert rest == ["https://example.com/jobs/2", "https://example.com/jobs/3"]
+        assert len(fake.runs) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_postings_stops_when_step_budget_is_spent(self, job_search_agent):
+        """Test that each page only gets the steps left in the budget and no page runs once it is spent."""
+        pages = [results_page([f"https://example.com/jobs/{i}"]) for i in range(5)]
+        fake = FakeSearchAgent(pages, steps_per_run=4)
+
+        with patch('app.agents.job_search_agent.Agent', return_value=fake):
+            urls = [p.url async for p in job_search_agent.search_postings("Python", limit=10, max_pages=5, max_steps=10)]
+
+        # max_steps counts the agent's steps across pages; the third page is cut short and yields nothing
+        assert fake.runs == [8, 10, 10]
+        assert fake.steps_taken == [4, 4, 2]
+        assert len(urls) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_postings_gives_every_page_its_own_steps(self, job_search_agent):
+        """Test that later pages get a full page's steps, not what the first page left of its allowance."""
+        pages = [results_page([f"https://example.com/jobs/{i}"]) for i in range(3)]
+        fake = FakeSearchAgent(pages, steps_per_run=6)
+
+        with patch('app.agents.job_search_agent.Agent', return_value=fake):
+            urls = [p.url async for p in job_search_agent.search_postings("Python", limit=10, max_pages=3, max_steps=30)]
+
+        assert fake.steps_taken == [6, 6, 6]
+        assert len(urls) == 3
+
+    @pytest.mark.asyncio
+    async def test_search_postings_stops_at_time_budget(self, job_search_agent):
+        """Test that a run overrunning the time budget is stopped and what was read is kept."""
+        fake = FakeSearchAgent([results_page(["https://example.com/jobs/1"]), results_page(["https://example.com/jobs/2"])])
+
+        async def slow_second_page(max_steps=500, on_step_start=None, on_step_end=None):
+            if fake.runs:
+                await asyncio.sleep(10)
+            return await FakeSearchAgent.run(fake, max_steps, on_step_start, on_step_end)
+
+        fake.run = slow_second_page
+
+        with patch('app.agents.job_search_agent.Agent', return_value=fake):
+            urls = [p.url async for p in job_search_agent.search_postings("Python", limit=5, timeout=0.2)]
+
+        assert urls == ["https://example.com/jobs/1"]
+        assert fake.stopped
+
+    @pytest.mark.asyncio
+    async def test_analyze_jobs_skips_duplicate_descriptions(self, job_search_agent, mock_page_fetcher):
+        """Test that the same posting found under two URLs is scored only once."""
+        description = " ".join(f"Responsibility {i}: build Python services with Django and AWS." for i in range(10))
+        mock_page_fetcher.fetch_description.return_value = ExtractedJobDescription(
+            text=description, confidence=0.9, method="greenhouse"
+        )
+        job_search_agent.analyze_job_fit = AsyncMock(return_value=JobFitAnalysis(is_fit=True, reasoning=""))
+
+        results = [job async for job in job_search_agent.analyze_jobs(
+            ["https://boards.greenhouse.io/acme/jobs/1", "https://www.linkedin.com/jobs/view/99"]
+        )]
+
+        assert len(results) == 1
+        job_search_agent.analyze_job_fit.assert_awaited_once()
+        assert job_search_agent.duplicates.duplicates == 1
+
     @pytest.mark.asyncio
     async def test_search_and_filter_jobs(self, job_search_agent):
         """Test combined search and filter functionality."""
@@ -161,3 +539,109 @@ class TestJobSearchAgent:
         assert len(filtered_jobs) == 1
         assert filtered_jobs[0]["url"] == "https://linkedin.com/jobs/1"
         assert filtered_jobs[0]["is_fit"] is True
+
+    @pytest.mark.asyncio
+    async def test_analyze_jobs_runs_concurrently_within_limit(self, job_search_agent):
+        """Test that fit analyses overlap but never exceed the concurrency limit times the batch size."""
+        job_search_agent.concurrency = 2
+        job_search_agent.fit_batch_size = 1
+        in_flight = [0]
+        peak = [0]
+
+        async def slow_analyze_fit(job_desc):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return JobFitAnalysis(is_fit=True, reasoning="Good match")
+
+        job_search_agent.analyze_job_fit = slow_analyze_fit
+        urls = [f"https://example.com/jobs/{i}" for i in range(6)]
+        results = [job async for job in job_search_agent.analyze_jobs(urls)]
+
+        assert len(results) == 6
+        assert peak[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_analyze_jobs_streams_in_completion_order(self, job_search_agent):
+        """Test that the fastest verdict is yielded first and early exit cancels the rest."""
+        delays = {"https://example.com/slow": 1.0, "https://example.com/fast": 0.0}
+        cancelled = []
+
+        async def analyze_fit(job_desc):
+            url = job_desc.removeprefix("Job at ")
+            try:
+                await asyncio.sleep(delays[url])
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return JobFitAnalysis(is_fit=True, reasoning=url)
+
+        job_search_agent.analyze_job_fit = analyze_fit
+        stream = job_search_agent.analyze_jobs(list(delays))
+        first = await anext(stream)
+        await stream.aclose()
+
+        assert first["url"] == "https://example.com/fast"
+        assert cancelled == ["https://example.com/slow"]
+
+    @pytest.mark.asyncio
+    async def test_stream_fit_jobs_yields_only_fitting_jobs(self, job_search_agent):
+        """Test that the streaming search yields fitting jobs only."""
+        async def analyze_fit(job_desc):
+            return JobFitAnalysis(is_fit="indeed" not in job_desc, reasoning="")
+
+        job_search_agent.analyze_job_fit = analyze_fit
+        job_search_agent.run_job_search = AsyncMock(return_value=["https://linkedin.com/jobs/1", "https://indeed.com/jobs/2"])
+
+        jobs = [job async for job in job_search_agent.stream_fit_jobs("Python developer", limit=5)]
+
+        assert [job["url"] for job in jobs] == ["https://linkedin.com/jobs/1"]
+
+    @pytest.mark.asyncio
+    async def test_get_job_description_over_http(self, job_search_agent, mock_page_fetcher, mock_browser_session):
+        """Test that a confident HTTP extraction is used without touching the browser."""
+        mock_page_fetcher.fetch_description.return_value = ExtractedJobDescription(
+            text="Senior Python engineer, Django and AWS.", confidence=0.9, method="greenhouse"
+        )
+        mock_browser_session.navigate_to = AsyncMock()
+
+        description = await job_search_agent.get_job_description("https://job-boards.greenhouse.io/acme/jobs/1")
+
+        assert description == "Senior Python engineer, Django and AWS."
+        mock_browser_session.navigate_to.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_job_description_renders_js_boards(self, job_search_agent, mock_page_fetcher, mock_browser_session):
+        """Test that pages without a confident description in their HTML are rendered in the browser."""
+        mock_page_fetcher.fetch_description.return_value = ExtractedJobDescription(
+            text="Loading...", confidence=0.2, method="heuristic"
+        )
+        mock_browser_session.navigate_to = AsyncMock()
+        rendered = ExtractedJobDescription(text="Rendered Python job description.", confidence=0.9, method="ashby")
+
+        with patch('app.agents.job_search_agent.wait_until_ready', AsyncMock(return_value=0.1)), \
+             patch('app.agents.job_search_agent.get_page_html', AsyncMock(return_value="<html></html>")), \
+             patch('app.agents.job_search_agent.extract_job_description', return_value=rendered):
+            description = await job_search_agent.get_job_description("https://jobs.ashbyhq.com/hooli/abc")
+
+        assert description == "Rendered Python job description."
+        mock_browser_session.navigate_to.assert_awaited_once_with("https://jobs.ashbyhq.com/hooli/abc")
+
+    @pytest.mark.asyncio
+    async def test_analyze_jobs_scores_scraped_descriptions(self, job_search_agent, mock_page_fetcher):
+        """Test that fit analysis receives the scraped description instead of a placeholder."""
+        mock_page_fetcher.fetch_description.return_value = ExtractedJobDescription(
+            text="Python developer with Django experience.", confidence=0.9, method="lever"
+        )
+        seen = []
+
+        async def analyze_fit(job_desc):
+            seen.append(job_desc)
+            return JobFitAnalysis(is_fit=True, reasoning="")
+
+        job_search_agent.analyze_job_fit = analyze_fit
+        results = [job async for job in job_search_agent.analyze_jobs(["https://jobs.lever.co/globex/1"])]
+
+        assert results[0]["url"] == "https://jobs.lever.co/globex/1"
+        assert seen == ["Python developer with Django experience."]
@@ -0,0 +1,172 @@
+import pytest
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.jobs import JobStore, canonicalize_url, extract_ats_job_id, job_key
+
+GREENHOUSE_URL = "https://job-boards.greenhouse.io/bugcrowd/jobs/7507933?gh_jid=7507933&gh_src=my.greenhouse.search"
+
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(tmp_path / "jobs.db", lease_seconds=60, max_attempts=2)
+    yield job_store
+    job_store.close()
+
+
+def test_canonicalize_url_strips_tracking():
+    """Test that tracking parameters, fragments, 'www.', trailing slashes and apply suffixes are removed."""
+    assert canonicalize_url(GREENHOUSE_URL) == "https://job-boards.greenhouse.io/bugcrowd/jobs/7507933?gh_jid=7507933"
+    assert canonicalize_url("http://www.Example.com/careers/python-dev/?utm_source=x&b=2&a=1#apply") == \
+        "https://example.com/careers/python-dev?a=1&b=2"
+    assert canonicalize_url("https://jobs.lever.co/globex/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60/apply?lever-source=LinkedIn") == \
+        "https://jobs.lever.co/globex/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60"
+
+
+@pytest.mark.parametrize("url, expected", [
+    (GREENHOUSE_URL, ("greenhouse", "7507933")),
+    ("https://boards.greenhouse.io/embed/job_app?for=bugcrowd&token=7507933", ("greenhouse", "7507933")),
+    ("https://www.bugcrowd.com/careers/?gh_jid=7507933", ("greenhouse", "7507933")),
+    ("https://jobs.lever.co/globex/4F1C2F9E-3B7D-4A59-9A6E-1B2C3D4E5F60", ("lever", "4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60")),
+    ("https://jobs.ashbyhq.com/acme/4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60/application", ("ashby", "4f1c2f9e-3b7d-4a59-9a6e-1b2c3d4e5f60")),
+    ("https://acme.wd5.myworkdayjobs.com/en-US/External/job/Austin-TX/Senior-Engineer_R-12345-1", ("workday", "acme:R-12345")),
+    ("https://www.linkedin.com/jobs/view/senior-engineer-at-acme-3901234567/?trk=abc", ("linkedin", "3901234567")),
+    ("https://www.indeed.com/viewjob?jk=abc123def&from=serp", ("indeed", "abc123def")),
+    ("https://example.com/careers/python-dev", None),
+])
+def test_extract_ats_job_id(url, expected):
+    """Test job ID extraction for the supported boards."""
+    assert extract_ats_job_id(url) == expected
+
+
+def test_add_dedupes_by_job_key(store):
+    """Test that links to the same posting are stored once, and only new jobs are returned."""
+    added = store.add([GREENHOUSE_URL, "https://boards.greenhouse.io/bugcrowd/jobs/7507933",
+                       "https://example.com/jobs/1?utm_source=google", "https://example.com/jobs/1"], query="python")
+
+    assert [job.job_key for job in added] == ["greenhouse:7507933", "https://example.com/jobs/1"]
+    assert added[0].ats == "greenhouse" and added[0].query == "python"
+    assert store.add([GREENHOUSE_URL]) == []
+    assert store.find("https://www.bugcrowd.com/careers/?gh_jid=7507933").id == added[0].id
+
+
+def test_uses_wal_mode(store):
+    """Test that the store runs in WAL mode so readers never block the writer."""
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_state_transitions(store):
+    """Test the discovered -> described -> scored -> applied lifecycle and that transitions release claims."""
+    job = store.add(["https://example.com/jobs/1"])[0]
+
+    claimed = store.claim("discovered", "w1")
+    store.mark_described(job.id, "Python developer")
+    described = store.get(job.id)
+    store.mark_scored(job.id, True, "Good match")
+    scored = store.get(job.id)
+    store.mark_applied(job.id)
+
+    assert [j.id for j in claimed] == [job.id] and claimed[0].claimed_by == "w1"
+    assert (described.state, described.description, described.claimed_by) == ("described", "Python developer", None)
+    assert (scored.state, scored.is_fit, scored.reasoning) == ("scored", True, "Good match")
+    assert store.get(job.id).state == "applied"
+    assert store.counts() == {"discovered": 0, "described": 0, "scored": 0, "applied": 1, "failed": 0}
+
+
+def test_claim_is_exclusive_across_threads(tmp_path):
+    """Test that concurrent workers on separate connections never claim the same job."""
+    path = tmp_path / "jobs.db"
+    seed = JobStore(path)
+    seed.add([f"https://example.com/jobs/{i}" for i in range(50)])
+
+    def worker(n: int) -> list[int]:
+        job_store = JobStore(path)
+        claimed = []
+        while jobs := job_store.claim("discovered", f"w{n}", limit=3):
+            claimed.extend(job.id for job in jobs)
+            for job in jobs:
+                job_store.mark_described(job.id, "text")
+        job_store.close()
+        return claimed
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(worker, range(4)))
+
+    all_claimed = [job_id for claimed in results for job_id in claimed]
+    assert sorted(all_claimed) == sorted(set(all_claimed))
+    assert len(all_claimed) == 50
+    seed.close()
+
+
+def test_expired_claims_are_taken_over(tmp_path):
+    """Test that a job claimed by a crashed worker is claimable again once the lease runs out."""
+    job_store = JobStore(tmp_path / "jobs.db", lease_seconds=0.05)
+    job_store.add(["https://example.com/jobs/1"])
+
+    assert job_store.claim("discovered", "crashed")
+    assert job_store.claim("discovered", "other") == []
+    time.sleep(0.1)
+    assert job_store.claim("discovered", "other")[0].claimed_by == "other"
+    job_store.close()
+
+
+def test_claim_fit_only(store):
+    """Test that applying only claims jobs scored as a fit."""
+    fit, unfit = store.add(["https://example.com/jobs/1", "https://example.com/jobs/2"])
+    store.mark_scored(fit.id, True, "yes")
+    store.mark_scored(unfit.id, False, "no")
+
+    assert [job.id for job in store.claim("scored", "w1", limit=-1, fit_only=True)] == [fit.id]
+
+
+def test_mark_failed_retries_then_gives_up(store):
+    """Test that a job keeps its stage until it has failed max_attempts times."""
+    job = store.add(["https://example.com/jobs/1"])[0]
+
+    assert store.mark_failed(job.id, "timeout") is False
+    retry = store.get(job.id)
+    assert store.mark_failed(job.id, "timeout again") is True
+
+    assert (retry.state, retry.attempts, retry.claimed_by) == ("discovered", 1, None)
+    assert (store.get(job.id).state, store.get(job.id).error) == ("failed", "timeout again")
+
+
+def test_mark_failed_final_gives_up_at_once(store):
+    """Test that a final failure moves the job to 'failed' on its first attempt."""
+    job = store.add(["https://example.com/jobs/1"])[0]
+
+    assert store.mark_failed(job.id, "partly submitted", final=True) is True
+    assert (store.get(job.id).state, store.get(job.id).attempts) == ("failed", 1)
+
+
+def test_claim_skips_excluded_jobs(store):
+    """Test that excluded job IDs are never claimed."""
+    first, second = store.add(["https://example.com/jobs/1", "https://example.com/jobs/2"])
+
+    assert [job.id for job in store.claim("discovered", "w1", limit=-1, exclude={first.id})] == [second.id]
+
+
+def test_state_survives_restart(tmp_path):
+    """Test that jobs and completed searches persist across store instances."""
+    first = JobStore(tmp_path / "jobs.db")
+    job = first.add(["https://example.com/jobs/1"])[0]
+    first.mark_described(job.id, "Python developer")
+    first.record_search("python", 1)
+    first.close()
+
+    reopened = JobStore(tmp_path / "jobs.db")
+    assert reopened.get(job.id).state == "described"
+    assert reopened.search_completed("python")
+    assert not reopened.search_completed("java")
+    reopened.close()
+
+
+def test_job_key_prefers_ats_id():
+    """Test the dedup key for ATS and non-ATS links."""
+    assert job_key(GREENHOUSE_URL) == "greenhouse:7507933"
+    assert job_key("https://example.com/jobs/1/") == "https://example.com/jobs/1"
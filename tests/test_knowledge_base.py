@@ -1,3 +1,5 @@
+import asyncio
+import time
 import pytest
 import sys
 import os
@@ -62,3 +64,284 @@ def test_knowledge_base_agent_with_empty_search():
         result = kb.query("Some query")
 
         assert "No relevant information" in result
+
+
+@pytest.fixture
+def mocked_kb(tmp_path):
+    """Create a knowledge base over temporary directories with a mocked mem0 backend."""
+    with patch('app.agents.knowledge_base_agent.Memory') as mock_memory_class, \
+         patch('app.agents.knowledge_base_agent.CohereEmbeddings'):
+        mock_memory = MagicMock()
+        mock_memory.add.side_effect = lambda content, **kwargs: {
+            "results": [{"id": f"mem-{mock_memory.add.call_count}", "memory": content, "event": "ADD"}]
+        }
+        mock_memory_class.return_value = mock_memory
+
+        data_dir = tmp_path / "kb"
+        kb = KnowledgeBaseAgent(data_dir=str(data_dir), cache_dir=str(tmp_path / "cache"))
+        yield kb, mock_memory, data_dir
+
+
+def test_knowledge_base_load_skips_unchanged_files(mocked_kb, tmp_path):
+    """Test that a warm start makes no mem0 calls for unchanged files."""
+    kb, mock_memory, data_dir = mocked_kb
+    (data_dir / "profile.md").write_text("Name: Jane Doe", encoding="utf-8")
+    (data_dir / "skills.txt").write_text("Python, Django", encoding="utf-8")
+
+    kb.load_from_directory()
+    assert mock_memory.add.call_count == 2
+    assert (tmp_path / "cache" / "kb_manifest.json").exists()
+
+    # A fresh agent reads the persisted manifest and skips everything
+    with patch('app.agents.knowledge_base_agent.Memory') as mock_memory_class, \
+         patch('app.agents.knowledge_base_agent.CohereEmbeddings'):
+        warm_memory = MagicMock()
+        mock_memory_class.return_value = warm_memory
+        warm_kb = KnowledgeBaseAgent(data_dir=str(data_dir), cache_dir=str(tmp_path / "cache"))
+        warm_kb.load_from_directory()
+
+    warm_memory.add.assert_not_called()
+    warm_memory.delete.assert_not_called()
+
+
+def test_knowledge_base_load_replaces_changed_files(mocked_kb):
+    """Test that a modified file has its old memories replaced."""
+    kb, mock_memory, data_dir = mocked_kb
+    file_path = data_dir / "skills.txt"
+    file_path.write_text("Python", encoding="utf-8")
+    kb.load_from_directory()
+    old_ids = kb.manifest.get("skills.txt").memory_ids
+
+    file_path.write_text("Python, Rust and Go", encoding="utf-8")
+    kb.load_from_directory()
+
+    assert mock_memory.add.call_count == 2
+    for memory_id in old_ids:
+        mock_memory.delete.assert_any_call(memory_id)
+    assert kb.manifest.get("skills.txt").memory_ids != old_ids
+
+
+def test_knowledge_base_load_ignores_touched_files(mocked_kb):
+    """Test that a file with a new mtime but identical content is not re-ingested."""
+    kb, mock_memory, data_dir = mocked_kb
+    file_path = data_dir / "skills.txt"
+    file_path.write_text("Python", encoding="utf-8")
+    kb.load_from_directory()
+
+    stat = file_path.stat()
+    os.utime(file_path, (stat.st_atime, stat.st_mtime + 10))
+    kb.load_from_directory()
+
+    assert mock_memory.add.call_count == 1
+    mock_memory.delete.assert_not_called()
+
+
+def test_knowledge_base_load_removes_deleted_files(mocked_kb):
+    """Test that memories of deleted files are removed from mem0 and the manifest."""
+    kb, mock_memory, data_dir = mocked_kb
+    file_path = data_dir / "old_job.md"
+    file_path.write_text("Worked at Acme", encoding="utf-8")
+    kb.load_from_directory()
+    memory_ids = kb.manifest.get("old_job.md").memory_ids
+
+    file_path.unlink()
+    kb.load_from_directory()
+
+    for memory_id in memory_ids:
+        mock_memory.delete.assert_any_call(memory_id)
+    assert kb.manifest.get("old_job.md") is None
+
+
+def test_knowledge_base_load_keeps_memories_shared_with_other_files(mocked_kb):
+    """Test that a memory another file updated survives the removal of the file that added it."""
+    kb, mock_memory, data_dir = mocked_kb
+    (data_dir / "profile.md").write_text("Lives in Austin", encoding="utf-8")
+    kb.load_from_directory()
+    shared_id = kb.manifest.get("profile.md").memory_ids[0]
+
+    # mem0 merges the new fact into the existing memory instead of adding one
+    mock_memory.add.side_effect = lambda content, **kwargs: {
+        "results": [{"id": shared_id, "memory": content, "event": "UPDATE"},
+                    {"id": "mem-own", "memory": content, "event": "ADD"}]
+    }
+    (data_dir / "relocation.md").write_text("Lives in Austin, open to relocating", encoding="utf-8")
+    kb.load_from_directory()
+
+    (data_dir / "relocation.md").unlink()
+    kb.load_from_directory()
+
+    mock_memory.delete.assert_called_once_with("mem-own")
+    assert kb.manifest.get("profile.md").memory_ids == [shared_id]
+
+
+def test_knowledge_base_version_tracks_content(mocked_kb):
+    """Test that the knowledge base version changes only when ingested content changes."""
+    kb, mock_memory, data_dir = mocked_kb
+    file_path = data_dir / "skills.txt"
+    file_path.write_text("Python", encoding="utf-8")
+    kb.load_from_directory()
+    version = kb.version
+
+    kb.load_from_directory()
+    assert kb.version == version
+
+    file_path.write_text("Python and Rust", encoding="utf-8")
+    kb.load_from_directory()
+    assert kb.version != version
+
+
+def fake_embedding(text: str) -> list[float]:
+    """Deterministic embedding where questions sharing a topic word point the same way."""
+    topics = ["phone", "email", "python", "education"]
+    vector = [1.0 if topic in text.lower() else 0.0 for topic in topics]
+    vector.append(0.05 * len(text.split()))
+    return vector
+
+
+@pytest.fixture
+def query_kb(mocked_kb):
+    """Knowledge base whose embedder and search are deterministic fakes."""
+    kb, mock_memory, data_dir = mocked_kb
+    kb.embeddings.inner.embed_query.side_effect = fake_embedding
+    kb.embeddings.inner.embed.side_effect = lambda texts, input_type: [fake_embedding(t) for t in texts]
+    mock_memory.embedding_model.embed.side_effect = lambda text, action: kb.embeddings.embed_query(text)
+    mock_memory.search.side_effect = lambda question, **kwargs: {"results": [{"memory": f"Answer to {question}"}]}
+    return kb, mock_memory, data_dir
+
+
+def test_query_reuses_answers_for_repeated_questions(query_kb):
+    """Test that the same question, modulo case and punctuation, is searched once."""
+    kb, mock_memory, _ = query_kb
+
+    first = kb.query("What is the applicant's phone number?")
+    second = kb.query("what is the applicants phone number")
+
+    assert first == second == "- Answer to What is the applicant's phone number?"
+    assert mock_memory.search.call_count == 1
+    assert kb.query_cache.hits == 1
+
+
+def test_query_reuses_answers_for_similar_questions(query_kb):
+    """Test that near-identical questions hit the semantic cache, unrelated ones do not."""
+    kb, mock_memory, _ = query_kb
+
+    kb.query("phone number")
+    assert kb.query("applicant's phone") == "- Answer to phone number"
+    kb.query("Which Python frameworks does the applicant know?")
+
+    assert mock_memory.search.call_count == 2
+    assert kb.query_cache.semantic_hits == 1
+
+
+def test_query_embeds_each_question_once(query_kb):
+    """Test that the cache lookup and mem0's search share one embedding call."""
+    kb, mock_memory, _ = query_kb
+
+    def search(question, **kwargs):
+        mock_memory.embedding_model.embed(question, "search")
+        return {"results": [{"memory": "555-0100"}]}
+    mock_memory.search.side_effect = search
+
+    kb.query("phone number")
+
+    assert kb.embeddings.inner.embed_query.call_count == 1
+
+
+def test_query_cache_invalidated_when_knowledge_base_changes(query_kb):
+    """Test that cached answers are dropped once the ingested content changes."""
+    kb, mock_memory, data_dir = query_kb
+    kb.query("phone number")
+
+    (data_dir / "contact.md").write_text("Phone: 555-0100", encoding="utf-8")
+    kb.load_from_directory()
+    kb.query("phone number")
+
+    assert mock_memory.search.call_count == 2
+
+
+def test_query_cache_evicts_least_recently_used(query_kb):
+    """Test that the cache stays within its size bound."""
+    kb, _, _ = query_kb
+    kb.query_cache.max_entries = 2
+
+    kb.query("phone number")
+    kb.query("email address")
+    kb.query("phone number")
+    kb.query("education history")
+
+    assert len(kb.query_cache) == 2
+    assert "phone number" in kb.query_cache
+    assert "email address" not in kb.query_cache
+
+
+def test_query_many_embeds_batch_in_one_call(query_kb):
+    """Test that a batch is embedded in one request and answered in order, searching duplicates once."""
+    kb, mock_memory, _ = query_kb
+    kb.query("phone number")
+
+    answers = kb.query_many(["phone number", "email address", "education history", "email address"])
+
+    assert answers == [
+        "- Answer to phone number",
+        "- Answer to email address",
+        "- Answer to education history",
+        "- Answer to email address",
+    ]
+    kb.embeddings.inner.embed.assert_called_once_with(["email address", "education history"], input_type="search_query")
+    assert mock_memory.search.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_aquery_does_not_block_event_loop(query_kb):
+    """Test that slow searches run off the event loop and in parallel."""
+    kb, mock_memory, _ = query_kb
+
+    def slow_search(question, **kwargs):
+        time.sleep(0.2)
+        return {"results": [{"memory": f"Answer to {question}"}]}
+    mock_memory.search.side_effect = slow_search
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    started = time.monotonic()
+    answers = await asyncio.gather(kb.aquery("phone number"), kb.aquery("email address"), kb.aquery("education history"))
+    elapsed = time.monotonic() - started
+    ticking.cancel()
+
+    assert answers == ["- Answer to phone number", "- Answer to email address", "- Answer to education history"]
+    assert elapsed < 0.5
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_aquery_shares_concurrent_identical_searches(query_kb):
+    """Test that the same question asked concurrently is searched once."""
+    kb, mock_memory, _ = query_kb
+
+    def slow_search(question, **kwargs):
+        time.sleep(0.05)
+        return {"results": [{"memory": "555-0100"}]}
+    mock_memory.search.side_effect = slow_search
+
+    answers = await asyncio.gather(*(kb.aquery("Phone number?") for _ in range(5)))
+
+    assert answers == ["- 555-0100"] * 5
+    assert mock_memory.search.call_count == 1
+    assert kb._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_aquery_many(query_kb):
+    """Test the async batch API."""
+    kb, _, _ = query_kb
+
+    answers = await kb.aquery_many(["phone number", "email address"])
+
+    assert answers == ["- Answer to phone number", "- Answer to email address"]
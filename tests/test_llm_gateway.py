@@ -0,0 +1,193 @@
+import asyncio
+import json
+import time
+import pytest
+import sys
+import os
+from unittest.mock import patch
+from browser_use.llm import ChatGroq, ChatOpenAI, UserMessage
+from browser_use.llm.exceptions import ModelProviderError
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import StubResponse
+from app.cache import CompletionCache
+from app.config import NVIDIA_API_KEY
+from app.llm_gateway import LLMGateway, LLMRoute, is_retryable
+from app.models.llm_responses import JobFitAnalysis
+from app.rate_limit import AsyncTokenBucket, get_rate_limiter
+
+NVIDIA_PATH = "/nvidia/v1/chat/completions"
+GROQ_PATH = "/groq/openai/v1/chat/completions"  # The Groq client adds the /openai/v1 prefix itself
+MESSAGES = [UserMessage(content="Is this job a fit?")]
+
+
+def completion(content: str, delay: float = 0.0) -> StubResponse:
+    """An OpenAI-compatible chat completion, as both NVIDIA and Groq return it."""
+    body = {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "fake",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17},
+    }
+    return StubResponse(body=json.dumps(body), headers={"Content-Type": "application/json"}, delay=delay)
+
+
+def error(status: int) -> StubResponse:
+    return StubResponse(status=status, body=json.dumps({"error": {"message": f"HTTP {status}"}}),
+                        headers={"Content-Type": "application/json"})
+
+
+def sequence(*responses: StubResponse):
+    """Answers with each response in turn, repeating the last one."""
+    remaining = list(responses)
+    return lambda request: remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+
+def unlimited() -> AsyncTokenBucket:
+    return AsyncTokenBucket(rate_per_minute=60000, capacity=1000)
+
+
+@pytest.fixture
+def make_gateway(stub_server):
+    """Builds a gateway whose NVIDIA and Groq routes point at the fake server."""
+    def make(**kwargs) -> LLMGateway:
+        routes = [
+            LLMRoute("nvidia", ChatOpenAI(model="nvidia-model", base_url=stub_server.url("/nvidia/v1"),
+                                          api_key="test", max_retries=0), rate_limiter=unlimited()),
+            LLMRoute("groq", ChatGroq(model="groq-model", base_url=stub_server.url("/groq"),
+                                      api_key="test", max_retries=0), rate_limiter=unlimited()),
+        ]
+        kwargs = {"retry_base": 0.01, "retry_max": 0.02, "hedge_after": 0} | kwargs
+        return LLMGateway(routes, **kwargs)
+    return make
+
+
+@pytest.mark.asyncio
+async def test_structured_output_is_cached_on_disk(stub_server, make_gateway, tmp_path):
+    """Test that a repeated prompt is answered from the cache, also after a restart, and only when asked."""
+    stub_server.route(NVIDIA_PATH, completion('{"is_fit": true, "reasoning": "Python match"}'), method="POST")
+    cache = CompletionCache(tmp_path / "llm.db")
+    gateway = make_gateway(cache=cache)
+
+    first = await gateway.ainvoke(MESSAGES, JobFitAnalysis, cache=True)
+    second = await gateway.ainvoke(MESSAGES, JobFitAnalysis, cache=True)
+    cache.close()
+    restarted = make_gateway(cache=CompletionCache(tmp_path / "llm.db"))
+    third = await restarted.ainvoke(MESSAGES, JobFitAnalysis, cache=True)
+    await restarted.ainvoke(MESSAGES, JobFitAnalysis)
+
+    assert first.completion == second.completion == third.completion == JobFitAnalysis(is_fit=True, reasoning="Python match")
+    assert first.usage.total_tokens == 17 and second.usage is None
+    assert len(stub_server.requests_for(NVIDIA_PATH)) == 2
+    assert (gateway.stats.cache_hits, restarted.stats.cache_hits) == (1, 1)
+    restarted.cache.close()
+
+
+def test_cache_key_covers_model_prompt_and_schema():
+    key = CompletionCache.make_key("m", MESSAGES, JobFitAnalysis)
+
+    assert key == CompletionCache.make_key("m", [UserMessage(content="Is this job a fit?")], JobFitAnalysis)
+    assert key != CompletionCache.make_key("other", MESSAGES, JobFitAnalysis)
+    assert key != CompletionCache.make_key("m", [UserMessage(content="Is this job a fit")], JobFitAnalysis)
+    assert key != CompletionCache.make_key("m", MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_retried(stub_server, make_gateway):
+    """Test that a 429 is retried on the same provider after a backoff."""
+    stub_server.route(NVIDIA_PATH, sequence(error(429), completion("yes")), method="POST")
+    gateway = make_gateway()
+
+    response = await gateway.ainvoke(MESSAGES)
+
+    assert response.completion == "yes"
+    assert len(stub_server.requests_for(NVIDIA_PATH)) == 2
+    assert not stub_server.requests_for(GROQ_PATH)
+    assert gateway.stats.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_fails_over_to_groq(stub_server, make_gateway):
+    """Test that a provider still failing after its retries hands the request to the other one."""
+    stub_server.route(NVIDIA_PATH, error(503), method="POST")
+    stub_server.route(GROQ_PATH, completion("from groq"), method="POST")
+    gateway = make_gateway(max_retries=2)
+
+    response = await gateway.ainvoke(MESSAGES)
+
+    assert response.completion == "from groq"
+    assert len(stub_server.requests_for(NVIDIA_PATH)) == 3
+    assert (gateway.stats.retries, gateway.stats.failovers) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_call_span_records_tokens_cost_and_failover(stub_server, make_gateway, span_recorder):
+    """Test that the call's span says which provider answered, what it cost and how it got there."""
+    stub_server.route(NVIDIA_PATH, error(503), method="POST")
+    stub_server.route(GROQ_PATH, completion("from groq"), method="POST")
+
+    with patch.dict('app.llm_gateway.PROVIDER_PRICE_PER_MILLION_TOKENS', {"groq": 1000.0}):
+        await make_gateway(max_retries=1).ainvoke(MESSAGES)
+
+    [span] = span_recorder.spans
+    assert span.name == "llm.call"
+    assert span.attributes == {
+        "model": "nvidia-model", "output": "text", "cached": False, "provider": "groq", "retries": 1,
+        "failovers": 1, "prompt_tokens": 12, "completion_tokens": 5, "cost_usd": pytest.approx(0.017),
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_errors_fail_over_without_retrying(stub_server, make_gateway):
+    """Test that a rejected request (such as a bad key) is not retried but still fails over."""
+    stub_server.route(NVIDIA_PATH, error(401), method="POST")
+    stub_server.route(GROQ_PATH, completion("from groq"), method="POST")
+
+    response = await make_gateway(max_retries=2).ainvoke(MESSAGES)
+
+    assert response.completion == "from groq"
+    assert len(stub_server.requests_for(NVIDIA_PATH)) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_is_hedged(stub_server, make_gateway):
+    """Test that a second provider is raced against a slow one and the first answer wins."""
+    stub_server.route(NVIDIA_PATH, completion("slow", delay=1.5), method="POST")
+    stub_server.route(GROQ_PATH, completion("fast"), method="POST")
+    gateway = make_gateway(hedge_after=0.1)
+
+    started = time.monotonic()
+    response = await gateway.ainvoke(MESSAGES)
+
+    assert response.completion == "fast"
+    assert time.monotonic() - started < 1.0
+    assert gateway.stats.hedges == 1
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_provider_fails(stub_server, make_gateway):
+    stub_server.route(NVIDIA_PATH, error(500), method="POST")
+    stub_server.route(GROQ_PATH, error(500), method="POST")
+    gateway = make_gateway(max_retries=0)
+
+    with pytest.raises(ModelProviderError):
+        await gateway.ainvoke(MESSAGES)
+    assert gateway.stats.errors == 1
+
+
+def test_routes_share_provider_buckets():
+    """Test that the configured key uses the provider's budget and other keys get their own."""
+    default = LLMRoute("nvidia", ChatOpenAI(model="m", api_key=NVIDIA_API_KEY))
+    other_key = LLMRoute("nvidia", ChatOpenAI(model="m", api_key="another-key"))
+
+    assert default.rate_limiter is get_rate_limiter("nvidia")
+    assert other_key.rate_limiter is not default.rate_limiter
+    assert other_key.rate_limiter is LLMRoute("nvidia", ChatOpenAI(model="m2", api_key="another-key")).rate_limiter
+
+
+def test_is_retryable():
+    assert is_retryable(ModelProviderError("busy", status_code=503))
+    assert not is_retryable(ModelProviderError("bad request", status_code=400))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(ValueError("bug"))
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+import pytest_asyncio
+import sys
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import StubResponse
+from app.agents.job_search_agent import JobSearchAgent
+from app.agents.knowledge_base_agent import KnowledgeBaseAgent
+from app.cache import FitCache, HttpCache
+from app.extraction import JobPageFetcher
+from app.http_client import PooledHttpClient
+from app.models.llm_responses import JobFitAnalysis
+
+FIXTURES = Path(__file__).parent / "fixtures" / "job_pages"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Oct 2025 10:00:00 GMT"
+
+
+def etag_route(body: str):
+    """Serves a page with an ETag and answers matching conditional requests with 304."""
+    def route(request):
+        if request.headers.get("if-none-match") == ETAG:
+            return StubResponse(status=304, headers={"ETag": ETAG})
+        return StubResponse(body=body, headers={"ETag": ETAG, "Content-Type": "text/html"})
+    return route
+
+
+@pytest_asyncio.fixture
+async def fetcher(tmp_path):
+    """Create a fetcher that always revalidates, with a temporary disk cache."""
+    page_fetcher = JobPageFetcher(PooledHttpClient(), HttpCache(tmp_path / "http"), fresh_seconds=0)
+    yield page_fetcher
+    await page_fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_caches_and_revalidates_with_etag(stub_server, fetcher):
+    """Test that a second fetch sends If-None-Match and reuses the cached body on 304."""
+    stub_server.route("/jobs/1", etag_route("<html><body>Job one</body></html>"))
+
+    first = await fetcher.fetch(stub_server.url("/jobs/1"))
+    second = await fetcher.fetch(stub_server.url("/jobs/1"))
+
+    assert first.html == second.html == "<html><body>Job one</body></html>"
+    assert not first.from_cache
+    assert second.from_cache and second.revalidated
+    requests = stub_server.requests_for("/jobs/1")
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == ETAG
+
+
+@pytest.mark.asyncio
+async def test_fetch_revalidates_with_last_modified(stub_server, fetcher):
+    """Test that Last-Modified is sent back as If-Modified-Since."""
+    def route(request):
+        if request.headers.get("if-modified-since") == LAST_MODIFIED:
+            return StubResponse(status=304)
+        return StubResponse(body="<p>Job</p>", headers={"Last-Modified": LAST_MODIFIED})
+    stub_server.route("/jobs/2", route)
+
+    await fetcher.fetch(stub_server.url("/jobs/2"))
+    second = await fetcher.fetch(stub_server.url("/jobs/2"))
+
+    assert second.revalidated
+    assert stub_server.requests_for("/jobs/2")[1].headers["if-modified-since"] == LAST_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_skip_the_network(stub_server, tmp_path):
+    """Test that entries inside the freshness window are served from disk, even by a new fetcher."""
+    stub_server.route("/jobs/3", etag_route("<p>Fresh job</p>"))
+    cache = HttpCache(tmp_path / "http")
+
+    first = JobPageFetcher(PooledHttpClient(), cache, fresh_seconds=3600)
+    await first.fetch(stub_server.url("/jobs/3"))
+    await first.aclose()
+
+    restarted = JobPageFetcher(PooledHttpClient(), HttpCache(tmp_path / "http"), fresh_seconds=3600)
+    page = await restarted.fetch(stub_server.url("/jobs/3"))
+    await restarted.aclose()
+
+    assert page.html == "<p>Fresh job</p>" and page.from_cache
+    assert len(stub_server.requests_for("/jobs/3")) == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_page_replaces_cache(stub_server, fetcher):
+    """Test that a 200 on revalidation stores the new body."""
+    versions = iter(["<p>Old</p>", "<p>New</p>"])
+    stub_server.route("/jobs/4", lambda request: StubResponse(body=next(versions), headers={"ETag": '"changing"'}))
+
+    await fetcher.fetch(stub_server.url("/jobs/4"))
+    page = await fetcher.fetch(stub_server.url("/jobs/4"))
+
+    assert page.html == "<p>New</p>" and not page.from_cache
+    assert fetcher.cache.get(stub_server.url("/jobs/4")).body == "<p>New</p>"
+
+
+@pytest.mark.asyncio
+async def test_missing_page_returns_none(stub_server, fetcher):
+    """Test that a 404 without a cached copy yields nothing."""
+    assert await fetcher.fetch(stub_server.url("/jobs/missing")) is None
+
+
+@pytest.mark.asyncio
+async def test_server_error_serves_stale_copy(stub_server, fetcher):
+    """Test that an error on revalidation falls back to the cached body."""
+    responses = iter([StubResponse(body="<p>Cached job</p>", headers={"ETag": ETAG}), StubResponse(status=503)])
+    stub_server.route("/jobs/5", lambda request: next(responses))
+
+    await fetcher.fetch(stub_server.url("/jobs/5"))
+    page = await fetcher.fetch(stub_server.url("/jobs/5"))
+
+    assert page.html == "<p>Cached job</p>" and page.from_cache
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit(stub_server, tmp_path):
+    """Test that requests to one host never exceed the per-host connection limit."""
+    for i in range(6):
+        stub_server.route(f"/jobs/{i}", StubResponse(body="<p>Job</p>", delay=0.05))
+    fetcher = JobPageFetcher(PooledHttpClient(max_per_host=2), HttpCache(tmp_path / "http"), fresh_seconds=0)
+
+    pages = await asyncio.gather(*(fetcher.fetch(stub_server.url(f"/jobs/{i}")) for i in range(6)))
+    await fetcher.aclose()
+
+    assert all(page is not None for page in pages)
+    assert stub_server.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_description_from_stub_board(stub_server, fetcher):
+    """Test that a served ATS page is parsed without a browser."""
+    stub_server.route("/acme/jobs/1", StubResponse(body=(FIXTURES / "greenhouse.html").read_text(encoding="utf-8")))
+
+    result = await fetcher.fetch_description(stub_server.url("/acme/jobs/1"))
+
+    assert result.confidence >= 0.6
+    assert "PostgreSQL and Kafka" in result.text
+
+
+@pytest.mark.asyncio
+async def test_job_search_agent_scrapes_stub_board(stub_server, fetcher, tmp_path):
+    """Test the search agent end to end against a stub job board, without a browser."""
+    stub_server.route("/globex/123", StubResponse(body=(FIXTURES / "lever.html").read_text(encoding="utf-8")))
+    kb = MagicMock(spec=KnowledgeBaseAgent)
+    kb.aquery.return_value = "Data engineer with Spark and Airflow."
+    kb.version = "kb-v1"
+    browser = MagicMock()
+    browser.navigate_to = AsyncMock()
+    fit_cache = FitCache(tmp_path / "fit_cache.db")
+    agent = JobSearchAgent(browser=browser, knowledge_base=kb, fit_cache=fit_cache, page_fetcher=fetcher)
+    agent.analyze_job_fit = AsyncMock(return_value=JobFitAnalysis(is_fit=True, reasoning="Match"))
+
+    results = [job async for job in agent.analyze_jobs([stub_server.url("/globex/123")])]
+    fit_cache.close()
+
+    assert results[0]["is_fit"] is True
+    assert "Spark and Airflow" in agent.analyze_job_fit.call_args.args[0]
+    browser.navigate_to.assert_not_called()
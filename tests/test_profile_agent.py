@@ -0,0 +1,126 @@
+import asyncio
+import json
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, AsyncMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.agents.knowledge_base_agent import KnowledgeBaseAgent
+from app.agents.profile_agent import ApplicantProfileAgent, PROFILE_QUESTIONS
+from app.llm_gateway import LLMGateway
+from app.models.applicant_profile import ApplicantProfile, ContactInfo, Links, WorkExperience
+
+
+def make_profile() -> ApplicantProfile:
+    return ApplicantProfile(
+        first_name="Jane",
+        last_name="Doe",
+        full_name="Jane Doe",
+        contact=ContactInfo(email="jane@example.com", phone="+1 555 0100"),
+        work_history=[WorkExperience(company="Acme", title="Backend Engineer", start_date="2021", end_date="Present")],
+        links=Links(github="https://github.com/janedoe"),
+        skills=["Python", "Django"],
+    )
+
+
+@pytest.fixture
+def mock_knowledge_base():
+    """Create a knowledge base mock answering batches of questions."""
+    kb = MagicMock(spec=KnowledgeBaseAgent)
+    kb.version = "kb-v1"
+    kb.aquery_many = AsyncMock(side_effect=lambda questions: [f"- fact for {q}" for q in questions])
+    return kb
+
+
+@pytest.fixture
+def mock_llm():
+    """Create an LLM mock returning a structured profile."""
+    llm = MagicMock()
+    response = MagicMock()
+    response.completion = make_profile()
+    llm.ainvoke = AsyncMock(return_value=response)
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_profile_built_with_one_batch_and_one_llm_call(mock_knowledge_base, mock_llm, tmp_path):
+    """Test that the profile comes from a single knowledge base batch and a single structured LLM call."""
+    agent = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+
+    profile = await agent.get_profile()
+
+    assert profile.full_name == "Jane Doe"
+    mock_knowledge_base.aquery_many.assert_awaited_once_with(list(PROFILE_QUESTIONS.values()))
+    assert mock_llm.ainvoke.await_args.kwargs["output_format"] is ApplicantProfile
+    assert mock_llm.ainvoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_reused_from_memory_and_disk(mock_knowledge_base, mock_llm, tmp_path):
+    """Test that the snapshot is built once and a restarted agent reads it from disk."""
+    agent = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+    await agent.get_profile()
+    await agent.get_profile()
+
+    restarted = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+    profile = await restarted.get_profile()
+
+    assert profile == make_profile()
+    assert mock_llm.ainvoke.await_count == 1
+    assert json.loads((tmp_path / "applicant_profile.json").read_text())["kb_version"] == "kb-v1"
+
+
+@pytest.mark.asyncio
+async def test_profile_rebuilt_when_knowledge_base_changes(mock_knowledge_base, mock_llm, tmp_path):
+    """Test that a new knowledge base version invalidates the snapshot."""
+    agent = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+    await agent.get_profile()
+
+    mock_knowledge_base.version = "kb-v2"
+    await agent.get_profile()
+
+    assert mock_llm.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_share_one_build(mock_knowledge_base, mock_llm, tmp_path):
+    """Test that concurrent callers wait for a single build."""
+    agent = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+
+    profiles = await asyncio.gather(*(agent.get_profile() for _ in range(5)))
+
+    assert all(p == profiles[0] for p in profiles)
+    assert mock_llm.ainvoke.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_build_failure_returns_none(mock_knowledge_base, mock_llm, tmp_path):
+    """Test that a failed build is not cached and callers get None."""
+    mock_llm.ainvoke.side_effect = Exception("API Error")
+    agent = ApplicantProfileAgent(mock_knowledge_base, llm=mock_llm, cache_dir=str(tmp_path))
+
+    assert await agent.get_profile() is None
+    assert not (tmp_path / "applicant_profile.json").exists()
+
+
+def test_profile_section_lookup():
+    """Test that sections are returned as JSON and unknown sections as None."""
+    profile = make_profile()
+
+    assert json.loads(profile.section("contact")) == {"email": "jane@example.com", "phone": "+1 555 0100"}
+    assert json.loads(profile.section("skills")) == ["Python", "Django"]
+    assert profile.section("favourite_colour") is None
+    assert "jane@example.com" in profile.to_prompt()
+    assert "eeo" not in profile.to_prompt()
+
+
+def test_default_llm_goes_through_the_gateway(mock_knowledge_base, tmp_path):
+    """Test that profile builds get the gateway's retries, failover and completion cache like the other agents."""
+    agent = ApplicantProfileAgent(mock_knowledge_base, cache_dir=str(tmp_path))
+
+    assert isinstance(agent.llm, LLMGateway)
+    assert agent.llm.provider == "groq"
+    assert agent.llm.cache is not None
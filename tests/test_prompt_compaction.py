@@ -0,0 +1,169 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.prompting import (
+    ApproximateTokenCounter, PromptCompactor, TokenizerCounter, aget_token_counter, load_token_counter, split_segments,
+)
+
+JOB_DESCRIPTION = """Senior Backend Engineer - Acme (Remote)
+
+About us
+Acme builds logistics software for thousands of warehouses. We were founded in 2012 and have offices in Berlin,
+Austin and Singapore. Our culture values curiosity, ownership and kindness, and we ship every day.
+
+Responsibilities
+Design and run Python services that route millions of parcels a day. Own PostgreSQL schemas and Kafka pipelines.
+
+Requirements
+5+ years of Python, Django and PostgreSQL. Experience running services on AWS with Docker and Kubernetes.
+
+Benefits
+Unlimited vacation, a learning budget, a home office stipend, gym membership, team offsites twice a year,
+parental leave, free lunches in every office, commuter benefits, pet insurance and a yearly wellness week.
+"""
+
+RESUME = """Jane Doe
+
+Summary
+Backend engineer with six years of Python and Django experience.
+
+Experience
+Built PostgreSQL-backed Django services on AWS at Globex, moving parcel tracking to Kafka.
+
+Skills
+Python, Django, PostgreSQL, Kafka, AWS, Docker
+
+Awards
+Hackathon winner 2015, employee of the month three times, best poster at a regional student fair.
+"""
+
+
+@pytest.fixture(scope="module")
+def counter() -> TokenizerCounter:
+    """A small BPE tokenizer trained on the test texts, standing in for the downloaded one."""
+    tokenizer = Tokenizer(models.BPE(unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    trainer = trainers.BpeTrainer(vocab_size=400, special_tokens=["[UNK]"],
+                                  initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    tokenizer.train_from_iterator([JOB_DESCRIPTION, RESUME], trainer)
+    return TokenizerCounter(tokenizer, "test-bpe")
+
+
+def test_short_text_is_unchanged(counter):
+    compactor = PromptCompactor(counter)
+
+    result = compactor.compact(RESUME, budget=10_000)
+
+    assert result.text == RESUME
+    assert result.saved_tokens == 0
+    assert result.dropped_sections == []
+
+
+def test_keeps_requirements_and_drops_boilerplate(counter):
+    """Test that the sections that decide fit survive and filler like benefits is dropped first."""
+    compactor = PromptCompactor(counter)
+    budget = counter.count(JOB_DESCRIPTION) // 2
+
+    result = compactor.compact(JOB_DESCRIPTION, budget, query=RESUME)
+
+    assert result.tokens <= budget
+    assert result.original_tokens == counter.count(JOB_DESCRIPTION)
+    assert "5+ years of Python, Django and PostgreSQL" in result.text
+    assert "Kafka pipelines" in result.text
+    assert "pet insurance" not in result.text
+    assert "benefits" in result.dropped_sections
+    # The kept sections stay in their original order
+    assert result.text.index("Responsibilities:") < result.text.index("Requirements:")
+
+
+def test_trims_a_section_that_only_partly_fits(counter):
+    compactor = PromptCompactor(counter)
+    budget = counter.count("Requirements:\n5+ years of Python, Django and PostgreSQL. Experience running")
+
+    result = compactor.compact(JOB_DESCRIPTION, budget, query=RESUME)
+
+    assert result.tokens <= budget
+    assert result.text.startswith("Requirements:\n5+ years of Python")
+    assert result.text.endswith("[...]")
+
+
+def test_ranks_unstructured_paragraphs_by_relevance(counter):
+    """Test that text without headings keeps the paragraphs most like the query."""
+    compactor = PromptCompactor(counter)
+    paragraphs = [
+        "We love dogs, coffee and long walks along the river on sunny afternoons with the whole team.",
+        "You will write Python and Django services backed by PostgreSQL and deploy them to AWS.",
+        "Our office has a rooftop garden, a library, a climbing wall and a piano nobody can play.",
+    ]
+    text = "\n\n".join(paragraphs)
+
+    result = compactor.compact(text, budget=counter.count(paragraphs[1]) + 2, query="Python Django PostgreSQL AWS")
+
+    assert result.text == paragraphs[1]
+    assert result.dropped_sections == ["body", "body"]
+
+
+def test_split_segments():
+    segments = dict(split_segments(RESUME))
+    assert set(segments) == {"header", "summary", "experience", "skills", "awards"}
+    assert [name for name, _ in split_segments("One sentence. Two. Three. Four.")] == ["body", "body"]
+
+
+def test_record_reports_savings(counter):
+    compactor = PromptCompactor(counter)
+    job = compactor.compact(JOB_DESCRIPTION, budget=60, query=RESUME)
+    resume = compactor.compact(RESUME, budget=10_000)
+
+    compactor.record("Fit analysis", job, resume)
+
+    assert compactor.stats.calls == 1
+    assert compactor.stats.saved_tokens == job.saved_tokens > 0
+    assert compactor.report() == (
+        f"Prompt compaction saved {job.saved_tokens} of {job.original_tokens + resume.original_tokens} tokens "
+        f"({compactor.stats.savings_rate:.0%}) over 1 prompts (test-bpe tokenizer)"
+    )
+
+
+def test_loads_tokenizer_from_local_copy(counter, tmp_path):
+    path = tmp_path / "tokenizer.json"
+    counter.tokenizer.save(str(path))
+
+    loaded = load_token_counter("test/bpe", path)
+
+    assert isinstance(loaded, TokenizerCounter)
+    assert loaded.count(JOB_DESCRIPTION) == counter.count(JOB_DESCRIPTION)
+
+
+def test_falls_back_to_estimate_without_tokenizer(tmp_path):
+    path = tmp_path / "tokenizer.json"
+    path.write_text("not a tokenizer", encoding="utf-8")
+
+    estimate = load_token_counter("test/bpe", path)
+
+    assert isinstance(estimate, ApproximateTokenCounter)
+    assert estimate.count("Python, Django and PostgreSQL") == 9
+
+
+def test_skips_download_when_downloads_are_off(tmp_path):
+    with patch.object(Tokenizer, "from_pretrained") as from_pretrained:
+        estimate = load_token_counter("test/bpe", tmp_path / "tokenizer.json", download=False)
+
+    assert isinstance(estimate, ApproximateTokenCounter)
+    from_pretrained.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_load_is_shared(counter):
+    with patch('app.prompting.tokens._token_counter', None), \
+            patch('app.prompting.tokens.load_token_counter', return_value=counter) as load:
+        assert await aget_token_counter() is counter
+        assert await aget_token_counter() is counter
+        assert PromptCompactor().counter is counter
+
+    load.assert_called_once()
@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.rate_limit import AsyncTokenBucket, get_rate_limiter
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    """Test that the bucket grants its capacity immediately and then refuses."""
+    bucket = AsyncTokenBucket(rate_per_minute=60, capacity=2)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire_waits_for_refill():
+    """Test that acquire waits roughly one refill interval when the bucket is empty."""
+    bucket = AsyncTokenBucket(rate_per_minute=6000, capacity=1)  # 100 tokens per second
+    assert await bucket.acquire() == pytest.approx(0.0, abs=0.005)
+
+    waited = await bucket.acquire()
+    assert 0.0 < waited < 0.1
+
+
+def test_get_rate_limiter_is_shared_per_provider():
+    """Test that agents using the same provider share one budget."""
+    assert get_rate_limiter("nvidia") is get_rate_limiter("nvidia")
+    assert get_rate_limiter("nvidia") is not get_rate_limiter("groq")
+    assert get_rate_limiter("nvidia", key="a") is not get_rate_limiter("nvidia", key="b")
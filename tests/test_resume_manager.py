@@ -69,7 +69,7 @@ async def test_resume_manager_agent_get_best_single_resume():
     """Test get_best_resume when only one resume is available."""
     with patch('os.listdir') as mock_listdir, \
          patch('builtins.open', MagicMock()) as mock_open, \
-         patch('app.agents.resume_manager_agent.PdfReader') as mock_pdf_reader:
+         patch('app.cache.resume_cache.PdfReader') as mock_pdf_reader:
         mock_listdir.return_value = ['resume1.pdf']
         mock_open.return_value.__enter__.return_value.read.return_value = b"Mock PDF content"
 
@@ -96,7 +96,7 @@ async def test_resume_manager_agent_get_best_multiple_resumes():
     """Test get_best_resume when multiple resumes are available."""
     with patch('os.listdir') as mock_listdir, \
          patch('builtins.open', MagicMock()) as mock_open, \
-         patch('app.agents.resume_manager_agent.PdfReader') as mock_pdf_reader:
+         patch('app.cache.resume_cache.PdfReader') as mock_pdf_reader:
         mock_listdir.return_value = ['resume1.pdf', 'resume2.pdf']
         mock_open.return_value.__enter__.return_value.read.return_value = b"Mock PDF content"
 
@@ -129,7 +129,7 @@ async def test_resume_manager_agent_get_best_llm_error():
     """Test get_best_resume handles LLM errors gracefully."""
     with patch('os.listdir') as mock_listdir, \
          patch('builtins.open', MagicMock()) as mock_open, \
-         patch('app.agents.resume_manager_agent.PdfReader') as mock_pdf_reader:
+         patch('app.cache.resume_cache.PdfReader') as mock_pdf_reader:
         mock_listdir.return_value = ['resume1.pdf', 'resume2.pdf']
         mock_open.return_value.__enter__.return_value.read.return_value = b"Mock PDF content"
 
@@ -152,3 +152,136 @@ async def test_resume_manager_agent_get_best_llm_error():
 
         # Should fall back to the first resume on error
         assert Path(best_resume).name == "resume1.pdf"
+
+
+def make_pdf(path: Path, lines: list[str]):
+    """Write a minimal single-page PDF whose text layer contains the given lines."""
+    content = "BT /F1 12 Tf 14 TL 72 720 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref_offset = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    path.write_bytes(body.encode("latin-1"))
+
+
+@pytest.fixture
+def resume_dirs(tmp_path):
+    """Create a resumes directory with two real PDFs and an empty cache directory."""
+    resumes_dir = tmp_path / "resumes"
+    resumes_dir.mkdir()
+    make_pdf(resumes_dir / "backend.pdf", ["Jane Doe", "Experience", "Python and Django at Acme", "Skills", "AWS, PostgreSQL"])
+    make_pdf(resumes_dir / "frontend.pdf", ["Jane Doe", "Experience", "React at Globex", "Skills", "TypeScript, CSS"])
+    return resumes_dir, tmp_path / "cache"
+
+
+def test_resume_manager_extracts_features(resume_dirs):
+    """Test that loading extracts text, tokens and section splits from each PDF."""
+    resumes_dir, cache_dir = resume_dirs
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 1):
+        rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir))
+        rm.load_resumes()
+
+    assert len(rm.resumes) == 2
+    backend_path = str(resumes_dir / "backend.pdf")
+    assert "Python and Django" in rm.resumes[backend_path]
+    features = rm.get_features(backend_path)
+    assert "django" in features.tokens
+    assert "AWS" in features.sections["skills"]
+    assert "Acme" in features.sections["experience"]
+
+
+def test_resume_manager_reuses_cache_on_warm_start(resume_dirs):
+    """Test that a warm start serves resumes from the cache without touching pypdf."""
+    resumes_dir, cache_dir = resume_dirs
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 1):
+        ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir)).load_resumes()
+
+    with patch('app.agents.resume_manager_agent.extract_resume_features') as mock_extract:
+        rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir))
+        rm.load_resumes()
+
+    mock_extract.assert_not_called()
+    assert len(rm.resumes) == 2
+
+
+def test_resume_manager_reextracts_changed_resume(resume_dirs):
+    """Test that a modified PDF is re-extracted and its stale cache entry pruned."""
+    resumes_dir, cache_dir = resume_dirs
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 1):
+        rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir))
+        rm.load_resumes()
+        make_pdf(resumes_dir / "backend.pdf", ["Jane Doe", "Skills", "Rust and Go"])
+        rm.load_resumes()
+
+    assert "Rust and Go" in rm.resumes[str(resumes_dir / "backend.pdf")]
+    assert len(list((cache_dir / "resumes").glob("*.json"))) == 2
+
+
+def test_resume_manager_loads_lazily(resume_dirs):
+    """Test that resumes are loaded on first access without an explicit load call."""
+    resumes_dir, cache_dir = resume_dirs
+    rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir))
+
+    assert len(rm.resumes) == 2
+
+
+def test_resume_manager_parallel_extraction(resume_dirs):
+    """Test that cold resumes are extracted through the process pool."""
+    resumes_dir, cache_dir = resume_dirs
+    make_pdf(resumes_dir / "data.pdf", ["Jane Doe", "Skills", "Spark, Airflow"])
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 2):
+        rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=MagicMock(), cache_dir=str(cache_dir))
+        rm.load_resumes()
+
+    assert len(rm.resumes) == 3
+    assert "Spark" in rm.resumes[str(resumes_dir / "data.pdf")]
+
+
+@pytest.mark.asyncio
+async def test_resume_manager_clear_winner_skips_llm(resume_dirs):
+    """Test that a clear local winner is returned without an LLM call."""
+    resumes_dir, cache_dir = resume_dirs
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock()
+    rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=mock_llm, cache_dir=str(cache_dir))
+
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 1):
+        best_resume = await rm.get_best_resume("Backend role: Python, Django, PostgreSQL and AWS")
+
+    assert Path(best_resume).name == "backend.pdf"
+    mock_llm.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_resume_manager_close_call_sends_only_top_k(resume_dirs):
+    """Test that only the shortlisted resumes are sent to the LLM when scores are close."""
+    resumes_dir, cache_dir = resume_dirs
+    make_pdf(resumes_dir / "fullstack.pdf", ["Jane Doe", "Skills", "Python, React"])
+    mock_llm = MagicMock()
+    mock_response = MagicMock()
+    mock_response.completion = "0"
+    mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+    rm = ResumeManagerAgent(resumes_dir=str(resumes_dir), llm=mock_llm, cache_dir=str(cache_dir))
+
+    with patch('app.agents.resume_manager_agent.RESUME_EXTRACT_WORKERS', 1), \
+         patch('app.agents.resume_manager_agent.RESUME_RANK_TOP_K', 2), \
+         patch('app.agents.resume_manager_agent.RESUME_RANK_CLEAR_MARGIN', 1.0):
+        best_resume = await rm.get_best_resume("Engineer with Python and React")
+
+    mock_llm.ainvoke.assert_called_once()
+    prompt = mock_llm.ainvoke.call_args.kwargs["messages"][0].content
+    assert prompt.count("Resume ID:") == 2
+    assert Path(best_resume).name in {"backend.pdf", "frontend.pdf", "fullstack.pdf"}
@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ranking import HashedBM25Index, ResumeRanker
+
+
+def test_bm25_index_scores_matching_document_highest():
+    """Test that the document sharing the query's terms scores highest."""
+    index = HashedBM25Index.from_texts([
+        "Python Django REST APIs on AWS",
+        "React TypeScript frontend and CSS",
+        "Java Spring microservices",
+    ])
+    scores = index.score(["django", "aws", "python"])
+
+    assert scores.shape == (3,)
+    assert scores.argmax() == 0
+    assert scores.dtype.name == "float32"
+
+
+def test_bm25_index_empty():
+    """Test that an empty index returns no scores."""
+    index = HashedBM25Index([])
+    assert index.score(["python"]).shape == (0,)
+
+
+def test_resume_ranker_orders_by_relevance():
+    """Test that resumes are ranked by their best matching section."""
+    ranker = ResumeRanker.from_texts({
+        "frontend.pdf": "Jane Doe\nExperience\nBuilt React apps\nSkills\nTypeScript, CSS, HTML",
+        "backend.pdf": "Jane Doe\nExperience\nBuilt Django services\nSkills\nPython, PostgreSQL, AWS",
+    })
+    ranked = ranker.rank("Backend engineer: Python, Django and PostgreSQL on AWS")
+
+    assert [path for path, _ in ranked] == ["backend.pdf", "frontend.pdf"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_resume_ranker_ties_keep_original_order():
+    """Test that identical resumes keep their load order."""
+    ranker = ResumeRanker.from_texts({"a.pdf": "Python developer", "b.pdf": "Python developer"})
+    ranked = ranker.rank("Python developer")
+
+    assert [path for path, _ in ranked] == ["a.pdf", "b.pdf"]
+    assert ranked[0][1] == pytest.approx(ranked[1][1])
+
+
+def test_resume_ranker_best_scores_match_rank():
+    """Test that batch scoring gives each job the score of its best resume."""
+    ranker = ResumeRanker.from_texts({
+        "frontend.pdf": "Experience\nBuilt React apps\nSkills\nTypeScript, CSS, HTML",
+        "backend.pdf": "Experience\nBuilt Django services\nSkills\nPython, PostgreSQL, AWS",
+    })
+    jobs = ["Backend engineer: Python, Django and PostgreSQL", "Frontend engineer: React and TypeScript", "Chef"]
+
+    scores = ranker.best_scores(jobs)
+
+    assert scores.shape == (3,)
+    for job, score in zip(jobs, scores):
+        assert score == pytest.approx(ranker.rank(job)[0][1], abs=1e-5)
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+import sys
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, AsyncMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.scheduler import ApplicationScheduler, DomainThrottle
+from app.session_pool import PoolMetrics
+
+
+def make_history(successful: bool = True):
+    history = MagicMock()
+    history.is_successful.return_value = successful
+    return history
+
+
+@pytest.fixture
+def mock_session_pool():
+    """Create a session pool that hands out a distinct mock browser per acquisition."""
+    pool = MagicMock()
+    pool.acquired = []
+
+    @asynccontextmanager
+    async def acquire():
+        browser = MagicMock(name=f"browser-{len(pool.acquired)}")
+        pool.acquired.append(browser)
+        yield browser
+
+    pool.acquire = acquire
+    pool.metrics = PoolMetrics()
+    return pool
+
+
+def make_scheduler(pool, apply_to_job, workers=3, throttle=None):
+    """Create a scheduler whose workers use a mocked JobApplicationAgent."""
+    def agent_factory(tab):
+        agent = MagicMock()
+        agent.browser = tab
+        agent.apply_to_job = AsyncMock(side_effect=apply_to_job)
+        agent.last_readiness_saved_seconds = 3.5
+        return agent
+
+    return ApplicationScheduler(
+        pool, knowledge_base=MagicMock(), resume_manager=MagicMock(), workers=workers,
+        throttle=throttle or DomainThrottle(max_concurrent=10, min_interval=0), agent_factory=agent_factory,
+    )
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_workers_in_parallel(mock_session_pool):
+    """Test that N workers apply concurrently, each on its own browser."""
+    in_flight = [0]
+    peak = [0]
+
+    async def apply_to_job(url):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return make_history()
+
+    scheduler = make_scheduler(mock_session_pool, apply_to_job, workers=3)
+    report = await scheduler.run([f"https://site{i}.example.com/job" for i in range(9)])
+
+    assert peak[0] == 3
+    assert len(mock_session_pool.acquired) == 9
+    assert report.status_counts == {"succeeded": 9}
+    assert all(r.readiness_saved_seconds == 3.5 for r in report.results)
+    assert report.jobs_per_minute > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reports_per_job_status(mock_session_pool):
+    """Test that failures, skips and exceptions are reported per job."""
+    async def apply_to_job(url):
+        if "skip" in url:
+            return None
+        if "boom" in url:
+            raise RuntimeError("browser crashed")
+        return make_history(successful="ok" in url)
+
+    scheduler = make_scheduler(mock_session_pool, apply_to_job, workers=2)
+    report = await scheduler.run(["https://a.com/ok", "https://b.com/bad", "https://c.com/skip", "https://d.com/boom"])
+
+    statuses = {r.url: r.status for r in report.results}
+    assert statuses == {
+        "https://a.com/ok": "succeeded",
+        "https://b.com/bad": "failed",
+        "https://c.com/skip": "skipped",
+        "https://d.com/boom": "failed",
+    }
+    assert next(r for r in report.results if r.url == "https://d.com/boom").error == "browser crashed"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_records_browser_acquisition_failures(mock_session_pool):
+    """Test that a job is reported as failed when no browser can be launched for it."""
+    @asynccontextmanager
+    async def failing_acquire():
+        raise RuntimeError("launch failed")
+        yield
+
+    mock_session_pool.acquire = failing_acquire
+    scheduler = make_scheduler(mock_session_pool, AsyncMock(), workers=1)
+    report = await scheduler.run(["https://a.com/1"])
+
+    assert report.results[0].status == "failed"
+    assert "launch failed" in report.results[0].error
+
+
+@pytest.mark.asyncio
+async def test_scheduler_enforces_per_domain_limit(mock_session_pool):
+    """Test that jobs on one domain never run more than the politeness limit at once."""
+    in_flight = [0]
+    peak = [0]
+
+    async def apply_to_job(url):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return make_history()
+
+    scheduler = make_scheduler(mock_session_pool, apply_to_job, workers=4,
+                               throttle=DomainThrottle(max_concurrent=1, min_interval=0))
+    report = await scheduler.run([f"https://boards.greenhouse.io/acme/jobs/{i}" for i in range(4)])
+
+    assert peak[0] == 1
+    assert len(report.results) == 4
+
+
+@pytest.mark.asyncio
+async def test_domain_throttle_spaces_out_starts():
+    """Test that consecutive starts on one domain respect the minimum interval."""
+    throttle = DomainThrottle(max_concurrent=2, min_interval=0.05)
+    loop = asyncio.get_running_loop()
+    starts = []
+
+    async def enter(url):
+        async with throttle.slot(url):
+            starts.append(loop.time())
+
+    await asyncio.gather(enter("https://a.com/1"), enter("https://a.com/2"))
+
+    assert starts[1] - starts[0] >= 0.045
@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+import sys
+import os
+from unittest.mock import patch, MagicMock, AsyncMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.session_pool import SessionPool, seed_pool_profile
+
+
+class FakeLauncher:
+    """Launches mock browsers whose liveness can be toggled."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.launched = []
+
+    async def __call__(self, slot: int):
+        await asyncio.sleep(self.delay)
+        browser = MagicMock(name=f"browser-{slot}")
+        browser.slot = slot
+        browser.cdp_client.send.Browser.getVersion = AsyncMock(return_value={"product": "Chrome"})
+        browser.kill = AsyncMock()
+        self.launched.append(browser)
+        return browser
+
+
+def make_pool(launcher, **kwargs):
+    options = dict(min_size=1, max_size=2, max_tasks=0, max_age_minutes=0, max_rss_mb=0, probe_timeout=0.1)
+    options.update(kwargs)
+    return SessionPool(launcher=launcher, **options)
+
+
+@pytest.mark.asyncio
+async def test_session_pool_prewarm_and_reuse():
+    """Test that prewarmed browsers are reused across acquisitions."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher)
+    await pool.prewarm()
+    assert len(launcher.launched) == 1
+
+    async with pool.acquire() as first:
+        pass
+    async with pool.acquire() as second:
+        pass
+
+    assert first is second is launcher.launched[0]
+    assert pool.metrics.acquisitions == 2
+    assert pool.metrics.launches == 1
+
+
+@pytest.mark.asyncio
+async def test_session_pool_respects_max_size_and_tracks_wait():
+    """Test that acquirers wait once max_size browsers are in use."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher, min_size=0, max_size=2)
+    in_use = [0]
+    peak = [0]
+
+    async def task():
+        async with pool.acquire():
+            in_use[0] += 1
+            peak[0] = max(peak[0], in_use[0])
+            await asyncio.sleep(0.02)
+            in_use[0] -= 1
+
+    await asyncio.gather(*(task() for _ in range(5)))
+
+    assert peak[0] == 2
+    assert len(launcher.launched) == 2
+    assert pool.metrics.max_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_session_pool_replaces_unresponsive_browser():
+    """Test that a browser failing its liveness probe is killed and replaced."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher)
+    await pool.prewarm()
+    dead = launcher.launched[0]
+    dead.cdp_client.send.Browser.getVersion = AsyncMock(side_effect=ConnectionError("gone"))
+
+    async with pool.acquire() as browser:
+        assert browser is not dead
+
+    dead.kill.assert_awaited_once()
+    assert pool.metrics.failed_probes == 1
+
+
+@pytest.mark.asyncio
+async def test_session_pool_recycles_after_max_tasks():
+    """Test that a browser is recycled once it has served max_tasks tasks."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher, min_size=0, max_tasks=2)
+
+    browsers = []
+    for _ in range(3):
+        async with pool.acquire() as browser:
+            browsers.append(browser)
+
+    assert browsers[0] is browsers[1]
+    assert browsers[2] is not browsers[0]
+    browsers[0].kill.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_pool_recycles_on_rss():
+    """Test that a browser using more memory than allowed is evicted."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher, min_size=0, max_rss_mb=100)
+
+    with patch('app.session_pool.browser_rss_mb', return_value=500.0):
+        async with pool.acquire() as browser:
+            pass
+
+    browser.kill.assert_awaited_once()
+    assert pool.metrics.rss_evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_session_pool_recycles_after_max_age():
+    """Test that a browser older than max_age_minutes is recycled on release."""
+    launcher = FakeLauncher()
+    pool = make_pool(launcher, min_size=0, max_age_minutes=1)
+
+    with patch('app.session_pool.PooledBrowser.age_minutes', new=5.0):
+        async with pool.acquire() as browser:
+            pass
+
+    browser.kill.assert_awaited_once()
+
+
+def test_seed_pool_profile_copies_profile_without_caches_or_locks(tmp_path):
+    """Test that a pool slot gets a fresh copy of the user's profile, minus caches and lock files."""
+    source = tmp_path / "profile"
+    (source / "Default" / "Network").mkdir(parents=True)
+    (source / "Default" / "Network" / "Cookies").write_text("session", encoding="utf-8")
+    (source / "Default" / "Cache").mkdir()
+    (source / "Default" / "Cache" / "data_0").write_text("cached", encoding="utf-8")
+    (source / "SingletonLock").write_text("host-123", encoding="utf-8")
+    stale = tmp_path / "pool" / "slot-1" / "Default" / "stale.txt"
+    stale.parent.mkdir(parents=True)
+    stale.write_text("old", encoding="utf-8")
+
+    target = seed_pool_profile(1, source_dir=source, pool_dir=tmp_path / "pool")
+
+    assert target == tmp_path / "pool" / "slot-1"
+    assert (target / "Default" / "Network" / "Cookies").read_text(encoding="utf-8") == "session"
+    assert not (target / "Default" / "Cache").exists()
+    assert not (target / "SingletonLock").exists()
+    assert not stale.exists()
+
+
+def test_seed_pool_profile_copies_each_slot_once(tmp_path):
+    """Test that a seeded slot is reused as is rather than copied again on every launch."""
+    source = tmp_path / "profile"
+    source.mkdir()
+    (source / "Cookies").write_text("first", encoding="utf-8")
+    target = seed_pool_profile(0, source_dir=source, pool_dir=tmp_path / "pool")
+    (source / "Cookies").write_text("second", encoding="utf-8")
+
+    assert seed_pool_profile(0, source_dir=source, pool_dir=tmp_path / "pool") == target
+    assert (target / "Cookies").read_text(encoding="utf-8") == "first"
+
+
+def test_seed_pool_profile_without_source_profile(tmp_path):
+    """Test that a missing profile leaves the slot with an empty profile directory."""
+    target = seed_pool_profile(0, source_dir=tmp_path / "missing", pool_dir=tmp_path / "pool")
+
+    assert target.is_dir()
+    assert list(target.iterdir()) == []
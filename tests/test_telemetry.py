@@ -0,0 +1,175 @@
+import asyncio
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.telemetry import (
+    JsonlSpanExporter, OpenTelemetryExporter, Span, Tracer, browser_step_hooks, configure_tracing,
+    format_report, get_tracer, load_spans, set_tracer, summarize, trace_files,
+)
+from app.telemetry.__main__ import main as report_main
+
+
+def make_span(name: str, duration_ms: float, trace_id: str = "run-1", **attributes) -> Span:
+    return Span(trace_id=trace_id, span_id=f"{name}-{duration_ms}", name=name, start=0.0,
+                duration_ms=duration_ms, attributes=attributes)
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks(span_recorder):
+    """Test that spans opened inside another span, also in tasks it starts, become its children."""
+    tracer = get_tracer()
+
+    async def child(i: int):
+        with tracer.span("llm.call", job=i):
+            await asyncio.sleep(0)
+
+    with tracer.span("application.apply", url="https://example.com/job") as parent:
+        await asyncio.gather(child(1), child(2))
+
+    children = [span for span in span_recorder.spans if span.name == "llm.call"]
+    assert [span.name for span in span_recorder.spans][-1] == "application.apply"
+    assert len(children) == 2
+    assert all(span.parent_id == parent.span_id and span.trace_id == "run-1" for span in children)
+    assert parent.parent_id is None
+    assert parent.attributes == {"url": "https://example.com/job"}
+    assert parent.duration_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_and_cancelled_spans(span_recorder):
+    """Test that a span closed by an exception records the error and a cancelled one its cancellation."""
+    tracer = get_tracer()
+
+    with pytest.raises(ValueError):
+        with tracer.span("kb.query"):
+            raise ValueError("index missing")
+
+    async def slow():
+        with tracer.span("browser.start"):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(slow())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    failed, cancelled = span_recorder.spans
+    assert (failed.status, failed.error) == ("error", "ValueError: index missing")
+    assert (cancelled.status, cancelled.error) == ("cancelled", None)
+
+
+@pytest.mark.asyncio
+async def test_browser_step_hooks_record_steps(span_recorder):
+    """Test that each agent step becomes a span and the existing step hook still runs."""
+    seen = []
+
+    async def existing_hook(agent):
+        seen.append(agent.state.n_steps)
+
+    step_start, step_end = browser_step_hooks("apply", on_step_end=existing_hook)
+    for n in (1, 2):
+        agent = SimpleNamespace(state=SimpleNamespace(n_steps=n))
+        await step_start(agent)
+        await step_end(agent)
+
+    assert seen == [1, 2]
+    assert [(span.name, span.attributes) for span in span_recorder.spans] == [
+        ("browser.step", {"task": "apply", "step": 1}),
+        ("browser.step", {"task": "apply", "step": 2}),
+    ]
+
+
+def test_jsonl_round_trip(tmp_path):
+    """Test that a run's spans are written as JSONL and read back, skipping a line cut short by a crash."""
+    tracer = configure_tracing(tmp_path, enabled=True, otel=False)
+    try:
+        with tracer.span("pipeline.run"):
+            with tracer.span("llm.call", prompt_tokens=120, completion_tokens=30):
+                pass
+    finally:
+        tracer.close()
+        set_tracer(Tracer())
+    path = tmp_path / f"{tracer.run_id}.jsonl"
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"trace_id": "run-1", "span_')
+
+    spans = load_spans(trace_files(tmp_path))
+
+    assert [span.name for span in spans] == ["llm.call", "pipeline.run"]
+    assert spans[0].parent_id == spans[1].span_id
+    assert spans[0].attributes == {"prompt_tokens": 120, "completion_tokens": 30}
+
+
+def test_disabled_tracing_writes_nothing(tmp_path):
+    """Test that with tracing off no exporter is installed and no trace file is written."""
+    tracer = configure_tracing(tmp_path, enabled=False, otel=False)
+    with tracer.span("pipeline.run"):
+        pass
+    set_tracer(Tracer())
+
+    assert tracer.exporters == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_summarize_percentiles_and_totals():
+    """Test per-stage percentiles, run and error counts and attribute totals, slowest stage first."""
+    spans = [make_span("llm.call", ms, trace_id=f"run-{ms % 2}", prompt_tokens=100, completion_tokens=10,
+                       cost_usd=0.001) for ms in range(1, 101)]
+    spans += [make_span("browser.step", 6000.0), make_span("kb.query", 20.0)]
+    spans[0].status = "error"
+
+    stats = summarize(spans)
+
+    assert [s.stage for s in stats] == ["browser.step", "llm.call", "kb.query"]
+    llm = stats[1]
+    assert (llm.count, llm.runs, llm.errors) == (100, 2, 1)
+    assert llm.p50_ms == pytest.approx(50.5)
+    assert llm.p95_ms == pytest.approx(95.05)
+    assert llm.totals == {"prompt_tokens": 10000.0, "completion_tokens": 1000.0, "cost_usd": pytest.approx(0.1)}
+    assert [s.stage for s in summarize(spans, stage_prefix="llm.")] == ["llm.call"]
+
+
+def test_format_report():
+    """Test the report table layout and the message for an empty trace."""
+    stats = summarize([make_span("llm.call", 200.0, prompt_tokens=90, completion_tokens=10, cost_usd=0.25)])
+
+    lines = format_report(stats).splitlines()
+
+    assert lines[0].split() == ["stage", "count", "runs", "errors", "p50", "ms", "p95", "ms", "total", "s",
+                                "tokens", "cost", "$"]
+    assert lines[2].split() == ["llm.call", "1", "1", "0", "200.0", "200.0", "0.2", "100", "0.2500"]
+    assert format_report([]) == "No spans recorded."
+
+
+def test_report_cli_reads_last_runs(tmp_path, capsys):
+    """Test that the report command only summarizes the most recent runs."""
+    for run_id, ms in (("20260101-000000-aaaaaa", 10.0), ("20260102-000000-bbbbbb", 30.0)):
+        exporter = JsonlSpanExporter(tmp_path / f"{run_id}.jsonl")
+        exporter.export(make_span("resume.rank", ms, trace_id=run_id))
+        exporter.close()
+
+    report_main(["--trace-dir", str(tmp_path), "--runs", "1"])
+
+    output = capsys.readouterr().out.splitlines()
+    assert output[0] == "1 run(s)"
+    assert output[3].split()[:6] == ["resume.rank", "1", "1", "0", "30.0", "30.0"]
+
+
+def test_opentelemetry_export_without_sdk():
+    """Test that spans pass through the OpenTelemetry API, a no-op without an SDK, without failing."""
+    exporter = OpenTelemetryExporter()
+    tracer = Tracer([exporter])
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("application.apply", url="https://example.com/job"):
+            with tracer.span("llm.call", provider=None):
+                raise RuntimeError("rate limited")
+    tracer.record("browser.step", start=0.0, duration_ms=5.0, task="search")
+
+    assert exporter._live == {}